@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""EventProcessor mesaj/saniye benchmark'i (gercekci Zigbee2MQTT payload'lari).
+
+Iki yol olculur:
+  - tek parse : parse() -> accept() -> update_battery() (MQTTCollector yolu)
+  - cift parse: process() + check_battery() (pil icin ayni bytes tekrar
+    parse edilir; eski _on_message sekli)
+
+Mesaj karisimi: hareket (occupancy true/false), kapi (contact), pil /
+link kalitesi / sicaklik alanlari ile; zaman damgalari 5 sn aralikli
+oldugundan debounce, pasif ve kabul yollarinin hepsi calisir.
+
+Kullanim:
+    python scripts/bench_event_processor.py
+    python scripts/bench_event_processor.py --messages 500000
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.collector.event_processor import EventProcessor
+
+SENSORS = [
+    ("mutfak_motion", "presence", "motion", "on"),
+    ("banyo_motion", "bathroom", "motion", "on"),
+    ("salon_motion", "presence", "motion", "on"),
+    ("buzdolabi_kapi", "fridge", "contact", "open"),
+    ("dis_kapi", "door", "contact", "open"),
+]
+
+
+def _payload(sensor_type: str, rng: random.Random) -> bytes:
+    """Zigbee2MQTT'nin yayinladigi tam durum sozlugu."""
+    common = {
+        "battery": rng.randint(5, 100),
+        "linkquality": rng.randint(20, 255),
+        "voltage": rng.randint(2700, 3100),
+        "device_temperature": rng.randint(18, 30),
+        "power_outage_count": rng.randint(0, 10),
+    }
+    if sensor_type == "motion":
+        state = {"occupancy": rng.random() < 0.7, "illuminance": rng.randint(0, 500),
+                 "illuminance_lux": rng.randint(0, 500)}
+    else:
+        state = {"contact": rng.random() < 0.5}
+    return json.dumps({**state, **common}).encode()
+
+
+def build_messages(n: int, seed: int = 42) -> list[tuple]:
+    rng = random.Random(seed)
+    base = datetime(2025, 2, 11, 8, 0, 0)
+    messages = []
+    for i in range(n):
+        sensor_id, channel, sensor_type, trigger = rng.choice(SENSORS)
+        messages.append((
+            sensor_id, channel, sensor_type, trigger,
+            _payload(sensor_type, rng), base + timedelta(seconds=5 * i),
+        ))
+    return messages
+
+
+def single_parse(messages: list[tuple]) -> float:
+    processor = EventProcessor()
+    t0 = time.perf_counter()
+    for sensor_id, channel, sensor_type, trigger, payload, ts in messages:
+        msg = processor.parse(sensor_type, trigger, payload, ts)
+        processor.accept(sensor_id, channel, msg)
+        if msg is not None:
+            processor.update_battery(sensor_id, msg.battery)
+    return time.perf_counter() - t0
+
+
+def double_parse(messages: list[tuple]) -> float:
+    processor = EventProcessor()
+    t0 = time.perf_counter()
+    for sensor_id, channel, sensor_type, trigger, payload, ts in messages:
+        processor.process(sensor_id, channel, sensor_type, trigger, payload, ts)
+        processor.check_battery(sensor_id, payload)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EventProcessor mesaj/sn benchmark'i")
+    parser.add_argument("--messages", type=int, default=200_000, help="Mesaj sayisi")
+    parser.add_argument("--rounds", type=int, default=3, help="Tekrar (en iyisi alinir)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    messages = build_messages(args.messages)
+    print(f"Mesaj sayisi: {args.messages} (ortalama payload {sum(len(m[4]) for m in messages) // len(messages)} bayt)")
+    for name, run in (("tek parse ", single_parse), ("cift parse", double_parse)):
+        best = min(run(messages) for _ in range(args.rounds))
+        print(f"{name}: {args.messages / best:10,.0f} mesaj/sn  {best * 1e6 / args.messages:6.2f} us/mesaj")
+
+
+if __name__ == "__main__":
+    main()
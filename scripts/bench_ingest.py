@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""MQTT ingest benchmark: saniyede islenen event sayisi.
+
+MQTTCollector._on_message uzerinden gercekci Zigbee2MQTT mesajlari gecirir
+ve iki modu karsilastirir:
+  - legacy: her get_db cagrisinda yeni sqlite3.connect + PRAGMA (eski davranis)
+  - pooled: thread-local kalici baglanti havuzu
+
+Kullanim:
+    python scripts/bench_ingest.py
+    python scripts/bench_ingest.py --events 5000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.collector.event_writer as event_writer_mod
+import src.database as database_mod
+from src.collector.mqtt_client import MQTTCollector
+from src.config import AppConfig
+from src.database import close_all_connections, init_db
+
+SENSORS = [
+    {"id": "mutfak_motion", "channel": "presence", "type": "motion", "trigger_value": "on"},
+    {"id": "buzdolabi_kapi", "channel": "fridge", "type": "contact", "trigger_value": "open"},
+    {"id": "banyo_kapi", "channel": "bathroom", "type": "contact", "trigger_value": "open"},
+    {"id": "dis_kapi", "channel": "door", "type": "contact", "trigger_value": "open"},
+]
+
+PAYLOADS = {
+    "motion": {"occupancy": True, "battery": 87, "linkquality": 120, "illuminance": 14},
+    "contact": {"contact": False, "battery": 92, "linkquality": 98, "voltage": 3000},
+}
+
+
+class _Message:
+    """paho MQTTMessage yerine sadece topic + payload."""
+
+    def __init__(self, topic: str, payload: bytes):
+        self.topic = topic
+        self.payload = payload
+
+
+@contextmanager
+def _legacy_get_db(db_path: str):
+    """Havuz oncesi get_db: her cagrida connect + PRAGMA + close."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA busy_timeout=5000")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _run(db_path: str, n_events: int) -> float:
+    """n_events mesaji isle, saniyedeki event sayisini dondur."""
+    config = AppConfig(sensors=SENSORS, database={"path": db_path})
+    collector = MQTTCollector(config, db_path)
+    messages = []
+    for s in SENSORS:
+        payload = json.dumps(PAYLOADS[s["type"]]).encode()
+        messages.append((f"zigbee2mqtt/{s['id']}", payload))
+
+    # Debounce'a takilmamak icin her mesaj 31sn ileri bir zamanda islenir
+    base = datetime.now()
+    timestamps = iter([base + timedelta(seconds=31 * i) for i in range(n_events)])
+
+    with patch("src.collector.event_processor.datetime") as fake_dt:
+        fake_dt.now.side_effect = lambda: next(timestamps)
+        start = time.perf_counter()
+        for i in range(n_events):
+            topic, payload = messages[i % len(messages)]
+            collector._on_message(None, None, _Message(topic, payload))
+        elapsed = time.perf_counter() - start
+    return n_events / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MQTT ingest benchmark")
+    parser.add_argument("--events", type=int, default=2000, help="Islenecek mesaj sayisi")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        pooled_db = os.path.join(tmp, "pooled.db")
+        init_db(legacy_db)
+        init_db(pooled_db)
+
+        with patch.object(database_mod, "get_db", _legacy_get_db), \
+             patch.object(event_writer_mod, "get_db", _legacy_get_db):
+            legacy_rate = _run(legacy_db, args.events)
+
+        pooled_rate = _run(pooled_db, args.events)
+        close_all_connections()
+
+    print(f"Event sayisi : {args.events}")
+    print(f"legacy       : {legacy_rate:8.0f} event/sn")
+    print(f"pooled       : {pooled_rate:8.0f} event/sn")
+    print(f"hizlanma     : {pooled_rate / legacy_rate:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
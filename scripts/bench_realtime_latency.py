@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Dusme alarmi gecikme benchmark'i: deadline -> alarm suresi.
+
+SensorSimulator ile uretilen gunluk eventleri zaman olcegi sikistirilarak
+gercek zamanda RealtimeMonitor'a (event-driven deadline zamanlayici)
+besler. Sonrasinda 45 dk (olcekli) baska sinyal gelmeyen her banyo
+event'i bir dusme senaryosudur. Iki olcum raporlanir:
+  - deadline: zamanlayicinin deadline'dan alarma kadar gercek gecikmesi
+  - cron:     ayni senaryolarda :00/:30 cron'unun deadline'dan sonra
+              alarmi yakalayacagi ana kadar gecen sure (simule zamanda)
+
+Kullanim:
+    python scripts/bench_realtime_latency.py
+    python scripts/bench_realtime_latency.py --days 3 --day-seconds 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.collector.fall_state import FallStateTracker
+from src.config import AppConfig
+from src.database import close_all_connections, init_db
+from src.detector.realtime_monitor import RealtimeMonitor
+from src.simulator.sensor_simulator import SensorSimulator
+
+FALL_MINUTES = 45
+
+
+def _cron_delay_minutes(deadline: datetime) -> float:
+    """Deadline'dan sonraki ilk :00/:30 cron calismasina kadar gecen dakika."""
+    tick = deadline.replace(minute=0, second=0, microsecond=0)
+    while tick < deadline:
+        tick += timedelta(minutes=30)
+    return (tick - deadline).total_seconds() / 60
+
+
+def _replay_day(
+    db_path: str, events: list[tuple], day_seconds: float
+) -> tuple[list[float], list[float]]:
+    """Bir gunu olcekli gercek zamanda oynat.
+
+    Returns:
+        (deadline gecikmeleri ms, cron gecikmeleri dk)
+    """
+    events = sorted(events)
+    sim_start = datetime.fromisoformat(events[0][0])
+    sim_span = (datetime.fromisoformat(events[-1][0]) - sim_start).total_seconds()
+    scale = day_seconds / max(sim_span, 1.0)  # gercek sn / simule sn
+
+    config = AppConfig()
+    # Olcekli dusme suresi; sessizlik alarmi bu olcumun disinda tutulur
+    config.alerts.fall_detection_minutes = FALL_MINUTES * scale
+    config.alerts.silence_threshold_hours = 24 * 365
+
+    fired: list[tuple[str, datetime]] = []
+    lock = threading.Lock()
+
+    def on_alert(alert) -> None:
+        if alert.alert_type == "fall_suspicion":
+            with lock:
+                fired.append((alert.last_event_time, datetime.now()))
+
+    tracker = FallStateTracker(db_path)
+    monitor = RealtimeMonitor(db_path, config, on_alert, fall_tracker=tracker)
+    monitor.start()
+
+    real_start = datetime.now()
+    mono_start = time.monotonic()
+    expected: dict[str, datetime] = {}  # real last_bt -> simule deadline
+    try:
+        for i, (sim_ts, sensor_id, channel, value) in enumerate(events):
+            offset = (datetime.fromisoformat(sim_ts) - sim_start).total_seconds() * scale
+            wait = mono_start + offset - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            real_ts = (real_start + timedelta(seconds=offset)).isoformat()
+            event = {
+                "sensor_id": sensor_id, "channel": channel, "timestamp": real_ts,
+                "event_type": "state_change", "value": value,
+            }
+            tracker.on_event(channel, real_ts)
+            monitor.on_event(event)
+
+            # Sonraki event 45 dk'dan sonra geliyorsa (veya hic gelmiyorsa) dusme senaryosu
+            if channel == "bathroom":
+                sim_dt = datetime.fromisoformat(sim_ts)
+                nxt = datetime.fromisoformat(events[i + 1][0]) if i + 1 < len(events) else None
+                if nxt is None or nxt - sim_dt >= timedelta(minutes=FALL_MINUTES):
+                    expected[real_ts] = sim_dt + timedelta(minutes=FALL_MINUTES)
+
+        # Son deadline'in gecmesini bekle
+        time.sleep(FALL_MINUTES * 60 * scale + 0.5)
+    finally:
+        monitor.stop()
+
+    timeout = timedelta(minutes=config.alerts.fall_detection_minutes)
+    deadline_ms = []
+    for last_bt, at in fired:
+        deadline = datetime.fromisoformat(last_bt) + timeout
+        deadline_ms.append((at - deadline).total_seconds() * 1000)
+    cron_min = [_cron_delay_minutes(d) for d in expected.values()]
+    if len(fired) != len(expected):
+        print(f"  uyari: {len(expected)} senaryo, {len(fired)} alarm")
+    return deadline_ms, cron_min
+
+
+def _summary(values: list[float]) -> str:
+    if not values:
+        return "veri yok"
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return (
+        f"n={len(values)} ort={statistics.mean(values):.1f} "
+        f"p95={p95:.1f} max={max(values):.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dusme alarmi gecikme benchmark'i")
+    parser.add_argument("--days", type=int, default=2, help="Simule gun sayisi")
+    parser.add_argument("--day-seconds", type=float, default=6.0,
+                        help="Bir simule gunun gercek suresi (sn)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    deadline_all: list[float] = []
+    cron_all: list[float] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        init_db(db_path)
+        sim = SensorSimulator(db_path, seed=args.seed)
+        start = datetime(2025, 3, 1)
+        for d in range(args.days):
+            date = (start + timedelta(days=d)).strftime("%Y-%m-%d")
+            events = sim._build_normal_events(date)
+            deadline_ms, cron_min = _replay_day(db_path, events, args.day_seconds)
+            deadline_all.extend(deadline_ms)
+            cron_all.extend(cron_min)
+        close_all_connections()
+
+    print(f"Simule gun      : {args.days} (gun basina {args.day_seconds:.1f} sn)")
+    print(f"deadline (ms)   : {_summary(deadline_all)}")
+    print(f"cron 30dk (dk)  : {_summary(cron_all)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Retention maliyeti: tek tabloda DELETE vs aylik bolumlerde DROP TABLE.
+
+Ayni event setiyle iki DB kurar (database.partition_events kapali / acik),
+retention gununu bir ay geriye cekip cleanup_old_events calistirir.
+Olculenler: temizlik suresi, temizlik sirasinda WAL'a yazilan bayt ve
+bugunun event sayisi sorgusunun suresi (router'in tek ay tablosuna
+indigi yol).
+
+Kullanim:
+    python scripts/bench_retention.py
+    python scripts/bench_retention.py --months 6 --per-day 3000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import (
+    cleanup_old_events,
+    close_all_connections,
+    configure_event_partitions,
+    get_db,
+    init_db,
+    run_db_maintenance,
+)
+from src.heartbeat.system_monitor import get_today_event_count
+from src.partitions import insert_events
+
+CHANNELS = ["presence", "fridge", "bathroom", "door"]
+
+
+def build(db_path: str, partitioned: bool, days: int, per_day: int, now: datetime) -> None:
+    """days gunluk, gun basina per_day event."""
+    init_db(db_path)
+    configure_event_partitions(db_path, partitioned)
+    rng = random.Random(42)
+    start = now - timedelta(days=days - 1)
+    for d in range(days):
+        day = (start + timedelta(days=d)).replace(hour=0, minute=0, second=0)
+        rows = []
+        for _ in range(per_day):
+            ts = day + timedelta(seconds=rng.randint(0, 86_399))
+            ch = rng.choice(CHANNELS)
+            rows.append((ts.strftime("%Y-%m-%dT%H:%M:%S"), f"{ch}_1", ch, "state_change", "on"))
+        with get_db(db_path) as conn:
+            insert_events(conn, rows)
+            conn.commit()
+    run_db_maintenance(db_path)
+
+
+def _wal_bytes(db_path: str) -> int:
+    wal = db_path + "-wal"
+    return os.path.getsize(wal) if os.path.exists(wal) else 0
+
+
+def measure(db_path: str, retention_days: int, now: datetime, repeats: int) -> dict:
+    wal_before = _wal_bytes(db_path)
+    t0 = time.perf_counter()
+    deleted = cleanup_old_events(db_path, retention_days)
+    cleanup_ms = (time.perf_counter() - t0) * 1000
+    wal_written = _wal_bytes(db_path) - wal_before
+
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        get_today_event_count(db_path, now)
+    query_us = (time.perf_counter() - t0) * 1e6 / repeats
+    return {"deleted": deleted, "cleanup_ms": cleanup_ms,
+            "wal_kb": wal_written / 1024, "query_us": query_us}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Retention DELETE vs DROP benchmark'i")
+    parser.add_argument("--months", type=int, default=4, help="Uretilecek ay sayisi")
+    parser.add_argument("--per-day", type=int, default=2000, help="Gun basina event")
+    parser.add_argument("--repeats", type=int, default=200, help="Sorgu tekrar sayisi")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    now = datetime.now()
+    days = args.months * 31
+    # En eski ~1 ayi dusurecek retention
+    retention = days - 31 - now.day
+
+    print(f"{days} gun x {args.per_day} event, retention={retention} gun\n")
+    print(f"{'duzen':>10} {'silinen':>9} {'temizlik ms':>12} {'WAL KB':>9} {'bugun sorgu us':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for partitioned in (False, True):
+            db_path = os.path.join(tmp, f"events_{int(partitioned)}.db")
+            build(db_path, partitioned, days, args.per_day, now)
+            r = measure(db_path, retention, now, args.repeats)
+            name = "bolumlu" if partitioned else "tek tablo"
+            print(f"{name:>10} {r['deleted']:9d} {r['cleanup_ms']:12.1f} "
+                  f"{r['wal_kb']:9.0f} {r['query_us']:15.1f}")
+        close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
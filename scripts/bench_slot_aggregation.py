@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Gunluk slot ozetleme benchmark'i: slot-slot vs tek SQL gecisi.
+
+SensorSimulator ile N gunluk event uretir ve iki yolu karsilastirir:
+  - legacy: gun basina 96 x aggregate_current_slot + fill_missing_slots
+  - day:    aggregate_day ile tum aralik tek INSERT ... SELECT
+
+Kullanim:
+    python scripts/bench_slot_aggregation.py
+    python scripts/bench_slot_aggregation.py --days 60
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.collector.slot_aggregator import (
+    aggregate_current_slot,
+    aggregate_day,
+    fill_missing_slots,
+)
+from src.database import close_all_connections, init_db
+from src.simulator.sensor_simulator import SensorSimulator
+
+CHANNELS = ["presence", "fridge", "bathroom", "door"]
+
+
+def _dates(start: datetime, days: int) -> list[str]:
+    return [(start + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gunluk slot ozetleme benchmark'i")
+    parser.add_argument("--days", type=int, default=30, help="Simule gun sayisi")
+    args = parser.parse_args()
+
+    start = datetime(2025, 1, 1)
+    dates = _dates(start, args.days)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        day_db = os.path.join(tmp, "day.db")
+        for db in (legacy_db, day_db):
+            init_db(db)
+            sim = SensorSimulator(db, seed=42)
+            for date in dates:
+                sim.generate_normal_day(date)
+
+        t0 = time.perf_counter()
+        for date in dates:
+            base = datetime.strptime(date, "%Y-%m-%d")
+            for slot_idx in range(96):
+                aggregate_current_slot(legacy_db, CHANNELS, now=base + timedelta(minutes=15 * slot_idx))
+            fill_missing_slots(legacy_db, date, CHANNELS)
+        legacy = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for date in dates:
+            aggregate_day(day_db, date, CHANNELS)
+        per_day = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        aggregate_day(day_db, (dates[0], dates[-1]), CHANNELS)
+        ranged = time.perf_counter() - t0
+        close_all_connections()
+
+    n = len(dates)
+    print(f"Gun sayisi       : {n}")
+    print(f"legacy           : {legacy * 1000 / n:8.2f} ms/gun")
+    print(f"aggregate_day    : {per_day * 1000 / n:8.2f} ms/gun")
+    print(f"aralik (tek SQL) : {ranged * 1000 / n:8.2f} ms/gun")
+    print(f"hizlanma         : {legacy / per_day:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
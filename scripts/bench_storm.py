@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Mesaj firtinasi altinda saglikli sensorlerin ingest gecikmesi.
+
+paho tek network thread'inde mesajlari sirayla isler; saglikli bir
+sensorun mesaji, onunde kuyrukta bekleyen firtina mesajlari islenene kadar
+bekler. Bu benchmark MQTTCollector._on_message'i ayni sirayla cagirip her
+saglikli mesajin "kuyruga girdigi an -> islenmesi bitti" suresini olcer.
+
+Senaryolar:
+  - firtina yok       : sadece saglikli sensorler
+  - firtina, koruma yok: collector.storm_protection = false
+  - firtina, koruma var: varsayilan token bucket + karantina
+
+Firtina: bir kontak sensoru her saglikli mesajin onunde --flood kadar
+acik/kapali mesaji (gercek Zigbee2MQTT payload'i) gonderir.
+
+Kullanim:
+    python scripts/bench_storm.py
+    python scripts/bench_storm.py --flood 200 --healthy 2000
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.collector.mqtt_client import MQTTCollector
+from src.config import AppConfig
+from src.database import close_all_connections, init_db
+
+HEALTHY = [
+    ("mutfak_motion", "presence", "motion", "on"),
+    ("banyo_motion", "bathroom", "motion", "on"),
+    ("buzdolabi_kapi", "fridge", "contact", "open"),
+    ("dis_kapi", "door", "contact", "open"),
+]
+FLOOD_SENSOR = ("pencere_kapi", "door", "contact", "open")
+
+
+class _Message:
+    __slots__ = ("topic", "payload")
+
+    def __init__(self, topic: str, payload: bytes):
+        self.topic = topic
+        self.payload = payload
+
+
+def _payload(sensor_type: str, active: bool) -> bytes:
+    state = {"occupancy": active} if sensor_type == "motion" else {"contact": not active}
+    return json.dumps({**state, "battery": 87, "linkquality": 120, "voltage": 2985}).encode()
+
+
+def build_stream(healthy: int, flood: int) -> list[tuple[bool, _Message]]:
+    """(saglikli_mi, mesaj) dizisi: her saglikli mesajin onunde flood firtina mesaji."""
+    flood_topic = f"zigbee2mqtt/{FLOOD_SENSOR[0]}"
+    stream = []
+    for i in range(healthy):
+        for j in range(flood):
+            stream.append((False, _Message(flood_topic, _payload("contact", j % 2 == 0))))
+        sensor_id, _, sensor_type, _ = HEALTHY[i % len(HEALTHY)]
+        stream.append((True, _Message(f"zigbee2mqtt/{sensor_id}", _payload(sensor_type, True))))
+    return stream
+
+
+def run(db_path: str, stream: list, storm_protection: bool) -> list[float]:
+    """Saglikli mesaj basina gecikme (us): onceki saglikli mesajdan bu yana kuyruk + isleme."""
+    config = AppConfig(
+        sensors=[
+            {"id": s, "channel": c, "type": t, "trigger_value": v}
+            for s, c, t, v in (*HEALTHY, FLOOD_SENSOR)
+        ],
+        collector={"storm_protection": storm_protection, "write_queue_size": 100_000},
+        database={"path": db_path},
+    )
+    collector = MQTTCollector(config, db_path)
+    collector._writer.start()
+    on_message = collector._on_message
+    latencies = []
+    arrived = time.perf_counter()
+    for healthy, message in stream:
+        on_message(None, None, message)
+        if healthy:
+            now = time.perf_counter()
+            latencies.append((now - arrived) * 1e6)
+            arrived = now
+    collector._writer.stop()
+    return latencies
+
+
+def _row(name: str, latencies: list[float]) -> str:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return (f"{name:>22} {statistics.median(latencies):10.1f} {p99:10.1f} "
+            f"{max(latencies):10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Firtina altinda saglikli sensor gecikmesi")
+    parser.add_argument("--healthy", type=int, default=1000, help="Saglikli mesaj sayisi")
+    parser.add_argument("--flood", type=int, default=100, help="Saglikli mesaj basina firtina mesaji")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    scenarios = (
+        ("firtina yok", build_stream(args.healthy, 0), True),
+        ("firtina, koruma yok", build_stream(args.healthy, args.flood), False),
+        ("firtina, koruma var", build_stream(args.healthy, args.flood), True),
+    )
+    print(f"{args.healthy} saglikli mesaj, her birinin onunde {args.flood} firtina mesaji\n")
+    print(f"{'senaryo':>22} {'p50 us':>10} {'p99 us':>10} {'max us':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, stream, protection) in enumerate(scenarios):
+            db_path = os.path.join(tmp, f"storm_{i}.db")
+            init_db(db_path)
+            print(_row(name, run(db_path, stream, protection)))
+        close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
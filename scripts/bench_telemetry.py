@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Telemetri sicak yol maliyeti: event basina eklenen sure.
+
+Olculenler:
+  - Counter.inc() ve Histogram.observe() tek cagri maliyeti
+  - EventProcessor.process() enstrumantasyonlu ve sayaclar no-op iken
+    (aradaki fark = event basina telemetri maliyeti)
+
+Kullanim:
+    python scripts/bench_telemetry.py
+    python scripts/bench_telemetry.py --calls 500000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.collector.event_processor as event_processor_mod
+from src.collector.event_processor import EventProcessor
+from src.telemetry import Registry
+
+PAYLOAD = b'{"occupancy": true, "battery": 87, "linkquality": 120}'
+
+
+class _NoopCounter:
+    def inc(self, amount=1):
+        pass
+
+
+def _per_call_ns(func, calls: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - t0) * 1e9 / calls
+
+
+def _process_ns(calls: int) -> float:
+    """Yarisi kabul, yarisi debounce olacak sekilde process() cagrilari."""
+    processor = EventProcessor(debounce_seconds=30)
+    base = datetime(2025, 1, 1)
+    stamps = [base + timedelta(seconds=20 * i) for i in range(calls)]
+    t0 = time.perf_counter()
+    for ts in stamps:
+        processor.process("mutfak_motion", "presence", "motion", "on", PAYLOAD, ts)
+    return (time.perf_counter() - t0) * 1e9 / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Telemetri sicak yol benchmark'i")
+    parser.add_argument("--calls", type=int, default=200_000, help="Cagri sayisi")
+    args = parser.parse_args()
+
+    registry = Registry()
+    hits = registry.counter("bench_hits", "bench").labels()
+    latency = registry.histogram("bench_seconds", "bench").labels()
+
+    inc_ns = _per_call_ns(hits.inc, args.calls)
+    observe_ns = _per_call_ns(lambda: latency.observe(0.0004), args.calls)
+    baseline_ns = _per_call_ns(lambda: None, args.calls)
+
+    instrumented = _process_ns(args.calls)
+    noop = _NoopCounter()
+    with patch.multiple(
+        event_processor_mod,
+        _ACCEPTED=noop, _DEBOUNCED=noop, _UNPARSED=noop, _INACTIVE=noop,
+    ):
+        plain = _process_ns(args.calls)
+
+    print(f"Cagri sayisi            : {args.calls}")
+    print(f"Counter.inc()           : {inc_ns:8.0f} ns")
+    print(f"Histogram.observe()     : {observe_ns - baseline_ns:8.0f} ns")
+    print(f"process() sayacli       : {instrumented:8.0f} ns/event")
+    print(f"process() no-op sayac   : {plain:8.0f} ns/event")
+    print(f"event basina ek maliyet : {max(0.0, instrumented - plain) / 1000:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Dashboard yuk testi: ingest calisirken /api/status gecikmesi.
+
+Gecici bir DB'ye gecmis veri yazar, uygulamayi uvicorn ile ayri bir
+proseste baslatir ve N es zamanli /api/status istemcisi (+ birkac agir
+heatmap/history istemcisi) ile iki modu olcer:
+  - inline: charts fonksiyonlari event loop'ta dogrudan (eski davranis)
+  - reader: DashboardReader (salt-okunur worker thread, zaman butcesi)
+Olcum boyunca sunucu prosesinde EventWriter saniyede --ingest-rate event
+yazmaya devam eder.
+
+Kullanim:
+    python scripts/load_test_dashboard.py
+    python scripts/load_test_dashboard.py --clients 50 --seconds 10
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from src.collector.event_writer import EventWriter
+from src.collector.slot_aggregator import aggregate_day
+from src.config import AppConfig
+from src.dashboard.api import router as dashboard_router
+from src.dashboard.data_access import DashboardReader
+from src.database import close_all_connections, init_db
+from src.simulator.sensor_simulator import SensorSimulator
+
+CHANNELS = ["presence", "fridge", "bathroom", "door"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _InlineReader:
+    """Eski davranis: veri fonksiyonu event loop'ta dogrudan calisir."""
+
+    async def run(self, func, *args, budget_ms=None, **kwargs):
+        return func(*args, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+def _ingest(db_path: str, rate: int, stop: threading.Event) -> None:
+    """stop set edilene kadar saniyede rate event yaz."""
+    writer = EventWriter(db_path)
+    writer.start()
+    sent = 0
+    interval = 1.0 / rate
+    while not stop.is_set():
+        ch = CHANNELS[sent % len(CHANNELS)]
+        writer.submit({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "sensor_id": f"{ch}_sensor", "channel": ch,
+            "event_type": "state_change", "value": "on",
+        })
+        sent += 1
+        time.sleep(interval)
+    writer.stop()
+
+
+def _serve(db_path: str, port: int, mode: str, ingest_rate: int) -> None:
+    """Ayri proseste: uygulama + arka planda ingest."""
+    config = AppConfig()
+    app = FastAPI()
+    app.include_router(dashboard_router)
+    app.state.db_path = db_path
+    app.state.config = config
+    if mode == "inline":
+        app.state.dashboard_reader = _InlineReader()
+    else:
+        app.state.dashboard_reader = DashboardReader(
+            config.dashboard.read_workers, config.dashboard.query_budget_ms
+        )
+
+    stop = threading.Event()
+    ingest = threading.Thread(target=_ingest, args=(db_path, ingest_rate, stop), daemon=True)
+    ingest.start()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+    stop.set()
+
+
+async def _clients(
+    base: str, clients: int, heavy_clients: int, seconds: float
+) -> tuple[list[float], int]:
+    """clients adet /api/status istemcisi + heavy_clients agir sorgu istemcisi."""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + seconds
+
+    async def status_client(http: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while time.monotonic() < deadline:
+            t0 = time.perf_counter()
+            response = await http.get(f"{base}/api/status")
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    async def heavy_client(http: httpx.AsyncClient) -> None:
+        while time.monotonic() < deadline:
+            await http.get(f"{base}/api/heatmap")
+            await http.get(f"{base}/api/history", params={"days": 365})
+
+    limits = httpx.Limits(max_connections=clients + heavy_clients)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as http:
+        await asyncio.gather(
+            *(status_client(http) for _ in range(clients)),
+            *(heavy_client(http) for _ in range(heavy_clients)),
+        )
+    return latencies, errors
+
+
+def _wait_port(port: int, timeout: float = 10.0) -> None:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"Sunucu baslamadi: {port}")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dashboard yuk testi")
+    parser.add_argument("--clients", type=int, default=50, help="Es zamanli /api/status istemcisi")
+    parser.add_argument("--heavy-clients", type=int, default=4, help="Agir sorgu istemcisi")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Mod basina sure")
+    parser.add_argument("--days", type=int, default=60, help="Gecmis veri (gun)")
+    parser.add_argument("--ingest-rate", type=int, default=50, help="Event/sn")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "load.db")
+        init_db(db_path)
+        sim = SensorSimulator(db_path, seed=42)
+        start = datetime.now() - timedelta(days=args.days)
+        dates = [(start + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(args.days)]
+        for date in dates:
+            sim.generate_normal_day(date)
+        aggregate_day(db_path, (dates[0], dates[-1]), CHANNELS)
+        close_all_connections()
+
+        for mode in ("inline", "reader"):
+            port = _free_port()
+            server = multiprocessing.Process(
+                target=_serve, args=(db_path, port, mode, args.ingest_rate), daemon=True
+            )
+            server.start()
+            try:
+                _wait_port(port)
+                latencies, errors = asyncio.run(_clients(
+                    f"http://127.0.0.1:{port}", args.clients, args.heavy_clients, args.seconds
+                ))
+            finally:
+                server.terminate()
+                server.join()
+            print(
+                f"{mode:7s} n={len(latencies):6d} hata={errors:3d} "
+                f"p50={_percentile(latencies, 0.50):7.1f} ms "
+                f"p95={_percentile(latencies, 0.95):7.1f} ms "
+                f"p99={_percentile(latencies, 0.99):7.1f} ms"
+            )
+
+    print(f"Istemci: {args.clients} status + {args.heavy_clients} agir, "
+          f"ingest: {args.ingest_rate} event/sn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Sorgu profili raporu: en pahali SQL ifadeleri ve DB buyudukce degisimi.
+
+Uc kaynak:
+  - simule DB (varsayilan): her --days boyutu icin bugune biten sensor
+    eventleri + slot ozetleri + daily_scores uretir, dashboard / aciklama /
+    trend / saglik okumalarini profilleme acik calistirir; boyutlar arasi
+    ifade bazli ortalama sure tablosu basar
+  - --db: mevcut veritabaninin kopyasi uzerinde ayni is yuku
+  - --url: calisan uygulamanin /api/admin/queries ciktisi
+    (config'te database.profile_queries: true olmali)
+
+Kullanim:
+    python scripts/query_report.py
+    python scripts/query_report.py --days 30 365 1095 --top 15
+    python scripts/query_report.py --db data/annem_guvende.db
+    python scripts/query_report.py --url http://annem-pi:8099 --user admin --password ***
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Proje kokunu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alerter.alert_manager import AlertManager
+from src.alerter.telegram_bot import TelegramNotifier
+from src.collector.slot_aggregator import aggregate_day
+from src.config import AppConfig
+from src.dashboard.charts import get_bundle_data, get_status_data, get_today_slots
+from src.database import (
+    close_all_connections,
+    configure_query_profiling,
+    get_db,
+    init_db,
+)
+from src.detector.trend_analyzer import analyze_all_trends
+from src.heartbeat.system_monitor import collect_system_metrics
+from src.simulator.sensor_simulator import SensorSimulator
+
+CHANNELS = ["presence", "fridge", "bathroom", "door"]
+
+
+def _seed_scores(db_path: str, dates: list[str], rng: random.Random) -> None:
+    """Is yuku icin daily_scores satirlari (ilk 14 gun ogrenme)."""
+    rows = []
+    for i, date in enumerate(dates):
+        nll = [rng.uniform(20, 60) for _ in CHANNELS]
+        rows.append((
+            date, i, *nll, sum(nll), 60.0, rng.randint(40, 80),
+            rng.gauss(0, 1), rng.gauss(0, 1), 1 if rng.random() < 0.05 else 0,
+            int(i < 14),
+        ))
+    with get_db(db_path) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO daily_scores (date, train_days, nll_presence, "
+            "nll_fridge, nll_bathroom, nll_door, nll_total, expected_count, "
+            "observed_count, count_z, composite_z, alert_level, is_learning) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+
+
+def build_simulated_db(db_path: str, days: int, now: datetime) -> None:
+    """Bugune biten days gunluk veri uret."""
+    init_db(db_path)
+    start = now - timedelta(days=days - 1)
+    dates = [(start + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days)]
+    sim = SensorSimulator(db_path, seed=42)
+    for date in dates:
+        sim.generate_normal_day(date)
+    aggregate_day(db_path, (dates[0], dates[-1]), CHANNELS)
+    _seed_scores(db_path, dates[:-1], random.Random(42))
+
+
+def run_workload(db_path: str, now: datetime, repeats: int) -> None:
+    """Uygulamanin tipik okuma yollarini calistir."""
+    config = AppConfig()
+    alert_mgr = AlertManager(config, TelegramNotifier("", []))
+    yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+    for _ in range(repeats):
+        get_status_data(db_path, True)
+        get_bundle_data(db_path, True, history_days=30)
+        get_today_slots(db_path, CHANNELS, now=now)
+        alert_mgr.generate_explanation(db_path, yesterday)
+        collect_system_metrics(db_path, now)
+        analyze_all_trends(db_path, CHANNELS, 30, 14, now=now)
+
+
+def profile(db_path: str, now: datetime, repeats: int) -> list[dict]:
+    """Profilleme acik is yuku; tum ifadeler (ortalamaya gore)."""
+    close_all_connections()
+    profiler = configure_query_profiling(True, slow_query_ms=float("inf"))
+    try:
+        run_workload(db_path, now, repeats)
+        close_all_connections()  # acik ifadeler kaydedilsin
+        return profiler.top(10_000, "avg")
+    finally:
+        configure_query_profiling(False)
+
+
+def _size_mb(db_path: str) -> float:
+    wal = db_path + "-wal"
+    return (os.path.getsize(db_path) + (os.path.getsize(wal) if os.path.exists(wal) else 0)) / 1e6
+
+
+def _short(sql: str, width: int = 70) -> str:
+    return sql if len(sql) <= width else sql[: width - 3] + "..."
+
+
+def print_top(queries: list[dict], top: int) -> None:
+    """Standart top-N tablo."""
+    print(f"{'toplam ms':>10} {'ort ms':>8} {'max ms':>8} {'adet':>6} {'satir/ad':>8} "
+          f"{'vm adim/ad':>10}  cagiran / ifade")
+    for q in sorted(queries, key=lambda q: q["total_ms"], reverse=True)[:top]:
+        steps = q["vm_steps"] // q["count"]
+        print(f"{q['total_ms']:10.2f} {q['avg_ms']:8.3f} {q['max_ms']:8.3f} {q['count']:6d} "
+              f"{q['avg_rows']:8.1f} {steps:10d}  {q['caller']}")
+        print(f"{'':56}{_short(q['sql'])}")
+
+
+def print_growth(results: dict[int, list[dict]], top: int) -> None:
+    """Boyutlar arasi ifade bazli ortalama sure (ms) ve VM adimi."""
+    sizes = sorted(results)
+    by_key = {
+        size: {(q["caller"], q["sql"]): q for q in queries}
+        for size, queries in results.items()
+    }
+    largest = by_key[sizes[-1]]
+    keys = sorted(largest, key=lambda k: largest[k]["avg_ms"], reverse=True)[:top]
+
+    header = "".join(f"{f'{s} gun':>14}" for s in sizes)
+    print(f"Ortalama ms / ifade (VM adimi){'':4}{header}  buyume  cagiran / ifade")
+    for key in keys:
+        cells = []
+        for size in sizes:
+            q = by_key[size].get(key)
+            cells.append(
+                f"{q['avg_ms']:.3f}/{q['vm_steps'] // q['count']}" if q else "-"
+            )
+        first = by_key[sizes[0]].get(key)
+        growth = (
+            f"{largest[key]['avg_ms'] / first['avg_ms']:6.1f}x"
+            if first and first["avg_ms"] > 0 else "     -"
+        )
+        print(f"{'':34}{''.join(f'{c:>14}' for c in cells)}  {growth}  {key[0]}")
+        print(f"{'':34}{_short(key[1], 90)}")
+
+
+def _from_url(url: str, user: str, password: str, top: int, sort: str) -> list[dict]:
+    import httpx
+
+    auth = (user, password) if user else None
+    response = httpx.get(
+        f"{url.rstrip('/')}/api/admin/queries",
+        params={"top": top, "sort": sort}, auth=auth, timeout=10.0,
+    )
+    response.raise_for_status()
+    data = response.json()
+    if not data["enabled"]:
+        sys.exit("Profilleme kapali: config.yml -> database.profile_queries: true")
+    return data["queries"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQL sorgu profili raporu")
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365],
+                        help="Simule DB boyutlari (gun)")
+    parser.add_argument("--db", help="Mevcut veritabani (kopyasi profillenir)")
+    parser.add_argument("--url", help="Calisan uygulama (ornegin http://annem-pi:8099)")
+    parser.add_argument("--user", default="", help="Dashboard kullanici adi (--url)")
+    parser.add_argument("--password", default="", help="Dashboard sifresi (--url)")
+    parser.add_argument("--top", type=int, default=20, help="Satir sayisi")
+    parser.add_argument("--sort", default="total", help="--url siralamasi (total/avg/max/...)")
+    parser.add_argument("--repeats", type=int, default=5, help="Is yuku tekrar sayisi")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    if args.url:
+        print_top(_from_url(args.url, args.user, args.password, args.top, args.sort), args.top)
+        return
+
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db:
+            copy = os.path.join(tmp, "copy.db")
+            with sqlite3.connect(args.db) as src, sqlite3.connect(copy) as dst:
+                src.backup(dst)
+            init_db(copy)
+            print(f"Veritabani: {args.db} ({_size_mb(copy):.1f} MB)\n")
+            print_top(profile(copy, now, args.repeats), args.top)
+            close_all_connections()
+            return
+
+        results: dict[int, list[dict]] = {}
+        for days in sorted(set(args.days)):
+            db_path = os.path.join(tmp, f"sim_{days}.db")
+            build_simulated_db(db_path, days, now)
+            print(f"{days:5d} gun: {_size_mb(db_path):6.1f} MB")
+            results[days] = profile(db_path, now, args.repeats)
+        close_all_connections()
+
+    print(f"\nEn pahali ifadeler ({max(results)} gun):\n")
+    print_top(results[max(results)], args.top)
+    if len(results) > 1:
+        print()
+        print_growth(results, args.top)
+
+
+if __name__ == "__main__":
+    main()
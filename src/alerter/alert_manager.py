@@ -7,6 +7,7 @@ uygun mesajlari TelegramNotifier ile gonderir.
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from datetime import datetime, timedelta
 
 from src.alerter.message_templates import (
@@ -20,6 +21,7 @@ from src.alerter.telegram_bot import TelegramNotifier
 from src.config import AppConfig
 from src.database import get_db, get_system_state, set_system_state
 from src.detector.realtime_checks import RealtimeAlert
+from src.partitions import events_source
 
 logger = logging.getLogger("annem_guvende.alerter")
 
@@ -46,6 +48,8 @@ class AlertManager:
     def __init__(self, config: AppConfig, notifier: TelegramNotifier):
         self._config = config
         self._notifier = notifier
+        # Alarm seviyesi degisimlerini dashboard canli akisina ileten callback
+        self._alert_listener: Callable[[dict], None] | None = None
 
         # Rate limiting: {alert_level: datetime} son gonderim zamani
         self._last_alert_time: dict[int, datetime] = {}
@@ -56,6 +60,19 @@ class AlertManager:
         self._cooldown_hours = 6
         self._morning_max_per_day = 2
 
+    def set_alert_listener(self, callback: Callable[[dict], None] | None) -> None:
+        """Alarm bildirimi callback'ini ayarla (DI pattern)."""
+        self._alert_listener = callback
+
+    def _publish_alert(self, alert: dict) -> None:
+        """Alarmi dinleyiciye ilet; hata alarm akisini durdurmaz."""
+        if self._alert_listener is None:
+            return
+        try:
+            self._alert_listener(alert)
+        except Exception:
+            logger.exception("Alarm dinleyici hatasi")
+
     def send_notification(self, message: str) -> dict[str, bool]:
         """Tum kayitli kullanicilara bildirim gonder.
 
@@ -335,6 +352,7 @@ class AlertManager:
 
         alert_level = row["alert_level"]
         train_days = row["train_days"] or 0
+        self._publish_alert({"source": "daily", "date": date, "level": alert_level})
 
         if alert_level > 0 and self.should_send_alert(alert_level, train_days, db_path=db_path):
             explanation = self.generate_explanation(db_path, date)
@@ -359,6 +377,11 @@ class AlertManager:
             alert: Gercek zamanli alarm verisi
             db_path: Veritabani yolu (rate-limit state kaliciligi icin)
         """
+        self._publish_alert({
+            "source": alert.alert_type,
+            "level": alert.alert_level,
+            "message": alert.message,
+        })
         if alert.alert_type == "morning_silence":
             today = datetime.now().strftime("%Y-%m-%d")
             if self.should_send_morning(today):
@@ -405,18 +428,18 @@ class AlertManager:
             ).fetchone()
 
             # Gunun event sayilari (channel bazli)
+            day_start, day_end = f"{today}T00:00:00", f"{today}T23:59:59"
             events = conn.execute(
-                """SELECT channel, COUNT(*) as cnt
-                   FROM sensor_events
+                f"""SELECT channel, COUNT(*) as cnt
+                   FROM {events_source(conn, day_start, day_end)}
                    WHERE timestamp >= ? AND timestamp < ?
                    GROUP BY channel""",
-                (f"{today}T00:00:00", f"{today}T23:59:59"),
+                (day_start, day_end),
             ).fetchall()
 
-            # Model state'ten gercek CI width hesapla
-            models = conn.execute(
-                "SELECT alpha, beta FROM model_state"
-            ).fetchall()
+        # Kayitli modelin CI width'i (versiyonlu onbellekten)
+        from src.learner.model_cache import get_model_view
+        view = get_model_view(db_path)
 
         # Skor varsa
         if row is not None:
@@ -431,12 +454,9 @@ class AlertManager:
         # Event sayilari dict
         event_counts = {e["channel"]: e["cnt"] for e in events} if events else {}
 
-        # CI width: model_state varsa gercek posterior'dan hesapla, yoksa fallback
-        if models:
-            from src.learner.beta_model import BetaPosterior
-            ci_width = sum(
-                BetaPosterior(r["alpha"], r["beta"]).ci_width for r in models
-            ) / len(models)
+        # CI width: model kaydi varsa gercek posterior'dan, yoksa fallback
+        if view is not None:
+            ci_width = view.avg_ci_width
         else:
             ci_width = max(0.05, 1.0 / max(train_days, 1))
 
@@ -71,6 +71,13 @@ TEMPLATE_BATTERY_WARNING = (
     "Lütfen en kısa sürede pil değiştirin."
 )
 
+TEMPLATE_SENSOR_QUARANTINE = (
+    "⚠️ <b>Sensör Karantinada</b>\n\n"
+    "Sensör <b>{sensor_id}</b> saniyede ~{rate} mesaj gönderiyor; "
+    "<b>{minutes} dakika</b> boyunca mesajları yok sayılacak.\n\n"
+    "Sensörün pilini, konumunu veya Zigbee bağlantısını kontrol edin."
+)
+
 
 # --- Render Fonksiyonlari ---
 
@@ -209,3 +216,18 @@ def render_battery_warning(sensor_id: str, battery: int) -> str:
         sensor_id=sensor_id,
         battery=battery,
     )
+
+
+def render_sensor_quarantine(sensor_id: str, rate: float, minutes: float) -> str:
+    """Mesaj firtinasi nedeniyle karantinaya alinan sensor bildirimi.
+
+    Args:
+        sensor_id: Sensor ID
+        rate: Olculen mesaj hizi (mesaj/sn)
+        minutes: Karantina suresi (dakika)
+    """
+    return TEMPLATE_SENSOR_QUARANTINE.format(
+        sensor_id=sensor_id,
+        rate=f"{rate:.0f}",
+        minutes=f"{minutes:g}",
+    )
@@ -5,11 +5,21 @@ Token bos ise sessizce devre disi kalir (graceful degradation).
 """
 
 import logging
+import time
 
 import httpx
 
+from src.telemetry import counter, histogram
+
 logger = logging.getLogger("annem_guvende.alerter")
 
+_REQUEST_SECONDS = histogram(
+    "annem_telegram_request_seconds", "Telegram Bot API gonderim suresi", ("method",)
+)
+_REQUESTS = counter(
+    "annem_telegram_requests", "Telegram Bot API gonderimleri (sonuca gore)", ("method", "outcome")
+)
+
 TELEGRAM_API_BASE = "https://api.telegram.org"
 SEND_TIMEOUT = 10.0
 
@@ -58,8 +68,8 @@ class TelegramNotifier:
             return False
 
         try:
-            response = self._client.post(
-                f"{self._base_url}/sendMessage",
+            response = self._post(
+                "sendMessage",
                 json={
                     "chat_id": chat_id,
                     "text": text,
@@ -117,8 +127,8 @@ class TelegramNotifier:
         }
 
         try:
-            response = self._client.post(
-                f"{self._base_url}/sendMessage",
+            response = self._post(
+                "sendMessage",
                 json=payload,
             )
             if response.status_code == 200:
@@ -162,8 +172,8 @@ class TelegramNotifier:
             return False
 
         try:
-            response = self._client.post(
-                f"{self._base_url}/sendPhoto",
+            response = self._post(
+                "sendPhoto",
                 data={
                     "chat_id": chat_id,
                     "caption": caption,
@@ -197,8 +207,8 @@ class TelegramNotifier:
             return False
 
         try:
-            response = self._client.post(
-                f"{self._base_url}/{method}",
+            response = self._post(
+                method,
                 json=payload,
             )
             if response.status_code == 200:
@@ -211,6 +221,18 @@ class TelegramNotifier:
             logger.error("Telegram %s baglanti hatasi: %s", method, exc)
             return False
 
+    def _post(self, method: str, **kwargs) -> httpx.Response:
+        """Bot API POST istegi; sure ve sonuc (ok / api_error / network_error) olculur."""
+        start = time.perf_counter()
+        outcome = "network_error"
+        try:
+            response = self._client.post(f"{self._base_url}/{method}", **kwargs)
+            outcome = "ok" if response.status_code == 200 else "api_error"
+            return response
+        finally:
+            _REQUEST_SECONDS.labels(method).observe(time.perf_counter() - start)
+            _REQUESTS.labels(method, outcome).inc()
+
     def close(self) -> None:
         """HTTP client'i kapat (shutdown sirasinda cagrilir)."""
         self._client.close()
@@ -370,6 +392,7 @@ class TelegramNotifier:
     def _handle_durum(self, chat_id: str, db_path: str, config) -> None:
         """Sistem durumu gonder."""
         from src.database import get_db, is_vacation_mode
+        from src.partitions import latest_event
 
         vacation = is_vacation_mode(db_path, config)
         vacation_text = "ACIK" if vacation else "KAPALI"
@@ -379,10 +402,7 @@ class TelegramNotifier:
                 "SELECT train_days, is_learning FROM daily_scores "
                 "ORDER BY date DESC LIMIT 1"
             ).fetchone()
-            event_row = conn.execute(
-                "SELECT timestamp FROM sensor_events "
-                "ORDER BY timestamp DESC LIMIT 1"
-            ).fetchone()
+            event_row = latest_event(conn, "timestamp")
 
         train_days = score_row["train_days"] if score_row else 0
         is_learning = bool(score_row["is_learning"]) if score_row else True
@@ -403,12 +423,13 @@ class TelegramNotifier:
         from datetime import datetime
 
         from src.database import get_db
+        from src.partitions import events_source
 
         today = datetime.now().strftime("%Y-%m-%d")
         with get_db(db_path) as conn:
             rows = conn.execute(
                 "SELECT channel, COUNT(*) as cnt "
-                "FROM sensor_events WHERE timestamp >= ? "
+                f"FROM {events_source(conn, today)} WHERE timestamp >= ? "
                 "GROUP BY channel",
                 (today,),
             ).fetchall()
@@ -5,9 +5,12 @@ Kullanim:
 """
 
 from src.collector.event_processor import EventProcessor
+from src.collector.fall_state import FallStateTracker
 from src.collector.mqtt_client import MQTTCollector
 from src.collector.slot_aggregator import (
+    SlotAccumulator,
     aggregate_current_slot,
+    aggregate_day,
     fill_missing_slots,
     get_slot,
 )
@@ -15,7 +18,10 @@ from src.collector.slot_aggregator import (
 __all__ = [
     "MQTTCollector",
     "EventProcessor",
+    "FallStateTracker",
+    "SlotAccumulator",
     "aggregate_current_slot",
+    "aggregate_day",
     "fill_missing_slots",
     "get_slot",
 ]
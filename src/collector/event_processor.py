@@ -1,97 +1,210 @@
-"""Ham sensor mesajlarini normalize et ve debounce uygula."""
+"""Ham sensor mesajlarini normalize et ve debounce uygula.
 
+Her MQTT mesaji bir kez parse edilir (EventProcessor.parse -> ParsedMessage);
+durum, pil ve link kalitesi ayni sozlukten okunur, debounce / dusme takibi /
+pil izleme bu nesneyi paylasir.
+"""
+
+import heapq
 import json
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+from src.telemetry import counter
+
 logger = logging.getLogger("annem_guvende.collector")
 
+_PROCESSED = counter(
+    "annem_events_processed", "Islenen sensor mesajlari (sonuca gore)", ("outcome",)
+)
+_ACCEPTED = _PROCESSED.labels("accepted")
+_DEBOUNCED = _PROCESSED.labels("debounced")
+_UNPARSED = _PROCESSED.labels("unparsed")
+_INACTIVE = _PROCESSED.labels("inactive")
+_DEBOUNCED_BY_SENSOR = counter(
+    "annem_debounced_events", "Debounce ile atilan eventler (pencere ayari icin)", ("sensor",)
+)
+
+# Bu sureden (veya sensorun penceresinden, hangisi buyukse) eski debounce kaydi silinir
+_STALE_AFTER = timedelta(hours=1)
+
+
+@dataclass(slots=True)
+class ParsedMessage:
+    """Tek seferde parse edilmis sensor mesaji.
+
+    value None ise durum taninmadi (pil / link kalitesi yine de okunmus olabilir).
+    """
+
+    timestamp: datetime
+    data: dict | None  # JSON sozlugu; duz string payload'da None
+    is_active: bool = False
+    value: str | None = None
+    battery: int | None = None
+    linkquality: int | None = None
+
+
+# --- Sensor tipi parser'lari: (payload, trigger_value) -> (is_active, value) ---
+
+def _motion_json(data: dict, trigger_value: str) -> tuple[bool, str] | None:
+    if "occupancy" in data:
+        is_active = bool(data["occupancy"])
+        return (is_active, "on" if is_active else "off")
+    return None
+
+
+def _contact_json(data: dict, trigger_value: str) -> tuple[bool, str] | None:
+    if "contact" in data:
+        # Zigbee2MQTT: contact=false -> kapi ACIK (sensor temassiz)
+        contact_val = bool(data["contact"])
+        if trigger_value == "open":
+            return (not contact_val, "closed" if contact_val else "open")
+        return (contact_val, "closed" if contact_val else "open")
+    return None
+
+
+def _motion_text(lower: str, trigger_value: str) -> tuple[bool, str] | None:
+    if lower in ("on", "true"):
+        return (True, "on")
+    if lower in ("off", "false"):
+        return (False, "off")
+    return None
+
+
+def _contact_text(lower: str, trigger_value: str) -> tuple[bool, str] | None:
+    if lower == "open":
+        return (trigger_value == "open", "open")
+    if lower == "closed":
+        return (trigger_value != "open", "closed")
+    return None
+
+
+# Sensor tipi -> parser (mesaj basina tek sozluk aramasi)
+_JSON_PARSERS = {"motion": _motion_json, "contact": _contact_json}
+_TEXT_PARSERS = {"motion": _motion_text, "contact": _contact_text}
+
+
+_DECODER = json.JSONDecoder()
+
+
+def _load_json_dict(text: str) -> dict | None:
+    """'{' ile baslayan (strip edilmis) payload'i yukle; dict degilse None.
+
+    json.loads yerine raw_decode: bytes kodlama tespiti ve bosluk regex'i
+    atlanir, sonda fazladan karakter varsa gecersiz sayilir.
+    """
+    if not text.startswith("{"):
+        return None
+    try:
+        data, end = _DECODER.raw_decode(text)
+    except ValueError:
+        return None
+    return data if end == len(text) and isinstance(data, dict) else None
+
+
+def _as_int(value) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
 
 class EventProcessor:
     """Sensor mesajlarini normalize eder ve debounce uygular.
 
-    Debounce kurali: Ayni sensor_id'den 30 saniye icinde
+    Debounce kurali: Ayni sensor_id'den pencere (varsayilan 30 sn) icinde
     gelen tekrar eventler filtrelenir (motion sensorleri cok sik tetiklenir).
+    Pencere sensor bazinda verilebilir (kapi / buzdolabi kontaklari PIR'dan
+    kisa).
+
+    Eski debounce kayitlari sona erme zamanina gore min-heap'te tutulur:
+    her mesajda yalnizca heap'in tepesine bakilir, sensor basina tek heap
+    girdisi vardir (tazelenen kayit sona erdiginde yeniden planlanir).
+
+    Args:
+        debounce_seconds: Varsayilan pencere
+        windows: {sensor_id: pencere saniyesi} (varsayilani ezer)
     """
 
-    def __init__(self, debounce_seconds: int = 30):
+    def __init__(self, debounce_seconds: float = 30, windows: dict[str, float] | None = None):
         self._debounce_seconds = debounce_seconds
+        self._default_window = timedelta(seconds=debounce_seconds)
+        self._windows = {
+            sensor_id: timedelta(seconds=seconds) for sensor_id, seconds in (windows or {}).items()
+        }
         # {sensor_id: son kabul edilen event zamani}
         self._last_event: dict[str, datetime] = {}
-        self._process_count: int = 0
+        # (sona erme zamani, sensor_id) min-heap'i
+        self._expiry: list[tuple[datetime, str]] = []
         # Pil izleme
         self._battery_levels: dict[str, int] = {}
         self._battery_warning_sent: dict[str, bool] = {}
 
-    def parse_payload(
-        self, sensor_type: str, trigger_value: str, raw_payload: bytes
-    ) -> tuple[bool, str] | None:
-        """Ham MQTT payload'ini parse et.
+    def parse(
+        self,
+        sensor_type: str,
+        trigger_value: str,
+        raw_payload: bytes,
+        timestamp: datetime | None = None,
+    ) -> ParsedMessage | None:
+        """Ham MQTT payload'ini tek seferde parse et.
+
+        Payload bir kez decode edilir; JSON ise sozluk bir kez yuklenir ve
+        durum sensor tipine gore dispatch tablosundaki parser ile okunur.
 
         Returns:
-            (is_active, value_str) - ornegin (True, "on") veya (False, "closed")
-            None - taninmayan format, atlanacak
+            ParsedMessage veya None (bos / decode edilemeyen payload)
         """
+        if timestamp is None:
+            timestamp = datetime.now()
         try:
             text = raw_payload.decode("utf-8").strip()
         except (UnicodeDecodeError, AttributeError):
             logger.warning("Payload decode edilemedi")
             return None
-
         if not text:
             return None
 
-        # JSON payload dene
-        try:
-            data = json.loads(text)
-            if isinstance(data, dict):
-                return self._parse_json_payload(data, sensor_type, trigger_value)
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-        # Duz string payload dene
-        return self._parse_string_payload(text, sensor_type, trigger_value)
+        data = _load_json_dict(text)
+        if data is not None:
+            parser = _JSON_PARSERS.get(sensor_type)
+            state = parser(data, trigger_value) if parser else None
+            if state is None:
+                logger.warning(
+                    "JSON payload taninmadi: type=%s, keys=%s", sensor_type, list(data.keys())
+                )
+            msg = ParsedMessage(
+                timestamp, data,
+                battery=_as_int(data.get("battery")),
+                linkquality=_as_int(data.get("linkquality")),
+            )
+        else:
+            parser = _TEXT_PARSERS.get(sensor_type)
+            state = parser(text.lower(), trigger_value) if parser else None
+            if state is None:
+                logger.warning("String payload taninmadi: type=%s, text=%s", sensor_type, text)
+            msg = ParsedMessage(timestamp, None)
+
+        if state is not None:
+            msg.is_active, msg.value = state
+        return msg
 
-    def _parse_json_payload(
-        self, data: dict, sensor_type: str, trigger_value: str
+    def parse_payload(
+        self, sensor_type: str, trigger_value: str, raw_payload: bytes
     ) -> tuple[bool, str] | None:
-        """JSON formatindaki payload'i parse et."""
-        if sensor_type == "motion":
-            if "occupancy" in data:
-                is_active = bool(data["occupancy"])
-                return (is_active, "on" if is_active else "off")
-        elif sensor_type == "contact":
-            if "contact" in data:
-                # Zigbee2MQTT: contact=false -> kapi ACIK (sensor temassiz)
-                contact_val = bool(data["contact"])
-                is_open = not contact_val
-                if trigger_value == "open":
-                    return (is_open, "open" if is_open else "closed")
-                else:
-                    return (contact_val, "closed" if contact_val else "open")
-
-        logger.warning("JSON payload taninmadi: type=%s, keys=%s", sensor_type, list(data.keys()))
-        return None
+        """Ham MQTT payload'inin durumu.
 
-    def _parse_string_payload(
-        self, text: str, sensor_type: str, trigger_value: str
-    ) -> tuple[bool, str] | None:
-        """Duz string formatindaki payload'i parse et."""
-        lower = text.lower()
-
-        if sensor_type == "motion":
-            if lower in ("on", "true"):
-                return (True, "on")
-            elif lower in ("off", "false"):
-                return (False, "off")
-        elif sensor_type == "contact":
-            if lower == "open":
-                return (trigger_value == "open", "open")
-            elif lower == "closed":
-                return (trigger_value != "open", "closed")
-
-        logger.warning("String payload taninmadi: type=%s, text=%s", sensor_type, text)
-        return None
+        Returns:
+            (is_active, value_str) - ornegin (True, "on") veya (False, "closed")
+            None - taninmayan format, atlanacak
+        """
+        msg = self.parse(sensor_type, trigger_value, raw_payload)
+        if msg is None or msg.value is None:
+            return None
+        return (msg.is_active, msg.value)
 
     def is_debounced(self, sensor_id: str, timestamp: datetime) -> bool:
         """Bu event debounce kurali ile filtrelenmeli mi?
@@ -101,25 +214,46 @@ class EventProcessor:
         last = self._last_event.get(sensor_id)
         if last is None:
             return False
-        return (timestamp - last) < timedelta(seconds=self._debounce_seconds)
+        return (timestamp - last) < self._windows.get(sensor_id, self._default_window)
+
+    def debounce_window(self, sensor_id: str) -> float:
+        """Sensorun debounce penceresi (saniye)."""
+        return self._windows.get(sensor_id, self._default_window).total_seconds()
+
+    def _ttl(self, sensor_id: str) -> timedelta:
+        return max(_STALE_AFTER, self._windows.get(sensor_id, self._default_window))
 
     def _record_event(self, sensor_id: str, timestamp: datetime) -> None:
         """Debounce tablosunu guncelle (son kabul edilen event zamani)."""
+        if sensor_id not in self._last_event:
+            heapq.heappush(self._expiry, (timestamp + self._ttl(sensor_id), sensor_id))
         self._last_event[sensor_id] = timestamp
 
     def _cleanup_stale_entries(self, now: datetime | None = None) -> int:
-        """1 saatten eski debounce kayitlarini temizle.
+        """Suresi dolan (1 saatten eski) debounce kayitlarini temizle.
+
+        Heap tepesinden sona erenler alinir; arada tazelenmis kayit yeni
+        sona erme zamaniyla geri konur.
 
         Returns:
             Silinen kayit sayisi
         """
         if now is None:
             now = datetime.now()
-        cutoff = now - timedelta(hours=1)
-        stale = [k for k, v in self._last_event.items() if v < cutoff]
-        for k in stale:
-            del self._last_event[k]
-        return len(stale)
+        heap = self._expiry
+        removed = 0
+        while heap and heap[0][0] < now:
+            _, sensor_id = heapq.heappop(heap)
+            last = self._last_event.get(sensor_id)
+            if last is None:
+                continue
+            expires = last + self._ttl(sensor_id)
+            if expires < now:
+                del self._last_event[sensor_id]
+                removed += 1
+            else:
+                heapq.heappush(heap, (expires, sensor_id))
+        return removed
 
     def process(
         self,
@@ -135,43 +269,53 @@ class EventProcessor:
         Returns:
             Normalize edilmis event dict veya None (filtrelendi/taninmadi).
         """
-        if timestamp is None:
-            timestamp = datetime.now()
+        msg = self.parse(sensor_type, trigger_value, raw_payload, timestamp)
+        return self.accept(sensor_id, channel, msg)
+
+    def accept(self, sensor_id: str, channel: str, msg: ParsedMessage | None) -> dict | None:
+        """Parse edilmis mesaja debounce uygula ve normalize et.
 
-        # Periyodik cleanup (her 100 cagri)
-        self._process_count += 1
-        if self._process_count % 100 == 0:
+        Returns:
+            Normalize edilmis event dict veya None (filtrelendi/taninmadi).
+        """
+        timestamp = msg.timestamp if msg is not None else datetime.now()
+
+        # Sona eren debounce kayitlari (cogu mesajda tek karsilastirma)
+        if self._expiry and self._expiry[0][0] < timestamp:
             self._cleanup_stale_entries(timestamp)
 
-        # 1. Payload parse et
-        result = self.parse_payload(sensor_type, trigger_value, raw_payload)
-        if result is None:
+        if msg is None or msg.value is None:
+            _UNPARSED.inc()
             return None
 
-        is_active, value_str = result
-
         # Sadece aktif eventleri kaydet (trigger anini yakala)
-        if not is_active:
+        if not msg.is_active:
+            _INACTIVE.inc()
             return None
 
-        # 2. Debounce kontrolu
+        # Debounce kontrolu
         if self.is_debounced(sensor_id, timestamp):
-            logger.debug("Debounce: %s (30sn icinde tekrar)", sensor_id)
+            _DEBOUNCED.inc()
+            _DEBOUNCED_BY_SENSOR.labels(sensor_id).inc()
+            logger.debug(
+                "Debounce: %s (%.0fsn icinde tekrar)", sensor_id, self.debounce_window(sensor_id)
+            )
             return None
 
-        # 3. Kabul et ve kaydet
+        # Kabul et ve kaydet
         self._record_event(sensor_id, timestamp)
+        _ACCEPTED.inc()
 
         return {
             "sensor_id": sensor_id,
             "channel": channel,
             "timestamp": timestamp.isoformat(),
             "event_type": "state_change",
-            "value": value_str,
+            "value": msg.value,
         }
 
     def check_battery(self, sensor_id: str, raw_payload: bytes) -> dict | None:
-        """Pil seviyesini kontrol et, dusuk ise uyari dict'i dondur.
+        """Ham payload'dan pil seviyesini kontrol et (bkz. update_battery).
 
         Args:
             sensor_id: Sensor ID
@@ -181,21 +325,24 @@ class EventProcessor:
             {"sensor_id": str, "battery": int} veya None
         """
         try:
-            text = raw_payload.decode("utf-8").strip()
-            data = json.loads(text)
-        except (UnicodeDecodeError, json.JSONDecodeError, ValueError):
+            data = _load_json_dict(raw_payload.decode("utf-8").strip())
+        except (UnicodeDecodeError, AttributeError):
             return None
-
-        if not isinstance(data, dict):
+        if data is None:
             return None
+        return self.update_battery(sensor_id, _as_int(data.get("battery")))
 
-        battery = data.get("battery")
-        if battery is None:
-            return None
+    def update_battery(self, sensor_id: str, battery: int | None) -> dict | None:
+        """Pil seviyesini kaydet, dusuk ise uyari dict'i dondur.
 
-        try:
-            battery = int(battery)
-        except (TypeError, ValueError):
+        Args:
+            sensor_id: Sensor ID
+            battery: Parse edilmis pil yuzdesi (ParsedMessage.battery) veya None
+
+        Returns:
+            {"sensor_id": str, "battery": int} veya None
+        """
+        if battery is None:
             return None
 
         self._battery_levels[sensor_id] = battery
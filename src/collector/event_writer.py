@@ -0,0 +1,330 @@
+"""sensor_events icin group-commit yazici thread.
+
+Collector kabul ettigi eventleri sinirli bir kuyruga birakir; ayri bir
+yazici thread bunlari N event veya M milisaniyede bir tek executemany
+transaction'i ile yazar. Boylece paho network thread'i DB commit'i
+(WAL altinda fsync) beklemez ve SD karta yazma sayisi azalir.
+
+Spool verilmisse DB'ye yazilamayan batch'ler ve kuyruk dolu iken gelen
+eventler diskteki spool dosyasina eklenir; yazici thread bosta kaldiginda
+spool'u sirayla ve idempotent olarak sensor_events'e geri oynatir. Kuyruk
+dolu iken gelen eventler once bellekteki tasma tamponuna alinir ve yazici
+thread tarafindan toplu (tek fsync) spool'lanir: paho thread'i fsync beklemez.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+
+from src.collector.spool import EventSpool
+from src.database import bump_data_version, get_db
+from src.partitions import insert_events, insert_events_once
+from src.telemetry import histogram
+
+logger = logging.getLogger("annem_guvende.collector")
+
+_COMMIT_SECONDS = histogram(
+    "annem_event_commit_seconds", "sensor_events batch yazma + commit suresi"
+).labels()
+
+# Kuyruk sonu isareti (stop icin)
+_STOP = object()
+
+
+class EventWriter:
+    """Sinirli kuyruk + batch commit yapan yazici thread.
+
+    Thread calismiyorsa (start() oncesi veya stop() sonrasi) submit()
+    eventi dogrudan, senkron olarak yazar.
+
+    Args:
+        db_path: Veritabani yolu
+        batch_size: Tek transaction'daki maksimum event sayisi
+        flush_interval_ms: Dayaniklilik penceresi; bir event en fazla
+            bu kadar sure commit edilmeden bekler
+        queue_size: Kuyruk kapasitesi (dolu ise event ayni kapasitede tasma
+            tamponuna alinip spool'a yazilir; spool yoksa reddedilir)
+        spool: Yazilamayan eventler icin disk spool'u (None = kapali)
+        replay_interval_s: Basarisiz spool oynatmasindan sonra bekleme
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 50,
+        flush_interval_ms: int = 500,
+        queue_size: int = 1000,
+        spool: EventSpool | None = None,
+        replay_interval_s: float = 30.0,
+    ):
+        self._db_path = db_path
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(0, flush_interval_ms) / 1000.0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._spool = spool
+        self._replay_interval = replay_interval_s
+        self._next_replay = 0.0
+        # Kuyruk doluyken gelen eventler; yazici thread toplu spool'lar
+        self._overflow: list[dict] = []
+        self._overflow_lock = threading.Lock()
+
+        # Sayaclar
+        self._stats_lock = threading.Lock()
+        self._events_written = 0
+        self._batches_written = 0
+        self._last_batch_size = 0
+        self._max_batch_size = 0
+        self._dropped = 0
+        self._write_errors = 0
+
+    @property
+    def running(self) -> bool:
+        """Yazici thread calisiyor mu?"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Yazici thread'i baslat (idempotent)."""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="event-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Event yazici baslatildi: batch=%d, pencere=%dms",
+            self._batch_size, int(self._flush_interval * 1000),
+        )
+
+    def submit(self, event: dict) -> bool:
+        """Eventi yazilmak uzere kuyruga ekle.
+
+        Returns:
+            True = kuyruga alindi (veya senkron yazildi / spool icin tampona alindi),
+            False = kuyruk ve tasma tamponu dolu (veya spool kapali)
+        """
+        if not self.running:
+            self._write_batch([event])
+            return True
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            if self._spool is not None:
+                with self._overflow_lock:
+                    if len(self._overflow) < self._queue.maxsize:
+                        self._overflow.append(event)
+                        return True
+            with self._stats_lock:
+                self._dropped += 1
+            logger.error("Event kuyrugu dolu, event atlandi: %s", event["sensor_id"])
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Kuyruktaki tum eventler yazilana kadar bekle.
+
+        Returns:
+            True = kuyruk bosaldi, False = zaman asimi
+        """
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Kuyrugu bosalt, son batch'i yaz ve thread'i durdur."""
+        if not self.running:
+            return
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass  # Thread mesgul; _stopping bayragini gorecek
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error("Event yazici %0.1fsn icinde durmadi", timeout)
+        else:
+            self._thread = None
+            # Thread cikarken tampona dusmus olabilecek son eventler
+            self._spool_overflow()
+            logger.info("Event yazici durduruldu (kuyruk bosaltildi)")
+
+    def replay_spool(self) -> int:
+        """Spool'daki eventleri simdi DB'ye aktarmayi dene.
+
+        Yazici thread bunu bosta kaldiginda kendisi cagirir; thread
+        calismiyorsa (test, kapanis) dogrudan cagrilabilir.
+
+        Returns:
+            DB'ye yeni eklenen event sayisi (hata veya spool yoksa 0)
+        """
+        if self._spool is None or not self._spool.pending:
+            return 0
+        try:
+            inserted = self._spool.replay(self._insert_once, self._batch_size * 10)
+        except Exception as exc:
+            self._next_replay = time.monotonic() + self._replay_interval
+            logger.warning(
+                "Spool oynatilamadi, %.0fsn sonra tekrar denenecek: %s",
+                self._replay_interval, exc,
+            )
+            return 0
+        if inserted:
+            bump_data_version("events")
+        return inserted
+
+    def stats(self) -> dict:
+        """Kuyruk derinligi, batch ve spool sayaclari."""
+        spool = self._spool.stats() if self._spool is not None else {
+            "spooled": 0, "replayed": 0, "replay_duplicates": 0,
+            "spool_corrupt": 0, "spool_pending": 0,
+        }
+        with self._stats_lock:
+            avg = (
+                self._events_written / self._batches_written
+                if self._batches_written else 0.0
+            )
+            return {
+                "queue_depth": self._queue.qsize(),
+                "overflow_pending": len(self._overflow),
+                "queue_capacity": self._queue.maxsize,
+                "events_written": self._events_written,
+                "batches_written": self._batches_written,
+                "last_batch_size": self._last_batch_size,
+                "max_batch_size": self._max_batch_size,
+                "avg_batch_size": round(avg, 2),
+                "dropped": self._dropped,
+                "write_errors": self._write_errors,
+                **spool,
+            }
+
+    # --- Dahili ---
+
+    def _run(self) -> None:
+        """Thread dongusu: ilk eventi bekle, pencere dolana kadar biriktir, yaz."""
+        stop = False
+        while not stop:
+            self._spool_overflow()
+            if self._spool is not None and self._spool.pending \
+                    and time.monotonic() >= self._next_replay:
+                self.replay_spool()
+            try:
+                first = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    break
+                continue
+
+            batch: list[dict] = []
+            taken = 1
+            if first is _STOP:
+                stop = True
+            else:
+                batch.append(first)
+                deadline = time.monotonic() + self._flush_interval
+                while len(batch) < self._batch_size:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = (
+                            self._queue.get(timeout=remaining)
+                            if remaining > 0 else self._queue.get_nowait()
+                        )
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+
+            if batch:
+                self._write_batch(batch)
+            for _ in range(taken):
+                self._queue.task_done()
+
+        self._drain()
+        self._spool_overflow()
+        # Kapanista son bir deneme; basarisizsa spool sonraki acilista oynatilir
+        self.replay_spool()
+
+    def _drain(self) -> None:
+        """Kapanista kuyrukta kalan eventleri batch'ler halinde yaz."""
+        batch: list[dict] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+            self._queue.task_done()
+            if len(batch) >= self._batch_size:
+                self._write_batch(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
+
+    def _spool_overflow(self) -> None:
+        """Tasma tamponundaki eventleri tek spool kaydi (tek fsync) olarak yaz."""
+        with self._overflow_lock:
+            events, self._overflow = self._overflow, []
+        if not events:
+            return
+        if self._spool.append(events):
+            logger.warning("Event kuyrugu doluydu, %d event spool'a yazildi", len(events))
+            return
+        with self._stats_lock:
+            self._dropped += len(events)
+        logger.error("Event kuyrugu doluydu, %d event spool'a yazilamadi ve atlandi", len(events))
+
+    def _insert_once(self, rows: list[tuple]) -> int:
+        """Spool satirlarini tek transaction'da, tekrar etmeden yaz."""
+        with get_db(self._db_path) as conn:
+            inserted = insert_events_once(conn, rows)
+            conn.commit()
+        return inserted
+
+    def _write_batch(self, batch: list[dict]) -> None:
+        """Batch'i tek transaction ile sensor_events'e yaz.
+
+        Yazilamazsa (or. 'database is locked') batch spool'a eklenir.
+        """
+        rows = [
+            (e["timestamp"], e["sensor_id"], e["channel"], e["event_type"], e["value"])
+            for e in batch
+        ]
+        start = time.perf_counter()
+        try:
+            with get_db(self._db_path) as conn:
+                insert_events(conn, rows)
+                conn.commit()
+            _COMMIT_SECONDS.observe(time.perf_counter() - start)
+            bump_data_version("events")
+        except Exception as exc:
+            with self._stats_lock:
+                self._write_errors += 1
+            if self._spool is not None and self._spool.append(batch):
+                # Spool'dan once bir sure DB'yi rahat birak
+                self._next_replay = time.monotonic() + self._replay_interval
+                logger.warning(
+                    "Event batch yazilamadi, spool'a alindi (%d event): %s", len(batch), exc
+                )
+            else:
+                logger.error("Event batch yazilamadi (%d event): %s", len(batch), exc)
+            return
+
+        with self._stats_lock:
+            self._events_written += len(batch)
+            self._batches_written += 1
+            self._last_batch_size = len(batch)
+            self._max_batch_size = max(self._max_batch_size, len(batch))
+        logger.debug("Event batch yazildi: %d event", len(batch))
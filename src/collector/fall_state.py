@@ -0,0 +1,107 @@
+"""Banyo / dusme tespiti icin proses-ici durum takibi.
+
+Bellekteki deger kaynak dogrudur. system_state'e (last_bathroom_time) sadece
+durum gecislerinde (banyoya giris, banyodan cikis, alarm sonrasi temizleme)
+ve flush() ile yazilir. Normal bir event ek DB yazmasi yapmaz.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+
+from src.database import get_system_state, set_system_state
+
+logger = logging.getLogger("annem_guvende.collector")
+
+STATE_KEY = "last_bathroom_time"
+
+
+class FallStateTracker:
+    """Son banyo kullanim zamanini bellekte tutar (write-behind).
+
+    Ilk kullanimda system_state'ten yuklenir; boylece yeniden baslatma
+    sonrasi yarim kalan banyo takibi kaybolmaz.
+
+    Args:
+        db_path: Veritabani yolu (kalicilik icin)
+    """
+
+    def __init__(self, db_path: str):
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._last_bathroom_time = ""
+        self._loaded = False
+        # Bellekte olup henuz system_state'e yazilmamis degisiklik var mi?
+        self._dirty = False
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._last_bathroom_time = get_system_state(self._db_path, STATE_KEY, "")
+            self._loaded = True
+
+    def _persist(self) -> None:
+        set_system_state(self._db_path, STATE_KEY, self._last_bathroom_time)
+        self._dirty = False
+
+    @property
+    def last_bathroom_time(self) -> str:
+        """Son banyo event zamani (ISO) veya bos string."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._last_bathroom_time
+
+    def on_event(self, channel: str, timestamp: str) -> None:
+        """Kabul edilen event ile durumu guncelle.
+
+        Banyo event'i zamani kaydeder; baska kanal event'i banyo durumunu
+        temizler (kisi banyodan cikmis kabul edilir).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if channel == "bathroom":
+                entered = not self._last_bathroom_time
+                self._last_bathroom_time = timestamp
+                if entered:
+                    self._persist()
+                else:
+                    # Banyoda devam: sadece bellek, flush'ta yazilir
+                    self._dirty = True
+            elif self._last_bathroom_time:
+                self._last_bathroom_time = ""
+                self._persist()
+
+    def pop_if_expired(
+        self, now: datetime, timeout_minutes: int
+    ) -> tuple[str, float] | None:
+        """Banyo sonrasi sure asildiysa durumu temizle ve dondur.
+
+        Returns:
+            (last_bathroom_time, gecen_dakika) veya sure dolmadiysa None
+        """
+        with self._lock:
+            self._ensure_loaded()
+            last_bt_str = self._last_bathroom_time
+            if not last_bt_str:
+                return None
+            try:
+                last_bt = datetime.fromisoformat(last_bt_str)
+            except ValueError:
+                return None
+
+            elapsed = (now - last_bt).total_seconds() / 60
+            if elapsed < timeout_minutes:
+                return None
+
+            # Alarm verilecek: tekrar alarm vermemesi icin temizle
+            self._last_bathroom_time = ""
+            self._persist()
+            return last_bt_str, elapsed
+
+    def flush(self) -> None:
+        """Yazilmamis degisikligi system_state'e yaz (shutdown / periyodik)."""
+        with self._lock:
+            if self._dirty:
+                self._persist()
+                logger.debug("Banyo durumu kaydedildi: %s", self._last_bathroom_time)
@@ -7,16 +7,50 @@ paho-mqtt loop_start() ile background thread'de calisir, uvicorn event loop'unu
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Callable
 
 from paho.mqtt.client import CallbackAPIVersion, Client, MQTTMessage
 
 from src.collector.event_processor import EventProcessor
+from src.collector.event_writer import EventWriter
+from src.collector.fall_state import FallStateTracker
+from src.collector.spool import EventSpool
+from src.collector.storm_guard import ADMIT, StormGuard
 from src.config import AppConfig, SensorConfig
-from src.database import get_db, get_system_state, set_system_state
+from src.telemetry import counter, histogram
 
 logger = logging.getLogger("annem_guvende.collector")
 
+_SAVE_SECONDS = histogram(
+    "annem_event_save_seconds", "Kabul edilen eventin yazici kuyruguna birakilma suresi"
+).labels()
+_UNKNOWN_TOPICS = counter(
+    "annem_mqtt_unknown_topics", "Sensor indeksinde olmayan topic'ten gelip atilan mesajlar"
+).labels()
+
+# Ilk gorulmede INFO ile loglanan bilinmeyen topic sayisi (sonrasi sadece sayac)
+_MAX_LOGGED_UNKNOWN = 256
+
+
+def debounce_windows(config: AppConfig) -> dict[str, float]:
+    """Varsayilandan farkli debounce penceresi olan sensorler.
+
+    Oncelik: sensors[].debounce_seconds > collector.debounce_by_type[tip]
+    > collector.debounce_seconds.
+
+    Returns:
+        {sensor_id: pencere saniyesi}
+    """
+    by_type = config.collector.debounce_by_type
+    windows: dict[str, float] = {}
+    for sensor in config.sensors:
+        if sensor.debounce_seconds is not None:
+            windows[sensor.id] = sensor.debounce_seconds
+        elif sensor.type in by_type:
+            windows[sensor.id] = by_type[sensor.type]
+    return windows
+
 
 class MQTTCollector:
     """Zigbee2MQTT'den sensor eventlerini toplar ve DB'ye yazar."""
@@ -24,12 +58,45 @@ class MQTTCollector:
     def __init__(self, config: AppConfig, db_path: str, battery_callback: Callable | None = None):
         self._config = config
         self._db_path = db_path
-        self._processor = EventProcessor(debounce_seconds=30)
+        self._processor = EventProcessor(
+            debounce_seconds=config.collector.debounce_seconds,
+            windows=debounce_windows(config),
+        )
         self._battery_callback = battery_callback
+        # Firtina korumasi: sensor basina token bucket + karantina (parse'tan once)
+        collector = config.collector
+        self._storm_guard = StormGuard(
+            rate_per_second=collector.storm_rate_per_second,
+            burst=collector.storm_burst,
+            quarantine_rate=collector.quarantine_rate_per_second,
+            quarantine_window=collector.quarantine_window_seconds,
+            quarantine_seconds=collector.quarantine_minutes * 60,
+        ) if collector.storm_protection else None
+
+        # Group-commit yazici (start() ile thread'e gecer); yazilamayan
+        # eventler disk spool'una, DB acilinca sirayla geri oynatilir
+        spool = EventSpool(
+            collector.spool_path or f"{db_path}.spool"
+        ) if collector.spool_enabled else None
+        self._writer = EventWriter(
+            db_path,
+            batch_size=collector.write_batch_size,
+            flush_interval_ms=collector.write_flush_ms,
+            queue_size=collector.write_queue_size,
+            spool=spool,
+            replay_interval_s=collector.spool_replay_seconds,
+        )
+        # Banyo / dusme takibi (bellekte, write-behind)
+        self._fall_tracker = FallStateTracker(db_path)
+        # Kabul edilen her event icin cagrilan dinleyiciler (or. deadline zamanlayici)
+        self._event_listeners: list[Callable[[dict], None]] = []
+        # Baglanti durumu degisince cagrilan dinleyiciler (or. dashboard canli akisi)
+        self._connection_listeners: list[Callable[[bool], None]] = []
 
-        # Sensor haritasi: {topic: sensor_config_dict}
+        # Topic indeksi: {topic: SensorConfig} (id + alias topic'leri)
         self._sensor_map: dict[str, SensorConfig] = {}
         self._build_sensor_map()
+        self._unknown_logged: set[str] = set()
 
         # paho-mqtt 2.x client
         self._client = Client(
@@ -57,21 +124,80 @@ class MQTTCollector:
         """Pil uyari callback'ini ayarla (DI pattern)."""
         self._battery_callback = callback
 
+    def set_quarantine_callback(self, callback: Callable[[str, float], None] | None) -> None:
+        """Sensor karantina bildirimi callback'ini ayarla (DI pattern).
+
+        Callback (sensor_id, mesaj/sn) ile paho network thread'inde,
+        karantinaya giriste bir kez cagrilir; hizli donmeli (bildirim
+        gonderimini baska thread'e birakmali).
+        """
+        if self._storm_guard is not None:
+            self._storm_guard.set_quarantine_callback(callback)
+
+    def add_event_listener(self, callback: Callable[[dict], None]) -> None:
+        """Kabul edilen her event icin cagrilacak dinleyici ekle (DI pattern).
+
+        Dinleyici paho network thread'inde calisir; hizli donmelidir.
+        """
+        self._event_listeners.append(callback)
+
+    def add_connection_listener(self, callback: Callable[[bool], None]) -> None:
+        """Baglanti kuruldu/koptu bildirimi icin dinleyici ekle (DI pattern).
+
+        Dinleyici paho network thread'inde calisir; hizli donmelidir.
+        """
+        self._connection_listeners.append(callback)
+
+    @property
+    def fall_tracker(self) -> FallStateTracker:
+        """Dusme tespiti durum nesnesi (realtime kontroller ile paylasilir)."""
+        return self._fall_tracker
+
     def _build_sensor_map(self) -> None:
-        """Config'deki sensor listesinden topic -> sensor eslesmesi olustur."""
+        """Config'deki sensor listesinden topic -> sensor indeksi olustur.
+
+        Her sensor id'si ve alias'lari (ek friendly_name, IEEE adresi) icin
+        bir topic eklenir; hepsi ayni SensorConfig'e (event'te sensor.id)
+        cikar. Cakisan topic'te ilk tanim gecerlidir.
+        """
         prefix = self._config.mqtt.topic_prefix
         for sensor in self._config.sensors:
-            topic = f"{prefix}/{sensor.id}"
-            self._sensor_map[topic] = sensor
-        logger.info("Sensor haritasi olusturuldu: %d sensor", len(self._sensor_map))
+            for name in (sensor.id, *sensor.aliases):
+                topic = f"{prefix}/{name}"
+                existing = self._sensor_map.setdefault(topic, sensor)
+                if existing is not sensor:
+                    logger.warning(
+                        "Topic cakismasi: %s zaten %s sensorune ait, %s icin yok sayildi",
+                        topic, existing.id, sensor.id,
+                    )
+        logger.info(
+            "Sensor haritasi olusturuldu: %d sensor, %d topic",
+            len(self._config.sensors), len(self._sensor_map),
+        )
+
+    def _subscriptions(self) -> list[str]:
+        """Abone olunacak topic filtreleri.
+
+        Wildcard modunda tek <prefix>/+; '+' tek seviye eslestigi icin
+        '/' iceren friendly_name'ler ayrica eklenir. Aksi halde indeksteki
+        her topic.
+        """
+        if not self._config.mqtt.wildcard_subscribe:
+            return sorted(self._sensor_map)
+        prefix = f"{self._topic_prefix}/"
+        nested = sorted(t for t in self._sensor_map if "/" in t[len(prefix):])
+        return [f"{prefix}+", *nested]
 
     def _on_connect(self, client, userdata, connect_flags, reason_code, properties):
         """Baglanti kuruldu - sensor topic'lerine subscribe ol."""
         if reason_code == 0:
             logger.info("MQTT broker'a baglandi: %s:%d", self._broker, self._port)
-            for topic in self._sensor_map:
-                client.subscribe(topic)
-                logger.info("Subscribe: %s", topic)
+            # Tum filtreler tek SUBSCRIBE paketinde (yeniden baglanmada tek tur)
+            topics = self._subscriptions()
+            if topics:
+                client.subscribe([(topic, 0) for topic in topics])
+            logger.info("Subscribe: %d topic filtresi", len(topics))
+            logger.debug("Subscribe: %s", ", ".join(topics))
             # Online durumunu bildir
             client.publish(
                 f"{self._topic_prefix}/annem_guvende/status",
@@ -79,40 +205,52 @@ class MQTTCollector:
             )
         else:
             logger.error("MQTT baglanti hatasi: reason_code=%s", reason_code)
+        self._notify_connection(reason_code == 0)
 
     def _on_message(self, client, userdata, message: MQTTMessage):
         """Yeni MQTT mesaji geldi - parse et, debounce, DB'ye yaz."""
         topic = message.topic
         sensor = self._sensor_map.get(topic)
         if sensor is None:
-            logger.debug("Bilinmeyen topic: %s", topic)
+            self._drop_unknown(topic)
+            return
+        # Firtina yapan sensorun mesaji sadece sayilir; parse / DB'ye girmez
+        if (
+            self._storm_guard is not None
+            and self._storm_guard.admit(sensor.id, time.monotonic()) != ADMIT
+        ):
             return
 
-        # EventProcessor ile isle
-        event = self._processor.process(
-            sensor_id=sensor.id,
-            channel=sensor.channel,
-            sensor_type=sensor.type,
-            trigger_value=sensor.trigger_value,
-            raw_payload=message.payload,
-        )
+        # Payload bir kez parse edilir; debounce, dusme takibi ve pil izleme paylasir
+        msg = self._processor.parse(sensor.type, sensor.trigger_value, message.payload)
+        event = self._processor.accept(sensor.id, sensor.channel, msg)
 
         if event is not None:
             self._save_event(event)
             self._update_fall_state(event)
+            self._notify_listeners(event)
 
         # Pil kontrolu
-        if self._battery_callback is not None:
-            warning = self._processor.check_battery(sensor.id, message.payload)
+        if self._battery_callback is not None and msg is not None:
+            warning = self._processor.update_battery(sensor.id, msg.battery)
             if warning is not None:
                 self._battery_callback(warning)
 
+    def _drop_unknown(self, topic: str) -> None:
+        """Indekste olmayan topic: say ve at (ilk gorulmede bir kez logla)."""
+        _UNKNOWN_TOPICS.inc()
+        if topic in self._unknown_logged or len(self._unknown_logged) >= _MAX_LOGGED_UNKNOWN:
+            return
+        self._unknown_logged.add(topic)
+        logger.info("Bilinmeyen topic atlandi (config'te yok veya alias eksik): %s", topic)
+
     def _on_disconnect(self, client, userdata, disconnect_flags, reason_code, properties):
         """Baglanti koptu - paho 2.x otomatik reconnect yapar."""
         if reason_code == 0:
             logger.info("MQTT baglantisi kapandi (normal)")
         else:
             logger.warning("MQTT baglantisi koptu: reason_code=%s (otomatik reconnect aktif)", reason_code)
+        self._notify_connection(False)
 
     def _update_fall_state(self, event: dict) -> None:
         """Banyo kullanim durumunu takip et (dusme tespiti icin).
@@ -120,30 +258,47 @@ class MQTTCollector:
         Banyo event'i geldiginde zamani kaydeder.
         Baska kanal event'i geldiginde (presence/kitchen/sleep/fridge)
         banyo zamani sifirlanir — kisi banyodan cikmis kabul edilir.
+        Durum bellekte tutulur; DB'ye sadece gecislerde yazilir.
         """
-        if event["channel"] == "bathroom":
-            set_system_state(
-                self._db_path, "last_bathroom_time", event["timestamp"]
-            )
-        else:
-            last_bt = get_system_state(self._db_path, "last_bathroom_time", "")
-            if last_bt:
-                set_system_state(self._db_path, "last_bathroom_time", "")
+        self._fall_tracker.on_event(event["channel"], event["timestamp"])
+
+    def _notify_listeners(self, event: dict) -> None:
+        """Event dinleyicilerini cagir; hata mesaj islemeyi durdurmaz."""
+        for listener in self._event_listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Event dinleyici hatasi: %s", event["sensor_id"])
+
+    def _notify_connection(self, connected: bool) -> None:
+        """Baglanti dinleyicilerini cagir; hata callback'i durdurmaz."""
+        for listener in self._connection_listeners:
+            try:
+                listener(connected)
+            except Exception:
+                logger.exception("Baglanti dinleyici hatasi")
 
     def _save_event(self, event: dict) -> None:
-        """Normalize edilmis event'i sensor_events tablosuna kaydet."""
-        with get_db(self._db_path) as conn:
-            conn.execute(
-                "INSERT INTO sensor_events (timestamp, sensor_id, channel, event_type, value) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (event["timestamp"], event["sensor_id"], event["channel"],
-                 event["event_type"], event["value"]),
-            )
-            conn.commit()
-        logger.debug("Event kaydedildi: %s/%s", event["sensor_id"], event["value"])
+        """Normalize edilmis event'i yazici kuyruguna birak (batch commit)."""
+        start = time.perf_counter()
+        submitted = self._writer.submit(event)
+        _SAVE_SECONDS.observe(time.perf_counter() - start)
+        if submitted:
+            logger.debug("Event kuyruga alindi: %s/%s", event["sensor_id"], event["value"])
+
+    def writer_stats(self) -> dict:
+        """Event yazici kuyruk derinligi ve batch sayaclari."""
+        return self._writer.stats()
+
+    def storm_stats(self) -> dict:
+        """Firtina korumasinin izledigi ve karantinadaki sensor sayisi."""
+        if self._storm_guard is None:
+            return {"tracked_sensors": 0, "quarantined_sensors": 0}
+        return self._storm_guard.stats()
 
     def start(self) -> None:
         """MQTT client'i baslat (background thread)."""
+        self._writer.start()
         self._client.connect(self._broker, self._port, keepalive=60)
         self._client.loop_start()
         logger.info("MQTT client baslatildi: %s:%d", self._broker, self._port)
@@ -160,6 +315,9 @@ class MQTTCollector:
             pass
         self._client.loop_stop()
         self._client.disconnect()
+        # Kuyrukta bekleyen eventleri ve banyo durumunu yaz
+        self._writer.stop()
+        self._fall_tracker.flush()
         logger.info("MQTT client durduruldu")
 
     def is_connected(self) -> bool:
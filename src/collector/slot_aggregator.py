@@ -1,9 +1,17 @@
-"""15 dakikalik slot ozetleme - APScheduler ile periyodik calisir."""
+"""15 dakikalik slot ozetleme - APScheduler ile periyodik calisir.
+
+Canli yol: SlotAccumulator collector'un gordugu her eventi bellekte
+(tarih, slot, kanal) sayacina ekler ve slot sinirinda slot_summary'ye yazar.
+SQL yolu (aggregate_current_slot) sensor_events'i tarar; accumulator'un
+tam gormedigi slotlar (ilk acilis) ve onarim icin yedek olarak kalir.
+"""
 
 import logging
+import threading
 from datetime import datetime, timedelta
 
-from src.database import get_db
+from src.database import bump_data_version, get_db
+from src.partitions import events_source
 
 logger = logging.getLogger("annem_guvende.collector")
 
@@ -48,7 +56,7 @@ def aggregate_current_slot(
         # Her kanal icin event say
         rows = conn.execute(
             "SELECT channel, COUNT(*) as cnt "
-            "FROM sensor_events "
+            f"FROM {events_source(conn, slot_start, slot_end)} "
             "WHERE timestamp >= ? AND timestamp < ? "
             "GROUP BY channel",
             (slot_start, slot_end),
@@ -69,11 +77,212 @@ def aggregate_current_slot(
                 (date_str, slot, ch, active, count),
             )
         conn.commit()
+    bump_data_version("slots")
 
     if channel_counts:
         logger.info("Slot ozeti guncellendi: %s slot=%d, %d kanal", date_str, slot, len(channel_counts))
 
 
+_UPSERT_SQL = (
+    "INSERT INTO slot_summary (date, slot, channel, active, event_count) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (date, slot, channel) DO UPDATE SET "
+    "active = excluded.active, event_count = excluded.event_count"
+)
+
+
+class SlotAccumulator:
+    """Canli slot sayaclari: sensor_events'i yeniden taramadan slot ozeti.
+
+    Sayaclar gun boyunca bellekte tutulur (gunde 96 x kanal satir); flush
+    her zaman toplam sayiyi yazar. Boylece slot sinirindan sonra gelen
+    gec bir event bir sonraki flush'ta dogru toplamla yazilir.
+
+    Accumulator'un baslatildigi slot kismidir (onceki eventleri gormedi);
+    bu slot icin flush() False doner ve cagiran SQL yoluna duser.
+
+    Args:
+        db_path: Veritabani yolu
+        channels: Bos slotlarda 0 yazilacak kanal listesi
+        now: Baslangic zamani (test icin override)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        channels: list[str] | None = None,
+        now: datetime | None = None,
+    ):
+        self._db_path = db_path
+        self._channels = list(channels or [])
+        self._lock = threading.Lock()
+        # Flush'lari sirala (add()'i bekletmez)
+        self._flush_lock = threading.Lock()
+        # {(date, slot, channel): event_count}
+        self._counts: dict[tuple[str, int, str], int] = {}
+        # Son flush'tan beri degisen anahtarlar
+        self._dirty: set[tuple[str, int, str]] = set()
+        # Tam gorulen ilk slot: baslangic slotundan sonraki slot
+        start = now or datetime.now()
+        _, first_full = get_slot_time_range(start)
+        self._covered_from = first_full
+
+    def add(self, event: dict) -> None:
+        """Kabul edilen eventi sayaca ekle (collector event dinleyicisi)."""
+        ts = event["timestamp"]
+        # "YYYY-MM-DDTHH:MM:SS" -> strptime'a gerek yok
+        key = (ts[:10], int(ts[11:13]) * 4 + int(ts[14:16]) // 15, event["channel"])
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._dirty.add(key)
+
+    def covers(self, dt: datetime) -> bool:
+        """dt'nin slotu accumulator tarafindan bastan sona goruldu mu?"""
+        slot_start, _ = get_slot_time_range(dt)
+        return slot_start >= self._covered_from
+
+    def snapshot(self, date_str: str) -> dict[str, list[int]]:
+        """Verilen gunun bellekteki slot sayaclari (acik slot dahil).
+
+        Returns:
+            {channel: [96 event_count]}
+        """
+        result = {ch: [0] * 96 for ch in self._channels}
+        with self._lock:
+            for (date, slot, ch), count in self._counts.items():
+                if date == date_str:
+                    result.setdefault(ch, [0] * 96)[slot] = count
+        return result
+
+    def flush(self, now: datetime | None = None) -> bool:
+        """now'in slotu ve oncesindeki degisen sayaclari slot_summary'ye yaz.
+
+        now'in slotu icin tum kanallar (bos olanlar 0) yazilir.
+        Eski gunlerin sayaclari yazildiktan sonra bellekten silinir.
+        DB yazimi _lock disinda yapilir: paho thread'indeki add() yavas /
+        kilitli yazimi beklemez. Yazim basarisizsa anahtarlar tekrar
+        degismis sayilir ve sonraki flush'ta yazilir.
+
+        Args:
+            now: Kapanan slot icindeki bir zaman (default: datetime.now())
+
+        Returns:
+            True = slot bellekten yazildi, False = slot kapsanmiyor (SQL yolu gerekli)
+        """
+        if now is None:
+            now = datetime.now()
+        date_str = now.strftime("%Y-%m-%d")
+        target = (date_str, get_slot(now))
+
+        with self._flush_lock:
+            with self._lock:
+                if not self.covers(now):
+                    # Kismi slot: SQL yolu yazacak, bellekteki eksik sayac ezmesin
+                    for key in [k for k in self._counts if k[:2] <= target]:
+                        del self._counts[key]
+                        self._dirty.discard(key)
+                    return False
+
+                keys = {k for k in self._dirty if k[:2] <= target}
+                keys.update((date_str, target[1], ch) for ch in self._channels)
+                rows = []
+                for key in sorted(keys):
+                    count = self._counts.get(key, 0)
+                    rows.append((key[0], key[1], key[2], 1 if count > 0 else 0, count))
+                self._dirty -= keys
+
+            try:
+                with get_db(self._db_path) as conn:
+                    conn.executemany(_UPSERT_SQL, rows)
+                    conn.commit()
+            except Exception:
+                with self._lock:
+                    self._dirty |= keys
+                raise
+            bump_data_version("slots")
+
+            with self._lock:
+                # Yazim sirasinda gelen (dirty) eski gun eventleri sonraki flush'a kalir
+                for key in [k for k in self._counts if k[0] < date_str and k not in self._dirty]:
+                    del self._counts[key]
+
+        logger.debug("Slot ozeti bellekten yazildi: %s slot=%d, %d satir", date_str, target[1], len(rows))
+        return True
+
+
+def aggregate_day(
+    db_path: str,
+    date_or_range: str | tuple[str, str],
+    channels: list[str] | None = None,
+) -> int:
+    """Bir gunun veya tarih araliginin tum slot ozetini tek SQL ile yaz.
+
+    Tarih, slot ve kanal SQL ifadeleriyle hesaplanir (timestamp substr);
+    sensor_events taramasi idx_events_ts_channel kapsayici indeksinden
+    yapilir. Her gun x 96 slot x kanal satiri (bos olanlar 0) tek
+    INSERT ... SELECT ve tek transaction ile upsert edilir. Mevcut
+    satirlar sensor_events'ten yeniden hesaplanan degerle guncellenir.
+
+    Args:
+        db_path: Veritabani yolu
+        date_or_range: "YYYY-MM-DD" veya (baslangic, bitis) dahil aralik
+        channels: Event olmasa da 0 yazilacak kanallar
+
+    Returns:
+        Yazilan (upsert edilen) satir sayisi
+    """
+    if isinstance(date_or_range, str):
+        start_date = end_date = date_or_range
+    else:
+        start_date, end_date = date_or_range
+    ts_start = f"{start_date}T00:00:00"
+    ts_end = (
+        datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+    ).strftime("%Y-%m-%dT00:00:00")
+
+    ch_list = list(dict.fromkeys(channels or []))
+    if ch_list:
+        chans_sql = "VALUES " + ", ".join("(?)" for _ in ch_list) + " UNION SELECT ch FROM counts"
+    else:
+        chans_sql = "SELECT ch FROM counts"
+
+    sql = (
+        "WITH RECURSIVE "
+        "days(d) AS (SELECT ? UNION ALL SELECT date(d, '+1 day') FROM days WHERE d < ?), "
+        "slots(s) AS (SELECT 0 UNION ALL SELECT s + 1 FROM slots WHERE s < 95), "
+        "counts(d, s, ch, cnt) AS ("
+        "  SELECT substr(timestamp, 1, 10), "
+        "         CAST(substr(timestamp, 12, 2) AS INTEGER) * 4 "
+        "         + CAST(substr(timestamp, 15, 2) AS INTEGER) / 15, "
+        "         channel, COUNT(*) "
+        "  FROM {events} "
+        "  WHERE timestamp >= ? AND timestamp < ? "
+        "  GROUP BY 1, 2, 3), "
+        f"chans(ch) AS ({chans_sql}) "
+        "INSERT INTO slot_summary (date, slot, channel, active, event_count) "
+        "SELECT days.d, slots.s, chans.ch, "
+        "       COALESCE(counts.cnt, 0) > 0, COALESCE(counts.cnt, 0) "
+        "FROM days CROSS JOIN slots CROSS JOIN chans "
+        "LEFT JOIN counts ON counts.d = days.d AND counts.s = slots.s "
+        "                AND counts.ch = chans.ch "
+        "WHERE true "
+        "ON CONFLICT (date, slot, channel) DO UPDATE SET "
+        "active = excluded.active, event_count = excluded.event_count"
+    )
+    params = [start_date, end_date, ts_start, ts_end, *ch_list]
+
+    with get_db(db_path) as conn:
+        # WITH ile baslayan DML'de cursor.rowcount guvenilir degil; changes()
+        # trigger'larin (data_changes sayaci) yazdiklarini saymaz
+        conn.execute(sql.format(events=events_source(conn, ts_start, ts_end)), params)
+        written = conn.execute("SELECT changes()").fetchone()[0]
+        conn.commit()
+    bump_data_version("slots")
+
+    logger.info("Gun slot ozeti yazildi: %s..%s, %d satir", start_date, end_date, written)
+    return written
+
+
 def fill_missing_slots(db_path: str, date_str: str, channels: list[str]) -> None:
     """Verilen gundeki bos slotlari active=0, event_count=0 olarak doldur.
 
@@ -90,5 +299,6 @@ def fill_missing_slots(db_path: str, date_str: str, channels: list[str]) -> None
                     (date_str, slot, ch),
                 )
         conn.commit()
+    bump_data_version("slots")
 
     logger.info("Eksik slotlar dolduruldu: %s, %d kanal", date_str, len(channels))
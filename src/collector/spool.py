@@ -0,0 +1,184 @@
+"""sensor_events yazilamadiginda eventler icin diskte kalici spool.
+
+DB kilitliyken (gece bakimi, uzun checkpoint) veya disk hatasinda
+EventWriter eventi atmak yerine buraya ekler; yazici thread DB tekrar
+yazilabilir oldugunda dosyayi sirayla sensor_events'e geri oynatir.
+
+Dosya formati: satir basina bir kayit, "<crc32 hex> <json>\\n". Elektrik
+kesintisinde yarim kalan son satir veya bozuk kayit checksum ile
+yakalanip atlanir. Her ekleme fsync edilir.
+
+Oynatma icin dosya once <yol>.replay adina tasinir; yeni eventler taze
+dosyaya eklenmeye devam eder. Oynatma bitince .replay silinir. Silme
+oncesi cokme olursa ayni kayitlar tekrar oynatilir; idempotency anahtari
+(bkz. partitions.insert_events_once) satirin iki kez yazilmasini onler.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import zlib
+from collections.abc import Callable
+
+logger = logging.getLogger("annem_guvende.collector")
+
+_FIELDS = ("timestamp", "sensor_id", "channel", "event_type", "value")
+
+
+def _encode(event: dict) -> bytes:
+    body = json.dumps(
+        [event[f] for f in _FIELDS], ensure_ascii=False, separators=(",", ":")
+    ).encode()
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+
+def _decode(line: bytes) -> tuple | None:
+    """Gecerli kayit ise (timestamp, sensor_id, channel, event_type, value)."""
+    if len(line) < 10 or not line.endswith(b"\n") or line[8:9] != b" ":
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        row = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(row, list) or len(row) != len(_FIELDS):
+        return None
+    return tuple(row)
+
+
+class EventSpool:
+    """Append-only, checksum'li event spool dosyasi.
+
+    append() herhangi bir thread'den cagrilabilir; replay() tek seferde
+    bir cagiranla calisir (yazici thread).
+
+    Args:
+        path: Spool dosya yolu (dizini yoksa olusturulur)
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._replay_path = path + ".replay"
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._pending = os.path.exists(path) or os.path.exists(self._replay_path)
+
+        # Sayaclar
+        self._spooled = 0
+        self._replayed = 0
+        self._duplicates = 0
+        self._corrupt = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def pending(self) -> bool:
+        """Oynatilmayi bekleyen kayit olabilir mi?"""
+        return self._pending
+
+    def append(self, events: list[dict]) -> bool:
+        """Eventleri sona ekle ve fsync et.
+
+        Returns:
+            True = diske yazildi, False = spool da yazilamadi (event kaybi)
+        """
+        data = b"".join(_encode(e) for e in events)
+        with self._lock:
+            try:
+                directory = os.path.dirname(self._path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self._path, "ab") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as exc:
+                logger.error("Spool'a yazilamadi (%d event kayboldu): %s", len(events), exc)
+                return False
+            self._spooled += len(events)
+            self._pending = True
+        return True
+
+    def replay(self, write: Callable[[list[tuple]], int], batch_size: int = 500) -> int:
+        """Bekleyen kayitlari dosya sirasiyla write() ile DB'ye aktar.
+
+        Args:
+            write: Satir listesini tek transaction'da yazip yeni eklenen
+                satir sayisini donduren fonksiyon (idempotent olmali)
+            batch_size: write() cagrisi basina satir
+
+        Returns:
+            DB'ye yeni eklenen satir sayisi. write() hata verirse kalan
+            kayitlar dosyada kalir ve hata cagirana iletilir.
+        """
+        if not self._replay_lock.acquire(blocking=False):
+            return 0
+        try:
+            inserted = 0
+            # Yarim kalmis onceki oynatma once, sonra birikmis yeni kayitlar
+            while self._rotate():
+                inserted += self._replay_file(write, max(1, batch_size))
+            return inserted
+        finally:
+            self._replay_lock.release()
+
+    def stats(self) -> dict:
+        """Spool sayaclari."""
+        with self._lock:
+            return {
+                "spooled": self._spooled,
+                "replayed": self._replayed,
+                "replay_duplicates": self._duplicates,
+                "spool_corrupt": self._corrupt,
+                "spool_pending": int(self._pending),
+            }
+
+    # --- Dahili ---
+
+    def _rotate(self) -> bool:
+        """Oynatilacak dosyayi hazirla; yoksa bekleyen bir sey kalmamistir."""
+        with self._lock:
+            if os.path.exists(self._replay_path):
+                return True
+            if os.path.exists(self._path):
+                os.replace(self._path, self._replay_path)
+                return True
+            self._pending = False
+            return False
+
+    def _replay_file(self, write: Callable[[list[tuple]], int], batch_size: int) -> int:
+        rows: list[tuple] = []
+        corrupt = 0
+        with open(self._replay_path, "rb") as f:
+            for line in f:
+                row = _decode(line)
+                if row is None:
+                    corrupt += 1
+                else:
+                    rows.append(row)
+        if corrupt:
+            logger.warning("Spool'da %d bozuk kayit atlandi", corrupt)
+
+        inserted = 0
+        for i in range(0, len(rows), batch_size):
+            chunk = rows[i:i + batch_size]
+            added = write(chunk)
+            inserted += added
+            with self._lock:
+                self._replayed += added
+                self._duplicates += len(chunk) - added
+        with self._lock:
+            self._corrupt += corrupt
+        os.remove(self._replay_path)
+        logger.info(
+            "Spool oynatildi: %d kayit, %d yeni event, %d bozuk",
+            len(rows), inserted, corrupt,
+        )
+        return inserted
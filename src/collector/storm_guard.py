@@ -0,0 +1,163 @@
+"""Sensor basina mesaj firtinasi korumasi: token bucket + karantina.
+
+Flap eden bir kontak veya Zigbee repeater dongusu saniyede yuzlerce mesaj
+uretebilir. StormGuard her mesaji parse'tan ONCE degerlendirir:
+
+  - ADMIT: token var, mesaj normal islenir
+  - LIMITED: sensorun kovasi bos; mesaj yalnizca sayilir (parse / DB yok)
+  - QUARANTINED: sensor pencere boyunca karantina esigini asti; sure
+    dolana kadar tum mesajlari sayilip atilir, girista callback (Telegram)
+    bir kez cagrilir
+
+Saglikli sensorlerin kovalari bagimsizdir; firtina onlarin gecikmesini
+etkilemez (bkz. scripts/bench_storm.py). Tek thread'den (paho network
+thread) cagrilir; stats() baska thread'den okunabilir.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from src.telemetry import counter
+
+logger = logging.getLogger("annem_guvende.collector")
+
+ADMIT = "admit"
+LIMITED = "limited"
+QUARANTINED = "quarantined"
+
+_DROPPED = counter(
+    "annem_storm_dropped", "Firtina korumasiyla sayilip atilan mesajlar", ("sensor", "reason")
+)
+_QUARANTINES = counter(
+    "annem_sensor_quarantines", "Karantinaya alinan sensor sayisi (giris)", ("sensor",)
+)
+
+
+class _SensorState:
+    __slots__ = (
+        "tokens", "updated", "window_start", "window_count", "quarantined_until",
+        "limited", "dropped",
+    )
+
+    def __init__(self, burst: float, now: float):
+        self.tokens = burst
+        self.updated = now
+        self.window_start = now
+        self.window_count = 0
+        self.quarantined_until = 0.0
+        # Sicak yolda telemetri etiket aramasi yapmamak icin onceden alinir
+        self.limited = None
+        self.dropped = None
+
+
+class StormGuard:
+    """Sensor basina token bucket ve otomatik karantina.
+
+    Args:
+        rate_per_second: Kovanin dolma hizi (surekli kabul edilen mesaj/sn)
+        burst: Kova kapasitesi (ani mesaj patlamasi toleransi)
+        quarantine_rate: Pencere ortalamasi bu hizi (mesaj/sn) asarsa karantina
+        quarantine_window: Karantina hizinin olculdugu pencere (sn)
+        quarantine_seconds: Karantina suresi
+        on_quarantine: Karantinaya giriste cagrilir: (sensor_id, mesaj/sn)
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 2.0,
+        burst: float = 20.0,
+        quarantine_rate: float = 10.0,
+        quarantine_window: float = 30.0,
+        quarantine_seconds: float = 1800.0,
+        on_quarantine: Callable[[str, float], None] | None = None,
+    ):
+        self._rate = rate_per_second
+        self._burst = burst
+        self._quarantine_limit = quarantine_rate * quarantine_window
+        self._quarantine_window = quarantine_window
+        self._quarantine_seconds = quarantine_seconds
+        self._on_quarantine = on_quarantine
+        self._states: dict[str, _SensorState] = {}
+        self._lock = threading.Lock()
+
+    def set_quarantine_callback(self, callback: Callable[[str, float], None] | None) -> None:
+        """Karantina bildirimi callback'ini ayarla (DI pattern)."""
+        self._on_quarantine = callback
+
+    def admit(self, sensor_id: str, now: float) -> str:
+        """Mesaj islenmeli mi?
+
+        Args:
+            sensor_id: Sensor ID
+            now: Monotonik zaman (time.monotonic())
+
+        Returns:
+            ADMIT, LIMITED veya QUARANTINED
+        """
+        state = self._states.get(sensor_id)
+        if state is None:
+            state = _SensorState(self._burst, now)
+            state.limited = _DROPPED.labels(sensor_id, LIMITED)
+            state.dropped = _DROPPED.labels(sensor_id, QUARANTINED)
+            with self._lock:
+                self._states[sensor_id] = state
+
+        # Karantina hizi: sabit pencerede tum mesajlar (atilanlar dahil)
+        if now - state.window_start >= self._quarantine_window:
+            state.window_start = now
+            state.window_count = 0
+        state.window_count += 1
+
+        if state.quarantined_until:
+            if now < state.quarantined_until:
+                state.dropped.inc()
+                return QUARANTINED
+            state.quarantined_until = 0.0
+            state.tokens = self._burst
+            logger.info("Sensor karantinadan cikti: %s", sensor_id)
+
+        if state.window_count > self._quarantine_limit:
+            self._quarantine(sensor_id, state, now)
+            state.dropped.inc()
+            return QUARANTINED
+
+        tokens = min(self._burst, state.tokens + (now - state.updated) * self._rate)
+        state.updated = now
+        if tokens >= 1.0:
+            state.tokens = tokens - 1.0
+            return ADMIT
+        state.tokens = tokens
+        state.limited.inc()
+        return LIMITED
+
+    def _quarantine(self, sensor_id: str, state: _SensorState, now: float) -> None:
+        state.quarantined_until = now + self._quarantine_seconds
+        rate = state.window_count / max(now - state.window_start, 1.0)
+        _QUARANTINES.labels(sensor_id).inc()
+        logger.warning(
+            "Sensor karantinaya alindi: %s (~%.0f mesaj/sn, %.0f dk)",
+            sensor_id, rate, self._quarantine_seconds / 60,
+        )
+        if self._on_quarantine is not None:
+            try:
+                self._on_quarantine(sensor_id, rate)
+            except Exception:
+                logger.exception("Karantina bildirimi gonderilemedi: %s", sensor_id)
+
+    def quarantined(self, now: float | None = None) -> list[str]:
+        """Su an karantinadaki sensorler."""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            states = list(self._states.items())
+        return sorted(s for s, st in states if st.quarantined_until > now)
+
+    def stats(self) -> dict:
+        """Izlenen ve karantinadaki sensor sayisi."""
+        with self._lock:
+            tracked = len(self._states)
+        return {"tracked_sensors": tracked, "quarantined_sensors": len(self.quarantined())}
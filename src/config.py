@@ -21,6 +21,7 @@ class MqttConfig(BaseModel):
     broker: str = "localhost"
     port: int = 1883
     topic_prefix: str = "zigbee2mqtt"
+    wildcard_subscribe: bool = False  # Sensor basina abonelik yerine tek <prefix>/+
 
 
 class SensorConfig(BaseModel):
@@ -28,6 +29,25 @@ class SensorConfig(BaseModel):
     channel: str = ""
     type: str = ""
     trigger_value: str = ""
+    aliases: list[str] = Field(default_factory=list)  # Ek friendly_name / IEEE adresi (0x...)
+    debounce_seconds: float | None = None  # Sensore ozel debounce penceresi (None: tip/varsayilan)
+
+
+class CollectorConfig(BaseModel):
+    write_batch_size: int = 50  # Tek transaction'da yazilacak max event
+    write_flush_ms: int = 500  # Dayaniklilik penceresi: event en fazla bu kadar bekler
+    write_queue_size: int = 1000  # Yazici kuyrugu kapasitesi
+    spool_enabled: bool = True  # DB yazilamazsa / kuyruk doluysa eventler diske
+    spool_path: str = ""  # Bos ise <database.path>.spool
+    spool_replay_seconds: float = 30.0  # Basarisiz oynatmadan sonra tekrar deneme
+    debounce_seconds: float = 30.0  # Varsayilan debounce penceresi
+    debounce_by_type: dict[str, float] = Field(default_factory=dict)  # Tip bazli pencere, or. {"contact": 5}
+    storm_protection: bool = True  # Sensor basina hiz siniri + karantina
+    storm_rate_per_second: float = 2.0  # Surekli kabul edilen mesaj/sn (token bucket dolma hizi)
+    storm_burst: int = 20  # Ani patlama toleransi (kova kapasitesi)
+    quarantine_rate_per_second: float = 10.0  # Pencere ortalamasi bunu asarsa karantina
+    quarantine_window_seconds: float = 30.0  # Karantina hizinin olculdugu pencere
+    quarantine_minutes: float = 30.0  # Karantina suresi (mesajlar sayilip atilir)
 
 
 class ModelConfig(BaseModel):
@@ -37,6 +57,7 @@ class ModelConfig(BaseModel):
     learning_days: int = 14
     prior_alpha: float = 1.0
     prior_beta: float = 1.0
+    legacy_model_rows: bool = True  # model_state satirlarini da yaz (uyumluluk)
 
 
 class AlertsConfig(BaseModel):
@@ -61,16 +82,37 @@ class HeartbeatConfig(BaseModel):
     url: str = ""
     device_id: str = "annem-pi"
     interval_seconds: int = 300
+    metrics_interval_seconds: float = 15.0  # Saglik metrikleri snapshot yenileme araligi
+    metrics_fresh_min_seconds: float = 5.0  # ?fresh=1 zorla yenileme hiz siniri
+    history_interval_seconds: float = 5.0  # Metrik gecmisi ornekleme araligi
+    history_capacity: int = 720  # Halka tampon ornek sayisi (720 x 5 sn = 1 saat)
+    watchdog_window_seconds: float = 300.0  # Sicaklik/RAM kontrolu pencere ortalamasi
 
 
 class DatabaseConfig(BaseModel):
     path: str = "./data/annem_guvende.db"
     retention_days: int = 90
+    profile_queries: bool = False  # Ifade bazli sorgu profilleme (/api/admin/queries)
+    slow_query_ms: float = 100.0  # Profilleme acikken bu sureyi asan sorgular loglanir
+    partition_events: bool = False  # sensor_events aylik tablolara bolunur, retention DROP TABLE
 
 
 class DashboardConfig(BaseModel):
     username: str = ""
     password: str = ""
+    read_workers: int = 4  # Dashboard okuma thread'leri (salt-okunur baglanti)
+    query_budget_ms: int = 2000  # Tek istek sorgu zaman butcesi, asilirsa 503
+    stream_buffer_size: int = 256  # SSE istemci basina mesaj kuyrugu (dolarsa istemci cikarilir)
+    stream_max_clients: int = 16  # Es zamanli /api/stream istemci limiti
+    stream_keepalive_seconds: float = 15.0  # Mesaj yoksa keepalive yorum araligi
+
+
+class SchedulerConfig(BaseModel):
+    max_workers: int = 4  # Job thread havuzu boyutu
+    max_instances: int = 1  # Ayni job'in es zamanli calisma limiti
+    coalesce: bool = True  # Kacirilan tetiklemeler tek calismaya birlesir
+    misfire_grace_time: int = 60  # Gec kalan tetikleme bu kadar sn icinde calisir
+    slow_wait_warn_seconds: float = 5.0  # Kuyruk bekleme uyari esigi
 
 
 class SystemConfig(BaseModel):
@@ -84,12 +126,14 @@ class SystemConfig(BaseModel):
 class AppConfig(BaseModel):
     mqtt: MqttConfig = Field(default_factory=MqttConfig)
     sensors: list[SensorConfig] = Field(default_factory=list)
+    collector: CollectorConfig = Field(default_factory=CollectorConfig)
     model: ModelConfig = Field(default_factory=ModelConfig)
     alerts: AlertsConfig = Field(default_factory=AlertsConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     dashboard: DashboardConfig = Field(default_factory=DashboardConfig)
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)
     system: SystemConfig = Field(default_factory=SystemConfig)
 
 
@@ -2,21 +2,130 @@
 
 FastAPI APIRouter ile 6 endpoint.
 app.state uzerinden DB path ve MQTT durumuna erisir.
-Veri hazirlamasi charts.py'ye delege edilir.
+Veri hazirlamasi charts.py'ye delege edilir; senkron SQLite cagrilari
+DashboardReader ile salt-okunur worker thread'lerde calisir (event loop
+bloklanmaz), zaman butcesini asan sorgu 503 dondurur. Periyodik yoklanan
+endpoint'ler veri versiyonlu ETag dondurur (If-None-Match -> 304).
+/api/stream ise degisiklikleri Server-Sent Events ile anlik iter.
 """
 
+import logging
+import time
+from datetime import datetime
+
 from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 
+from src.collector.slot_aggregator import SlotAccumulator
+from src.config import HeartbeatConfig
 from src.dashboard.charts import (
+    BUNDLE_FIELDS,
+    get_bundle_data,
     get_daily_data,
     get_heatmap_data,
     get_history_data,
     get_learning_curve_data,
     get_status_data,
+    get_today_slots,
+)
+from src.dashboard.data_access import DashboardReader
+from src.dashboard.event_hub import KEEPALIVE, EventHub, HubMessage
+from src.dashboard.response_cache import CACHE_CONTROL, ResponseCache, etag_matches
+from src.database import QueryBudgetExceeded, get_persisted_versions, get_query_profiler
+from src.heartbeat import MetricsSampler, run_health_checks
+from src.telemetry import histogram
+
+logger = logging.getLogger("annem_guvende.dashboard")
+
+_HANDLER_SECONDS = histogram(
+    "annem_dashboard_request_seconds", "Dashboard API handler suresi", ("route", "status")
 )
-from src.heartbeat import collect_system_metrics, run_health_checks
 
-router = APIRouter(prefix="/api", tags=["dashboard"])
+
+class _TimedRoute(APIRoute):
+    """Handler suresini route sablonu + durum koduna gore olcen route."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        path = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as exc:
+                status = exc.status_code
+                raise
+            finally:
+                _HANDLER_SECONDS.labels(path, str(status)).observe(time.perf_counter() - start)
+
+        return timed_handler
+
+
+router = APIRouter(prefix="/api", tags=["dashboard"], route_class=_TimedRoute)
+
+
+def _reader(request: Request) -> DashboardReader:
+    """app.state'teki okuyucu (lifespan disinda - testlerde - ilk istekte olusur)."""
+    reader = getattr(request.app.state, "dashboard_reader", None)
+    if reader is None:
+        dashboard = getattr(getattr(request.app.state, "config", None), "dashboard", None)
+        if dashboard is not None:
+            reader = DashboardReader(dashboard.read_workers, dashboard.query_budget_ms)
+        else:
+            reader = DashboardReader()
+        request.app.state.dashboard_reader = reader
+    return reader
+
+
+async def _read(request: Request, func, *args, **kwargs):
+    """Veri fonksiyonunu okuma havuzunda calistir; butce asiminda 503."""
+    try:
+        return await _reader(request).run(func, *args, **kwargs)
+    except QueryBudgetExceeded as exc:
+        logger.warning("Dashboard sorgusu kesildi: %s (%s)", request.url.path, exc)
+        raise HTTPException(status_code=503, detail="Sorgu zaman asimi") from exc
+
+
+def _response_cache(request: Request) -> ResponseCache:
+    """app.state'teki yanit onbellegi (yoksa ilk istekte olusur)."""
+    cache = getattr(request.app.state, "response_cache", None)
+    if cache is None:
+        cache = ResponseCache()
+        request.app.state.response_cache = cache
+    return cache
+
+
+async def _cached_read(
+    request: Request, key: str, scopes: tuple[str, ...], extra: tuple, func, *args
+) -> Response:
+    """Veri versiyonlu ETag ile yanit: eslesirse 304, ayni ETag'de bellekten govde.
+
+    ETag veri okunmadan ONCE hesaplanir; okuma sirasinda yazim olursa bir
+    sonraki istek yeni versiyonu gorur. Kalici izler (tek satirlik okumalar)
+    okuma havuzunda alinir; baska surecin yazdigi veri de ETag'i degistirir.
+    """
+    cache = _response_cache(request)
+    persisted = await _read(
+        request, get_persisted_versions, request.app.state.db_path, scopes
+    )
+    etag = cache.etag(scopes, extra, persisted)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        cache.mark_not_modified()
+        return Response(status_code=304, headers=headers)
+
+    body = cache.get(key, etag)
+    if body is None:
+        data = await _read(request, func, *args)
+        body = JSONResponse(jsonable_encoder(data)).body
+        cache.put(key, etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 def _safe_mqtt_check(request: Request) -> bool:
@@ -32,50 +141,193 @@ def _safe_mqtt_check(request: Request) -> bool:
 
 @router.get("/status")
 async def api_status(request: Request):
-    """Anlik durum verisi."""
+    """Anlik durum verisi (age_minutes nedeniyle ETag dakikalik degisir)."""
     db_path = request.app.state.db_path
     mqtt_ok = _safe_mqtt_check(request)
-    return get_status_data(db_path, mqtt_ok)
+    minute = datetime.now().strftime("%Y-%m-%dT%H:%M")
+    return await _cached_read(
+        request, "status", ("events", "scores", "model"), (minute, mqtt_ok),
+        get_status_data, db_path, mqtt_ok,
+    )
+
+
+def _event_hub(request: Request) -> EventHub:
+    """app.state'teki canli akis hub'i (yoksa ilk istekte olusur)."""
+    hub = getattr(request.app.state, "event_hub", None)
+    if hub is None:
+        dashboard = getattr(getattr(request.app.state, "config", None), "dashboard", None)
+        if dashboard is not None:
+            hub = EventHub(dashboard.stream_buffer_size, dashboard.stream_max_clients)
+        else:
+            hub = EventHub()
+        request.app.state.event_hub = hub
+    return hub
+
+
+@router.get("/stream")
+async def api_stream(request: Request):
+    """Server-Sent Events canli akis: event, slot, alert ve mqtt deltalari.
+
+    Ilk mesaj "hello" (anlik MQTT durumu); istemci bunu aldiginda tam
+    yenileme yapar. Kuyrugu dolan istemci "evicted" mesajiyla kapatilir.
+    """
+    hub = _event_hub(request)
+    sub = hub.subscribe()
+    if sub is None:
+        raise HTTPException(status_code=503, detail="Canli akis istemci limiti dolu")
+    dashboard = getattr(getattr(request.app.state, "config", None), "dashboard", None)
+    keepalive = dashboard.stream_keepalive_seconds if dashboard is not None else 15.0
+    hello = HubMessage(0, "hello", {"mqtt_connected": _safe_mqtt_check(request)})
+
+    async def frames():
+        try:
+            yield hello.to_sse()
+            while True:
+                message = await sub.get(keepalive)
+                if message is KEEPALIVE:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                elif message is None:
+                    yield HubMessage(0, "evicted", {}).to_sse()
+                    return
+                else:
+                    yield message.to_sse()
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/daily/{date}")
 async def api_daily(date: str, request: Request):
     """Belirli bir gune ait detayli veri."""
-    result = get_daily_data(request.app.state.db_path, date)
+    result = await _read(request, get_daily_data, request.app.state.db_path, date)
     if result is None:
         raise HTTPException(status_code=404, detail="Tarih bulunamadi")
     return result
 
 
+@router.get("/today")
+async def api_today(request: Request):
+    """Bugunun slot aktivitesi (slot siniri beklenmeden, canli sayaclar dahil)."""
+    from src.learner.metrics import get_channels_from_config
+
+    channels = get_channels_from_config(request.app.state.config)
+    accumulator = getattr(request.app.state, "slot_accumulator", None)
+    live = None
+    if isinstance(accumulator, SlotAccumulator):
+        live = accumulator.snapshot(datetime.now().strftime("%Y-%m-%d"))
+    return await _read(request, get_today_slots, request.app.state.db_path, channels, live)
+
+
 @router.get("/history")
 async def api_history(request: Request, days: int = 30):
     """Tarihsel gunluk skor verileri."""
-    return get_history_data(request.app.state.db_path, days)
+    today = datetime.now().strftime("%Y-%m-%d")
+    return await _cached_read(
+        request, f"history:{days}", ("scores",), (today, days),
+        get_history_data, request.app.state.db_path, days,
+    )
 
 
 @router.get("/heatmap")
 async def api_heatmap(request: Request):
     """Model olasilik haritasi ve son aktivite."""
-    return get_heatmap_data(request.app.state.db_path)
+    today = datetime.now().strftime("%Y-%m-%d")
+    return await _cached_read(
+        request, "heatmap", ("model", "slots"), (today,),
+        get_heatmap_data, request.app.state.db_path,
+    )
 
 
 @router.get("/learning-curve")
 async def api_learning_curve(request: Request):
     """Ogrenme egrisi verileri."""
-    return get_learning_curve_data(request.app.state.db_path)
+    return await _cached_read(
+        request, "learning-curve", ("scores",), (),
+        get_learning_curve_data, request.app.state.db_path,
+    )
+
+
+# Panel -> bagli oldugu veri kapsamlari (ETag icin)
+_BUNDLE_SCOPES = {
+    "status": ("events", "scores", "model"),
+    "heatmap": ("model", "slots"),
+    "history": ("scores",),
+    "learning_curve": ("scores",),
+}
+
+
+@router.get("/bundle")
+async def api_bundle(request: Request, fields: str | None = None, days: int = 30):
+    """Ilk yukleme paketi: status, heatmap, history, learning_curve tek istekte.
+
+    Tum paneller tek okuma transaction'inda hazirlanir. fields virgulle
+    ayrilmis alt kume secer (orn. ?fields=status,history).
+    """
+    if fields:
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested.difference(BUNDLE_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Bilinmeyen alan: {', '.join(sorted(unknown))}"
+            )
+        selected = tuple(f for f in BUNDLE_FIELDS if f in requested)
+    else:
+        selected = BUNDLE_FIELDS
+
+    mqtt_ok = _safe_mqtt_check(request)
+    now = datetime.now()
+    scopes = tuple(dict.fromkeys(s for f in selected for s in _BUNDLE_SCOPES[f]))
+    extra: tuple = (now.strftime("%Y-%m-%d"), days, ",".join(selected))
+    if "status" in selected:
+        extra += (now.strftime("%H:%M"), mqtt_ok)
+    return await _cached_read(
+        request, f"bundle:{','.join(selected)}:{days}", scopes, extra,
+        get_bundle_data, request.app.state.db_path, mqtt_ok, selected, days,
+    )
+
+
+def _heartbeat_config(request: Request) -> HeartbeatConfig:
+    """app.state.config.heartbeat (config yoksa varsayilanlar)."""
+    heartbeat = getattr(getattr(request.app.state, "config", None), "heartbeat", None)
+    return heartbeat if heartbeat is not None else HeartbeatConfig()
+
+
+def _metrics_sampler(request: Request) -> MetricsSampler:
+    """app.state'teki metrik ornekleyici (yoksa ilk istekte olusur, thread'siz TTL)."""
+    sampler = getattr(request.app.state, "metrics_sampler", None)
+    if sampler is None:
+        heartbeat = _heartbeat_config(request)
+        sampler = MetricsSampler(
+            request.app.state.db_path,
+            heartbeat.metrics_interval_seconds,
+            heartbeat.metrics_fresh_min_seconds,
+        )
+        request.app.state.metrics_sampler = sampler
+    return sampler
 
 
 @router.get("/health")
-async def api_health(request: Request, response: Response):
+async def api_health(request: Request, response: Response, fresh: bool = False):
     """Sistem saglik kontrolu.
 
-    Mevcut /health endpoint mantigini yeniden kullanir.
+    Mevcut /health endpoint mantigini yeniden kullanir; metrikler ortak
+    snapshot'tan gelir (TTL dolduysa veya ?fresh=1 ise okuma havuzunda yenilenir).
     """
     try:
-        db_path = request.app.state.db_path
         mqtt_ok = _safe_mqtt_check(request)
-        metrics = collect_system_metrics(db_path)
-        status = run_health_checks(metrics, mqtt_ok)
+        sampler = _metrics_sampler(request)
+        snapshot = await _reader(request).run(sampler.get, fresh)
+        metrics = snapshot.metrics
+        windows = sampler.windows(_heartbeat_config(request).watchdog_window_seconds)
+        status = run_health_checks(metrics, mqtt_ok, windows=windows)
+        job_runner = getattr(request.app.state, "job_runner", None)
         return {
             "status": "ok" if status.all_healthy else "degraded",
             "checks": {c.name: c.healthy for c in status.checks},
@@ -87,12 +339,61 @@ async def api_health(request: Request, response: Response):
                 "db_size_mb": round(metrics.db_size_mb, 2),
                 "today_event_count": metrics.today_event_count,
             },
+            "metrics_age_seconds": round(snapshot.age_seconds, 1),
+            "jobs": job_runner.stats() if job_runner is not None else {},
         }
     except Exception as exc:
         response.status_code = 503
         return {"status": "error", "reason": str(exc)}
 
 
+@router.get("/metrics/history")
+async def api_metrics_history(request: Request, minutes: int = 60, points: int = 120):
+    """Sistem metrikleri gecmisi (halka tampondan, kovalara bolunmus ortalamalar).
+
+    Args:
+        minutes: Gecmis uzunlugu (dakika, 1-1440)
+        points: En fazla nokta sayisi (1-500)
+    """
+    minutes = min(max(minutes, 1), 1440)
+    points = min(max(points, 1), 500)
+    history = _metrics_sampler(request).history
+    if history is None:
+        return {"bucket_seconds": minutes * 60 / points, "timestamps": []}
+    return history.downsample(minutes * 60, points)
+
+
+@router.get("/admin/queries")
+async def api_admin_queries(top: int = 20, sort: str = "total"):
+    """Sorgu profili: en pahali ifadeler (database.profile_queries kapaliysa bos).
+
+    Args:
+        top: Satir sayisi (1-200)
+        sort: total / avg / max / count / rows / steps
+    """
+    profiler = get_query_profiler()
+    if profiler is None:
+        return {"enabled": False, "queries": []}
+    try:
+        queries = profiler.top(min(max(top, 1), 200), sort)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {
+        "enabled": True,
+        "slow_query_ms": round(profiler.slow_seconds * 1000, 1),
+        "queries": queries,
+    }
+
+
+@router.delete("/admin/queries")
+async def api_admin_queries_reset():
+    """Sorgu profilini sifirla (olcum penceresi baslatmak icin)."""
+    profiler = get_query_profiler()
+    if profiler is not None:
+        profiler.reset()
+    return {"enabled": profiler is not None}
+
+
 @router.get("/trends")
 async def api_trends(request: Request):
     """Son N gunluk kanal bazli trend egimleri."""
@@ -106,5 +407,5 @@ async def api_trends(request: Request):
     days = config.system.trend_analysis_days
     min_days = config.system.trend_min_days
 
-    trends = analyze_all_trends(db_path, channels, days, min_days)
+    trends = await _read(request, analyze_all_trends, db_path, channels, days, min_days)
     return {"trends": trends, "period_days": days}
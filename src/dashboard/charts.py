@@ -8,8 +8,9 @@ import math
 from datetime import datetime, timedelta
 
 from src.database import get_db
-from src.learner.beta_model import BetaPosterior
 from src.learner.metrics import CHANNELS
+from src.learner.model_cache import ModelView, get_model_view
+from src.partitions import events_source, latest_event
 
 ALERT_LABELS = {0: "Normal", 1: "Dikkat", 2: "Uyarı", 3: "Acil"}
 
@@ -27,63 +28,77 @@ def get_status_data(db_path: str, mqtt_connected: bool) -> dict:
         Status dict (her zaman gecerli, bos DB'de varsayilanlar)
     """
     now = datetime.now()
-    today = now.strftime("%Y-%m-%d")
 
     with get_db(db_path) as conn:
-        # Son event
-        row = conn.execute(
-            "SELECT timestamp, sensor_id, channel FROM sensor_events "
-            "ORDER BY timestamp DESC LIMIT 1"
-        ).fetchone()
-
-        if row:
-            last_event = {
-                "timestamp": row["timestamp"],
-                "sensor_id": row["sensor_id"],
-                "channel": row["channel"],
-            }
-            # age_minutes hesapla
-            try:
-                event_dt = datetime.fromisoformat(row["timestamp"])
-                age = (now - event_dt).total_seconds() / 60.0
-                last_event["age_minutes"] = round(age, 1)
-            except (ValueError, TypeError):
-                last_event["age_minutes"] = None
-        else:
-            last_event = None
-
-        # Bugunun event sayisi
-        count_row = conn.execute(
-            "SELECT COUNT(*) as cnt FROM sensor_events WHERE timestamp >= ?",
-            (today,),
-        ).fetchone()
-        today_event_count = count_row["cnt"] if count_row else 0
-
         # Ogrenme durumu - en son daily_scores
         score_row = conn.execute(
             "SELECT train_days, is_learning, composite_z, alert_level "
             "FROM daily_scores ORDER BY date DESC LIMIT 1"
         ).fetchone()
 
-        if score_row:
-            train_days = score_row["train_days"] or 0
-            is_learning = bool(score_row["is_learning"])
-            composite_z = score_row["composite_z"]
-            alert_level = score_row["alert_level"] or 0
-        else:
-            train_days = 0
-            is_learning = True
-            composite_z = 0.0
-            alert_level = 0
-
         # Toplam gun sayisi
         days_row = conn.execute(
             "SELECT COUNT(DISTINCT date) as cnt FROM daily_scores"
         ).fetchone()
         total_days = days_row["cnt"] if days_row else 0
 
-        # avg_ci_width - model_state'ten anlik hesapla
-        avg_ci_width = _compute_avg_ci_width(conn)
+        return _build_status(conn, db_path, now, mqtt_connected, score_row, total_days)
+
+
+def _build_status(
+    conn, db_path: str, now: datetime, mqtt_connected: bool, score_row, total_days: int
+) -> dict:
+    """Status dict'i olustur (son skor satiri ve gun sayisi disaridan gelir).
+
+    Args:
+        conn: Acik DB baglantisi
+        db_path: SQLite veritabani yolu (model onbellegi icin)
+        now: Istek zamani
+        mqtt_connected: MQTT baglanti durumu
+        score_row: En son daily_scores satiri (yoksa None)
+        total_days: daily_scores gun sayisi
+    """
+    today = now.strftime("%Y-%m-%d")
+
+    # Son event
+    row = latest_event(conn)
+
+    if row:
+        last_event = {
+            "timestamp": row["timestamp"],
+            "sensor_id": row["sensor_id"],
+            "channel": row["channel"],
+        }
+        # age_minutes hesapla
+        try:
+            event_dt = datetime.fromisoformat(row["timestamp"])
+            age = (now - event_dt).total_seconds() / 60.0
+            last_event["age_minutes"] = round(age, 1)
+        except (ValueError, TypeError):
+            last_event["age_minutes"] = None
+    else:
+        last_event = None
+
+    # Bugunun event sayisi
+    count_row = conn.execute(
+        f"SELECT COUNT(*) as cnt FROM {events_source(conn, today)} WHERE timestamp >= ?",
+        (today,),
+    ).fetchone()
+    today_event_count = count_row["cnt"] if count_row else 0
+
+    if score_row:
+        train_days = score_row["train_days"] or 0
+        is_learning = bool(score_row["is_learning"])
+        composite_z = score_row["composite_z"]
+        alert_level = score_row["alert_level"] or 0
+    else:
+        train_days = 0
+        is_learning = True
+        composite_z = 0.0
+        alert_level = 0
+
+    # avg_ci_width - versiyonlu model onbelleginden
+    avg_ci_width = _compute_avg_ci_width(db_path)
 
     return {
         "last_event": last_event,
@@ -151,6 +166,48 @@ def get_daily_data(db_path: str, date: str, channels: list[str] | None = None) -
     }
 
 
+def get_today_slots(
+    db_path: str,
+    channels: list[str] | None = None,
+    live: dict[str, list[int]] | None = None,
+    now: datetime | None = None,
+) -> dict:
+    """Bugunun slot aktivitesi: slot_summary + henuz yazilmamis canli sayaclar.
+
+    Args:
+        db_path: SQLite veritabani yolu
+        channels: Kanal listesi (None ise CHANNELS default)
+        live: SlotAccumulator.snapshot() ciktisi ({channel: [96 sayac]})
+        now: Simdiki zaman (test icin override)
+
+    Returns:
+        {"date", "slots": {ch: [96 active]}, "event_counts": {ch: toplam}}
+    """
+    ch_list = channels if channels is not None else list(CHANNELS)
+    date = (now or datetime.now()).strftime("%Y-%m-%d")
+    counts = {ch: [0] * 96 for ch in ch_list}
+
+    with get_db(db_path) as conn:
+        rows = conn.execute(
+            "SELECT slot, channel, event_count FROM slot_summary WHERE date = ?",
+            (date,),
+        ).fetchall()
+    for row in rows:
+        if row["channel"] in counts and 0 <= row["slot"] < 96:
+            counts[row["channel"]][row["slot"]] = row["event_count"]
+
+    # Canli sayac slot_summary'den once gunceldir; kismi slotta buyuk olan gecerli
+    for ch, live_counts in (live or {}).items():
+        if ch in counts:
+            counts[ch] = [max(a, b) for a, b in zip(counts[ch], live_counts)]
+
+    return {
+        "date": date,
+        "slots": {ch: [1 if c > 0 else 0 for c in counts[ch]] for ch in ch_list},
+        "event_counts": {ch: sum(counts[ch]) for ch in ch_list},
+    }
+
+
 def get_history_data(db_path: str, days: int = 30) -> dict:
     """Tarihsel gunluk skor verileri.
 
@@ -169,6 +226,11 @@ def get_history_data(db_path: str, days: int = 30) -> dict:
             (days,),
         ).fetchall()
 
+    return _build_history(rows)
+
+
+def _build_history(rows) -> dict:
+    """History dict'i (satirlar yeniden eskiye sirali)."""
     return {
         "days": [
             {
@@ -195,60 +257,52 @@ def get_heatmap_data(db_path: str, channels: list[str] | None = None) -> dict:
     Returns:
         Heatmap dict: model (96 slot x N kanal) + recent_activity
     """
+    with get_db(db_path) as conn:
+        return _build_heatmap(conn, db_path, channels)
+
+
+def _build_heatmap(conn, db_path: str, channels: list[str] | None) -> dict:
+    """Heatmap dict'i acik baglanti uzerinden olustur."""
     ch_list = channels if channels is not None else list(CHANNELS)
-    default_prior = BetaPosterior(1.0, 1.0)
 
-    with get_db(db_path) as conn:
-        # Bulk SELECT 1: tum model_state satirlarini tek sorguda al
-        model_rows = conn.execute(
-            "SELECT slot, channel, alpha, beta FROM model_state"
-        ).fetchall()
+    # Model: versiyonlu onbellek; eksik kanal/model Beta(1, 1) prior
+    view = get_model_view(db_path) or ModelView.empty()
 
-        # Dict lookup: {(slot, channel): (alpha, beta)}
-        model_lookup: dict[tuple[int, str], tuple[float, float]] = {}
-        for row in model_rows:
-            model_lookup[(row["slot"], row["channel"])] = (
-                row["alpha"], row["beta"]
-            )
+    # Model olasilik haritasi olustur
+    model = {}
+    for ch in ch_list:
+        means = view.channel_means(ch)
+        widths = view.channel_ci_widths(ch)
+        model[ch] = [
+            {
+                "slot": s,
+                "probability": round(means[s], 4),
+                "ci_width": round(widths[s], 4),
+            }
+            for s in range(96)
+        ]
 
-        # Model olasilik haritasi olustur
-        model = {}
-        for ch in ch_list:
-            channel_data = []
-            for s in range(96):
-                ab = model_lookup.get((s, ch))
-                if ab:
-                    bp = BetaPosterior(ab[0], ab[1])
-                else:
-                    bp = default_prior
-                channel_data.append({
-                    "slot": s,
-                    "probability": round(bp.mean, 4),
-                    "ci_width": round(bp.ci_width, 4),
-                })
-            model[ch] = channel_data
-
-        # Bulk SELECT 2: son 14 gunun ortalama aktivitesi (tek sorgu)
-        cutoff = (datetime.now() - timedelta(days=14)).strftime("%Y-%m-%d")
-        activity_rows = conn.execute(
-            "SELECT channel, slot, AVG(active) as avg_active "
-            "FROM slot_summary "
-            "WHERE date >= ? "
-            "GROUP BY channel, slot",
-            (cutoff,),
-        ).fetchall()
+    # Bulk SELECT 2: son 14 gunun ortalama aktivitesi (tek sorgu)
+    cutoff = (datetime.now() - timedelta(days=14)).strftime("%Y-%m-%d")
+    activity_rows = conn.execute(
+        "SELECT channel, slot, AVG(active) as avg_active "
+        "FROM slot_summary "
+        "WHERE date >= ? "
+        "GROUP BY channel, slot",
+        (cutoff,),
+    ).fetchall()
 
-        # Dict lookup: {(channel, slot): avg_active}
-        activity_lookup: dict[tuple[str, int], float] = {}
-        for row in activity_rows:
-            activity_lookup[(row["channel"], row["slot"])] = row["avg_active"]
+    # Dict lookup: {(channel, slot): avg_active}
+    activity_lookup: dict[tuple[str, int], float] = {}
+    for row in activity_rows:
+        activity_lookup[(row["channel"], row["slot"])] = row["avg_active"]
 
-        recent_activity = {}
-        for ch in ch_list:
-            recent_activity[ch] = [
-                round(activity_lookup.get((ch, s), 0.0), 4)
-                for s in range(96)
-            ]
+    recent_activity = {}
+    for ch in ch_list:
+        recent_activity[ch] = [
+            round(activity_lookup.get((ch, s), 0.0), 4)
+            for s in range(96)
+        ]
 
     return {
         "model": model,
@@ -272,6 +326,11 @@ def get_learning_curve_data(db_path: str) -> dict:
             "FROM daily_scores ORDER BY date ASC"
         ).fetchall()
 
+    return _build_learning_curve(rows)
+
+
+def _build_learning_curve(rows) -> dict:
+    """Learning curve dict'i (satirlar eskiden yeniye sirali)."""
     dates = []
     train_days_list = []
     nll_totals = []
@@ -302,24 +361,83 @@ def get_learning_curve_data(db_path: str) -> dict:
     }
 
 
-def _compute_avg_ci_width(conn) -> float:
-    """Model state'ten anlik ortalama CI genisligi hesapla.
+BUNDLE_FIELDS = ("status", "heatmap", "history", "learning_curve")
+
+# Tek daily_scores taramasinda status, history ve learning curve icin gereken kolonlar
+_SCORE_COLUMNS = (
+    "date, train_days, is_learning, composite_z, alert_level, "
+    "nll_total, observed_count, aw_accuracy, aw_balanced_acc"
+)
+
+
+def get_bundle_data(
+    db_path: str,
+    mqtt_connected: bool,
+    fields: tuple[str, ...] = BUNDLE_FIELDS,
+    history_days: int = 30,
+) -> dict:
+    """Ilk yukleme paketi: secilen panellerin verisi tek okuma transaction'inda.
+
+    Tum paneller ayni WAL snapshot'ini gorur. daily_scores bir kez taranir;
+    status (son satir, gun sayisi), history (son history_days gun) ve
+    learning curve (tum satirlar) ayni satirlardan uretilir.
 
     Args:
-        conn: Acik SQLite baglantisi
+        db_path: SQLite veritabani yolu
+        mqtt_connected: MQTT baglanti durumu
+        fields: BUNDLE_FIELDS alt kumesi
+        history_days: History penceresi (gun)
 
     Returns:
-        Ortalama CI genisligi (model yoksa 1.0)
+        {field: panel verisi} - yalnizca istenen alanlar
     """
-    rows = conn.execute(
-        "SELECT alpha, beta FROM model_state"
-    ).fetchall()
+    now = datetime.now()
+    result: dict = {}
 
-    if not rows:
-        return 1.0
+    with get_db(db_path) as conn:
+        conn.execute("BEGIN")  # okuma snapshot'i; blok sonunda pool geri alir
+
+        rows = []
+        total_days = 0
+        if "learning_curve" in fields:
+            rows = conn.execute(
+                f"SELECT {_SCORE_COLUMNS} FROM daily_scores ORDER BY date ASC"
+            ).fetchall()
+            total_days = len(rows)  # date PRIMARY KEY
+        elif "status" in fields or "history" in fields:
+            rows = conn.execute(
+                f"SELECT {_SCORE_COLUMNS} FROM daily_scores ORDER BY date DESC LIMIT ?",
+                (max(history_days, 1),),
+            ).fetchall()[::-1]
+            if "status" in fields:
+                total_days = conn.execute("SELECT COUNT(*) FROM daily_scores").fetchone()[0]
+
+        if "status" in fields:
+            result["status"] = _build_status(
+                conn, db_path, now, mqtt_connected, rows[-1] if rows else None, total_days,
+            )
+        if "heatmap" in fields:
+            result["heatmap"] = _build_heatmap(conn, db_path, None)
 
-    widths = [BetaPosterior(r["alpha"], r["beta"]).ci_width for r in rows]
-    return sum(widths) / len(widths)
+    if "history" in fields:
+        recent = rows[-history_days:] if history_days > 0 else []
+        result["history"] = _build_history(recent[::-1])
+    if "learning_curve" in fields:
+        result["learning_curve"] = _build_learning_curve(rows)
+    return result
+
+
+def _compute_avg_ci_width(db_path: str) -> float:
+    """Kayitli modelin ortalama CI genisligi (model onbellegi uzerinden).
+
+    Args:
+        db_path: SQLite veritabani yolu
+
+    Returns:
+        Ortalama CI genisligi (model yoksa 1.0)
+    """
+    view = get_model_view(db_path)
+    return view.avg_ci_width if view is not None else 1.0
 
 
 def _approximate_ci_width(train_days: int) -> float:
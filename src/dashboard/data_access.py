@@ -0,0 +1,71 @@
+"""Dashboard async veri erisim katmani.
+
+charts.py fonksiyonlari senkron SQLite kullanir; async endpoint'ler bunlari
+dogrudan cagirirsa sorgu suresince event loop bloklanir. DashboardReader
+bu cagrilari ayri bir thread havuzunda calistirir:
+  - havuz thread'leri salt-okunur (mode=ro) baglanti kullanir
+  - her cagri bir zaman butcesine tabidir (query_budget); asilirsa
+    QueryBudgetExceeded firlatilir ve endpoint 503 dondurur
+  - ayni anda en fazla max_workers sorgu calisir, fazlasi kuyrukta bekler
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from src.database import query_budget, set_thread_read_only
+
+logger = logging.getLogger("annem_guvende.dashboard")
+
+T = TypeVar("T")
+
+
+class DashboardReader:
+    """Salt-okunur dashboard sorgularini worker thread'lerde calistirir.
+
+    Args:
+        max_workers: Es zamanli sorgu sayisi (havuz boyutu)
+        budget_ms: Varsayilan sorgu zaman butcesi (ms, 0 = sinirsiz)
+    """
+
+    def __init__(self, max_workers: int = 4, budget_ms: int = 2000):
+        self._budget = budget_ms / 1000 if budget_ms > 0 else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="dashboard-read",
+            initializer=set_thread_read_only,
+        )
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args,
+        budget_ms: int | None = None,
+        **kwargs,
+    ) -> T:
+        """func(*args, **kwargs)'i okuma havuzunda calistir ve sonucu bekle.
+
+        Args:
+            func: Senkron veri fonksiyonu (orn. get_status_data)
+            budget_ms: Bu cagri icin butce (None ise varsayilan)
+
+        Raises:
+            QueryBudgetExceeded: Sorgu butceyi asarsa
+        """
+        budget = self._budget if budget_ms is None else (budget_ms / 1000 or None)
+        call = functools.partial(self._call, budget, func, args, kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    @staticmethod
+    def _call(budget, func, args, kwargs):
+        with query_budget(budget):
+            return func(*args, **kwargs)
+
+    def close(self) -> None:
+        """Havuzu kapat (calisan sorgular tamamlanir)."""
+        self._executor.shutdown(wait=True)
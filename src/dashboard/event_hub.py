@@ -0,0 +1,164 @@
+"""Surec ici pub/sub: dashboard canli akisi (SSE) icin kucuk delta mesajlari.
+
+Yayincilar (collector dinleyicisi, alert manager, MQTT baglanti callback'i)
+herhangi bir thread'den publish() cagirir; her abone kendi asyncio
+loop'unda sinirli bir kuyruktan okur. Kuyrugu dolan (yavas) abone
+cikarilir: kuyrugu bosaltilir, "evicted" isaretlenir ve akisi kapanir;
+istemci yeniden baglanip tam yenileme yapar.
+
+Mesaj tipleri:
+  event: {"channel", "sensor_id", "timestamp"}  - kabul edilen sensor eventi
+  slot:  {"date", "slot", "channel"}             - slot bugun ilk kez aktif oldu
+  alert: {"source", "level", ...}                 - alarm seviyesi / gercek zamanli alarm
+  mqtt:  {"connected"}                            - MQTT baglanti degisimi
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from dataclasses import dataclass
+
+logger = logging.getLogger("annem_guvende.dashboard")
+
+
+@dataclass(frozen=True)
+class HubMessage:
+    """Tek akis mesaji (id artan sira numarasi)."""
+
+    id: int
+    event: str
+    data: dict
+
+    def to_sse(self) -> str:
+        """SSE metin cercevesi."""
+        payload = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.event}\ndata: {payload}\n\n"
+
+
+# Subscription.get zaman asimi isareti
+KEEPALIVE = object()
+
+
+class Subscription:
+    """Tek SSE istemcisinin sinirli mesaj kuyrugu (abonenin loop'una bagli)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.evicted = False
+
+    def _offer(self, message: HubMessage) -> bool:
+        """Loop thread'inde: mesaji kuyruga koy; kuyruk doluysa aboneyi cikar."""
+        if self.evicted:
+            return False
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.evicted = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)  # bekleyen get()'i uyandir
+            return False
+
+    async def get(self, timeout: float) -> HubMessage | object | None:
+        """Sonraki mesaj; timeout dolarsa KEEPALIVE, cikarildiysa None."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return KEEPALIVE
+
+
+class EventHub:
+    """Thread-safe yayinci, asyncio aboneli sinirli pub/sub.
+
+    Args:
+        buffer_size: Abone basina kuyruk kapasitesi (dolunca abone cikarilir)
+        max_subscribers: Es zamanli abone limiti
+    """
+
+    def __init__(self, buffer_size: int = 256, max_subscribers: int = 16):
+        self._buffer_size = max(1, buffer_size)
+        self._max_subscribers = max_subscribers
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._evictions = 0
+        # Slot flip takibi: bugun aktif olan (date, slot, channel)
+        self._active_slots: set[tuple[str, int, str]] = set()
+
+    def subscribe(self) -> Subscription | None:
+        """Calisan loop icin yeni abone (limit doluysa None)."""
+        sub = Subscription(asyncio.get_running_loop(), self._buffer_size)
+        with self._lock:
+            if len(self._subscribers) >= self._max_subscribers:
+                return None
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Aboneyi kaldir (akis kapandiginda)."""
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def publish(self, event: str, data: dict) -> None:
+        """Tum abonelere mesaj gonder (herhangi bir thread'den cagrilabilir)."""
+        message = HubMessage(next(self._ids), event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub._loop.call_soon_threadsafe(self._deliver, sub, message)
+            except RuntimeError:
+                # Abonenin loop'u kapanmis
+                self.unsubscribe(sub)
+
+    def _deliver(self, sub: Subscription, message: HubMessage) -> None:
+        if not sub._offer(message) and sub.evicted:
+            with self._lock:
+                if sub in self._subscribers:
+                    self._subscribers.discard(sub)
+                    self._evictions += 1
+            logger.warning("Yavas SSE istemcisi cikarildi (kuyruk=%d)", self._buffer_size)
+
+    # --- Yayinci adaptorleri (DI callback olarak baglanir) ---
+
+    def on_sensor_event(self, event: dict) -> None:
+        """Collector dinleyicisi: event + slot ilk kez aktif olduysa slot mesaji."""
+        ts = event["timestamp"]
+        channel = event["channel"]
+        self.publish("event", {
+            "channel": channel, "sensor_id": event["sensor_id"], "timestamp": ts,
+        })
+        try:
+            date = ts[:10]
+            slot = int(ts[11:13]) * 4 + int(ts[14:16]) // 15
+        except (TypeError, ValueError):
+            return
+        key = (date, slot, channel)
+        with self._lock:
+            if key in self._active_slots:
+                return
+            # Gun degistiyse eski gunleri unut
+            stale = [k for k in self._active_slots if k[0] < date]
+            for k in stale:
+                self._active_slots.discard(k)
+            self._active_slots.add(key)
+        self.publish("slot", {"date": date, "slot": slot, "channel": channel})
+
+    def on_alert(self, alert: dict) -> None:
+        """AlertManager dinleyicisi."""
+        self.publish("alert", alert)
+
+    def on_mqtt_state(self, connected: bool) -> None:
+        """MQTT baglanti callback'i."""
+        self.publish("mqtt", {"connected": connected})
+
+    def stats(self) -> dict:
+        """Abone ve cikarilma sayilari."""
+        with self._lock:
+            return {"subscribers": len(self._subscribers), "evictions": self._evictions}
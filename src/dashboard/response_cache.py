@@ -0,0 +1,103 @@
+"""Veri versiyonlu HTTP yanit onbellegi (ETag / 304).
+
+Her endpoint hangi veri kapsamlarina bagli oldugunu bildirir (orn.
+heatmap -> "model", "slots"). ETag = sunucu acilis kimligi + bu
+kapsamlarin surec ici veri versiyonlari + DB'deki kalici izleri
+(database.get_persisted_versions; baska surecin yazdiklari da gorulur)
++ istege ozel ek parcalar (gun, dakika, parametreler). Ikisi de yazan
+tarafta commit ile degistigi icin ETag degismedikce yanit govdesi de
+degismez:
+  - If-None-Match eslesirse 304 (DB'ye hic gidilmez)
+  - ayni ETag icin govde bellekte tutulur, tekrar hesaplanmaz
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from src.database import get_data_version
+
+# Tarayici her seferinde dogrular (304 ile ucuz); ara vekiller saklamaz
+CACHE_CONTROL = "private, no-cache"
+
+
+class ResponseCache:
+    """ETag hesaplayan ve son yanit govdelerini tutan LRU onbellek.
+
+    Args:
+        max_entries: Tutulacak en fazla yanit sayisi
+        boot_id: Surec kimligi (None ise rastgele; yeniden baslatma ETag'leri gecersiz kilar)
+    """
+
+    def __init__(self, max_entries: int = 64, boot_id: str | None = None):
+        self._max_entries = max_entries
+        self._boot_id = boot_id or uuid.uuid4().hex[:8]
+        self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def etag(
+        self,
+        scopes: Iterable[str],
+        extra: Iterable[object] = (),
+        persisted: Iterable[str] = (),
+    ) -> str:
+        """Kapsam versiyonlari + kalici izler + ek parcalardan zayif ETag uret."""
+        parts = [self._boot_id]
+        parts.extend(f"{scope}={get_data_version(scope)}" for scope in scopes)
+        parts.extend(persisted)
+        parts.extend(str(x) for x in extra)
+        digest = hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+        return f'W/"{digest}"'
+
+    def get(self, key: str, etag: str) -> bytes | None:
+        """key icin ayni ETag'li govde varsa dondur."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == etag:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        """Govdeyi sakla (en eski girdi tasarsa atilir)."""
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def mark_not_modified(self) -> None:
+        """304 ile yanitlanan istegi say."""
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> dict:
+        """Onbellek sayaclari."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match basligi ETag ile eslesiyor mu? (zayif karsilastirma)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(",")
+    )
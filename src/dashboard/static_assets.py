@@ -0,0 +1,198 @@
+"""Onceden sikistirilmis, icerik-hash'li statik dosyalar.
+
+Uygulama acilisinda static/ dizini bir kez okunur; her dosya icin:
+  - icerik hash'li ad (chart.umd.min.js -> chart.umd.min.<hash>.js)
+  - gzip (ve brotli paketi kuruluysa br) varyantlari bellekte hazirlanir
+Istekte Accept-Encoding'e gore en kucuk uygun varyant gonderilir.
+Hash'li adlar degismez icerik tasidigi icin "immutable" onbelleklenir;
+giris sayfasi (index.html) ve hash'siz adlar ETag ile her seferinde
+dogrulanir. index.html icindeki /static/<ad> referanslari hash'li adlara
+cevrilir, boylece yeni surumde tarayici eski dosyayi kullanmaz.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+try:  # opsiyonel: brotli kurulu degilse yalnizca gzip
+    import brotli
+except ImportError:  # pragma: no cover - ortama bagli
+    brotli = None
+
+logger = logging.getLogger("annem_guvende.dashboard")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Bu boyutun altindaki dosyalar sikistirilmaz (baslik maliyeti kazanci asar)
+_MIN_COMPRESS_BYTES = 256
+# Sikistirilabilir icerik tipleri
+_COMPRESSIBLE_PREFIXES = ("text/", "application/javascript", "application/json", "image/svg")
+
+
+@dataclass
+class StaticAsset:
+    """Tek statik dosya: ham icerik ve sikistirilmis varyantlari."""
+
+    name: str
+    media_type: str
+    digest: str
+    # {"identity": bytes, "gzip": bytes, "br": bytes}
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def hashed_name(self) -> str:
+        stem, dot, ext = self.name.rpartition(".")
+        return f"{stem}.{self.digest}.{ext}" if dot else f"{self.name}.{self.digest}"
+
+
+def _hashed(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=5).hexdigest()
+
+
+def _compress(data: bytes, media_type: str) -> dict[str, bytes]:
+    """identity + (uygunsa) gzip/br varyantlari; kazanc yoksa varyant eklenmez."""
+    variants = {"identity": data}
+    if len(data) < _MIN_COMPRESS_BYTES or not media_type.startswith(_COMPRESSIBLE_PREFIXES):
+        return variants
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        variants["gzip"] = gz
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            variants["br"] = br
+    return variants
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    """Accept-Encoding basligindan q>0 olan kodlamalar."""
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(token)
+    return accepted
+
+
+class StaticAssets:
+    """static/ dizinini bellekte sikistirilmis ve hash'li olarak sunan ASGI uygulamasi.
+
+    Args:
+        directory: Statik dosya dizini
+        entry: Hash'lenmeyen, referanslari yeniden yazilan giris sayfasi
+    """
+
+    def __init__(self, directory: str, entry: str = "index.html"):
+        self._entry = entry
+        self._assets: dict[str, StaticAsset] = {}
+        self._hashed: dict[str, StaticAsset] = {}
+        self._load(directory)
+
+    def _load(self, directory: str) -> None:
+        raw: dict[str, bytes] = {}
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    raw[name] = f.read()
+
+        for name, data in raw.items():
+            if name == self._entry:
+                continue
+            asset = self._build(name, data)
+            self._assets[name] = asset
+            self._hashed[asset.hashed_name] = asset
+
+        # Giris sayfasi: /static/<ad> -> /static/<hash'li ad>
+        if self._entry in raw:
+            html = raw[self._entry].decode("utf-8")
+            for name, asset in self._assets.items():
+                html = html.replace(f"/static/{name}", f"/static/{asset.hashed_name}")
+            self._assets[self._entry] = self._build(self._entry, html.encode("utf-8"))
+
+        total = sum(len(a.variants["identity"]) for a in self._assets.values())
+        logger.info(
+            "Statik dosyalar hazir: %d dosya, %.0f KB (brotli=%s)",
+            len(self._assets), total / 1024, brotli is not None,
+        )
+
+    @staticmethod
+    def _build(name: str, data: bytes) -> StaticAsset:
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+        return StaticAsset(name, media_type, _hashed(data), _compress(data, media_type))
+
+    def url(self, name: str) -> str:
+        """Dosyanin hash'li URL'i (giris sayfasi icin duz URL)."""
+        asset = self._assets[name]
+        return f"/static/{name if name == self._entry else asset.hashed_name}"
+
+    def lookup(self, name: str) -> tuple[StaticAsset, bool] | None:
+        """Ada gore dosya ve immutable olup olmadigi."""
+        asset = self._hashed.get(name)
+        if asset is not None:
+            return asset, True
+        asset = self._assets.get(name)
+        return (asset, False) if asset is not None else None
+
+    def response(self, request: Request, name: str) -> Response:
+        """Tek dosya yaniti: icerik pazarligi, ETag/304, onbellek basliklari."""
+        found = self.lookup(name)
+        if found is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        asset, immutable = found
+
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next(
+            (enc for enc in ("br", "gzip") if enc in accepted and enc in asset.variants),
+            "identity",
+        )
+        etag = f'"{asset.digest}-{encoding}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        }
+        if len(asset.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+
+        body = asset.variants[encoding]
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            return Response(status_code=200, headers=headers, media_type=asset.media_type)
+        return Response(body, headers=headers, media_type=asset.media_type)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request = Request(scope, receive)
+        if request.method not in ("GET", "HEAD"):
+            response: Response = PlainTextResponse("Method Not Allowed", status_code=405)
+        else:
+            name = scope["path"][len(scope.get("root_path", "")):].lstrip("/")
+            response = self.response(request, name)
+        await response(scope, receive, send)
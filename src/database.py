@@ -5,10 +5,23 @@ from __future__ import annotations
 import logging
 import os
 import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections.abc import Iterable
 from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
+from src.partitions import (
+    disable_partitioning,
+    drop_partitions_before,
+    enable_partitioning,
+    is_partitioned,
+)
+
 if TYPE_CHECKING:
     from src.config import AppConfig
 
@@ -96,24 +109,653 @@ MIGRATIONS = [
     CREATE INDEX IF NOT EXISTS idx_pending_alerts_status_ts
         ON pending_alerts(status, timestamp);
     """),
+    (5, """
+    -- Sema versiyonu 5: gun/aralik slot ozetleme icin kapsayici indeks
+    -- aggregate_day() zaman araligini tarar ve sadece channel okur;
+    -- (timestamp, channel) ile tablo satirlarina hic gidilmez.
+
+    CREATE INDEX IF NOT EXISTS idx_events_ts_channel
+        ON sensor_events(timestamp, channel);
+    """),
+    (6, """
+    -- Sema versiyonu 6: Tek blob model snapshot'i
+    -- data: format=1 -> little-endian float64, once tum alpha sonra tum beta
+    -- (kanal-oncelikli, kanal x slots). model_state uyumluluk icin opsiyonel.
+
+    CREATE TABLE IF NOT EXISTS model_snapshot (
+        version      INTEGER PRIMARY KEY,
+        format       INTEGER NOT NULL,
+        channels     TEXT NOT NULL,
+        slots        INTEGER NOT NULL,
+        data         BLOB NOT NULL,
+        trained_date TEXT,
+        created_at   TEXT DEFAULT (datetime('now'))
+    );
+    """),
+    (7, """
+    -- Sema versiyonu 7: Kalici degisiklik sayaclari (ETag icin)
+    -- Trigger'lar her yazan surecte (dashboard, simulator CLI) sayaci artirir;
+    -- ayni transaction'da commit edildigi icin okuyan her surec gorur.
+
+    CREATE TABLE IF NOT EXISTS data_changes (
+        scope       TEXT PRIMARY KEY,
+        version     INTEGER NOT NULL DEFAULT 0
+    );
+    INSERT OR IGNORE INTO data_changes (scope, version) VALUES ('slots', 0), ('scores', 0);
+    CREATE TRIGGER IF NOT EXISTS trg_slot_summary_insert AFTER INSERT ON slot_summary
+    BEGIN UPDATE data_changes SET version = version + 1 WHERE scope = 'slots'; END;
+    CREATE TRIGGER IF NOT EXISTS trg_slot_summary_update AFTER UPDATE ON slot_summary
+    BEGIN UPDATE data_changes SET version = version + 1 WHERE scope = 'slots'; END;
+    CREATE TRIGGER IF NOT EXISTS trg_slot_summary_delete AFTER DELETE ON slot_summary
+    BEGIN UPDATE data_changes SET version = version + 1 WHERE scope = 'slots'; END;
+    CREATE TRIGGER IF NOT EXISTS trg_daily_scores_insert AFTER INSERT ON daily_scores
+    BEGIN UPDATE data_changes SET version = version + 1 WHERE scope = 'scores'; END;
+    CREATE TRIGGER IF NOT EXISTS trg_daily_scores_update AFTER UPDATE ON daily_scores
+    BEGIN UPDATE data_changes SET version = version + 1 WHERE scope = 'scores'; END;
+    CREATE TRIGGER IF NOT EXISTS trg_daily_scores_delete AFTER DELETE ON daily_scores
+    BEGIN UPDATE data_changes SET version = version + 1 WHERE scope = 'scores'; END;
+"""),
 ]
 
 
+# Uzun sure bosta kalan baglanti kullanilmadan once SELECT 1 ile dogrulanir (sn)
+_HEALTH_CHECK_INTERVAL = 60.0
+
+
+# Thread bazli varsayilanlar: salt-okunur mod ve sorgu zaman butcesi
+_thread_defaults = threading.local()
+
+
+class QueryBudgetExceeded(sqlite3.OperationalError):
+    """Salt-okunur sorgu zaman butcesini asti (progress handler ile kesildi)."""
+
+
+def set_thread_read_only(read_only: bool = True) -> None:
+    """Bu thread'deki get_db() cagrilarinin varsayilan modunu ayarla.
+
+    Dashboard okuma thread'leri baslangicta True ile cagirir; boylece
+    charts fonksiyonlari imza degismeden salt-okunur baglanti kullanir.
+    """
+    _thread_defaults.read_only = read_only
+
+
 @contextmanager
-def get_db(db_path: str):
-    """SQLite baglantisi context manager.
+def query_budget(seconds: float | None):
+    """Bu thread'deki salt-okunur sorgulara zaman butcesi uygula.
 
-    WAL modu ve row_factory aktif.
+    Butce asilirsa SQLite sorgusu kesilir ve QueryBudgetExceeded firlatilir.
+    None ise butce yok.
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.execute("PRAGMA busy_timeout=5000")
+    previous = getattr(_thread_defaults, "deadline", None)
+    _thread_defaults.deadline = (
+        time.monotonic() + seconds if seconds is not None else None
+    )
     try:
-        yield conn
+        yield
+    except sqlite3.OperationalError as exc:
+        deadline = _thread_defaults.deadline
+        if deadline is not None and time.monotonic() >= deadline and "interrupt" in str(exc):
+            raise QueryBudgetExceeded(f"Sorgu zaman butcesi asildi ({seconds:.2f} sn)") from exc
+        raise
     finally:
-        conn.close()
+        _thread_defaults.deadline = previous
+
+
+def _budget_exceeded() -> int:
+    """Progress handler: butce dolduysa sorguyu kes (0 olmayan donus)."""
+    deadline = getattr(_thread_defaults, "deadline", None)
+    return 1 if deadline is not None and time.monotonic() >= deadline else 0
+
+
+# ------------------------------------------------------------------ #
+#  Sorgu profilleme (opt-in: database.profile_queries)
+# ------------------------------------------------------------------ #
+
+# Profilleme acikken progress handler bu kadar VM adiminda bir cagrilir
+_PROFILE_STEP = 100
+
+_profile_local = threading.local()
+
+
+@dataclass
+class QueryStats:
+    """Tek (cagiran, ifade) cifti icin birikmis olcumler."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    vm_steps: int = 0  # SQLite sanal makine adimi (yaklasik, _PROFILE_STEP hassasiyetinde)
+
+
+_SORT_KEYS = {
+    "total": lambda s: s.total_seconds,
+    "avg": lambda s: s.total_seconds / s.count,
+    "max": lambda s: s.max_seconds,
+    "count": lambda s: s.count,
+    "rows": lambda s: s.rows,
+    "steps": lambda s: s.vm_steps,
+}
+
+
+class QueryProfiler:
+    """Ifade bazli sorgu istatistikleri ve yavas sorgu logu.
+
+    Args:
+        slow_query_ms: Bu sureyi asan ifadeler WARNING ile loglanir
+    """
+
+    def __init__(self, slow_query_ms: float = 100.0):
+        self.slow_seconds = slow_query_ms / 1000.0
+        # RLock: cursor __del__ kaydi kilit tutulurken tetiklenebilir
+        self._lock = threading.RLock()
+        self._stats: dict[tuple[str, str], QueryStats] = {}
+
+    def record(self, caller: str, sql: str, seconds: float, rows: int, steps: int) -> None:
+        """Tamamlanan bir ifadeyi istatistiklere ekle."""
+        key = (caller, sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats()
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+            stats.vm_steps += steps
+        if seconds >= self.slow_seconds:
+            logger.warning(
+                "Yavas sorgu: %.1f ms, %d satir (%s) %s", seconds * 1000, rows, caller, sql[:300]
+            )
+
+    def top(self, n: int = 20, sort: str = "total") -> list[dict]:
+        """En pahali n ifade.
+
+        Args:
+            n: Satir sayisi
+            sort: total / avg / max / count / rows / steps
+
+        Raises:
+            ValueError: Bilinmeyen siralama anahtari
+        """
+        if sort not in _SORT_KEYS:
+            raise ValueError(f"Bilinmeyen siralama: {sort}")
+        with self._lock:
+            items = [(key, QueryStats(**vars(s))) for key, s in self._stats.items()]
+        items.sort(key=lambda item: _SORT_KEYS[sort](item[1]), reverse=True)
+        return [
+            {
+                "caller": caller,
+                "sql": sql,
+                "count": s.count,
+                "total_ms": round(s.total_seconds * 1000, 3),
+                "avg_ms": round(s.total_seconds * 1000 / s.count, 3),
+                "max_ms": round(s.max_seconds * 1000, 3),
+                "rows": s.rows,
+                "avg_rows": round(s.rows / s.count, 1),
+                "vm_steps": s.vm_steps,
+            }
+            for (caller, sql), s in items[:n]
+        ]
+
+    def reset(self) -> None:
+        """Tum istatistikleri sil."""
+        with self._lock:
+            self._stats.clear()
+
+
+_profiler: QueryProfiler | None = None
+
+
+def configure_query_profiling(enabled: bool, slow_query_ms: float = 100.0) -> QueryProfiler | None:
+    """Sorgu profillemeyi ac/kapat.
+
+    Yalnizca bundan SONRA acilan baglantilar etkilenir; init_db ve
+    baslangic oncesinde cagrilmalidir (testlerde close_all_connections ile).
+
+    Returns:
+        Aktif profiler veya None
+    """
+    global _profiler
+    _profiler = QueryProfiler(slow_query_ms) if enabled else None
+    if enabled:
+        logger.info("Sorgu profilleme aktif (yavas sorgu esigi %.0f ms)", slow_query_ms)
+    return _profiler
+
+
+def get_query_profiler() -> QueryProfiler | None:
+    """Aktif profiler (profilleme kapaliysa None)."""
+    return _profiler
+
+
+def _count_steps() -> int:
+    """Profilleme progress handler'i: VM adimlarini say, butceyi uygula."""
+    _profile_local.ticks = getattr(_profile_local, "ticks", 0) + 1
+    return _budget_exceeded()
+
+
+def _caller_name() -> str:
+    """Profilleme sarmalayicilari disindaki ilk cagiran: modul.fonksiyon"""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code in _PROFILER_CODE:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+class _ProfiledCursor(sqlite3.Cursor):
+    """Sure (execute + fetch), satir sayisi ve VM adimlarini olcen cursor.
+
+    Ifade, cursor tukendiginde, ayni cursor'da yeni execute yapildiginda,
+    cursor serbest birakildiginda veya baglanti havuza dondugunde kaydedilir.
+    """
+
+    def __init__(self, connection: _ProfiledConnection):
+        super().__init__(connection)
+        self._pending: tuple[str, str, int] | None = None  # (cagiran, sql, baslangic tick)
+        self._elapsed = 0.0
+        self._fetched = 0
+
+    def _begin(self, sql: str) -> None:
+        self._finish()
+        self._pending = (_caller_name(), " ".join(sql.split()), getattr(_profile_local, "ticks", 0))
+        self._elapsed = 0.0
+        self._fetched = 0
+        self.connection._open_cursors.add(self)
+
+    def _finish(self) -> None:
+        if self._pending is None:
+            return
+        caller, sql, start_ticks = self._pending
+        self._pending = None
+        self.connection._open_cursors.discard(self)
+        rows = self._fetched or max(self.rowcount, 0)
+        steps = (getattr(_profile_local, "ticks", 0) - start_ticks) * _PROFILE_STEP
+        profiler = _profiler
+        if profiler is not None:
+            profiler.record(caller, sql, self._elapsed, rows, steps)
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._elapsed += time.perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        self._begin(sql)
+        self._timed(super().execute, sql, parameters)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._begin(sql)
+        self._timed(super().executemany, sql, seq_of_parameters)
+        return self
+
+    def executescript(self, sql_script):
+        self._begin(sql_script)
+        self._timed(super().executescript, sql_script)
+        self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        else:
+            self._fetched += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, size if size is not None else self.arraysize)
+        self._fetched += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._fetched += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def __del__(self):
+        self._finish()
+
+
+class _ProfiledConnection(sqlite3.Connection):
+    """execute / executemany / executescript cagrilarini _ProfiledCursor ile yapar."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Zayif referans: acik ifadeyi canli tutup commit'i engellemesin
+        self._open_cursors: weakref.WeakSet[_ProfiledCursor] = weakref.WeakSet()
+
+    def cursor(self, factory=_ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def finish_statements(self) -> None:
+        """Acik (tukenmemis) cursor'lari kaydet - havuza donuste cagrilir."""
+        for cursor in list(self._open_cursors):
+            cursor._finish()
+
+
+# _caller_name() bu fonksiyonlarin cerceveleri atlar
+_PROFILER_CODE = frozenset(
+    func.__code__
+    for cls in (_ProfiledCursor, _ProfiledConnection)
+    for func in vars(cls).values()
+    if callable(func) and hasattr(func, "__code__")
+) | {_caller_name.__code__}
+
+
+class _PooledConnection:
+    """Havuzdaki tek bir baglanti + thread-local kullanim bilgisi."""
+
+    __slots__ = ("conn", "depth", "last_used", "generation")
+
+    def __init__(self, conn: sqlite3.Connection, generation: int):
+        self.conn = conn
+        self.depth = 0
+        self.last_used = time.monotonic()
+        self.generation = generation
+
+
+class ConnectionPool:
+    """Thread-local, kalici SQLite baglanti havuzu.
+
+    Her (thread, db_path, mod) icin tek baglanti acilir ve tekrar kullanilir.
+    PRAGMA ayarlari (WAL, foreign_keys, busy_timeout) sadece baglanti
+    olusturulurken bir kez calisir. Salt-okunur baglantilar (mode=ro)
+    query_budget() zaman butcesine uyar. Baglantilar thread'ler arasinda
+    paylasilmaz; kapatma (close_all) ise herhangi bir thread'den yapilabilir.
+    """
+
+    def __init__(self, health_check_interval: float = _HEALTH_CHECK_INTERVAL):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._health_check_interval = health_check_interval
+        # Kapatma icin tum acik baglantilarin kaydi:
+        # {(thread_id, db_path, ro): (sahip thread'e weakref, conn)}
+        self._registry: dict[
+            tuple[int, str, bool], tuple[weakref.ref, sqlite3.Connection]
+        ] = {}
+        # close_all() sonrasi eski thread-local kayitlari gecersiz kilar
+        self._generation = 0
+
+    @staticmethod
+    def _connect(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+        """Yeni baglanti ac ve tek seferlik PRAGMA ayarlarini uygula.
+
+        Profilleme aciksa baglanti _ProfiledConnection olur ve progress
+        handler VM adimlarini da sayar (butce kontrolu korunur).
+        """
+        profiling = _profiler is not None
+        factory = _ProfiledConnection if profiling else sqlite3.Connection
+        if read_only:
+            # WAL modu init_db ile kalici; salt-okunur baglanti yazmayi reddeder
+            uri = f"file:{os.path.abspath(db_path)}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=factory)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA busy_timeout=5000")
+            if profiling:
+                conn.set_progress_handler(_count_steps, _PROFILE_STEP)
+            else:
+                conn.set_progress_handler(_budget_exceeded, 1000)
+            return conn
+        conn = sqlite3.connect(db_path, check_same_thread=False, factory=factory)
+        if profiling:
+            conn.set_progress_handler(_count_steps, _PROFILE_STEP)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _entries(self) -> dict[tuple[str, bool], _PooledConnection]:
+        entries = getattr(self._local, "entries", None)
+        if entries is None:
+            entries = {}
+            self._local.entries = entries
+        return entries
+
+    def _open(self, db_path: str, read_only: bool) -> _PooledConnection:
+        conn = self._connect(db_path, read_only)
+        owner = weakref.ref(threading.current_thread())
+        with self._lock:
+            # Sonlanmis thread'lerin baglantilari (ident tekrar kullanilinca
+            # ustune yazilacak kayit dahil) burada kapatilir
+            stale = self._reap_dead_threads()
+            self._registry[(threading.get_ident(), db_path, read_only)] = (owner, conn)
+            generation = self._generation
+        self._close_quietly(stale)
+        return _PooledConnection(conn, generation)
+
+    @staticmethod
+    def _close_quietly(conns: list[sqlite3.Connection]) -> None:
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _reap_dead_threads(self) -> list[sqlite3.Connection]:
+        """Sahibi sonlanmis kayitlari cikar (self._lock altinda cagrilir)."""
+        stale = []
+        for key, (owner, conn) in list(self._registry.items()):
+            thread = owner()
+            if thread is None or not thread.is_alive():
+                del self._registry[key]
+                stale.append(conn)
+        return stale
+
+    def _discard(self, db_path: str, read_only: bool, entry: _PooledConnection) -> None:
+        with self._lock:
+            key = (threading.get_ident(), db_path, read_only)
+            registered = self._registry.get(key)
+            if registered is not None and registered[1] is entry.conn:
+                del self._registry[key]
+        try:
+            entry.conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _is_healthy(self, entry: _PooledConnection) -> bool:
+        """Baglanti hala kullanilabilir mi? (SELECT 1)"""
+        try:
+            entry.conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _checkout(self, db_path: str, read_only: bool = False) -> _PooledConnection:
+        entries = self._entries()
+        entry = entries.get((db_path, read_only))
+
+        if entry is not None and entry.depth == 0:
+            if entry.generation != self._generation:
+                # close_all() sonrasi: baglanti zaten kapatildi
+                entry = None
+            elif (
+                time.monotonic() - entry.last_used > self._health_check_interval
+                and not self._is_healthy(entry)
+            ):
+                logger.warning("Sagliksiz DB baglantisi yenileniyor: %s", db_path)
+                self._discard(db_path, read_only, entry)
+                entry = None
+
+        if entry is None:
+            entry = self._open(db_path, read_only)
+            entries[(db_path, read_only)] = entry
+
+        entry.depth += 1
+        return entry
+
+    def _checkin(self, entry: _PooledConnection) -> None:
+        entry.depth -= 1
+        entry.last_used = time.monotonic()
+        if entry.depth == 0 and isinstance(entry.conn, _ProfiledConnection):
+            entry.conn.finish_statements()
+        if entry.depth == 0 and entry.generation == self._generation:
+            # Eski davranisla uyum: commit edilmemis degisiklikler geri alinir
+            try:
+                if entry.conn.in_transaction:
+                    entry.conn.rollback()
+            except sqlite3.Error:
+                pass
+
+    @contextmanager
+    def connection(self, db_path: str, read_only: bool = False):
+        """Bu thread'in db_path baglantisini ver (ic ice kullanim desteklenir)."""
+        entry = self._checkout(db_path, read_only)
+        try:
+            yield entry.conn
+        finally:
+            self._checkin(entry)
+
+    def close_all(self) -> int:
+        """Tum thread'lerin acik baglantilarini kapat.
+
+        Returns:
+            Kapatilan baglanti sayisi
+        """
+        with self._lock:
+            conns = [conn for _, conn in self._registry.values()]
+            self._registry.clear()
+            self._generation += 1
+        self._close_quietly(conns)
+        return len(conns)
+
+    def stats(self) -> dict:
+        """Havuz durumu (acik baglanti sayisi, sonlanmis thread'ler haric)."""
+        with self._lock:
+            stale = self._reap_dead_threads()
+            count = len(self._registry)
+        self._close_quietly(stale)
+        return {"open_connections": count}
+
+
+_pool = ConnectionPool()
+
+
+@contextmanager
+def get_db(db_path: str, read_only: bool | None = None):
+    """SQLite baglantisi context manager.
+
+    Baglanti thread-local havuzdan gelir (her cagri yeni connect yapmaz).
+    WAL modu ve row_factory aktif. Blok sonunda commit edilmemis
+    degisiklikler geri alinir, baglanti kapatilmaz.
+
+    Args:
+        db_path: Veritabani yolu
+        read_only: True ise mode=ro baglanti (query_budget uygulanir).
+            None ise thread varsayilani (set_thread_read_only).
+    """
+    if read_only is None:
+        read_only = getattr(_thread_defaults, "read_only", False)
+    with _pool.connection(db_path, read_only) as conn:
+        yield conn
+
+
+def close_all_connections() -> int:
+    """Havuzdaki tum baglantilari kapat (shutdown ve testler icin).
+
+    Returns:
+        Kapatilan baglanti sayisi
+    """
+    closed = _pool.close_all()
+    if closed:
+        logger.info("DB baglanti havuzu kapatildi: %d baglanti", closed)
+    return closed
+
+
+# Surec ici veri versiyonlari: yazan taraf commit'ten SONRA artirir, okuyan
+# onbellekler anahtar olarak kullanir. Kapsamlar: "events" (sensor_events),
+# "slots" (slot_summary), "scores" (daily_scores), "model" (model snapshot).
+_data_versions: dict[str, int] = {}
+_data_versions_lock = threading.Lock()
+
+
+def bump_data_version(scope: str) -> int:
+    """Kapsamin veri versiyonunu artir (commit edilmis yazimdan sonra cagrilir).
+
+    Returns:
+        Yeni versiyon
+    """
+    with _data_versions_lock:
+        version = _data_versions.get(scope, 0) + 1
+        _data_versions[scope] = version
+    return version
+
+
+# Kalici veri izleri: baska bir surecin (or. simulator CLI) commit'lerini de
+# yansitir. events: AUTOINCREMENT sayaclari (tek tablo veya ay bolumleri; bolum
+# eklenip silinince de degisir), model: son snapshot versiyonu, slots /
+# scores: migration v7 trigger sayaclari. Hepsi tek satir / PK okumasidir.
+_PERSISTED_VERSION_SQL = {
+    "events": (
+        "SELECT COALESCE(SUM(seq), 0) || '.' || COUNT(*) FROM sqlite_sequence "
+        "WHERE name GLOB 'sensor_events*'"
+    ),
+    "model": "SELECT COALESCE(MAX(version), 0) FROM model_snapshot",
+    "slots": "SELECT version FROM data_changes WHERE scope = 'slots'",
+    "scores": "SELECT version FROM data_changes WHERE scope = 'scores'",
+}
+
+
+def get_persisted_versions(db_path: str, scopes: Iterable[str]) -> list[str]:
+    """Kapsamlarin DB'de kalici veri izleri (surecler arasi gecerli).
+
+    Args:
+        db_path: Veritabani yolu
+        scopes: Veri kapsamlari (bilinmeyenler atlanir)
+
+    Returns:
+        Kapsam sirasiyla iz degerleri ("scope=deger")
+    """
+    with get_db(db_path) as conn:
+        return [
+            f"{scope}={conn.execute(_PERSISTED_VERSION_SQL[scope]).fetchone()[0]}"
+            for scope in scopes if scope in _PERSISTED_VERSION_SQL
+        ]
+
+
+def get_data_version(scope: str) -> int:
+    """Kapsamin guncel veri versiyonu (hic artirilmadiysa 0)."""
+    with _data_versions_lock:
+        return _data_versions.get(scope, 0)
+
+
+def reset_data_versions() -> None:
+    """Tum veri versiyonlarini sifirla (testler icin)."""
+    with _data_versions_lock:
+        _data_versions.clear()
+
+
+def check_db_connection(db_path: str) -> bool:
+    """Bu thread'in havuz baglantisi calisiyor mu? (health check)"""
+    try:
+        with get_db(db_path) as conn:
+            conn.execute("SELECT 1").fetchone()
+        return True
+    except sqlite3.Error:
+        return False
 
 
 def _get_current_version(conn: sqlite3.Connection) -> int:
@@ -170,9 +812,47 @@ def init_db(db_path: str) -> None:
         logger.info("Veritabani hazir, sema versiyonu: %d", final_version)
 
 
+def configure_event_partitions(db_path: str, enabled: bool) -> int:
+    """sensor_events duzenini config'e getir (aylik bolumlu <-> tek tablo).
+
+    init_db'den sonra cagrilir; donusum tek transaction'dir ve mevcut
+    eventler tasinir. Duzen zaten istenen gibiyse no-op.
+
+    Args:
+        db_path: Veritabani yolu
+        enabled: True ise aylik bolumleme (bkz. src/partitions.py)
+
+    Returns:
+        Tasinan event sayisi
+
+    Raises:
+        ValueError: Donusum yapilamadi (or. gecersiz timestamp'li event);
+            transaction geri alinir, duzen degismez
+    """
+    with get_db(db_path) as conn:
+        if is_partitioned(conn) == enabled:
+            return 0
+        try:
+            moved = enable_partitioning(conn) if enabled else disable_partitioning(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+    bump_data_version("events")
+    logger.info(
+        "sensor_events %s: %d event tasindi",
+        "aylik bolumlere ayrildi" if enabled else "tek tabloda birlestirildi", moved,
+    )
+    return moved
+
+
 def cleanup_old_events(db_path: str, retention_days: int) -> int:
     """retention_days gunden eski sensor_events kayitlarini sil.
 
+    Bolumlu duzende satir silinmez: tamami cutoff'tan eski ay tablolari
+    DROP edilir. Cutoff'un dustugu ay bir sonraki aya kadar tutulur
+    (saklama retention_days ile retention_days + ~1 ay arasi).
+
     Args:
         db_path: Veritabani yolu
         retention_days: Tutulacak gun sayisi
@@ -184,12 +864,18 @@ def cleanup_old_events(db_path: str, retention_days: int) -> int:
         "%Y-%m-%dT00:00:00"
     )
     with get_db(db_path) as conn:
-        cursor = conn.execute(
-            "DELETE FROM sensor_events WHERE timestamp < ?", (cutoff,)
-        )
-        deleted = cursor.rowcount
+        if is_partitioned(conn):
+            months, deleted = drop_partitions_before(conn, cutoff)
+            if months:
+                logger.info("Event bolumleri silindi: %s", ", ".join(months))
+        else:
+            cursor = conn.execute(
+                "DELETE FROM sensor_events WHERE timestamp < ?", (cutoff,)
+            )
+            deleted = cursor.rowcount
         conn.commit()
     if deleted:
+        bump_data_version("events")
         logger.info(
             "Eski eventler temizlendi: %d kayit silindi (retention=%d gun)",
             deleted,
@@ -8,6 +8,7 @@ from src.detector.realtime_checks import (
     check_morning_vital_sign,
     run_realtime_checks,
 )
+from src.detector.realtime_monitor import RealtimeMonitor
 from src.detector.threshold_engine import get_alert_level
 from src.detector.trend_analyzer import analyze_all_trends, calculate_channel_trend
 
@@ -22,6 +23,7 @@ __all__ = [
     "check_morning_vital_sign",
     "check_extended_silence",
     "RealtimeAlert",
+    "RealtimeMonitor",
     "analyze_all_trends",
     "calculate_channel_trend",
 ]
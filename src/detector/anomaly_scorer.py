@@ -13,7 +13,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from src.config import AppConfig
-from src.database import get_db
+from src.database import bump_data_version, get_db
 from src.detector.history_manager import get_normal_stats
 from src.detector.threshold_engine import get_alert_level
 
@@ -98,6 +98,7 @@ def score_day(
             (composite_z, alert_level, target_date),
         )
         conn.commit()
+    bump_data_version("scores")
 
     result = AnomalyResult(
         date=target_date,
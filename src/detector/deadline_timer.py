@@ -0,0 +1,116 @@
+"""Heap tabanli deadline zamanlayici.
+
+Anahtar bazli tek-atimlik zamanlayicilar: ayni anahtarla yeniden kurmak
+onceki zamanlayiciyi iptal eder. Iptal edilen kayitlar heap'ten hemen
+silinmez (lazy deletion); sirasi geldiginde atlanir. Tek bir arka plan
+thread'i en yakin deadline'a kadar uyur.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger("annem_guvende.detector")
+
+
+class DeadlineTimer:
+    """Anahtar bazli, iptal edilebilir deadline zamanlayicisi.
+
+    Callback'ler zamanlayici thread'inde calisir; uzun surmemeleri gerekir.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        # (deadline_monotonic, seq, key) - min-heap
+        self._heap: list[tuple[float, int, str]] = []
+        # {key: (seq, callback)} - aktif zamanlayicilar
+        self._active: dict[str, tuple[int, Callable[[], None]]] = {}
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._running = False
+
+    def start(self) -> None:
+        """Zamanlayici thread'ini baslat (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="deadline-timer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Thread'i durdur; bekleyen zamanlayicilar calistirilmaz."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def arm(self, key: str, delay_seconds: float, callback: Callable[[], None]) -> None:
+        """key icin zamanlayici kur (varsa oncekini iptal eder)."""
+        deadline = time.monotonic() + max(0.0, delay_seconds)
+        with self._cond:
+            seq = next(self._seq)
+            self._active[key] = (seq, callback)
+            heapq.heappush(self._heap, (deadline, seq, key))
+            # Yeni kayit en yakin deadline ise thread'i uyandir
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+
+    def cancel(self, key: str) -> bool:
+        """key zamanlayicisini iptal et.
+
+        Returns:
+            True = aktif bir zamanlayici iptal edildi
+        """
+        with self._cond:
+            return self._active.pop(key, None) is not None
+
+    def is_armed(self, key: str) -> bool:
+        """key icin bekleyen zamanlayici var mi?"""
+        with self._cond:
+            return key in self._active
+
+    def _pop_due(self) -> list[Callable[[], None]] | None:
+        """Suresi dolan callback'leri al; yoksa bir sonraki deadline'a kadar bekle.
+
+        Returns:
+            Calistirilacak callback listesi veya durduruldu ise None
+        """
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                due: list[Callable[[], None]] = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, seq, key = heapq.heappop(self._heap)
+                    active = self._active.get(key)
+                    if active is not None and active[0] == seq:
+                        del self._active[key]
+                        due.append(active[1])
+                if due:
+                    return due
+                # Iptal edilmis kayitlarla dolu heap'i temizle
+                if not self._active:
+                    self._heap.clear()
+                wait = self._heap[0][0] - now if self._heap else None
+                self._cond.wait(wait)
+            return None
+
+    def _run(self) -> None:
+        while True:
+            due = self._pop_due()
+            if due is None:
+                return
+            for callback in due:
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("Deadline callback hatasi")
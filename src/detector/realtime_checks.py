@@ -4,14 +4,24 @@ Her 30 dakikada APScheduler ile calisir:
 1. Sabah vital sign: 11:00'a kadar hic event yoksa -> alert_level=2
 2. Uzun sessizlik: Awake window icinde 3+ saat event yoksa -> alert_level=1
 3. Dusme suphesi: Banyo sonrasi 45+ dk baska sinyal yoksa -> alert_level=3
+
+Uzun sessizlik ve dusme suphesi ayrica realtime_monitor tarafindan
+event-driven deadline zamanlayicilariyla aninda kontrol edilir; cron yedektir.
 """
 
+from __future__ import annotations
+
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 from src.config import AppConfig
 from src.database import get_db, get_system_state, set_system_state
+from src.partitions import events_source
+
+if TYPE_CHECKING:
+    from src.collector.fall_state import FallStateTracker
 
 logger = logging.getLogger("annem_guvende.detector")
 
@@ -68,7 +78,7 @@ def check_morning_vital_sign(
 
     with get_db(db_path) as conn:
         count = conn.execute(
-            "SELECT COUNT(*) FROM sensor_events "
+            f"SELECT COUNT(*) FROM {events_source(conn, today_start, now_iso)} "
             "WHERE timestamp >= ? AND timestamp < ?",
             (today_start, now_iso),
         ).fetchone()[0]
@@ -111,19 +121,43 @@ def check_extended_silence(
     if now.hour < awake_start or now.hour >= awake_end:
         return None
 
-    silence_hours = config.alerts.silence_threshold_hours
-
     today = now.strftime("%Y-%m-%d")
     today_start = f"{today}T00:00:00"
 
     with get_db(db_path) as conn:
         row = conn.execute(
-            "SELECT MAX(timestamp) as last_ts FROM sensor_events "
+            f"SELECT MAX(timestamp) as last_ts FROM {events_source(conn, today_start)} "
             "WHERE timestamp >= ?",
             (today_start,),
         ).fetchone()
 
     last_ts = row["last_ts"] if row else None
+    return evaluate_extended_silence(last_ts, config, now)
+
+
+def evaluate_extended_silence(
+    last_ts: str | None,
+    config: AppConfig,
+    now: datetime,
+) -> RealtimeAlert | None:
+    """Son event zamanina gore uzun sessizlik karari (DB okumaz).
+
+    check_extended_silence ve event-driven deadline zamanlayicisi
+    ayni karari bu fonksiyonla verir.
+
+    Args:
+        last_ts: Bugunku son event zamani (ISO) veya None
+        config: Uygulama konfigurasyonu
+        now: Simdiki zaman
+
+    Returns:
+        RealtimeAlert veya alarm yoksa None
+    """
+    awake_start = config.model.awake_start_hour
+    awake_end = config.model.awake_end_hour
+
+    if now.hour < awake_start or now.hour >= awake_end:
+        return None
 
     if last_ts is None:
         # Hic event yok - morning check halleder (saat >= 11 ise)
@@ -143,7 +177,7 @@ def check_extended_silence(
         return None
 
     silence_duration = now - last_event_dt
-    threshold = timedelta(hours=silence_hours)
+    threshold = timedelta(hours=config.alerts.silence_threshold_hours)
 
     if silence_duration >= threshold:
         hours_silent = silence_duration.total_seconds() / 3600
@@ -161,6 +195,7 @@ def check_fall_suspicion(
     db_path: str,
     config: AppConfig,
     now: datetime | None = None,
+    tracker: FallStateTracker | None = None,
 ) -> RealtimeAlert | None:
     """Banyo sonrasi uzun sure hareket yoksa dusme suphesi.
 
@@ -172,6 +207,8 @@ def check_fall_suspicion(
         db_path: Veritabani yolu
         config: Uygulama konfigurasyonu
         now: Simdiki zaman (test icin override)
+        tracker: Collector'un bellekteki banyo durumu. Verilirse kaynak
+            budur; yoksa system_state'ten okunur.
 
     Returns:
         RealtimeAlert(level=3) veya alarm yoksa None
@@ -180,11 +217,19 @@ def check_fall_suspicion(
     if timeout <= 0:
         return None
 
+    now = now or datetime.now()
+
+    if tracker is not None:
+        expired = tracker.pop_if_expired(now, timeout)
+        if expired is None:
+            return None
+        last_bt_str, elapsed = expired
+        return _fall_alert(last_bt_str, elapsed)
+
     last_bt_str = get_system_state(db_path, "last_bathroom_time", "")
     if not last_bt_str:
         return None
 
-    now = now or datetime.now()
     try:
         last_bt = datetime.fromisoformat(last_bt_str)
     except ValueError:
@@ -194,26 +239,33 @@ def check_fall_suspicion(
     if elapsed >= timeout:
         # Alarm verildikten sonra state'i temizle (tekrar tekrar alarm vermesin)
         set_system_state(db_path, "last_bathroom_time", "")
-        return RealtimeAlert(
-            alert_type="fall_suspicion",
-            alert_level=3,
-            message=(
-                f"⚠️ DÜŞME ŞÜPHESİ: Banyo kullanımından bu yana "
-                f"{int(elapsed)} dakika geçti, hiçbir sensörden sinyal yok!"
-            ),
-            last_event_time=last_bt_str,
-        )
+        return _fall_alert(last_bt_str, elapsed)
     return None
 
 
+def _fall_alert(last_bt_str: str, elapsed: float) -> RealtimeAlert:
+    """Dusme suphesi alarm nesnesi olustur."""
+    return RealtimeAlert(
+        alert_type="fall_suspicion",
+        alert_level=3,
+        message=(
+            f"⚠️ DÜŞME ŞÜPHESİ: Banyo kullanımından bu yana "
+            f"{int(elapsed)} dakika geçti, hiçbir sensörden sinyal yok!"
+        ),
+        last_event_time=last_bt_str,
+    )
+
+
 def run_realtime_checks(
     db_path: str,
     config: AppConfig,
     now: datetime | None = None,
+    fall_tracker: FallStateTracker | None = None,
 ) -> list[RealtimeAlert]:
     """Tum gercek zamanli kontrolleri calistir.
 
     Her 30 dakikada bir APScheduler tarafindan cagirilir.
+    fall_tracker verilirse dusme kontrolu bellekteki durumu kullanir.
 
     Returns:
         Tespit edilen alarm listesi (bos olabilir).
@@ -228,7 +280,7 @@ def run_realtime_checks(
     if silence:
         alerts.append(silence)
 
-    fall = check_fall_suspicion(db_path, config, now)
+    fall = check_fall_suspicion(db_path, config, now, tracker=fall_tracker)
     if fall:
         alerts.append(fall)
 
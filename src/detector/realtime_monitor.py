@@ -0,0 +1,196 @@
+"""Event-driven dusme ve uzun sessizlik tespiti.
+
+Collector her kabul ettigi eventi on_event() ile bildirir; monitor buna
+gore deadline zamanlayicilarini kurar veya iptal eder:
+- Banyo event'i -> dusme zamanlayicisi (fall_detection_minutes) kurulur,
+  baska kanal event'i zamanlayiciyi iptal eder.
+- Her event -> sessizlik zamanlayicisi (silence_threshold_hours) yeniden kurulur.
+  Cron kontrolu gibi yalnizca bugunun eventleri sayilir ve deadline
+  morning_check_hour'dan once dolmaz.
+
+Zamanlayici dolunca karar realtime_checks'teki ayni fonksiyonlarla verilir,
+boylece alarm deadline'dan saniyeler icinde uretilir. 30dk'lik
+realtime_checks cron'u yedek olarak calismaya devam eder.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from src.config import AppConfig
+from src.database import get_db, get_system_state, is_vacation_mode
+from src.detector.deadline_timer import DeadlineTimer
+from src.detector.realtime_checks import (
+    RealtimeAlert,
+    check_fall_suspicion,
+    evaluate_extended_silence,
+)
+from src.partitions import events_source
+
+if TYPE_CHECKING:
+    from src.collector.fall_state import FallStateTracker
+
+logger = logging.getLogger("annem_guvende.detector")
+
+FALL_TIMER = "fall_suspicion"
+SILENCE_TIMER = "extended_silence"
+
+
+def _parse_ts(value) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class RealtimeMonitor:
+    """Event'lerle beslenen dusme / sessizlik deadline takipcisi.
+
+    Args:
+        db_path: Veritabani yolu
+        config: Uygulama konfigurasyonu
+        alert_callback: Alarm uretildiginde cagrilir (or. AlertManager)
+        fall_tracker: Collector'un bellekteki banyo durumu
+        timer: Deadline zamanlayici (test icin override)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        config: AppConfig,
+        alert_callback: Callable[[RealtimeAlert], None],
+        fall_tracker: FallStateTracker | None = None,
+        timer: DeadlineTimer | None = None,
+    ):
+        self._db_path = db_path
+        self._config = config
+        self._alert_callback = alert_callback
+        self._fall_tracker = fall_tracker
+        self._timer = timer or DeadlineTimer()
+
+    def start(self) -> None:
+        """Zamanlayici thread'ini baslat ve mevcut durumdan deadline'lari kur."""
+        self._timer.start()
+        self._seed()
+
+    def stop(self) -> None:
+        """Zamanlayiciyi durdur (bekleyen deadline'lar iptal)."""
+        self._timer.stop()
+
+    def on_event(self, event: dict) -> None:
+        """Collector'dan gelen kabul edilmis event ile zamanlayicilari guncelle."""
+        timestamp = event["timestamp"]
+        if self._config.alerts.fall_detection_minutes > 0:
+            if event["channel"] == "bathroom":
+                self._arm_fall(timestamp)
+            else:
+                self._timer.cancel(FALL_TIMER)
+        self._arm_silence(timestamp)
+
+    # --- Dahili ---
+
+    def _seed(self) -> None:
+        """Yeniden baslatma sonrasi: yarim kalan banyo durumu ve bugunku son event."""
+        if self._config.alerts.fall_detection_minutes > 0:
+            if self._fall_tracker is not None:
+                last_bt = self._fall_tracker.last_bathroom_time
+            else:
+                last_bt = get_system_state(self._db_path, "last_bathroom_time", "")
+            if last_bt:
+                self._arm_fall(last_bt)
+
+        today_start = datetime.now().strftime("%Y-%m-%dT00:00:00")
+        with get_db(self._db_path) as conn:
+            row = conn.execute(
+                f"SELECT MAX(timestamp) as last_ts FROM {events_source(conn, today_start)} "
+                "WHERE timestamp >= ?",
+                (today_start,),
+            ).fetchone()
+        if row and row["last_ts"]:
+            self._arm_silence(row["last_ts"])
+
+    def _fall_delay(self, last_bt: str) -> float | None:
+        """Banyo zamanina gore dusme deadline'ina kalan saniye (gecersizse None)."""
+        last_bt_dt = _parse_ts(last_bt)
+        if last_bt_dt is None:
+            return None
+        deadline = last_bt_dt + timedelta(minutes=self._config.alerts.fall_detection_minutes)
+        return (deadline - datetime.now()).total_seconds()
+
+    def _arm_fall(self, last_bt: str) -> None:
+        """Banyo zamanindan itibaren dusme deadline'ini kur."""
+        delay = self._fall_delay(last_bt)
+        if delay is not None:
+            self._timer.arm(FALL_TIMER, delay, self._on_fall_deadline)
+
+    def _arm_silence(self, last_ts: str, at: datetime | None = None) -> None:
+        """Son event zamanindan itibaren sessizlik deadline'ini kur.
+
+        Onceki gunun eventi deadline kurmaz (bekleyen deadline iptal edilir):
+        check_extended_silence de yalnizca bugunun eventlerine bakar.
+        Deadline en erken bugun morning_check_hour'dadir.
+        """
+        last_dt = _parse_ts(last_ts)
+        if last_dt is None:
+            return
+        if last_dt.date() != datetime.now().date():
+            self._timer.cancel(SILENCE_TIMER)
+            return
+        if at is None:
+            at = max(
+                last_dt + timedelta(hours=self._config.alerts.silence_threshold_hours),
+                last_dt.replace(
+                    hour=self._config.alerts.morning_check_hour,
+                    minute=0, second=0, microsecond=0,
+                ),
+            )
+        delay = (at - datetime.now()).total_seconds()
+        self._timer.arm(SILENCE_TIMER, delay, lambda: self._on_silence_deadline(last_ts))
+
+    def _on_fall_deadline(self) -> None:
+        if is_vacation_mode(self._db_path, self._config):
+            return
+        alert = check_fall_suspicion(self._db_path, self._config, tracker=self._fall_tracker)
+        if alert is not None:
+            self._dispatch(alert)
+            return
+
+        # Duvar saati ile monotonic saat arasindaki kayma yuzunden deadline'a
+        # birkac ms erken ulasildiysa kalan sure icin yeniden kur
+        if self._fall_tracker is not None:
+            last_bt = self._fall_tracker.last_bathroom_time
+        else:
+            last_bt = get_system_state(self._db_path, "last_bathroom_time", "")
+        delay = self._fall_delay(last_bt) if last_bt else None
+        if delay is not None and delay > 0:
+            self._timer.arm(FALL_TIMER, delay, self._on_fall_deadline)
+
+    def _on_silence_deadline(self, last_ts: str) -> None:
+        if is_vacation_mode(self._db_path, self._config):
+            return
+        now = datetime.now()
+        last_dt = _parse_ts(last_ts)
+        if last_dt is None or last_dt.date() != now.date():
+            # Deadline gece yarisini gecti: dunun eventi bugun alarm uretmez
+            return
+        alert = evaluate_extended_silence(last_ts, self._config, now)
+        if alert is not None:
+            self._dispatch(alert)
+            return
+
+        # Deadline gece dolduysa ve ayni gun uyanik pencere henuz baslamadiysa,
+        # cron gibi awake_start'ta tekrar degerlendir
+        awake_start = self._config.model.awake_start_hour
+        if now.hour < awake_start:
+            at = now.replace(hour=awake_start, minute=0, second=0, microsecond=0)
+            self._arm_silence(last_ts, at=at)
+
+    def _dispatch(self, alert: RealtimeAlert) -> None:
+        logger.warning(
+            "Gercek zamanli alarm (deadline): %s | seviye=%d | %s",
+            alert.alert_type, alert.alert_level, alert.message,
+        )
+        self._alert_callback(alert)
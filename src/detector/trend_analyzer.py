@@ -14,6 +14,7 @@ import logging
 from datetime import datetime, timedelta
 
 from src.database import get_db
+from src.partitions import events_source
 
 logger = logging.getLogger("annem_guvende.detector")
 
@@ -77,7 +78,7 @@ def get_daily_event_counts(
     with get_db(db_path) as conn:
         rows = conn.execute(
             "SELECT DATE(timestamp) AS d, COUNT(*) AS cnt "
-            "FROM sensor_events "
+            f"FROM {events_source(conn, start_date)} "
             "WHERE channel = ? AND timestamp >= ? "
             "GROUP BY d",
             (channel, start_date),
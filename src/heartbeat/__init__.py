@@ -1,6 +1,8 @@
 """Heartbeat modulu - Sistem sagligi (Sprint 5)."""
 
 from src.heartbeat.heartbeat_client import HeartbeatClient
+from src.heartbeat.metrics_history import MetricsHistory, WindowStats
+from src.heartbeat.metrics_sampler import MetricsSampler, MetricsSnapshot, MetricsUnavailableError
 from src.heartbeat.system_monitor import (
     SystemMetrics,
     collect_system_metrics,
@@ -12,6 +14,7 @@ from src.heartbeat.system_monitor import (
     get_memory_percent,
     get_today_event_count,
     get_uptime_seconds,
+    get_wal_size_mb,
 )
 from src.heartbeat.watchdog import (
     HealthCheck,
@@ -29,9 +32,15 @@ __all__ = [
     "get_cpu_temp",
     "get_uptime_seconds",
     "get_db_size_mb",
+    "get_wal_size_mb",
     "get_last_event_age_minutes",
     "get_today_event_count",
     "HeartbeatClient",
+    "MetricsHistory",
+    "WindowStats",
+    "MetricsSampler",
+    "MetricsSnapshot",
+    "MetricsUnavailableError",
     "HealthCheck",
     "HealthStatus",
     "run_health_checks",
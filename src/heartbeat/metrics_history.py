@@ -0,0 +1,186 @@
+"""Surec ici sistem metrikleri gecmisi (sabit boyutlu halka tampon).
+
+Anlik tek olcum (cpu_percent interval=0, anlik sicaklik) gurultuludur;
+watchdog karari tek bir ornege dayanmamalidir. MetricsSampler birkac
+saniyede bir hafif bir ornek (psutil + dosya boyutlari, DB sorgusu yok)
+alip buraya yazar:
+  - her alan icin onceden ayrilmis array('d') kolonlari, ornek basina
+    dict/nesne olusturulmaz; tampon dolunca en eski ornegin uzerine yazilir
+  - eksik deger (orn. Pi disinda sicaklik) NaN olarak saklanir
+  - window(): son N saniyenin ortalama / max / p95 ozeti (watchdog icin)
+  - downsample(): dashboard grafigi icin kovalara bolunmus ortalamalar
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+from src.heartbeat.system_monitor import (
+    get_cpu_percent,
+    get_cpu_temp,
+    get_db_size_mb,
+    get_disk_percent,
+    get_memory_percent,
+    get_wal_size_mb,
+)
+
+HISTORY_FIELDS = (
+    "cpu_percent",
+    "cpu_temp",
+    "memory_percent",
+    "disk_percent",
+    "db_size_mb",
+    "wal_size_mb",
+)
+
+_NAN = float("nan")
+
+
+@dataclass(frozen=True)
+class WindowStats:
+    """Bir alanin zaman penceresi ozeti (count=0 ise degerler NaN)."""
+
+    mean: float
+    max: float
+    p95: float
+    count: int
+
+
+_EMPTY_WINDOW = WindowStats(_NAN, _NAN, _NAN, 0)
+
+
+def sample_history_row(db_path: str) -> tuple[float | None, ...]:
+    """Hafif ornek: HISTORY_FIELDS sirasinda degerler (DB sorgusu yok).
+
+    Args:
+        db_path: Veritabani yolu (dosya boyutlari icin)
+    """
+    return (
+        get_cpu_percent(),
+        get_cpu_temp(),
+        get_memory_percent(),
+        get_disk_percent(),
+        get_db_size_mb(db_path),
+        get_wal_size_mb(db_path),
+    )
+
+
+class MetricsHistory:
+    """HISTORY_FIELDS icin sabit kapasiteli halka tampon (thread-safe).
+
+    Args:
+        capacity: Tutulacak en fazla ornek sayisi
+    """
+
+    def __init__(self, capacity: int = 720):
+        self._capacity = max(1, capacity)
+        self._timestamps = array("d", [0.0]) * self._capacity
+        self._columns = [array("d", [_NAN]) * self._capacity for _ in HISTORY_FIELDS]
+        self._head = 0  # sonraki yazma konumu
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, values: tuple[float | None, ...], timestamp: float | None = None) -> None:
+        """Ornegi yaz (None -> NaN); tampon doluysa en eskisinin uzerine.
+
+        Args:
+            values: HISTORY_FIELDS sirasinda degerler
+            timestamp: Unix zamani (None ise simdi)
+        """
+        ts = time.time() if timestamp is None else timestamp
+        with self._lock:
+            i = self._head
+            self._timestamps[i] = ts
+            for column, value in zip(self._columns, values):
+                column[i] = _NAN if value is None else value
+            self._head = (i + 1) % self._capacity
+            if self._count < self._capacity:
+                self._count += 1
+
+    def _range_since(self, since: float) -> tuple[int, int]:
+        """since sonrasi orneklerin (baslangic konumu, adet) - kilit altinda cagrilir."""
+        n = 0
+        i = self._head
+        while n < self._count:
+            i = (i - 1) % self._capacity
+            if self._timestamps[i] < since:
+                break
+            n += 1
+        return (self._head - n) % self._capacity, n
+
+    def window(self, field: str, seconds: float, now: float | None = None) -> WindowStats:
+        """Son seconds saniyedeki gecerli (NaN olmayan) degerlerin ozeti.
+
+        Args:
+            field: HISTORY_FIELDS icinden alan adi
+            seconds: Pencere uzunlugu
+            now: Pencere sonu (None ise simdi)
+        """
+        end = time.time() if now is None else now
+        column = self._columns[HISTORY_FIELDS.index(field)]
+        with self._lock:
+            start, n = self._range_since(end - seconds)
+            values = [
+                v for k in range(n)
+                if not math.isnan(v := column[(start + k) % self._capacity])
+            ]
+        if not values:
+            return _EMPTY_WINDOW
+        values.sort()
+        p95 = values[min(len(values) - 1, math.ceil(0.95 * len(values)) - 1)]
+        return WindowStats(sum(values) / len(values), values[-1], p95, len(values))
+
+    def windows(self, seconds: float, now: float | None = None) -> dict[str, WindowStats]:
+        """Tum alanlar icin window() sonucu."""
+        end = time.time() if now is None else now
+        return {field: self.window(field, seconds, end) for field in HISTORY_FIELDS}
+
+    def downsample(self, seconds: float, points: int, now: float | None = None) -> dict:
+        """Son seconds saniyeyi en fazla points kovaya bol; kova ortalamalari.
+
+        Args:
+            seconds: Gecmis uzunlugu
+            points: En fazla nokta sayisi
+            now: Bitis zamani (None ise simdi)
+
+        Returns:
+            {"bucket_seconds", "timestamps", <alan>: [ortalama | None, ...]}
+            Bos kovalar atlanir; timestamps kova baslangici (unix sn).
+        """
+        end = time.time() if now is None else now
+        begin = end - seconds
+        points = max(1, points)
+        bucket = seconds / points
+        sums = [[0.0] * points for _ in HISTORY_FIELDS]
+        counts = [[0] * points for _ in HISTORY_FIELDS]
+        seen = [False] * points
+
+        with self._lock:
+            start, n = self._range_since(begin)
+            for k in range(n):
+                i = (start + k) % self._capacity
+                b = min(points - 1, int((self._timestamps[i] - begin) / bucket))
+                seen[b] = True
+                for f, column in enumerate(self._columns):
+                    v = column[i]
+                    if not math.isnan(v):
+                        sums[f][b] += v
+                        counts[f][b] += 1
+
+        used = [b for b in range(points) if seen[b]]
+        result: dict = {
+            "bucket_seconds": round(bucket, 3),
+            "timestamps": [round(begin + b * bucket, 3) for b in used],
+        }
+        for f, field in enumerate(HISTORY_FIELDS):
+            result[field] = [
+                round(sums[f][b] / counts[f][b], 3) if counts[f][b] else None for b in used
+            ]
+        return result
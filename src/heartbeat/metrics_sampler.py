@@ -0,0 +1,176 @@
+"""Arka plan sistem metrikleri ornekleyicisi (TTL onbellekli snapshot).
+
+collect_system_metrics psutil + iki sensor_events sorgusu calistirir.
+Saglik endpoint'leri (Docker healthcheck, uptime monitor) ve heartbeat /
+watchdog job'lari her seferinde yeniden olcmek yerine ortak bir
+snapshot'i okur:
+  - arka plan thread'i snapshot'i interval_seconds araliginda yeniler
+  - thread calismiyorsa (testler) get() TTL dolunca istek aninda yeniler
+  - get(fresh=True) zorla yeniler; fresh_min_interval_seconds icinde
+    tekrar zorlanirsa mevcut snapshot doner (hiz siniri)
+  - son olcum basarisizsa get() MetricsUnavailableError firlatir
+history verilirse ayni thread history_interval_seconds araliginda hafif
+ornekleri halka tampona yazar (watchdog pencere ozetleri, dashboard grafigi).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.heartbeat.metrics_history import MetricsHistory, WindowStats, sample_history_row
+from src.heartbeat.system_monitor import SystemMetrics, collect_system_metrics
+
+logger = logging.getLogger("annem_guvende.heartbeat")
+
+
+class MetricsUnavailableError(RuntimeError):
+    """Son metrik olcumu basarisiz oldu."""
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Onbellekteki metrikler ve yasi."""
+
+    metrics: SystemMetrics
+    age_seconds: float
+
+
+class MetricsSampler:
+    """SystemMetrics snapshot'ini periyodik yenileyen ortak kaynak.
+
+    Args:
+        db_path: Veritabani yolu
+        interval_seconds: Yenileme araligi / TTL (sn)
+        fresh_min_interval_seconds: Zorla yenilemeler arasi en kisa sure (sn)
+        collect: Olcum fonksiyonu (test icin override)
+        clock: Monotonik saat (test icin override)
+        history: Hafif orneklerin yazilacagi halka tampon (None = gecmis yok)
+        history_interval_seconds: Gecmis ornekleme araligi (sn)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        interval_seconds: float = 15.0,
+        fresh_min_interval_seconds: float = 5.0,
+        collect: Callable[[str], SystemMetrics] = collect_system_metrics,
+        clock: Callable[[], float] = time.monotonic,
+        history: MetricsHistory | None = None,
+        history_interval_seconds: float = 5.0,
+    ):
+        self._db_path = db_path
+        self._interval = interval_seconds
+        self._fresh_min_interval = fresh_min_interval_seconds
+        self._collect = collect
+        self._clock = clock
+        self.history = history
+        self._history_interval = history_interval_seconds
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.RLock()  # ayni anda tek olcum
+        self._metrics: SystemMetrics | None = None
+        self._sampled_at = 0.0  # son basarili olcum (monotonic)
+        self._attempted_at: float | None = None  # son olcum denemesi
+        self._error: Exception | None = None
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Ilk olcumu yap ve arka plan thread'ini baslat."""
+        self.record_history()
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-sampler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Metrik ornekleyici baslatildi: %.0f sn aralik", self._interval)
+
+    def stop(self) -> None:
+        """Thread'i durdur."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        if self.history is None:
+            while not self._stop.wait(self._interval):
+                self.refresh()
+            return
+        tick = min(self._history_interval, self._interval)
+        while not self._stop.wait(tick):
+            self.record_history()
+            with self._lock:
+                attempted = self._attempted_at
+            # Yarim tick tolerans: wait() kaymasi tam bir tick gecikmesin
+            if attempted is None or self._clock() - attempted >= self._interval - tick / 2:
+                self.refresh()
+
+    def record_history(self) -> None:
+        """Gecmis tamponuna hafif bir ornek yaz (gecmis yoksa no-op)."""
+        if self.history is None:
+            return
+        try:
+            self.history.append(sample_history_row(self._db_path))
+        except Exception as exc:
+            logger.debug("Gecmis ornegi alinamadi: %s", exc)
+
+    def windows(self, seconds: float) -> dict[str, WindowStats] | None:
+        """Son seconds saniyenin alan bazli ozeti (gecmis yoksa None)."""
+        if self.history is None or not len(self.history):
+            return None
+        return self.history.windows(seconds)
+
+    def refresh(self) -> None:
+        """Simdi olc; hata snapshot'i silmez ama get() hatayi bildirir."""
+        with self._refresh_lock:
+            started = self._clock()
+            try:
+                metrics = self._collect(self._db_path)
+            except Exception as exc:
+                logger.warning("Sistem metrikleri olculemedi: %s", exc)
+                with self._lock:
+                    self._attempted_at = started
+                    self._error = exc
+                return
+            with self._lock:
+                self._metrics = metrics
+                self._sampled_at = started
+                self._attempted_at = started
+                self._error = None
+
+    def get(self, fresh: bool = False) -> MetricsSnapshot:
+        """Onbellekteki snapshot (TTL dolduysa veya fresh ise yenilenir).
+
+        Args:
+            fresh: True ise zorla yenile (hiz sinirli)
+
+        Raises:
+            MetricsUnavailableError: Son olcum basarisizsa
+        """
+        with self._lock:
+            attempted = self._attempted_at
+        since = None if attempted is None else self._clock() - attempted
+        if since is None or since >= self._interval or (
+            fresh and since >= self._fresh_min_interval
+        ):
+            self._refresh_if_unchanged(attempted)
+
+        with self._lock:
+            if self._error is not None or self._metrics is None:
+                raise MetricsUnavailableError(str(self._error))
+            return MetricsSnapshot(self._metrics, self._clock() - self._sampled_at)
+
+    def _refresh_if_unchanged(self, attempted: float | None) -> None:
+        # Es zamanli istekler: ilki olcer, digerleri onun sonucunu kullanir
+        with self._refresh_lock:
+            with self._lock:
+                if self._attempted_at != attempted:
+                    return
+            self.refresh()
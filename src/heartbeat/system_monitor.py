@@ -13,6 +13,7 @@ from datetime import datetime
 import psutil
 
 from src.database import get_db
+from src.partitions import events_source
 
 logger = logging.getLogger("annem_guvende.heartbeat")
 
@@ -94,6 +95,14 @@ def get_db_size_mb(db_path: str) -> float:
         return 0.0
 
 
+def get_wal_size_mb(db_path: str) -> float:
+    """SQLite WAL dosyasi boyutu (MB).
+
+    WAL yoksa (checkpoint sonrasi / WAL kapali) 0.0 dondurur.
+    """
+    return get_db_size_mb(f"{db_path}-wal")
+
+
 def get_last_event_age_minutes(
     db_path: str,
     now: datetime | None = None,
@@ -114,12 +123,13 @@ def get_last_event_age_minutes(
 
     today_str = now.strftime("%Y-%m-%d")
 
+    today_start = f"{today_str}T00:00:00"
     with get_db(db_path) as conn:
         row = conn.execute(
-            """SELECT MAX(timestamp) as last_ts
-               FROM sensor_events
+            f"""SELECT MAX(timestamp) as last_ts
+               FROM {events_source(conn, today_start)}
                WHERE timestamp >= ?""",
-            (f"{today_str}T00:00:00",),
+            (today_start,),
         ).fetchone()
 
     if row is None or row["last_ts"] is None:
@@ -151,12 +161,13 @@ def get_today_event_count(
 
     today_str = now.strftime("%Y-%m-%d")
 
+    day_start, day_end = f"{today_str}T00:00:00", f"{today_str}T23:59:59"
     with get_db(db_path) as conn:
         row = conn.execute(
-            """SELECT COUNT(*) as cnt
-               FROM sensor_events
+            f"""SELECT COUNT(*) as cnt
+               FROM {events_source(conn, day_start, day_end)}
                WHERE timestamp >= ? AND timestamp < ?""",
-            (f"{today_str}T00:00:00", f"{today_str}T23:59:59"),
+            (day_start, day_end),
         ).fetchone()
 
     return row["cnt"] if row else 0
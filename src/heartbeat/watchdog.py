@@ -8,6 +8,7 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from src.heartbeat.metrics_history import WindowStats
 from src.heartbeat.system_monitor import SystemMetrics
 
 logger = logging.getLogger("annem_guvende.heartbeat")
@@ -18,6 +19,8 @@ CPU_TEMP_WARNING = 80.0  # Celsius
 DISK_WARNING_PERCENT = 90.0
 RAM_WARNING_PERCENT = 85.0
 DB_SIZE_WARNING_MB = 500.0  # Pi icin buyuk
+# Pencere ozeti en az bu kadar ornek iceriyorsa anlik deger yerine kullanilir
+MIN_WINDOW_SAMPLES = 3
 
 
 @dataclass
@@ -47,12 +50,35 @@ class HealthStatus:
         return [c for c in self.checks if not c.healthy]
 
 
-def check_cpu_temp(metrics: SystemMetrics) -> HealthCheck:
+def _windowed(window: WindowStats | None) -> WindowStats | None:
+    """Yeterli ornek iceren pencere ozeti (yoksa None -> anlik deger)."""
+    if window is None or window.count < MIN_WINDOW_SAMPLES:
+        return None
+    return window
+
+
+def check_cpu_temp(metrics: SystemMetrics, window: WindowStats | None = None) -> HealthCheck:
     """CPU sicakligi kontrolu.
 
     > 80°C → sagliksiz.
     None (Pi olmayan platform) → saglikli.
+    window verilirse tek ornek yerine pencere ortalamasi degerlendirilir.
     """
+    window = _windowed(window)
+    if window is not None:
+        detail = f"ort. {window.mean:.1f}°C, en yüksek {window.max:.1f}°C"
+        if window.mean >= CPU_TEMP_WARNING:
+            return HealthCheck(
+                name="cpu_temp",
+                healthy=False,
+                message=f"CPU sıcaklığı çok yüksek: {detail}",
+            )
+        return HealthCheck(
+            name="cpu_temp",
+            healthy=True,
+            message=f"CPU sıcaklığı normal: {detail}",
+        )
+
     if metrics.cpu_temp is None:
         return HealthCheck(
             name="cpu_temp",
@@ -93,11 +119,27 @@ def check_disk_usage(metrics: SystemMetrics) -> HealthCheck:
     )
 
 
-def check_ram_usage(metrics: SystemMetrics) -> HealthCheck:
+def check_ram_usage(metrics: SystemMetrics, window: WindowStats | None = None) -> HealthCheck:
     """RAM kullanim kontrolu.
 
     > %85 → sagliksiz.
+    window verilirse tek ornek yerine pencere ortalamasi degerlendirilir.
     """
+    window = _windowed(window)
+    if window is not None:
+        detail = f"ort. %{window.mean:.0f}, en yüksek %{window.max:.0f}"
+        if window.mean >= RAM_WARNING_PERCENT:
+            return HealthCheck(
+                name="ram",
+                healthy=False,
+                message=f"RAM kullanımı çok yüksek: {detail}",
+            )
+        return HealthCheck(
+            name="ram",
+            healthy=True,
+            message=f"RAM kullanımı normal: {detail}",
+        )
+
     if metrics.memory_percent >= RAM_WARNING_PERCENT:
         return HealthCheck(
             name="ram",
@@ -160,6 +202,7 @@ def run_health_checks(
     metrics: SystemMetrics,
     mqtt_connected: bool,
     now: datetime | None = None,
+    windows: dict[str, WindowStats] | None = None,
 ) -> HealthStatus:
     """Tum saglik kontrollerini calistir.
 
@@ -170,17 +213,20 @@ def run_health_checks(
         metrics: Sistem metrikleri
         mqtt_connected: MQTT baglanti durumu
         now: Simdiki zaman (test icin override)
+        windows: Metrik gecmisi pencere ozetleri (MetricsHistory.windows);
+            verilirse sicaklik ve RAM kontrolleri pencere ortalamasini kullanir
 
     Returns:
         HealthStatus (tum check sonuclari)
     """
     if now is None:
         now = datetime.now()
+    windows = windows or {}
 
     checks = [
-        check_cpu_temp(metrics),
+        check_cpu_temp(metrics, windows.get("cpu_temp")),
         check_disk_usage(metrics),
-        check_ram_usage(metrics),
+        check_ram_usage(metrics, windows.get("memory_percent")),
         check_mqtt_status(mqtt_connected, metrics.last_event_age_minutes),
         check_db_health(metrics.db_size_mb),
     ]
@@ -8,8 +8,13 @@ import logging
 from datetime import datetime, timedelta
 
 from src.alerter import AlertManager, TelegramNotifier
+from src.collector.fall_state import FallStateTracker
 from src.collector.mqtt_client import MQTTCollector
-from src.collector.slot_aggregator import aggregate_current_slot, fill_missing_slots
+from src.collector.slot_aggregator import (
+    SlotAccumulator,
+    aggregate_current_slot,
+    aggregate_day,
+)
 from src.config import AppConfig
 from src.database import (
     cleanup_old_events,
@@ -20,7 +25,8 @@ from src.database import (
 from src.detector import run_daily_scoring, run_realtime_checks
 from src.heartbeat import (
     HeartbeatClient,
-    collect_system_metrics,
+    MetricsSampler,
+    MetricsUnavailableError,
     format_watchdog_alert,
     run_health_checks,
 )
@@ -29,16 +35,29 @@ from src.learner import run_daily_learning
 logger = logging.getLogger("annem_guvende")
 
 
-def slot_aggregation_job(db_path: str, channels: list[str]) -> None:
-    """15dk slot ozetleme (saat dilimlerine hizali)."""
+def slot_aggregation_job(
+    db_path: str,
+    channels: list[str],
+    accumulator: SlotAccumulator | None = None,
+) -> None:
+    """15dk slot ozetleme (saat dilimlerine hizali).
+
+    Accumulator verilirse kapanan slot bellekteki sayaclardan yazilir;
+    accumulator'un tam gormedigi slot icin sensor_events taranir.
+    """
     adjusted_now = datetime.now() - timedelta(minutes=1)
+    if accumulator is not None and accumulator.flush(adjusted_now):
+        return
     aggregate_current_slot(db_path, channels, now=adjusted_now)
 
 
 def fill_yesterday_slots_job(db_path: str, channels: list[str]) -> None:
-    """Onceki gunun eksik slotlarini doldur."""
+    """Onceki gunun tum slotlarini sensor_events'ten tek geciste yeniden yaz.
+
+    Eksik slotlari doldurur; kesinti sirasinda kacirilan slotlari da onarir.
+    """
     yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    fill_missing_slots(db_path, yesterday, channels)
+    aggregate_day(db_path, yesterday, channels)
 
 
 def daily_learning_job(db_path: str, config: AppConfig) -> None:
@@ -63,12 +82,18 @@ def daily_scoring_job(
 
 
 def realtime_checks_job(
-    db_path: str, config: AppConfig, alert_mgr: AlertManager
+    db_path: str,
+    config: AppConfig,
+    alert_mgr: AlertManager,
+    fall_tracker: FallStateTracker | None = None,
 ) -> None:
     """Gercek zamanli sessizlik kontrolleri (tatil modunda atlanir)."""
+    if fall_tracker is not None:
+        # Banyoda devam eden durumun periyodik write-behind kaydi
+        fall_tracker.flush()
     if is_vacation_mode(db_path, config):
         return
-    alerts = run_realtime_checks(db_path, config)
+    alerts = run_realtime_checks(db_path, config, fall_tracker=fall_tracker)
     for alert in alerts:
         logger.warning(
             "Gercek zamanli alarm: %s | seviye=%d | %s",
@@ -88,23 +113,35 @@ def daily_summary_job(
 
 
 def heartbeat_job(
-    db_path: str,
+    metrics_sampler: MetricsSampler,
     heartbeat_client: HeartbeatClient,
     mqtt_collector: MQTTCollector,
 ) -> None:
-    """Heartbeat VPS ping."""
-    metrics = collect_system_metrics(db_path)
+    """Heartbeat VPS ping (ortak metrik snapshot'i ile)."""
+    try:
+        metrics = metrics_sampler.get().metrics
+    except MetricsUnavailableError as exc:
+        logger.warning("Heartbeat atlandi, metrik yok: %s", exc)
+        return
     heartbeat_client.send(metrics, mqtt_collector.is_connected())
 
 
 def watchdog_job(
-    db_path: str,
+    metrics_sampler: MetricsSampler,
     mqtt_collector: MQTTCollector,
     alert_mgr: AlertManager,
+    window_seconds: float = 300.0,
 ) -> None:
-    """Sistem saglik kontrolu."""
-    metrics = collect_system_metrics(db_path)
-    status = run_health_checks(metrics, mqtt_collector.is_connected())
+    """Sistem saglik kontrolu (ortak metrik snapshot'i + gecmis pencere ozeti ile)."""
+    try:
+        metrics = metrics_sampler.get().metrics
+    except MetricsUnavailableError as exc:
+        logger.warning("Watchdog atlandi, metrik yok: %s", exc)
+        return
+    status = run_health_checks(
+        metrics, mqtt_collector.is_connected(),
+        windows=metrics_sampler.windows(window_seconds),
+    )
     if not status.all_healthy:
         for w in status.warnings:
             logger.warning("Watchdog: %s - %s", w.name, w.message)
@@ -1,7 +1,15 @@
 """Learner modulu - Beta-Binomial rutin ogrenme (Sprint 2)."""
 
-from src.learner.beta_model import BetaPosterior
+from src.learner.beta_model import BetaModelArray, BetaPosterior
 from src.learner.metrics import calculate_daily_metrics
+from src.learner.model_cache import ModelView, get_model_view
 from src.learner.routine_learner import run_daily_learning
 
-__all__ = ["BetaPosterior", "calculate_daily_metrics", "run_daily_learning"]
+__all__ = [
+    "BetaModelArray",
+    "BetaPosterior",
+    "ModelView",
+    "calculate_daily_metrics",
+    "get_model_view",
+    "run_daily_learning",
+]
@@ -1,12 +1,23 @@
 """Beta-Binomial model matematiksel cekirdegi.
 
 BetaPosterior dataclass'i: mean, variance, CI, NLL, Bayesian update.
-Harici bagimliligi yok (sadece stdlib math).
+BetaModelArray: tum kanal x 96 slot icin ayni islemler, duz float dizileri
+uzerinde toplu (nesne olusturmadan) hesaplanir.
+Harici bagimliligi yok (sadece stdlib math + array).
 """
 
+from __future__ import annotations
+
 import math
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 
+SLOTS = 96
+
+# Credible interval seviyesi -> normal yaklasim z degeri
+_Z_VALUES = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
+
 
 @dataclass
 class BetaPosterior:
@@ -41,7 +52,7 @@ class BetaPosterior:
         SciPy dogrulamasi: n>=7'de max %2 hata, n>=14'te ~%0.
         Uc degerlerde (p~0 veya p~1) hata artabilir.
         """
-        z = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}[level]
+        z = _Z_VALUES[level]
         lo = max(0.0, self.mean - z * self.std)
         hi = min(1.0, self.mean + z * self.std)
         return (lo, hi)
@@ -69,3 +80,199 @@ class BetaPosterior:
             return BetaPosterior(self.alpha + 1, self.beta)
         else:
             return BetaPosterior(self.alpha, self.beta + 1)
+
+
+def beta_means(alpha: Sequence[float], beta: Sequence[float]) -> array:
+    """Eleman bazli posterior ortalama: alpha / (alpha + beta)."""
+    return array("d", [a / (a + b) for a, b in zip(alpha, beta)])
+
+
+def beta_variances(alpha: Sequence[float], beta: Sequence[float]) -> array:
+    """Eleman bazli posterior varyans."""
+    return array("d", [
+        (a * b) / ((a + b) ** 2 * (a + b + 1)) for a, b in zip(alpha, beta)
+    ])
+
+
+def beta_ci_widths(
+    alpha: Sequence[float], beta: Sequence[float], level: float = 0.90
+) -> array:
+    """Eleman bazli credible interval genisligi (BetaPosterior.ci_width ile ayni)."""
+    z = _Z_VALUES[level]
+    sqrt = math.sqrt
+    widths = array("d")
+    for a, b in zip(alpha, beta):
+        n = a + b
+        m = a / n
+        half = z * sqrt((a * b) / (n ** 2 * (n + 1)))
+        widths.append(min(1.0, m + half) - max(0.0, m - half))
+    return widths
+
+
+class BetaModelArray:
+    """Kanal x 96 slot Beta posterior'lari, duz alpha/beta dizileri olarak.
+
+    Dizi duzeni satir-oncelikli: kanal i, slot s -> i * 96 + s.
+    model[channel][slot] erisimi BetaPosterior gorunumu dondurur (uyumluluk).
+
+    Args:
+        channels: Kanal listesi (satir sirasi)
+        alpha: len(channels) * 96 uzunlukta alpha degerleri
+        beta: len(channels) * 96 uzunlukta beta degerleri
+    """
+
+    __slots__ = ("_channels", "_index", "alpha", "beta")
+
+    def __init__(
+        self,
+        channels: Sequence[str],
+        alpha: Iterable[float],
+        beta: Iterable[float],
+    ):
+        self._channels = list(channels)
+        self._index = {ch: i for i, ch in enumerate(self._channels)}
+        # array / memoryview('d') kopyalanmadan kullanilir (snapshot zero-copy)
+        self.alpha = alpha if isinstance(alpha, (array, memoryview)) else array("d", alpha)
+        self.beta = beta if isinstance(beta, (array, memoryview)) else array("d", beta)
+        size = len(self._channels) * SLOTS
+        if len(self.alpha) != size or len(self.beta) != size:
+            raise ValueError(
+                f"alpha/beta uzunlugu {size} olmali "
+                f"({len(self.alpha)}/{len(self.beta)})"
+            )
+
+    @classmethod
+    def from_prior(
+        cls, channels: Sequence[str], prior_a: float = 1.0, prior_b: float = 1.0
+    ) -> BetaModelArray:
+        """Tum slotlar prior ile baslatilmis model."""
+        size = len(channels) * SLOTS
+        return cls(channels, array("d", [prior_a]) * size, array("d", [prior_b]) * size)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Mapping],
+        channels: Sequence[str],
+        prior_a: float = 1.0,
+        prior_b: float = 1.0,
+    ) -> BetaModelArray:
+        """model_state satirlarindan (slot, channel, alpha, beta) model kur.
+
+        Eksik slotlar prior ile kalir; listede olmayan kanallar atlanir.
+        """
+        model = cls.from_prior(channels, prior_a, prior_b)
+        index = model._index
+        for row in rows:
+            i = index.get(row["channel"])
+            s = row["slot"]
+            if i is not None and 0 <= s < SLOTS:
+                model.alpha[i * SLOTS + s] = row["alpha"]
+                model.beta[i * SLOTS + s] = row["beta"]
+        return model
+
+    @classmethod
+    def from_posteriors(
+        cls,
+        model: Mapping[str, Sequence[BetaPosterior]],
+        channels: Sequence[str] | None = None,
+    ) -> BetaModelArray:
+        """{channel: [96 BetaPosterior]} sozlugunden donustur."""
+        ch_list = list(channels) if channels is not None else list(model)
+        alpha = array("d")
+        beta = array("d")
+        for ch in ch_list:
+            posteriors = model[ch]
+            alpha.extend(p.alpha for p in posteriors[:SLOTS])
+            beta.extend(p.beta for p in posteriors[:SLOTS])
+        return cls(ch_list, alpha, beta)
+
+    @property
+    def channels(self) -> list[str]:
+        """Kanal listesi (satir sirasi)."""
+        return list(self._channels)
+
+    def offset(self, channel: str) -> int:
+        """Kanalin duz dizideki baslangic indeksi."""
+        return self._index[channel] * SLOTS
+
+    def posterior(self, channel: str, slot: int) -> BetaPosterior:
+        """Tek slotun skaler BetaPosterior gorunumu."""
+        i = self.offset(channel) + slot
+        return BetaPosterior(self.alpha[i], self.beta[i])
+
+    def __getitem__(self, channel: str) -> list[BetaPosterior]:
+        i = self.offset(channel)
+        return [
+            BetaPosterior(a, b)
+            for a, b in zip(self.alpha[i:i + SLOTS], self.beta[i:i + SLOTS])
+        ]
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self._index
+
+    def select(
+        self, channels: Sequence[str], prior_a: float = 1.0, prior_b: float = 1.0
+    ) -> BetaModelArray:
+        """Verilen kanal sirasiyla model; modelde olmayan kanallar prior ile."""
+        if list(channels) == self._channels:
+            return self
+        result = BetaModelArray.from_prior(channels, prior_a, prior_b)
+        for ch in channels:
+            if ch in self._index:
+                src, dst = self.offset(ch), result.offset(ch)
+                result.alpha[dst:dst + SLOTS] = array("d", self.alpha[src:src + SLOTS])
+                result.beta[dst:dst + SLOTS] = array("d", self.beta[src:src + SLOTS])
+        return result
+
+    def means(self) -> array:
+        """Tum slotlarin posterior ortalamasi (duz dizi)."""
+        return beta_means(self.alpha, self.beta)
+
+    def variances(self) -> array:
+        """Tum slotlarin posterior varyansi (duz dizi)."""
+        return beta_variances(self.alpha, self.beta)
+
+    def ci_widths(self, level: float = 0.90) -> array:
+        """Tum slotlarin credible interval genisligi (duz dizi)."""
+        return beta_ci_widths(self.alpha, self.beta, level)
+
+    def avg_ci_width(self) -> float:
+        """Ortalama 90% CI genisligi (model bossa 1.0)."""
+        widths = self.ci_widths()
+        return sum(widths) / len(widths) if widths else 1.0
+
+    def nll(
+        self,
+        slot_data: Mapping[str, Sequence[int]],
+        channels: Sequence[str] | None = None,
+    ) -> dict[str, float]:
+        """Kanal bazli toplam negative log-likelihood.
+
+        p [0.001, 0.999] araligina clamp edilir (BetaPosterior.nll ile ayni).
+        """
+        log = math.log
+        result = {}
+        for ch in channels if channels is not None else self._channels:
+            i = self.offset(ch)
+            total = 0.0
+            for a, b, obs in zip(
+                self.alpha[i:i + SLOTS], self.beta[i:i + SLOTS], slot_data[ch]
+            ):
+                p = max(0.001, min(0.999, a / (a + b)))
+                total -= log(p) if obs == 1 else log(1 - p)
+            result[ch] = total
+        return result
+
+    def update(self, slot_data: Mapping[str, Sequence[int]]) -> BetaModelArray:
+        """Tum slotlar icin Bayesian update (immutable - yeni model dondurur)."""
+        alpha = array("d", self.alpha)
+        beta = array("d", self.beta)
+        for ch in self._channels:
+            i = self.offset(ch)
+            for s, obs in enumerate(slot_data[ch][:SLOTS]):
+                if obs == 1:
+                    alpha[i + s] += 1
+                else:
+                    beta[i + s] += 1
+        return BetaModelArray(self._channels, alpha, beta)
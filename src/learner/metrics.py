@@ -6,9 +6,10 @@ Saf hesaplama modulu: DB erisimi yok, sadece veri + model alir, dict dondurur.
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
-from src.learner.beta_model import BetaPosterior
+from src.learner.beta_model import SLOTS, BetaModelArray, BetaPosterior
 
 if TYPE_CHECKING:
     from src.config import AppConfig
@@ -31,7 +32,7 @@ def get_channels_from_config(config: AppConfig) -> list[str]:
 
 def calculate_daily_metrics(
     slot_data: dict[str, list[int]],
-    model: dict[str, list[BetaPosterior]],
+    model: BetaModelArray | dict[str, list[BetaPosterior]],
     awake_start: int = 24,
     awake_end: int = 92,
     channels: list[str] | None = None,
@@ -40,7 +41,7 @@ def calculate_daily_metrics(
 
     Args:
         slot_data: {channel: [96 active degeri (0/1)]}
-        model: {channel: [96 BetaPosterior]}
+        model: BetaModelArray veya {channel: [96 BetaPosterior]}
         awake_start: Uyanik slot baslangici (default 24 = 06:00)
         awake_end: Uyanik slot bitisi (default 92 = 23:00)
         channels: Kanal listesi (None ise DEFAULT_CHANNELS)
@@ -50,34 +51,28 @@ def calculate_daily_metrics(
               aw_accuracy, aw_balanced_acc, aw_active_recall, avg_ci_width
     """
     ch_list = channels if channels is not None else list(DEFAULT_CHANNELS)
+    if not isinstance(model, BetaModelArray):
+        model = BetaModelArray.from_posteriors(model, ch_list)
+    means = model.means()
     metrics = {}
 
     # --- a) PER-SENSOR NLL (v3 duzeltmesi: her kanal ayri) ---
-    nll_per_channel = {}
-    for channel in ch_list:
-        nll = sum(
-            model[channel][s].nll(slot_data[channel][s])
-            for s in range(96)
-        )
-        nll_per_channel[channel] = nll
+    nll_per_channel = model.nll(slot_data, ch_list)
 
     for channel in ch_list:
         metrics[f"nll_{channel}"] = nll_per_channel[channel]
     metrics["nll_total"] = sum(nll_per_channel.values())
 
     # --- b) EVENT COUNT DEVIATION ---
-    expected = sum(
-        model[ch][s].mean
-        for ch in ch_list for s in range(96)
-    )
-    observed = sum(
-        slot_data[ch][s]
-        for ch in ch_list for s in range(96)
-    )
-    var_count = sum(
-        model[ch][s].mean * (1 - model[ch][s].mean)
-        for ch in ch_list for s in range(96)
-    )
+    expected = 0.0
+    var_count = 0.0
+    observed = 0
+    for ch in ch_list:
+        i = model.offset(ch)
+        for m in means[i:i + SLOTS]:
+            expected += m
+            var_count += m * (1 - m)
+        observed += sum(slot_data[ch][:SLOTS])
     count_z = (observed - expected) / math.sqrt(var_count) if var_count > 0 else 0.0
 
     metrics["expected_count"] = expected
@@ -85,39 +80,50 @@ def calculate_daily_metrics(
     metrics["count_z"] = count_z
 
     # --- c) AWAKE WINDOW ACCURACY ---
-    aw_metrics = _calculate_awake_accuracy(slot_data, model, awake_start, awake_end, ch_list)
+    aw_metrics = _calculate_awake_accuracy(
+        slot_data, model, awake_start, awake_end, ch_list, means=means
+    )
     metrics.update(aw_metrics)
 
     # --- d) CI WIDTH ---
-    ci_widths = [
-        model[ch][s].ci_width
-        for ch in ch_list for s in range(96)
-    ]
-    metrics["avg_ci_width"] = sum(ci_widths) / len(ci_widths) if ci_widths else 1.0
+    widths = model.ci_widths()
+    ci_total = 0.0
+    for ch in ch_list:
+        i = model.offset(ch)
+        ci_total += sum(widths[i:i + SLOTS])
+    n_slots = len(ch_list) * SLOTS
+    metrics["avg_ci_width"] = ci_total / n_slots if n_slots else 1.0
 
     return metrics
 
 
 def _calculate_awake_accuracy(
     slot_data: dict[str, list[int]],
-    model: dict[str, list[BetaPosterior]],
+    model: BetaModelArray | dict[str, list[BetaPosterior]],
     awake_start: int,
     awake_end: int,
     channels: list[str] | None = None,
+    means: Sequence[float] | None = None,
 ) -> dict:
     """Awake window (06:00-23:00) uzerinde accuracy metrikleri.
 
     Tahmin: mean >= 0.5 -> predicted active, aksi halde inactive.
+    means verilirse (BetaModelArray.means()) tekrar hesaplanmaz.
     """
     ch_list = channels if channels is not None else list(DEFAULT_CHANNELS)
+    if not isinstance(model, BetaModelArray):
+        model = BetaModelArray.from_posteriors(model, ch_list)
+    if means is None:
+        means = model.means()
     tp = 0  # true positive: predicted active, actually active
     tn = 0  # true negative: predicted inactive, actually inactive
     fp = 0  # false positive: predicted active, actually inactive
     fn = 0  # false negative: predicted inactive, actually active
 
     for ch in ch_list:
+        i = model.offset(ch)
         for s in range(awake_start, awake_end):
-            predicted = 1 if model[ch][s].mean >= 0.5 else 0
+            predicted = 1 if means[i + s] >= 0.5 else 0
             actual = slot_data[ch][s]
             if predicted == 1 and actual == 1:
                 tp += 1
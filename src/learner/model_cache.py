@@ -0,0 +1,120 @@
+"""Surec ici model onbellegi - model versiyonu basina bir kez hesaplanir.
+
+Model gunde bir kez (gece ogrenmesinde) degisir; dashboard, alerter ve
+Telegram ozeti ise her cagrida ayni posterior'lari okur. ModelView
+kayitli modeli ve ondan turetilen mean / CI genisligi / ortalama CI
+degerlerini tutar. Anahtar kalici model_snapshot.version (baska bir
+surecin, or. simulator CLI'nin yazdigi model de gorulur) ile surec ici
+"model" veri versiyonunun (yalnizca model_state satirlari olan eski
+DB'ler icin) ikilisidir; ogrenme sonrasi eski gorunum okunamaz.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from array import array
+from dataclasses import dataclass
+
+from src.database import get_data_version, get_db
+from src.learner.beta_model import SLOTS, BetaModelArray, beta_ci_widths
+from src.learner.model_store import load_model_with_ci_width
+
+logger = logging.getLogger("annem_guvende.learner")
+
+# Modelde olmayan kanallar icin Beta(1, 1) prior degerleri
+_PRIOR_MEAN = 0.5
+_PRIOR_CI_WIDTH = beta_ci_widths([1.0], [1.0])[0]
+
+
+@dataclass(frozen=True)
+class ModelView:
+    """Bir model versiyonunun onceden hesaplanmis salt-okunur gorunumu.
+
+    version: Olusturuldugu (model_snapshot.version, "model" veri versiyonu)
+    model: Kayitli model (snapshot veya model_state satirlari)
+    means: Duz posterior ortalama dizisi (model ile ayni duzen)
+    ci_widths: Duz 90% CI genislik dizisi
+    avg_ci_width: Kayitli posterior'larin ortalama CI genisligi
+    """
+
+    version: tuple[int, int]
+    model: BetaModelArray
+    means: array
+    ci_widths: array
+    avg_ci_width: float
+
+    @classmethod
+    def empty(cls) -> ModelView:
+        """Kayitli model yokken: tum kanallar prior, ortalama CI 1.0."""
+        return cls((0, 0), BetaModelArray([], [], []), array("d"), array("d"), 1.0)
+
+    def channel_means(self, channel: str) -> list[float]:
+        """Kanalin 96 slot ortalamasi (modelde yoksa prior)."""
+        if channel not in self.model:
+            return [_PRIOR_MEAN] * SLOTS
+        i = self.model.offset(channel)
+        return list(self.means[i:i + SLOTS])
+
+    def channel_ci_widths(self, channel: str) -> list[float]:
+        """Kanalin 96 slot CI genisligi (modelde yoksa prior)."""
+        if channel not in self.model:
+            return [_PRIOR_CI_WIDTH] * SLOTS
+        i = self.model.offset(channel)
+        return list(self.ci_widths[i:i + SLOTS])
+
+
+_cache: dict[str, ModelView] = {}
+_cache_lock = threading.Lock()
+
+
+def _model_version(db_path: str) -> tuple[int, int]:
+    """Kalici snapshot versiyonu (PK uzerinden tek okuma) + surec ici versiyon."""
+    # Surec ici versiyon DB okumasindan ONCE alinir: arada commit + bump
+    # olursa bir sonraki cagri yeni versiyonu gorur ve yeniden kurar.
+    local = get_data_version("model")
+    with get_db(db_path) as conn:
+        snapshot = conn.execute(
+            "SELECT COALESCE(MAX(version), 0) FROM model_snapshot"
+        ).fetchone()[0]
+    return snapshot, local
+
+
+def get_model_view(db_path: str) -> ModelView | None:
+    """Guncel model versiyonunun gorunumu (gerekirse DB'den kurulur).
+
+    Args:
+        db_path: Veritabani yolu
+
+    Returns:
+        ModelView veya hic model kaydi yoksa None (bu durum onbelleklenmez)
+    """
+    version = _model_version(db_path)
+    with _cache_lock:
+        view = _cache.get(db_path)
+    if view is not None and view.version == version:
+        return view
+
+    # Model ve ortalama CI tek okumadan: arada yazilan bir kayit iki model
+    # versiyonunu ayni gorunumde karistiramaz
+    loaded = load_model_with_ci_width(db_path)
+    if loaded is None:
+        return None
+    model, avg = loaded
+    view = ModelView(
+        version=version,
+        model=model,
+        means=model.means(),
+        ci_widths=model.ci_widths(),
+        avg_ci_width=avg,
+    )
+    with _cache_lock:
+        _cache[db_path] = view
+    logger.debug("Model onbellegi yenilendi: %s v%d", db_path, version[0])
+    return view
+
+
+def clear_model_cache() -> None:
+    """Onbellegi bosalt (testler ve DB degisimi icin)."""
+    with _cache_lock:
+        _cache.clear()
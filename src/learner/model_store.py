@@ -0,0 +1,208 @@
+"""Model kaliciligi - tek blob snapshot (model_snapshot tablosu).
+
+Her ogrenme calismasinda model tek satir olarak yazilir:
+  format=1: little-endian float64, once tum alpha sonra tum beta
+  (kanal-oncelikli, kanal x slots). Kanal listesi JSON olarak saklanir.
+
+Okuma zero-copy'dir: BLOB bytes'i memoryview.cast("d") ile dogrudan
+BetaModelArray'in alpha/beta dizisi olur. Snapshot yoksa (eski veritabani)
+model_state satirlarina dusulur.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import sys
+from array import array
+from collections.abc import Sequence
+
+from src.database import bump_data_version, get_db
+from src.learner.beta_model import SLOTS, BetaModelArray, beta_ci_widths
+
+logger = logging.getLogger("annem_guvende.learner")
+
+SNAPSHOT_FORMAT = 1
+
+# Geri donus icin saklanan son snapshot sayisi
+KEEP_SNAPSHOTS = 7
+
+_LEGACY_UPSERT_SQL = (
+    "INSERT INTO model_state (slot, channel, alpha, beta, last_updated) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (slot, channel) DO UPDATE SET "
+    "alpha = excluded.alpha, beta = excluded.beta, last_updated = excluded.last_updated"
+)
+
+
+def encode_model(model: BetaModelArray) -> bytes:
+    """Modeli format=1 blob'una cevir."""
+    data = array("d", model.alpha)
+    data.extend(model.beta)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def decode_model(channels: Sequence[str], blob: bytes) -> BetaModelArray:
+    """format=1 blob'undan model olustur (little-endian makinede kopyasiz).
+
+    Raises:
+        ValueError: Blob boyutu kanal sayisiyla uyusmuyorsa
+    """
+    n = len(channels) * SLOTS
+    if sys.byteorder == "little":
+        values = memoryview(blob).cast("d")
+    else:
+        swapped = array("d")
+        swapped.frombytes(blob)
+        swapped.byteswap()
+        values = memoryview(swapped)
+    if len(values) != 2 * n:
+        raise ValueError(f"Snapshot boyutu hatali: {len(values)} != {2 * n}")
+    return BetaModelArray(channels, values[:n], values[n:])
+
+
+def save_model(
+    db_path: str,
+    model: BetaModelArray,
+    trained_date: str,
+    legacy_rows: bool = True,
+) -> int:
+    """Modeli yeni bir snapshot versiyonu olarak atomik yaz.
+
+    Args:
+        db_path: Veritabani yolu
+        model: Kaydedilecek model
+        trained_date: Modelin egitildigi son gun (YYYY-MM-DD)
+        legacy_rows: True ise ayni transaction'da model_state de guncellenir
+
+    Returns:
+        Yazilan snapshot versiyonu
+    """
+    blob = encode_model(model)
+    with get_db(db_path) as conn:
+        version = conn.execute(
+            "SELECT COALESCE(MAX(version), 0) + 1 FROM model_snapshot"
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT INTO model_snapshot "
+            "(version, format, channels, slots, data, trained_date) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (version, SNAPSHOT_FORMAT, json.dumps(model.channels), SLOTS, blob, trained_date),
+        )
+        conn.execute(
+            "DELETE FROM model_snapshot WHERE version <= ?",
+            (version - KEEP_SNAPSHOTS,),
+        )
+        if legacy_rows:
+            rows = []
+            for ch in model.channels:
+                i = model.offset(ch)
+                for s in range(SLOTS):
+                    rows.append((s, ch, model.alpha[i + s], model.beta[i + s], trained_date))
+            conn.executemany(_LEGACY_UPSERT_SQL, rows)
+        conn.commit()
+    # Commit'ten sonra: model onbellegi bu versiyonla yeniden kurulur
+    bump_data_version("model")
+
+    logger.debug("Model snapshot yazildi: v%d (%d bayt)", version, len(blob))
+    return version
+
+
+def load_model_snapshot(conn: sqlite3.Connection) -> BetaModelArray | None:
+    """En son snapshot'i oku.
+
+    Returns:
+        BetaModelArray veya snapshot yoksa / okunamazsa None
+    """
+    row = conn.execute(
+        "SELECT version, format, channels, slots, data FROM model_snapshot "
+        "ORDER BY version DESC LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return None
+    if row["format"] != SNAPSHOT_FORMAT or row["slots"] != SLOTS:
+        logger.error("Desteklenmeyen model snapshot: v%d format=%d", row["version"], row["format"])
+        return None
+    try:
+        return decode_model(json.loads(row["channels"]), row["data"])
+    except ValueError as exc:
+        logger.error("Model snapshot okunamadi (v%d): %s", row["version"], exc)
+        return None
+
+
+def average_ci_width(conn: sqlite3.Connection) -> float | None:
+    """Kayitli modelin ortalama 90% CI genisligi.
+
+    Snapshot varsa ondan, yoksa mevcut model_state satirlarindan hesaplar.
+
+    Returns:
+        Ortalama CI genisligi veya hic model kaydi yoksa None
+    """
+    model = load_model_snapshot(conn)
+    if model is not None:
+        return model.avg_ci_width()
+    rows = conn.execute("SELECT alpha, beta FROM model_state").fetchall()
+    if not rows:
+        return None
+    widths = beta_ci_widths([r["alpha"] for r in rows], [r["beta"] for r in rows])
+    return sum(widths) / len(widths)
+
+
+def load_model_with_ci_width(db_path: str) -> tuple[BetaModelArray, float] | None:
+    """Kayitli modeli ve ortalama 90% CI genisligini tek okumada yukle.
+
+    Ikisi ayni snapshot / satir kumesinden hesaplanir (arada yazilan bir
+    kayit iki versiyonu karistiramaz). model_state yolunda ortalama yalnizca
+    kayitli satirlar uzerindendir (average_ci_width ile ayni).
+
+    Returns:
+        (model, ortalama CI) veya hic model kaydi yoksa None
+    """
+    with get_db(db_path) as conn:
+        model = load_model_snapshot(conn)
+        if model is not None:
+            return model, model.avg_ci_width()
+        rows = conn.execute("SELECT slot, channel, alpha, beta FROM model_state").fetchall()
+    if not rows:
+        return None
+    model = BetaModelArray.from_rows(rows, list(dict.fromkeys(r["channel"] for r in rows)))
+    widths = beta_ci_widths([r["alpha"] for r in rows], [r["beta"] for r in rows])
+    return model, sum(widths) / len(widths)
+
+
+def load_model(
+    db_path: str,
+    channels: Sequence[str] | None = None,
+    prior_a: float = 1.0,
+    prior_b: float = 1.0,
+) -> BetaModelArray | None:
+    """Kayitli modeli yukle: once snapshot, yoksa model_state satirlari.
+
+    Args:
+        db_path: Veritabani yolu
+        channels: Istenen kanal sirasi (None ise kayittaki kanallar)
+        prior_a: Eksik kanal/slot icin alpha
+        prior_b: Eksik kanal/slot icin beta
+
+    Returns:
+        BetaModelArray veya hic model kaydi yoksa None
+    """
+    with get_db(db_path) as conn:
+        model = load_model_snapshot(conn)
+        if model is None:
+            rows = conn.execute(
+                "SELECT slot, channel, alpha, beta FROM model_state"
+            ).fetchall()
+            if not rows:
+                return None
+            ch_list = channels if channels is not None else list(
+                dict.fromkeys(r["channel"] for r in rows)
+            )
+            return BetaModelArray.from_rows(rows, ch_list, prior_a, prior_b)
+
+    if channels is None:
+        return model
+    return model.select(channels, prior_a, prior_b)
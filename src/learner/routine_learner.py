@@ -5,7 +5,7 @@ Her gece 00:15'te calisir:
 2. Mevcut model_state'i yukle (yoksa baslat)
 3. GUNCELLEME ONCESI metrikleri hesapla (modeli ne kadar sasirtti?)
 4. Posteriori guncelle (Bayesian update)
-5. model_state'e kaydet
+5. Modeli kaydet (model_snapshot blob; opsiyonel model_state satirlari)
 6. daily_scores'a yaz (composite_z=0.0; detector uzerine yazar)
 """
 
@@ -13,9 +13,10 @@ import logging
 from datetime import datetime, timedelta
 
 from src.config import AppConfig
-from src.database import get_db
-from src.learner.beta_model import BetaPosterior
+from src.database import bump_data_version, get_db
+from src.learner.beta_model import BetaModelArray
 from src.learner.metrics import DEFAULT_CHANNELS, calculate_daily_metrics, get_channels_from_config
+from src.learner.model_store import load_model, save_model
 
 logger = logging.getLogger("annem_guvende.learner")
 
@@ -62,8 +63,11 @@ def run_daily_learning(
     # 4. Posterior guncelle
     updated_model = _update_posteriors(model, slot_data, channels=channels)
 
-    # 5. model_state'e kaydet
-    _save_model_state(db_path, updated_model, target_date, channels=channels)
+    # 5. Modeli kaydet (model_snapshot blob; opsiyonel model_state satirlari)
+    _save_model_state(
+        db_path, updated_model, target_date,
+        legacy_rows=config.model.legacy_model_rows,
+    )
 
     # 6. daily_scores'a yaz (composite_z=0.0; detector overwrite edecek)
     train_days = _count_train_days(db_path)
@@ -119,81 +123,40 @@ def _load_slot_data(
 
 def _load_or_initialize_model(
     db_path: str, prior_a: float, prior_b: float, channels: list[str] | None = None
-) -> dict[str, list[BetaPosterior]]:
-    """model_state'ten yukle; bossa N*96 satirlik prior ekle.
+) -> BetaModelArray:
+    """Kayitli modeli yukle (snapshot, yoksa model_state); hic yoksa prior.
 
     Returns:
-        {channel: [96 BetaPosterior]}
+        BetaModelArray (kanal x 96 slot)
     """
     ch_list = channels if channels is not None else list(DEFAULT_CHANNELS)
-    with get_db(db_path) as conn:
-        rows = conn.execute(
-            "SELECT slot, channel, alpha, beta FROM model_state"
-        ).fetchall()
-
-    if rows:
-        model: dict[str, list[BetaPosterior]] = {
-            ch: [BetaPosterior(prior_a, prior_b) for _ in range(96)]
-            for ch in ch_list
-        }
-        for row in rows:
-            ch = row["channel"]
-            s = row["slot"]
-            if ch in model and 0 <= s < 96:
-                model[ch][s] = BetaPosterior(row["alpha"], row["beta"])
+    model = load_model(db_path, ch_list, prior_a, prior_b)
+    if model is not None:
         return model
 
-    # Ilk calisma: N*96 satir INSERT
-    with get_db(db_path) as conn:
-        for ch in ch_list:
-            for s in range(96):
-                conn.execute(
-                    "INSERT INTO model_state (slot, channel, alpha, beta) "
-                    "VALUES (?, ?, ?, ?)",
-                    (s, ch, prior_a, prior_b),
-                )
-        conn.commit()
-    logger.info("model_state baslatildi: %d satir (%d kanal x 96 slot)",
-                len(ch_list) * 96, len(ch_list))
-
-    return {
-        ch: [BetaPosterior(prior_a, prior_b) for _ in range(96)]
-        for ch in ch_list
-    }
+    logger.info("Model baslatildi: %d kanal x 96 slot, prior=(%.1f, %.1f)",
+                len(ch_list), prior_a, prior_b)
+    return BetaModelArray.from_prior(ch_list, prior_a, prior_b)
 
 
 def _update_posteriors(
-    model: dict[str, list[BetaPosterior]],
+    model: BetaModelArray,
     slot_data: dict[str, list[int]],
     channels: list[str] | None = None,
-) -> dict[str, list[BetaPosterior]]:
+) -> BetaModelArray:
     """Tum slotlar icin Bayesian update (immutable - yeni model dondurur)."""
-    ch_list = channels if channels is not None else list(DEFAULT_CHANNELS)
-    updated = {}
-    for ch in ch_list:
-        updated[ch] = [
-            model[ch][s].update(slot_data[ch][s]) for s in range(96)
-        ]
-    return updated
+    return model.update(slot_data)
 
 
 def _save_model_state(
     db_path: str,
-    model: dict[str, list[BetaPosterior]],
+    model: BetaModelArray,
     date: str,
-    channels: list[str] | None = None,
+    legacy_rows: bool = True,
 ) -> None:
-    """Guncellenmis model_state'i DB'ye yaz."""
-    ch_list = channels if channels is not None else list(DEFAULT_CHANNELS)
-    with get_db(db_path) as conn:
-        for ch in ch_list:
-            for s in range(96):
-                conn.execute(
-                    "UPDATE model_state SET alpha = ?, beta = ?, last_updated = ? "
-                    "WHERE slot = ? AND channel = ?",
-                    (model[ch][s].alpha, model[ch][s].beta, date, s, ch),
-                )
-        conn.commit()
+    """Guncellenmis modeli tek snapshot olarak yaz (opsiyonel model_state)."""
+    version = save_model(db_path, model, date, legacy_rows=legacy_rows)
+    logger.debug("Model kaydedildi: v%d (%s)", version, date)
 
 
 def _count_train_days(db_path: str) -> int:
@@ -236,3 +199,4 @@ def _save_daily_scores(
             ),
         )
         conn.commit()
+    bump_data_version("scores")
@@ -9,24 +9,34 @@ import logging
 import os
 import secrets
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import RedirectResponse
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 
 from src.alerter import AlertManager, TelegramNotifier
-from src.collector import MQTTCollector
+from src.collector import MQTTCollector, SlotAccumulator
 from src.config import load_config
 from src.dashboard import dashboard_router
+from src.dashboard.data_access import DashboardReader
+from src.dashboard.event_hub import EventHub
+from src.dashboard.response_cache import ResponseCache
+from src.dashboard.static_assets import StaticAssets
 from src.database import (
+    close_all_connections,
+    configure_event_partitions,
+    configure_query_profiling,
     get_system_state,
     init_db,
     set_system_state,
 )
+from src.detector import RealtimeMonitor
 from src.heartbeat import (
     HeartbeatClient,
+    MetricsHistory,
+    MetricsSampler,
     collect_system_metrics,
     run_health_checks,
 )
@@ -45,6 +55,8 @@ from src.jobs import (
     watchdog_job,
     weekly_trend_job,
 )
+from src.scheduler import JobRunner
+from src.telemetry import OPENMETRICS_CONTENT_TYPE, REGISTRY, register_stats
 
 # Loglama ayarlari
 logging.basicConfig(
@@ -124,7 +136,16 @@ async def lifespan(app: FastAPI):
         )
         raise SystemExit(1)
 
+    # Profilleme baglanti acilirken secilir: init_db'den once
+    configure_query_profiling(
+        config.database.profile_queries, config.database.slow_query_ms,
+    )
     init_db(db_path)
+    try:
+        configure_event_partitions(db_path, config.database.partition_events)
+    except ValueError as exc:
+        # Veri kaybetmektense mevcut duzenle devam et
+        logger.error("sensor_events bolumleme degistirilemedi: %s", exc)
     app.state.db_path = db_path
     logger.info("Veritabani hazir: %s", db_path)
 
@@ -159,8 +180,16 @@ async def lifespan(app: FastAPI):
         set_system_state(db_path, "vacation_mode", initial_vacation)
         logger.info("Tatil modu baslatildi: %s", initial_vacation)
 
+    # Dashboard canli akis hub'i (SSE): collector ve alarm yoneticisi yayinlar
+    event_hub = EventHub(
+        config.dashboard.stream_buffer_size, config.dashboard.stream_max_clients,
+    )
+    app.state.event_hub = event_hub
+
     # MQTT collector
     mqtt_collector = MQTTCollector(config, db_path)
+    mqtt_collector.add_connection_listener(event_hub.on_mqtt_state)
+    mqtt_collector.add_event_listener(event_hub.on_sensor_event)
     try:
         mqtt_collector.start()
         logger.info("MQTT collector baslatildi")
@@ -168,11 +197,19 @@ async def lifespan(app: FastAPI):
         logger.warning("MQTT baglantisi basarisiz, 30sn sonra tekrar denenir: %s", exc)
     app.state.mqtt_collector = mqtt_collector
 
-    # APScheduler
-    scheduler = AsyncIOScheduler(timezone="Europe/Istanbul")
-    scheduler.start()
-    app.state.scheduler = scheduler
-    logger.info("APScheduler baslatildi")
+    # APScheduler: tetikleyiciler event loop'ta, job govdeleri sinirli thread havuzunda
+    job_runner = JobRunner(config.scheduler, timezone="Europe/Istanbul")
+    job_runner.start()
+    app.state.job_runner = job_runner
+    app.state.scheduler = job_runner.scheduler
+
+    # Dashboard okuma havuzu (salt-okunur baglanti, sorgu zaman butcesi)
+    dashboard_reader = DashboardReader(
+        config.dashboard.read_workers, config.dashboard.query_budget_ms,
+    )
+    app.state.dashboard_reader = dashboard_reader
+    response_cache = ResponseCache()
+    app.state.response_cache = response_cache
 
     # Telegram bildirim
     notifier = TelegramNotifier(
@@ -180,6 +217,7 @@ async def lifespan(app: FastAPI):
         chat_ids=config.telegram.chat_ids,
     )
     alert_mgr = AlertManager(config, notifier)
+    alert_mgr.set_alert_listener(event_hub.on_alert)
     app.state.alert_manager = alert_mgr
     logger.info("Bildirim sistemi hazir (enabled=%s)", notifier.enabled)
 
@@ -192,51 +230,113 @@ async def lifespan(app: FastAPI):
 
     mqtt_collector.set_battery_callback(battery_alert_callback)
 
+    # Mesaj firtinasi yapan sensor karantinaya alininca tek bildirim.
+    # Callback paho network thread'inde gelir: Telegram gonderimi (chat basina
+    # 10 sn timeout) zamanlayici havuzunda, tek seferlik job olarak yapilir
+    def quarantine_alert_callback(sensor_id: str, rate: float) -> None:
+        from src.alerter.message_templates import render_sensor_quarantine
+
+        text = render_sensor_quarantine(sensor_id, rate, config.collector.quarantine_minutes)
+        job_runner.add_job(
+            lambda: notifier.send_to_all(text), "date",
+            id=f"quarantine_notice_{sensor_id}", replace_existing=True,
+        )
+
+    mqtt_collector.set_quarantine_callback(quarantine_alert_callback)
+
+    # Event-driven dusme / sessizlik zamanlayicilari (cron yedek olarak kalir)
+    realtime_monitor = RealtimeMonitor(
+        db_path, config,
+        lambda alert: alert_mgr.handle_realtime_alert(alert, db_path=db_path),
+        fall_tracker=mqtt_collector.fall_tracker,
+    )
+    realtime_monitor.start()
+    mqtt_collector.add_event_listener(realtime_monitor.on_event)
+    app.state.realtime_monitor = realtime_monitor
+
     from src.learner.metrics import get_channels_from_config
     channels = get_channels_from_config(config)
     retention_days = config.database.retention_days
 
+    # Canli slot sayaclari (slot sinirinda sensor_events taranmaz)
+    slot_accumulator = SlotAccumulator(db_path, channels)
+    mqtt_collector.add_event_listener(slot_accumulator.add)
+    app.state.slot_accumulator = slot_accumulator
+
     # --- Scheduler Job'lari ---
-    scheduler.add_job(
-        lambda: slot_aggregation_job(db_path, channels),
+    job_runner.add_job(
+        lambda: slot_aggregation_job(db_path, channels, slot_accumulator),
         "cron", minute="0,15,30,45",
         id="slot_aggregator", name="15dk slot ozetleme", replace_existing=True,
     )
-    scheduler.add_job(
+    job_runner.add_job(
         lambda: fill_yesterday_slots_job(db_path, channels),
         "cron", hour=0, minute=5,
         id="fill_missing_slots", name="Eksik slot doldurma", replace_existing=True,
     )
-    scheduler.add_job(
+    job_runner.add_job(
         lambda: daily_learning_job(db_path, config),
         "cron", hour=0, minute=15,
         id="daily_learning", name="Gunluk model ogrenme", replace_existing=True,
     )
-    scheduler.add_job(
+    job_runner.add_job(
         lambda: daily_scoring_job(db_path, config, alert_mgr),
         "cron", hour=0, minute=20,
         id="daily_scoring", name="Gunluk anomali skorlama", replace_existing=True,
     )
-    scheduler.add_job(
-        lambda: realtime_checks_job(db_path, config, alert_mgr),
+    job_runner.add_job(
+        lambda: realtime_checks_job(
+            db_path, config, alert_mgr, mqtt_collector.fall_tracker
+        ),
         "cron", minute="0,30",
         id="realtime_checks", name="Gercek zamanli kontroller", replace_existing=True,
     )
-    scheduler.add_job(
+    job_runner.add_job(
         lambda: daily_summary_job(db_path, config, alert_mgr),
         "cron", hour=22, minute=0,
         id="daily_summary", name="Gunluk ozet (22:00)", replace_existing=True,
     )
 
     # Haftalik kirilganlik trend raporu (Pazar 10:00)
-    scheduler.add_job(
+    job_runner.add_job(
         lambda: weekly_trend_job(db_path, config, alert_mgr),
         "cron", day_of_week="sun", hour=10, minute=0,
         id="weekly_trend", name="Haftalik kirilganlik trend raporu",
         replace_existing=True,
     )
 
-    # Heartbeat + Watchdog
+    # Heartbeat + Watchdog + saglik endpoint'leri: ortak metrik snapshot'i
+    metrics_sampler = MetricsSampler(
+        db_path,
+        interval_seconds=config.heartbeat.metrics_interval_seconds,
+        fresh_min_interval_seconds=config.heartbeat.metrics_fresh_min_seconds,
+        collect=collect_system_metrics,
+        history=MetricsHistory(config.heartbeat.history_capacity),
+        history_interval_seconds=config.heartbeat.history_interval_seconds,
+    )
+    metrics_sampler.start()
+    app.state.metrics_sampler = metrics_sampler
+
+    # /metrics: bilesenlerin kendi sayaclari scrape aninda okunur
+    def system_stats() -> dict:
+        snapshot = metrics_sampler.get()
+        return {**asdict(snapshot.metrics), "age_seconds": snapshot.age_seconds}
+
+    register_stats("system", system_stats, "Sistem metrikleri snapshot'i")
+    register_stats(
+        "event_writer", mqtt_collector.writer_stats, "Event yazici",
+        counters=(
+            "events_written", "batches_written", "dropped", "write_errors",
+            "spooled", "replayed", "replay_duplicates", "spool_corrupt",
+        ),
+    )
+    register_stats("storm_guard", mqtt_collector.storm_stats, "Sensor firtina korumasi")
+    register_stats("stream", event_hub.stats, "Canli akis", counters=("evictions",))
+    register_stats(
+        "response_cache", response_cache.stats, "Dashboard yanit onbellegi",
+        counters=("hits", "misses", "not_modified"),
+    )
+
     heartbeat_client = HeartbeatClient(
         url=config.heartbeat.url,
         device_id=config.heartbeat.device_id,
@@ -245,27 +345,30 @@ async def lifespan(app: FastAPI):
 
     if heartbeat_client.enabled:
         interval = config.heartbeat.interval_seconds
-        scheduler.add_job(
-            lambda: heartbeat_job(db_path, heartbeat_client, mqtt_collector),
+        job_runner.add_job(
+            lambda: heartbeat_job(metrics_sampler, heartbeat_client, mqtt_collector),
             "interval", seconds=interval,
             id="heartbeat", name="Heartbeat (VPS ping)", replace_existing=True,
         )
         logger.info("Heartbeat aktif: %s (her %d sn)", config.heartbeat.url, interval)
 
-    scheduler.add_job(
-        lambda: watchdog_job(db_path, mqtt_collector, alert_mgr),
+    job_runner.add_job(
+        lambda: watchdog_job(
+            metrics_sampler, mqtt_collector, alert_mgr,
+            config.heartbeat.watchdog_window_seconds,
+        ),
         "cron", minute="0,15,30,45",
         id="system_watchdog", name="Sistem saglik kontrolu", replace_existing=True,
     )
     logger.info("Sistem watchdog aktif (15dk araliklarla)")
 
-    scheduler.add_job(
+    job_runner.add_job(
         lambda: mqtt_retry_job(mqtt_collector),
         "interval", seconds=30,
         id="mqtt_retry", name="MQTT yeniden baglanti", replace_existing=True,
     )
 
-    scheduler.add_job(
+    job_runner.add_job(
         lambda: nightly_maintenance_job(db_path, retention_days),
         "cron", hour=3, minute=0,
         id="nightly_maintenance", name="Gece DB bakimi (03:00)", replace_existing=True,
@@ -274,7 +377,7 @@ async def lifespan(app: FastAPI):
 
     # Telegram komut polling
     if notifier.enabled:
-        scheduler.add_job(
+        job_runner.add_job(
             lambda: telegram_command_job(db_path, config, notifier),
             "interval", seconds=30,
             id="telegram_commands", name="Telegram komut isleme",
@@ -284,7 +387,7 @@ async def lifespan(app: FastAPI):
 
     # Eskalasyon kontrolu (her 2dk)
     if notifier.enabled and config.telegram.emergency_chat_ids:
-        scheduler.add_job(
+        job_runner.add_job(
             lambda: escalation_check_job(db_path, config, notifier),
             "interval", minutes=2,
             id="escalation_check", name="Eskalasyon kontrolu",
@@ -295,10 +398,14 @@ async def lifespan(app: FastAPI):
     yield
 
     # --- Kapanma (Shutdown) ---
+    realtime_monitor.stop()
     mqtt_collector.stop()
-    scheduler.shutdown(wait=False)
+    job_runner.shutdown(wait=False)
+    metrics_sampler.stop()
+    dashboard_reader.close()
     notifier.close()
     logger.info("APScheduler durduruldu")
+    close_all_connections()
     logger.info("Uygulama kapaniyor")
 
 
@@ -316,6 +423,10 @@ app.add_middleware(
     password=_boot_config.dashboard.password,
 )
 
+# JSON yanitlari (orn. /api/bundle) icin gzip; onceden sikistirilmis statik
+# dosyalar ve SSE akisi middleware tarafindan atlanir
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(dashboard_router)
 
 
@@ -326,12 +437,19 @@ async def root_redirect():
 
 
 @app.get("/health")
-async def health_check(response: Response):
-    """Sistem saglik kontrolu endpoint'i."""
+async def health_check(response: Response, fresh: bool = False):
+    """Sistem saglik kontrolu endpoint'i (onbellekteki metrik snapshot'i).
+
+    ?fresh=1 olcumu zorla yeniler (hiz sinirli). Yenileme (psutil + DB
+    sorgulari) event loop'u bloklamamak icin okuma havuzunda calisir.
+    """
     try:
-        metrics = collect_system_metrics(app.state.db_path)
+        sampler = app.state.metrics_sampler
+        snapshot = await app.state.dashboard_reader.run(sampler.get, fresh)
+        metrics = snapshot.metrics
         mqtt_ok = app.state.mqtt_collector.is_connected()
-        status = run_health_checks(metrics, mqtt_ok)
+        windows = sampler.windows(app.state.config.heartbeat.watchdog_window_seconds)
+        status = run_health_checks(metrics, mqtt_ok, windows=windows)
         return {
             "status": "ok" if status.all_healthy else "degraded",
             "version": "0.1.0",
@@ -344,15 +462,29 @@ async def health_check(response: Response):
                 "db_size_mb": round(metrics.db_size_mb, 2),
                 "today_event_count": metrics.today_event_count,
             },
+            "metrics_age_seconds": round(snapshot.age_seconds, 1),
         }
     except Exception as exc:
         response.status_code = 503
         return {"status": "error", "reason": str(exc), "version": "0.1.0"}
 
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """OpenMetrics (Prometheus) metin cikisi: sayaclar, histogramlar, bilesen istatistikleri.
+
+    Render kayitli tum stats fonksiyonlarini cagirir (system_stats TTL
+    dolduysa psutil + DB okur); event loop'u bloklamamak icin okuma
+    havuzunda calisir.
+    """
+    body = await app.state.dashboard_reader.run(REGISTRY.render)
+    return Response(body, media_type=OPENMETRICS_CONTENT_TYPE)
+
+
+# Statik dosyalar: acilista bir kez gzip/br + icerik hash'li ad (immutable onbellek)
 _static_dir = os.path.join(os.path.dirname(__file__), "dashboard", "static")
 if os.path.isdir(_static_dir):
-    app.mount("/static", StaticFiles(directory=_static_dir), name="static")
+    app.mount("/static", StaticAssets(_static_dir), name="static")
 
 
 if __name__ == "__main__":
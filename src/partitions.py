@@ -0,0 +1,407 @@
+"""sensor_events icin aylik bolumleme (opsiyonel, database.partition_events).
+
+Acikken her ayin eventleri ayni DB dosyasinda ayri bir tabloda tutulur
+(sensor_events_pYYYYMM) ve sensor_events bunlarin UNION ALL view'i olur:
+mevcut sorgular degismeden calisir, view'a INSERT / DELETE trigger'larla
+ilgili aya yonlenir. Retention satir satir DELETE yerine tum ay
+tablosunu DROP eder (indeks sayfasi yeniden yazimi / WAL sismesi yok).
+
+Sicak okuyucular events_source() ile yalnizca zaman araligina dusen
+ay tablolarini sorgular; yazicilar insert_events() ile dogrudan ay
+tablosuna yazar (ay tablosu ilk eventte olusturulur).
+
+Tum fonksiyonlar acik bir baglanti alir; commit cagirana aittir.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+from collections.abc import Iterable
+
+logger = logging.getLogger("annem_guvende.partitions")
+
+VIEW_NAME = "sensor_events"
+PARTITION_PREFIX = "sensor_events_p"
+
+_COLUMNS = "id, timestamp, sensor_id, channel, event_type, value, created_at"
+_INSERT_COLUMNS = "timestamp, sensor_id, channel, event_type, value"
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+
+_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp   TEXT NOT NULL,
+        sensor_id   TEXT NOT NULL,
+        channel     TEXT NOT NULL,
+        event_type  TEXT NOT NULL DEFAULT 'state_change',
+        value       TEXT,
+        created_at  TEXT DEFAULT (datetime('now'))
+    )
+"""
+
+# Bolumlu tabloda (timestamp) indeksi ayri tutulmaz: (timestamp, channel)
+# ayni on eki kapsar, yazma basina bir indeks daha az guncellenir.
+_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_{name}_ts_channel ON {name}(timestamp, channel)",
+    "CREATE INDEX IF NOT EXISTS idx_{name}_channel ON {name}(channel, timestamp)",
+)
+
+# Bolumsuz duzene donuste tek tablo semasi (MIGRATIONS v1 + v5 ile ayni)
+_PLAIN_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_events_ts ON sensor_events(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_events_channel ON sensor_events(channel, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_events_ts_channel ON sensor_events(timestamp, channel)",
+)
+
+# Ay tablosunun id baslangici: YYYYMM * 10^10 (bolumler arasi id cakismaz)
+_ID_BASE = 10**10
+
+
+def partition_name(month: str) -> str:
+    """'2025-02' -> 'sensor_events_p202502'"""
+    return f"{PARTITION_PREFIX}{month[:4]}{month[5:7]}"
+
+
+def _month_of(name: str) -> str:
+    suffix = name[len(PARTITION_PREFIX):]
+    return f"{suffix[:4]}-{suffix[4:6]}"
+
+
+def _next_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year + 1:04d}-01" if mon == 12 else f"{year:04d}-{mon + 1:02d}"
+
+
+def is_partitioned(conn: sqlite3.Connection) -> bool:
+    """sensor_events bolumlu view mi (tablo degil)?"""
+    row = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = ?", (VIEW_NAME,)
+    ).fetchone()
+    return row is not None and row[0] == "view"
+
+
+def list_partitions(conn: sqlite3.Connection) -> list[str]:
+    """Mevcut ay bolumleri, eskiden yeniye ('YYYY-MM' listesi)."""
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? "
+        "ORDER BY name",
+        (f"{PARTITION_PREFIX}[0-9][0-9][0-9][0-9][0-9][0-9]",),
+    ).fetchall()
+    return [_month_of(row[0]) for row in rows]
+
+
+def _union(months: Iterable[str]) -> str:
+    return " UNION ALL ".join(
+        f"SELECT {_COLUMNS} FROM {partition_name(m)}" for m in months
+    )
+
+
+def _layout(conn: sqlite3.Connection) -> list[str] | None:
+    """Tek sqlite_master okumasi: bolumsuz ise None, degilse ay listesi."""
+    rows = conn.execute(
+        "SELECT name, type FROM sqlite_master WHERE name = ? "
+        "OR (type = 'table' AND name GLOB ?) ORDER BY name",
+        (VIEW_NAME, f"{PARTITION_PREFIX}[0-9][0-9][0-9][0-9][0-9][0-9]"),
+    ).fetchall()
+    if not any(name == VIEW_NAME and kind == "view" for name, kind in rows):
+        return None
+    return [_month_of(name) for name, _ in rows if name != VIEW_NAME]
+
+
+def events_source(
+    conn: sqlite3.Connection, start: str | None = None, end: str | None = None
+) -> str:
+    """[start, end) zaman araligi icin FROM ifadesi (query router).
+
+    Bolumleme kapaliyken "sensor_events"; aciksa yalnizca araliga dusen
+    ay tablolari: tek ay ise tablonun kendisi, birden fazla ise UNION ALL
+    alt sorgusu. Kolonlar sensor_events ile aynidir.
+
+    Args:
+        conn: Acik DB baglantisi
+        start: Dahil alt sinir (ISO timestamp veya tarih), None ise sinirsiz
+        end: Haric ust sinir, None ise sinirsiz
+
+    Returns:
+        SQL FROM ifadesi
+    """
+    partitions = _layout(conn)
+    if partitions is None:
+        return VIEW_NAME
+    months = [
+        m for m in partitions
+        if (start is None or m >= start[:7]) and (end is None or m <= end[:7])
+    ]
+    if not months:
+        return f"(SELECT {_COLUMNS} FROM {VIEW_NAME} WHERE 0)"
+    if len(months) == 1:
+        return partition_name(months[0])
+    return f"({_union(months)})"
+
+
+def latest_event(
+    conn: sqlite3.Connection, columns: str = "timestamp, sensor_id, channel"
+) -> sqlite3.Row | None:
+    """En son event satiri (ORDER BY timestamp DESC LIMIT 1).
+
+    Bolumlu duzende en yeni aydan geriye dogru tek tablo sorgulanir;
+    tum ay tablolarinin birlesimi siralanmaz.
+    """
+    sql = f"SELECT {columns} FROM {{}} ORDER BY timestamp DESC LIMIT 1"
+    partitions = _layout(conn)
+    if partitions is None:
+        return conn.execute(sql.format(VIEW_NAME)).fetchone()
+    for month in reversed(partitions):
+        row = conn.execute(sql.format(partition_name(month))).fetchone()
+        if row is not None:
+            return row
+    return None
+
+
+def _begin(conn: sqlite3.Connection) -> None:
+    """Sema degisikligi icin yazma kilidi (acik transaction yoksa)."""
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+def _create_partition(conn: sqlite3.Connection, month: str) -> None:
+    name = partition_name(month)
+    conn.execute(_TABLE_DDL.format(name=name))
+    for ddl in _INDEX_DDL:
+        conn.execute(ddl.format(name=name))
+    seq = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = ?", (name,)
+    ).fetchone()
+    if seq is None:
+        conn.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+            (name, int(month[:4] + month[5:7]) * _ID_BASE),
+        )
+
+
+def _rebuild_view(conn: sqlite3.Connection) -> None:
+    """sensor_events view'ini ve INSERT / DELETE trigger'larini yeniden yaz."""
+    months = list_partitions(conn)
+    conn.execute(f"DROP VIEW IF EXISTS {VIEW_NAME}")
+    if months:
+        body = _union(months)
+    else:
+        body = (
+            "SELECT CAST(NULL AS INTEGER) AS id, NULL AS timestamp, NULL AS sensor_id, "
+            "NULL AS channel, NULL AS event_type, NULL AS value, NULL AS created_at WHERE 0"
+        )
+    conn.execute(f"CREATE VIEW {VIEW_NAME} AS {body}")
+
+    known = ", ".join(f"'{m}'" for m in months) or "NULL"
+    inserts = "".join(
+        f"INSERT INTO {partition_name(m)} ({_COLUMNS}) "
+        "SELECT NEW.id, NEW.timestamp, NEW.sensor_id, NEW.channel, "
+        "COALESCE(NEW.event_type, 'state_change'), NEW.value, "
+        "COALESCE(NEW.created_at, datetime('now')) "
+        f"WHERE substr(NEW.timestamp, 1, 7) = '{m}'; "
+        for m in months
+    )
+    conn.execute(
+        f"CREATE TRIGGER {VIEW_NAME}_insert INSTEAD OF INSERT ON {VIEW_NAME} BEGIN "
+        "SELECT RAISE(ABORT, 'sensor_events: bu ay icin bolum yok (insert_events kullanin)') "
+        f"WHERE substr(NEW.timestamp, 1, 7) NOT IN ({known}); "
+        f"{inserts}END"
+    )
+    deletes = "".join(
+        f"DELETE FROM {partition_name(m)} WHERE id = OLD.id; " for m in months
+    )
+    conn.execute(
+        f"CREATE TRIGGER {VIEW_NAME}_delete INSTEAD OF DELETE ON {VIEW_NAME} BEGIN "
+        f"SELECT 1; {deletes}END"
+    )
+
+
+def ensure_partitions(conn: sqlite3.Connection, months: Iterable[str]) -> list[str]:
+    """Eksik ay tablolarini olustur ve view'i guncelle.
+
+    Bolumleme kapaliysa no-op. Olusturma yazma kilidi altinda acik
+    transaction'a katilir; commit cagirana aittir.
+
+    Returns:
+        Yeni olusturulan aylar
+    """
+    wanted = {m for m in months if _MONTH_RE.match(m)}
+    if not wanted or not is_partitioned(conn):
+        return []
+    if wanted.issubset(list_partitions(conn)):
+        return []
+    _begin(conn)
+    # Kilit alindiktan sonra tekrar bak (baska baglanti olusturmus olabilir)
+    missing = sorted(wanted - set(list_partitions(conn)))
+    for month in missing:
+        _create_partition(conn, month)
+    if missing:
+        _rebuild_view(conn)
+        logger.info("Event bolumu olusturuldu: %s", ", ".join(missing))
+    return missing
+
+
+def _targets(conn: sqlite3.Connection, rows: list[tuple]) -> dict[str, list[tuple]]:
+    """Satirlari yazilacak tabloya gore grupla (bolumlu ise eksik aylari olustur)."""
+    if not is_partitioned(conn):
+        return {VIEW_NAME: rows}
+    by_month: dict[str, list[tuple]] = {}
+    for row in rows:
+        by_month.setdefault(row[0][:7], []).append(row)
+    ensure_partitions(conn, by_month)
+    return {
+        partition_name(month) if _MONTH_RE.match(month) else VIEW_NAME: month_rows
+        for month, month_rows in by_month.items()
+    }
+
+
+def insert_events(conn: sqlite3.Connection, rows: list[tuple]) -> None:
+    """Eventleri yaz; bolumlu duzende dogrudan ay tablolarina.
+
+    Args:
+        conn: Acik DB baglantisi (commit cagirana ait)
+        rows: [(timestamp, sensor_id, channel, event_type, value), ...]
+    """
+    for target, target_rows in _targets(conn, rows).items():
+        conn.executemany(
+            f"INSERT INTO {target} ({_INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+            target_rows,
+        )
+
+
+def insert_events_once(conn: sqlite3.Connection, rows: list[tuple]) -> int:
+    """Eventleri yalnizca ayni event henuz yoksa yaz (spool replay).
+
+    Idempotency anahtari (timestamp, sensor_id, channel, value): debounce
+    sonrasi ayni sensorden ayni saniyede ayni deger iki kez kabul edilmez.
+    Kontrol (timestamp, channel) indeksini kullanir; ayni cagridaki
+    tekrarlar da atlanir.
+
+    Args:
+        conn: Acik DB baglantisi (commit cagirana ait)
+        rows: [(timestamp, sensor_id, channel, event_type, value), ...]
+
+    Returns:
+        Yeni eklenen satir sayisi
+    """
+    inserted = 0
+    for target, target_rows in _targets(conn, rows).items():
+        for row in target_rows:
+            inserted += conn.execute(
+                f"INSERT INTO {target} ({_INSERT_COLUMNS}) SELECT ?1, ?2, ?3, ?4, ?5 "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {target} WHERE timestamp = ?1 "
+                "AND channel = ?3 AND sensor_id = ?2 AND value IS ?5)",
+                row,
+            ).rowcount
+    return inserted
+
+
+def drop_partitions_before(conn: sqlite3.Connection, cutoff: str) -> tuple[list[str], int]:
+    """Tamami cutoff'tan eski ay tablolarini DROP et.
+
+    Args:
+        conn: Acik DB baglantisi (commit cagirana ait)
+        cutoff: ISO timestamp; ayin sonu bundan once olan bolumler silinir
+
+    Returns:
+        (silinen aylar, silinen satir sayisi)
+    """
+    expired = [m for m in list_partitions(conn) if _next_month(m) <= cutoff]
+    if not expired:
+        return [], 0
+    # secure_delete=ON (bazi derlemelerde varsayilan) bosalan her sayfayi
+    # sifirla yeniden yazar; DROP'un kazanimini silmemesi icin gecici FAST
+    secure = conn.execute("PRAGMA secure_delete").fetchone()[0]
+    conn.execute("PRAGMA secure_delete = FAST")
+    try:
+        _begin(conn)
+        rows = 0
+        for month in expired:
+            name = partition_name(month)
+            rows += conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+            conn.execute(f"DROP TABLE {name}")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (name,))
+        _rebuild_view(conn)
+    finally:
+        conn.execute(f"PRAGMA secure_delete = {int(secure)}")
+    return expired, rows
+
+
+def enable_partitioning(conn: sqlite3.Connection) -> int:
+    """sensor_events tablosunu ay tablolarina tasi, yerine view koy.
+
+    Tek transaction; cagiran commit eder. Zaten bolumluyse no-op.
+    timestamp'i 'YYYY-MM' ile baslamayan satir varsa hicbir aya
+    yerlestirilemez: donusum yapilmaz (veri silinmez).
+
+    Returns:
+        Tasinan satir sayisi
+
+    Raises:
+        ValueError: Gecersiz timestamp'li satir var (tablo degismedi)
+    """
+    if is_partitioned(conn):
+        return 0
+    _begin(conn)
+    invalid = conn.execute(
+        "SELECT COUNT(*) FROM sensor_events WHERE timestamp NOT GLOB ?",
+        ("[0-9][0-9][0-9][0-9]-[0-9][0-9]*",),
+    ).fetchone()[0]
+    if invalid:
+        raise ValueError(
+            f"sensor_events: {invalid} eventin timestamp'i gecersiz (YYYY-MM...), "
+            "bolumleme yapilmadi"
+        )
+    months = [
+        row[0] for row in conn.execute(
+            "SELECT DISTINCT substr(timestamp, 1, 7) FROM sensor_events"
+        ).fetchall()
+        if row[0] and _MONTH_RE.match(row[0])
+    ]
+    moved = 0
+    for month in sorted(months):
+        _create_partition(conn, month)
+        moved += conn.execute(
+            f"INSERT INTO {partition_name(month)} ({_COLUMNS}) "
+            f"SELECT {_COLUMNS} FROM sensor_events WHERE timestamp >= ? AND timestamp < ?",
+            (month, _next_month(month)),
+        ).rowcount
+    total = conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0]
+    if total != moved:
+        # Yukaridaki kontrol bunu onler; yine de eksik kopyayla DROP edilmez
+        raise ValueError(
+            f"sensor_events: {total - moved} event bolumlere tasinamadi, bolumleme yapilmadi"
+        )
+    conn.execute("DROP TABLE sensor_events")
+    conn.execute("DELETE FROM sqlite_sequence WHERE name = 'sensor_events'")
+    _rebuild_view(conn)
+    return moved
+
+
+def disable_partitioning(conn: sqlite3.Connection) -> int:
+    """Ay tablolarini tekrar tek sensor_events tablosunda birlestir.
+
+    Tek transaction; cagiran commit eder. Bolumlu degilse no-op.
+
+    Returns:
+        Tasinan satir sayisi
+    """
+    if not is_partitioned(conn):
+        return 0
+    _begin(conn)
+    months = list_partitions(conn)
+    conn.execute(f"DROP VIEW {VIEW_NAME}")
+    conn.execute(_TABLE_DDL.format(name=VIEW_NAME))
+    moved = 0
+    for month in months:
+        name = partition_name(month)
+        moved += conn.execute(
+            f"INSERT INTO {VIEW_NAME} ({_COLUMNS}) SELECT {_COLUMNS} FROM {name}"
+        ).rowcount
+        conn.execute(f"DROP TABLE {name}")
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (name,))
+    for ddl in _PLAIN_INDEX_DDL:
+        conn.execute(ddl)
+    return moved
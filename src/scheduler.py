@@ -0,0 +1,196 @@
+"""Zamanlayici calistirma katmani - job'lar event loop disinda calisir.
+
+APScheduler tetikleyicileri asyncio loop'unda kalir, job govdeleri ise
+sinirli bir thread havuzunda (scheduler.max_workers) calisir. Her job icin:
+  - max_instances / coalesce: ust uste binen tetiklemeler birlesir,
+    ayni job ayni anda en fazla max_instances kez calisir
+  - kuyruk bekleme suresi: havuza gonderimden govdenin baslamasina kadar
+  - calisma suresi: govdenin baslangicindan bitisine kadar
+olculur ve JobRunner.stats() ile okunur; ayni olcumler /metrics
+histogramlarina da yazilir.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from apscheduler.executors.base import run_job
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from src.config import SchedulerConfig
+from src.telemetry import JOB_BUCKETS, counter, histogram
+
+logger = logging.getLogger("annem_guvende.scheduler")
+
+_JOB_SECONDS = histogram(
+    "annem_job_duration_seconds", "Job govdesi calisma suresi", ("job",), JOB_BUCKETS
+)
+_JOB_WAIT_SECONDS = histogram(
+    "annem_job_wait_seconds", "Job kuyruk bekleme suresi", ("job",), JOB_BUCKETS
+)
+_JOB_RUNS = counter("annem_job_runs", "Job tetiklemeleri (sonuca gore)", ("job", "outcome"))
+
+_SKIP_REASONS = {
+    EVENT_JOB_MISSED: "misfire",
+    EVENT_JOB_MAX_INSTANCES: "max_instances",
+}
+
+
+@dataclass
+class JobStats:
+    """Tek job'in calisma istatistikleri (saniye)."""
+
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0  # max_instances dolu veya misfire nedeniyle atlanan
+    last_wait: float = 0.0
+    max_wait: float = 0.0
+    total_wait: float = 0.0
+    last_run: float = 0.0
+    max_run: float = 0.0
+    total_run: float = 0.0
+
+
+# Calisan gonderimin havuza verilis ani (monotonik); job govdesi okur
+_SUBMITTED = threading.local()
+
+
+def _run_job_stamped(submitted: float, job, jobstore_alias, run_times, logger_name):
+    """APScheduler run_job'i, gonderim anini thread'e birakarak calistir."""
+    _SUBMITTED.value = submitted
+    try:
+        return run_job(job, jobstore_alias, run_times, logger_name)
+    finally:
+        _SUBMITTED.value = None
+
+
+class _TimedThreadPoolExecutor(ThreadPoolExecutor):
+    """Gonderim anini her gonderimle birlikte tasiyan thread havuzu.
+
+    Gonderim ani job bazinda bir siraya degil, o gonderimi calistiran
+    thread'e verilir: executor tarafinda kacirilan (misfire) calismalar ve
+    coalesce=False ile tek gonderimdeki birden fazla run_time sonraki
+    calismalarin bekleme olcumunu kaydirmaz.
+    """
+
+    def _do_submit_job(self, job, run_times):
+        # BasePoolExecutor._do_submit_job ile ayni; yalnizca run_job sarili
+        def callback(f):
+            exc = f.exception()
+            if exc:
+                self._run_job_error(job.id, exc, exc.__traceback__)
+            else:
+                self._run_job_success(job.id, f.result())
+
+        f = self._pool.submit(
+            _run_job_stamped, time.monotonic(), job, job._jobstore_alias,
+            run_times, self._logger.name,
+        )
+        f.add_done_callback(callback)
+
+
+class JobRunner:
+    """Sinirli thread havuzlu APScheduler sarmalayicisi.
+
+    Args:
+        config: Zamanlayici ayarlari (havuz boyutu, job varsayilanlari)
+        timezone: Tetikleyici saat dilimi
+    """
+
+    def __init__(self, config: SchedulerConfig, timezone: str = "Europe/Istanbul"):
+        self._config = config
+        self._lock = threading.Lock()
+        self._stats: dict[str, JobStats] = defaultdict(JobStats)
+
+        executor = _TimedThreadPoolExecutor(config.max_workers)
+        self.scheduler = AsyncIOScheduler(
+            timezone=timezone,
+            executors={"default": executor},
+            job_defaults={
+                "coalesce": config.coalesce,
+                "max_instances": config.max_instances,
+                "misfire_grace_time": config.misfire_grace_time,
+            },
+        )
+        self.scheduler.add_listener(
+            self._on_skipped, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
+
+    def start(self) -> None:
+        """Zamanlayiciyi baslat (calisan event loop icinde cagrilmali)."""
+        self.scheduler.start()
+        logger.info(
+            "Zamanlayici baslatildi: %d worker, max_instances=%d, coalesce=%s",
+            self._config.max_workers, self._config.max_instances, self._config.coalesce,
+        )
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Zamanlayiciyi durdur."""
+        self.scheduler.shutdown(wait=wait)
+
+    def add_job(self, func: Callable[[], object], trigger: str, *, id: str, **kwargs):
+        """Olculen bir job ekle (AsyncIOScheduler.add_job ile ayni parametreler).
+
+        Args:
+            func: Parametresiz senkron job govdesi
+            trigger: "cron" / "interval" / "date"
+            id: Job kimligi (istatistik anahtari)
+            **kwargs: Tetikleyici ve job ayarlari (max_instances vb. ezilebilir)
+        """
+        return self.scheduler.add_job(self._timed(id, func), trigger, id=id, **kwargs)
+
+    def stats(self) -> dict[str, dict]:
+        """Job bazli istatistiklerin kopyasi: {job_id: JobStats alanlari}."""
+        with self._lock:
+            return {job_id: asdict(s) for job_id, s in self._stats.items()}
+
+    def _on_skipped(self, event) -> None:
+        with self._lock:
+            self._stats[event.job_id].skipped += 1
+        _JOB_RUNS.labels(event.job_id, "skipped").inc()
+        logger.warning("Job atlandi (%s): %s", _SKIP_REASONS.get(event.code, "?"), event.job_id)
+
+    def _timed(self, job_id: str, func: Callable[[], object]) -> Callable[[], object]:
+        duration = _JOB_SECONDS.labels(job_id)
+        queue_wait = _JOB_WAIT_SECONDS.labels(job_id)
+
+        def run():
+            start = time.monotonic()
+            # Havuz disindan (dogrudan) cagrida bekleme yok
+            submitted = getattr(_SUBMITTED, "value", None) or start
+            wait = start - submitted
+            if wait > self._config.slow_wait_warn_seconds:
+                logger.warning("Job kuyrukta bekledi: %s (%.1f sn)", job_id, wait)
+
+            failed = False
+            try:
+                return func()
+            except Exception:
+                failed = True
+                raise
+            finally:
+                elapsed = time.monotonic() - start
+                with self._lock:
+                    s = self._stats[job_id]
+                    s.runs += 1
+                    if failed:
+                        s.failures += 1
+                    s.last_wait = wait
+                    s.max_wait = max(s.max_wait, wait)
+                    s.total_wait += wait
+                    s.last_run = elapsed
+                    s.max_run = max(s.max_run, elapsed)
+                    s.total_run += elapsed
+                duration.observe(elapsed)
+                queue_wait.observe(wait)
+                _JOB_RUNS.labels(job_id, "error" if failed else "ok").inc()
+                logger.debug("Job bitti: %s (bekleme=%.3f sn, sure=%.3f sn)", job_id, wait, elapsed)
+
+        return run
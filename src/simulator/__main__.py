@@ -8,9 +8,8 @@ Kullanim:
 import argparse
 import logging
 import sys
-from datetime import datetime, timedelta
 
-from src.collector.slot_aggregator import aggregate_current_slot, fill_missing_slots
+from src.collector.slot_aggregator import aggregate_day
 from src.config import load_config
 from src.database import init_db
 from src.detector import run_daily_scoring
@@ -53,12 +52,8 @@ def run_demo_with_pipeline(config_path: str | None, speed: float) -> None:
         """Her gun: slot aggregation + fill + learn + score."""
         demo_day_callback(day_num, date, event_count, is_anomaly)
 
-        # Slot aggregation: o gunun tum 96 slotunu doldur
-        base = datetime.strptime(date, "%Y-%m-%d")
-        for slot_idx in range(96):
-            slot_time = base + timedelta(minutes=slot_idx * 15)
-            aggregate_current_slot(db_path, channels, now=slot_time)
-        fill_missing_slots(db_path, date, channels)
+        # Slot aggregation: o gunun tum 96 slotu tek SQL gecisinde
+        aggregate_day(db_path, date, channels)
 
         # Ogrenme + skorlama
         run_daily_learning(db_path, config, target_date=date)
@@ -12,7 +12,8 @@ import time
 from collections.abc import Callable
 from datetime import datetime, timedelta
 
-from src.database import get_db
+from src.database import bump_data_version, get_db
+from src.partitions import insert_events
 
 logger = logging.getLogger("annem_guvende.simulator")
 
@@ -293,11 +294,9 @@ class SensorSimulator:
         if not events:
             return
 
+        rows = [(ts, sensor_id, channel, "state_change", value)
+                for ts, sensor_id, channel, value in events]
         with get_db(self._db_path) as conn:
-            conn.executemany(
-                "INSERT INTO sensor_events "
-                "(timestamp, sensor_id, channel, event_type, value) "
-                "VALUES (?, ?, ?, 'state_change', ?)",
-                events,
-            )
+            insert_events(conn, rows)
             conn.commit()
+        bump_data_version("events")
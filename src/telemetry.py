@@ -0,0 +1,340 @@
+"""Surec ici telemetri: sayaclar, sabit kovali histogramlar, OpenMetrics cikisi.
+
+Sicak yol (her sensor mesaji, her event yazimi) kilit almaz: her thread
+kendi deger listesine yazar (tek yazici -> kayip artis yok), /metrics
+okumasi tum thread parcalarini toplar. inc() / observe() mikro saniyenin
+altinda kalir (bkz. scripts/bench_telemetry.py).
+
+Kendi sayaclarini zaten tutan bilesenler (EventWriter, EventHub,
+ResponseCache, MetricsSampler) register_stats() ile kaydedilir; degerleri
+yalnizca scrape aninda okunur.
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("annem_guvende.telemetry")
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Saniye cinsinden kova sinirlari
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+JOB_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class _Shards:
+    """Thread basina sabit uzunlukta deger listesi; toplam okuma aninda."""
+
+    __slots__ = ("_size", "_local", "_all", "_lock")
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._all: list[list] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> list:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0] * self._size
+            with self._lock:  # thread basina bir kez
+                self._all.append(values)
+            self._local.values = values
+            return values
+
+    def total(self) -> list:
+        with self._lock:
+            shards = list(self._all)
+        if not shards:
+            return [0] * self._size
+        return [sum(column) for column in zip(*shards)]
+
+
+class _CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._shards.local()[0] += amount
+
+    def value(self) -> float:
+        return self._shards.total()[0]
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self._bounds = bounds
+        # [kova_0 .. kova_n-1, +Inf kovasi, toplam]
+        self._shards = _Shards(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        values = self._shards.local()
+        values[bisect_left(self._bounds, value)] += 1
+        values[-1] += value
+
+    def snapshot(self) -> tuple[list[int], int, float]:
+        """(kumulatif kova sayilari, toplam adet, deger toplami)"""
+        totals = self._shards.total()
+        cumulative = []
+        running = 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+
+class _Family(abc.ABC):
+    """Etiketli metrik ailesi; labels() ile alt metrik alinir (sicak yolda onceden)."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """Bos alt metrik (Counter / Histogram tanimlar)."""
+
+    def labels(self, *values: str):
+        """Etiket degerlerine ait alt metrik (yoksa olusturulur)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: {len(self.labelnames)} etiket bekleniyordu")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def children(self) -> list[tuple[tuple[str, ...], object]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+class Counter(_Family):
+    """Monoton artan sayac (OpenMetrics'te <ad>_total)."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+
+class Histogram(_Family):
+    """Sabit kovali histogram."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+@dataclass
+class MetricFamily:
+    """Scrape aninda uretilen metrik ailesi (register_stats / collector ciktisi)."""
+
+    name: str
+    kind: str  # "gauge" | "counter"
+    help: str
+    samples: list[tuple[dict[str, str], float]] = field(default_factory=list)
+
+
+class Registry:
+    """Metrik aileleri ve scrape aninda okunan collector'lar."""
+
+    def __init__(self):
+        self._families: dict[str, _Family] = {}
+        self._collectors: dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, family: _Family) -> _Family:
+        with self._lock:
+            existing = self._families.get(family.name)
+            if existing is None:
+                self._families[family.name] = family
+                return family
+        if type(existing) is not type(family) or existing.labelnames != family.labelnames:
+            raise ValueError(f"Metrik zaten farkli tanimla kayitli: {family.name}")
+        return existing
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Sayac tanimla (ayni ad + etiketlerle tekrar cagri mevcut olani dondurur)."""
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Histogram tanimla (ayni ad + etiketlerle tekrar cagri mevcut olani dondurur)."""
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(
+        self, name: str, collect: Callable[[], Iterable[MetricFamily]]
+    ) -> None:
+        """Scrape aninda cagrilacak collector ekle (ayni ad yenisiyle degisir)."""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def unregister_collector(self, name: str) -> None:
+        """Collector'i kaldir (yoksa no-op)."""
+        with self._lock:
+            self._collectors.pop(name, None)
+
+    def render(self) -> str:
+        """OpenMetrics metin cikisi (# EOF ile biter)."""
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda f: f.name)
+            collectors = list(self._collectors.items())
+
+        lines: list[str] = []
+        for family in families:
+            _render_family(lines, family)
+        for name, collect in collectors:
+            try:
+                produced = list(collect())
+            except Exception as exc:
+                logger.warning("Metrik collector hatasi (%s): %s", name, exc)
+                continue
+            for metric in produced:
+                _render_metric_family(lines, metric)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def register_stats(
+    prefix: str,
+    stats: Callable[[], dict],
+    help: str,
+    counters: Iterable[str] = (),
+    registry: Registry | None = None,
+) -> None:
+    """Duz bir stats() sozlugunu scrape aninda gauge/counter olarak yayinla.
+
+    Args:
+        prefix: Metrik adi oneki (annem_<prefix>_<anahtar>)
+        stats: Sayisal degerli sozluk donduren fonksiyon
+        help: Aciklama (anahtar adi eklenir)
+        counters: Monoton artan anahtarlar (digerleri gauge)
+        registry: Hedef kayit (None ise REGISTRY)
+    """
+    counter_keys = frozenset(counters)
+
+    def collect() -> list[MetricFamily]:
+        families = []
+        for key, value in stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            kind = "counter" if key in counter_keys else "gauge"
+            families.append(
+                MetricFamily(f"annem_{prefix}_{key}", kind, f"{help}: {key}", [({}, value)])
+            )
+        return families
+
+    (registry or REGISTRY).register_collector(prefix, collect)
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _render_header(lines: list[str], name: str, kind: str, help: str) -> None:
+    lines.append(f"# TYPE {name} {kind}")
+    lines.append(f"# HELP {name} {_escape(help)}")
+
+
+def _render_family(lines: list[str], family: _Family) -> None:
+    _render_header(lines, family.name, family.kind, family.help)
+    for values, child in family.children():
+        if isinstance(child, _CounterChild):
+            labels = _labels(family.labelnames, values)
+            lines.append(f"{family.name}_total{labels} {_format_value(child.value())}")
+            continue
+        cumulative, count, total = child.snapshot()
+        bounds = [_format_value(b) for b in family.buckets] + ["+Inf"]
+        for bound, running in zip(bounds, cumulative):
+            labels = _labels(family.labelnames, values, f'le="{bound}"')
+            lines.append(f"{family.name}_bucket{labels} {running}")
+        labels = _labels(family.labelnames, values)
+        lines.append(f"{family.name}_count{labels} {count}")
+        lines.append(f"{family.name}_sum{labels} {_format_value(total)}")
+
+
+def _render_metric_family(lines: list[str], metric: MetricFamily) -> None:
+    name = metric.name.removesuffix("_total") if metric.kind == "counter" else metric.name
+    suffix = "_total" if metric.kind == "counter" else ""
+    _render_header(lines, name, metric.kind, metric.help)
+    for labels, value in metric.samples:
+        label_str = _labels(labels.keys(), labels.values())
+        lines.append(f"{name}{suffix}{label_str} {_format_value(value)}")
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    """REGISTRY'de sayac tanimla."""
+    return REGISTRY.counter(name, help, labelnames)
+
+
+def histogram(
+    name: str,
+    help: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = LATENCY_BUCKETS,
+) -> Histogram:
+    """REGISTRY'de histogram tanimla."""
+    return REGISTRY.histogram(name, help, labelnames, buckets)
@@ -3,7 +3,17 @@
 import pytest
 
 from src.config import AppConfig
-from src.database import init_db
+from src.database import close_all_connections, init_db, reset_data_versions
+from src.learner.model_cache import clear_model_cache
+
+
+@pytest.fixture(autouse=True)
+def _close_db_pool():
+    """Her test sonrasi havuzdaki kalici DB baglantilarini ve onbellekleri temizle."""
+    yield
+    close_all_connections()
+    clear_model_cache()
+    reset_data_versions()
 
 
 @pytest.fixture
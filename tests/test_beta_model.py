@@ -1,4 +1,4 @@
-"""BetaPosterior hesaplama testleri - mean, variance, CI, NLL, update."""
+"""BetaPosterior ve BetaModelArray testleri - mean, variance, CI, NLL, update."""
 
 import math
 
@@ -90,3 +90,86 @@ def test_update_immutable():
     _ = bp.update(1)
     assert bp.alpha == 3.0
     assert bp.beta == 5.0
+
+
+# --- BetaModelArray testleri ---
+
+def _random_model(seed: int = 3) -> dict[str, list[BetaPosterior]]:
+    import random
+
+    rng = random.Random(seed)
+    return {
+        ch: [BetaPosterior(rng.uniform(0.5, 20), rng.uniform(0.5, 20)) for _ in range(96)]
+        for ch in ("presence", "fridge")
+    }
+
+
+def test_array_matches_scalar_posteriors():
+    """Dizi mean/varyans/CI degerleri BetaPosterior ile ayni olmali."""
+    from src.learner.beta_model import BetaModelArray
+
+    model = _random_model()
+    arr = BetaModelArray.from_posteriors(model)
+    means, variances, widths = arr.means(), arr.variances(), arr.ci_widths()
+
+    for ch, posteriors in model.items():
+        i = arr.offset(ch)
+        for s, bp in enumerate(posteriors):
+            assert means[i + s] == pytest.approx(bp.mean)
+            assert variances[i + s] == pytest.approx(bp.variance)
+            assert widths[i + s] == pytest.approx(bp.ci_width)
+            assert arr.posterior(ch, s) == bp
+        assert arr[ch] == posteriors
+
+
+def test_array_nll_and_update_match_scalar():
+    """Toplu NLL ve update skaler hesaplamayla ayni olmali."""
+    from src.learner.beta_model import BetaModelArray
+
+    model = _random_model(seed=5)
+    slot_data = {ch: [(s // 7) % 2 for s in range(96)] for ch in model}
+    arr = BetaModelArray.from_posteriors(model)
+
+    nll = arr.nll(slot_data)
+    updated = arr.update(slot_data)
+    for ch, posteriors in model.items():
+        expected = sum(bp.nll(slot_data[ch][s]) for s, bp in enumerate(posteriors))
+        assert nll[ch] == pytest.approx(expected)
+        assert updated[ch] == [bp.update(slot_data[ch][s]) for s, bp in enumerate(posteriors)]
+    # Immutable: orijinal degismemeli
+    assert arr["presence"] == model["presence"]
+
+
+def test_array_from_rows_fills_missing_with_prior():
+    """model_state'te olmayan slot/kanal prior ile baslamali."""
+    from src.learner.beta_model import BetaModelArray
+
+    rows = [
+        {"slot": 5, "channel": "presence", "alpha": 4.0, "beta": 2.0},
+        {"slot": 3, "channel": "unknown", "alpha": 9.0, "beta": 9.0},
+    ]
+    arr = BetaModelArray.from_rows(rows, ["presence", "door"], prior_a=1.0, prior_b=2.0)
+
+    assert arr.posterior("presence", 5) == BetaPosterior(4.0, 2.0)
+    assert arr.posterior("presence", 6) == BetaPosterior(1.0, 2.0)
+    assert arr.posterior("door", 3) == BetaPosterior(1.0, 2.0)
+    assert "unknown" not in arr
+
+
+def test_metrics_same_for_dict_and_array_model():
+    """calculate_daily_metrics dict ve BetaModelArray ile ayni sonucu vermeli."""
+    from src.learner.beta_model import BetaModelArray
+    from src.learner.metrics import calculate_daily_metrics
+
+    model = _random_model(seed=11)
+    channels = list(model)
+    slot_data = {ch: [1 if 30 <= s < 70 else 0 for s in range(96)] for ch in channels}
+
+    from_dict = calculate_daily_metrics(slot_data, model, channels=channels)
+    from_array = calculate_daily_metrics(
+        slot_data, BetaModelArray.from_posteriors(model), channels=channels
+    )
+
+    assert from_dict.keys() == from_array.keys()
+    for key, value in from_dict.items():
+        assert from_array[key] == pytest.approx(value)
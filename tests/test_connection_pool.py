@@ -0,0 +1,117 @@
+"""Kalici SQLite baglanti havuzu testleri."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.database import (
+    _pool,
+    check_db_connection,
+    close_all_connections,
+    get_db,
+)
+
+
+def test_same_thread_reuses_connection(initialized_db):
+    """Ayni thread'de ardisik get_db cagrilari ayni baglantiyi kullanmali."""
+    with get_db(initialized_db) as conn1:
+        pass
+    with get_db(initialized_db) as conn2:
+        pass
+    assert conn1 is conn2
+
+
+def test_different_threads_get_different_connections(initialized_db):
+    """Her thread kendi baglantisini almali."""
+    with get_db(initialized_db) as main_conn:
+        pass
+
+    seen = []
+
+    def worker():
+        with get_db(initialized_db) as conn:
+            seen.append(conn)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert seen and seen[0] is not main_conn
+
+
+def test_pragmas_applied_once(initialized_db):
+    """WAL, foreign_keys ve busy_timeout havuz baglantisinda aktif olmali."""
+    with get_db(initialized_db) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+def test_uncommitted_changes_rolled_back(initialized_db):
+    """Commit edilmeyen degisiklikler blok sonunda geri alinmali (eski davranis)."""
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO system_state (key, value) VALUES ('k', 'v')"
+        )
+
+    with get_db(initialized_db) as conn:
+        row = conn.execute("SELECT value FROM system_state WHERE key = 'k'").fetchone()
+    assert row is None
+
+
+def test_nested_usage_keeps_outer_transaction(initialized_db):
+    """Ic ice get_db kullaniminda ic blok dis transaction'i geri almamali."""
+    with get_db(initialized_db) as outer:
+        outer.execute("INSERT INTO system_state (key, value) VALUES ('k', 'v')")
+        with get_db(initialized_db) as inner:
+            assert inner is outer
+        outer.commit()
+
+    with get_db(initialized_db) as conn:
+        row = conn.execute("SELECT value FROM system_state WHERE key = 'k'").fetchone()
+    assert row["value"] == "v"
+
+
+def test_close_all_and_reopen(initialized_db):
+    """close_all_connections sonrasi yeni baglanti acilmali ve calismali."""
+    with get_db(initialized_db) as conn1:
+        pass
+    assert close_all_connections() >= 1
+    assert _pool.stats()["open_connections"] == 0
+
+    with get_db(initialized_db) as conn2:
+        assert conn2.execute("SELECT 1").fetchone()[0] == 1
+    assert conn2 is not conn1
+
+
+def test_unhealthy_connection_replaced(initialized_db, monkeypatch):
+    """Bosta kalip bozulan baglanti saglik kontrolunde yenilenmeli."""
+    with get_db(initialized_db) as conn1:
+        pass
+    conn1.close()  # disaridan kapanmis baglanti simulasyonu
+    monkeypatch.setattr(_pool, "_health_check_interval", -1.0)
+
+    assert check_db_connection(initialized_db) is True
+    with get_db(initialized_db) as conn2:
+        pass
+    assert conn2 is not conn1
+
+
+def test_dead_thread_connections_closed(initialized_db):
+    """Sonlanan thread'in baglantisi sonraki acilista kapatilir (ident tekrar kullanilsa da sizmaz)."""
+    opened = []
+
+    def worker():
+        with get_db(initialized_db) as conn:
+            opened.append(conn)
+
+    for _ in range(5):
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+    assert _pool.stats()["open_connections"] == 1  # yalnizca ana thread
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -169,3 +169,147 @@ def test_api_health(initialized_db):
 
     data = resp.json()
     assert "status" in data
+
+
+def test_api_today_merges_live_counts(initialized_db):
+    """GET /api/today -> slot_summary + canli accumulator sayaclari."""
+    from src.collector.slot_aggregator import SlotAccumulator
+
+    app = _create_test_app(initialized_db)
+    today = datetime.now().strftime("%Y-%m-%d")
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO slot_summary (date, slot, channel, active, event_count) "
+            "VALUES (?, 10, 'presence', 1, 2)",
+            (today,),
+        )
+        conn.commit()
+
+    acc = SlotAccumulator(initialized_db, ["presence"])
+    acc.add({"timestamp": f"{today}T12:05:00", "channel": "fridge", "sensor_id": "x"})
+    app.state.slot_accumulator = acc
+
+    client = TestClient(app)
+    data = client.get("/api/today").json()
+
+    assert data["date"] == today
+    assert data["slots"]["presence"][10] == 1
+    assert data["slots"]["fridge"][48] == 1
+    assert data["event_counts"]["presence"] == 2
+
+
+# --- ETag / 304 testleri ---
+
+def test_etag_304_until_scores_change(initialized_db):
+    """Ayni veri versiyonunda If-None-Match -> 304; daily_scores yazimi ETag'i degistirir."""
+    from src.learner.routine_learner import _save_daily_scores
+
+    client = TestClient(_create_test_app(initialized_db))
+    first = client.get("/api/learning-curve")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    again = client.get("/api/learning-curve", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    metrics = dict.fromkeys(
+        ["nll_presence", "nll_fridge", "nll_bathroom", "nll_door", "nll_total",
+         "expected_count", "observed_count", "count_z",
+         "aw_accuracy", "aw_balanced_acc", "aw_active_recall"], 0.0,
+    )
+    _save_daily_scores(initialized_db, "2025-01-15", 1, metrics, 0.0, 1)
+
+    changed = client.get("/api/learning-curve", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["dates"] == ["2025-01-15"]
+
+
+def test_etag_tracks_external_writers(initialized_db):
+    """Baska surecin commit'i (surec ici versiyon artmadan) da ETag'i degistirir."""
+    client = TestClient(_create_test_app(initialized_db))
+    etags = {
+        path: client.get(path).headers["ETag"]
+        for path in ("/api/learning-curve", "/api/heatmap", "/api/status")
+    }
+
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO daily_scores (date, train_days, is_learning) VALUES ('2025-01-15', 1, 1)"
+        )
+        conn.execute(
+            "INSERT INTO slot_summary (date, slot, channel, active, event_count) "
+            "VALUES ('2025-01-15', 0, 'presence', 1, 1)"
+        )
+        conn.execute(
+            "INSERT INTO sensor_events (timestamp, sensor_id, channel, value) "
+            "VALUES ('2025-01-15T08:00:00', 's1', 'presence', 'on')"
+        )
+        conn.commit()
+
+    for path, etag in etags.items():
+        resp = client.get(path, headers={"If-None-Match": etag})
+        assert resp.status_code == 200, path
+        assert resp.headers["ETag"] != etag
+
+
+def test_cached_body_reused_without_query(initialized_db, monkeypatch):
+    """ETag degismedikce govde bellekten doner, veri fonksiyonu tekrar calismaz."""
+    calls = []
+
+    def counting(db_path):
+        calls.append(db_path)
+        return {"model": {}, "recent_activity": {}}
+
+    monkeypatch.setattr("src.dashboard.api.get_heatmap_data", counting)
+    client = TestClient(_create_test_app(initialized_db))
+    a = client.get("/api/heatmap")
+    b = client.get("/api/heatmap")
+    assert a.json() == b.json()
+    assert a.headers["ETag"] == b.headers["ETag"]
+    assert len(calls) == 1
+
+
+def test_status_etag_tracks_mqtt_state(initialized_db):
+    """MQTT durumu degisince status ETag'i de degisir."""
+    app = _create_test_app(initialized_db)
+    client = TestClient(app)
+    etag = client.get("/api/status").headers["ETag"]
+
+    app.state.mqtt_collector.is_connected.return_value = True
+    resp = client.get("/api/status", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["mqtt_connected"] is True
+
+
+def test_api_bundle_fields_and_etag(initialized_db):
+    """Bundle secilen panelleri dondurur; bilinmeyen alan 400, ETag ile 304."""
+    with get_db(initialized_db) as conn:
+        _insert_daily_score(conn, "2025-01-15")
+
+    client = TestClient(_create_test_app(initialized_db))
+    full = client.get("/api/bundle")
+    assert full.status_code == 200
+    assert set(full.json()) == {"status", "heatmap", "history", "learning_curve"}
+
+    partial = client.get("/api/bundle", params={"fields": "history,status"})
+    assert set(partial.json()) == {"status", "history"}
+    assert partial.headers["etag"] != full.headers["etag"]
+
+    again = client.get("/api/bundle", headers={"If-None-Match": full.headers["etag"]})
+    assert again.status_code == 304
+
+    assert client.get("/api/bundle", params={"fields": "status,nope"}).status_code == 400
+
+
+def test_etag_matches_weak_and_lists():
+    """If-None-Match: zayif/guclu ve virgullu liste karsilastirmasi."""
+    from src.dashboard.response_cache import etag_matches
+
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"x", "abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 
 from src.dashboard.charts import (
     _approximate_ci_width,
+    get_bundle_data,
     get_daily_data,
     get_heatmap_data,
     get_history_data,
@@ -266,6 +267,44 @@ def test_get_learning_curve_data_empty(initialized_db):
     assert result["ci_widths"] == []
 
 
+# --- get_bundle_data testleri ---
+
+def test_get_bundle_data_matches_individual_panels(initialized_db):
+    """Bundle ayni veriyi tek taramayla uretir: paneller tek tek fonksiyonlarla ayni."""
+    now = datetime.now()
+    with get_db(initialized_db) as conn:
+        _insert_event(conn, now.strftime("%Y-%m-%dT%H:%M:%S"), "buzdolabi", "fridge")
+        for i in range(40):
+            date = (now - timedelta(days=40 - i)).strftime("%Y-%m-%d")
+            _insert_daily_score(conn, date, train_days=i, nll_total=10.0 + i,
+                                alert_level=i % 3, observed_count=30 + i)
+        _insert_slot_summary(conn, now.strftime("%Y-%m-%d"), 32, "fridge")
+        _insert_model_state(conn, 32, "fridge")
+        conn.commit()
+
+    bundle = get_bundle_data(initialized_db, mqtt_connected=True, history_days=30)
+
+    assert bundle["status"] == get_status_data(initialized_db, mqtt_connected=True)
+    assert bundle["heatmap"] == get_heatmap_data(initialized_db)
+    assert bundle["history"] == get_history_data(initialized_db, days=30)
+    assert bundle["learning_curve"] == get_learning_curve_data(initialized_db)
+    # 14 gunluk olay grafigi 30 gunluk pencerenin basindan kesilir
+    assert bundle["history"]["days"][:14] == get_history_data(initialized_db, days=14)["days"]
+
+
+def test_get_bundle_data_field_selection(initialized_db):
+    """Yalnizca istenen alanlar doner; learning curve olmadan da status dogru."""
+    with get_db(initialized_db) as conn:
+        for i in range(5):
+            _insert_daily_score(conn, f"2025-01-0{i + 1}", train_days=i)
+
+    bundle = get_bundle_data(initialized_db, False, fields=("status", "history"), history_days=2)
+
+    assert set(bundle) == {"status", "history"}
+    assert bundle["status"]["learning"]["total_days"] == 5
+    assert [d["date"] for d in bundle["history"]["days"]] == ["2025-01-05", "2025-01-04"]
+
+
 # --- _approximate_ci_width testleri ---
 
 def test_approximate_ci_width_decreases():
@@ -0,0 +1,86 @@
+"""Dashboard okuma katmani testleri - salt-okunur baglanti, zaman butcesi, 503."""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import AppConfig
+from src.dashboard.api import router as dashboard_router
+from src.dashboard.data_access import DashboardReader
+from src.database import QueryBudgetExceeded, get_db, query_budget
+
+# ~yuz milyon satirlik sayim: butce olmadan saniyeler surer
+_SLOW_SQL = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) "
+    "SELECT COUNT(*) FROM n"
+)
+
+
+def _slow_query(db_path: str) -> int:
+    with get_db(db_path) as conn:
+        return conn.execute(_SLOW_SQL).fetchone()[0]
+
+
+def test_read_only_connection_rejects_writes(initialized_db):
+    """read_only=True baglanti okur ama yazamaz; yazma baglantisindan ayridir."""
+    with get_db(initialized_db, read_only=True) as ro, get_db(initialized_db) as rw:
+        assert ro is not rw
+        ro.execute("SELECT COUNT(*) FROM sensor_events").fetchone()
+        with pytest.raises(sqlite3.OperationalError):
+            ro.execute("INSERT INTO system_state (key, value) VALUES ('x', 'y')")
+
+
+def test_query_budget_interrupts_read(initialized_db):
+    """Butceyi asan salt-okunur sorgu QueryBudgetExceeded ile kesilir."""
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(0.05), get_db(initialized_db, read_only=True) as conn:
+            conn.execute(_SLOW_SQL).fetchone()
+
+    # Butce disinda ayni baglanti normal calisir
+    with get_db(initialized_db, read_only=True) as conn:
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+
+
+def test_reader_runs_in_read_only_worker(initialized_db):
+    """DashboardReader cagrilari loop disi, salt-okunur thread'de calisir."""
+    reader = DashboardReader(max_workers=2, budget_ms=1000)
+
+    def probe(db_path):
+        with get_db(db_path) as conn:
+            try:
+                conn.execute("INSERT INTO system_state (key, value) VALUES ('x', 'y')")
+                writable = True
+            except sqlite3.OperationalError:
+                writable = False
+        return threading.current_thread().name, writable
+
+    async def scenario():
+        return await asyncio.gather(*(reader.run(probe, initialized_db) for _ in range(4)))
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        reader.close()
+    assert all(name.startswith("dashboard-read") for name, _ in results)
+    assert not any(writable for _, writable in results)
+
+
+def test_api_returns_503_when_budget_exceeded(initialized_db, monkeypatch):
+    """Sorgu butcesi asilirsa endpoint 503 doner."""
+    app = FastAPI()
+    app.include_router(dashboard_router)
+    app.state.db_path = initialized_db
+    app.state.config = AppConfig(dashboard={"query_budget_ms": 50})
+
+    monkeypatch.setattr(
+        "src.dashboard.api.get_learning_curve_data", _slow_query
+    )
+    try:
+        response = TestClient(app).get("/api/learning-curve")
+    finally:
+        app.state.dashboard_reader.close()
+    assert response.status_code == 503
@@ -4,6 +4,9 @@ import json
 from datetime import datetime, timedelta
 
 from src.collector.event_processor import EventProcessor
+from src.collector.mqtt_client import debounce_windows
+from src.config import AppConfig
+from src.telemetry import REGISTRY
 
 # --- parse_payload testleri ---
 
@@ -77,6 +80,36 @@ def test_parse_empty_payload_returns_none():
     assert result is None
 
 
+# --- parse (tek seferlik ParsedMessage) testleri ---
+
+def test_parse_carries_state_battery_and_linkquality():
+    """Tek parse: durum, pil, link kalitesi ve zaman ayni nesnede."""
+    proc = EventProcessor()
+    ts = datetime(2025, 2, 11, 10, 0, 0)
+    payload = b' {"occupancy": true, "battery": 87, "linkquality": "120", "voltage": 3000}\n'
+
+    msg = proc.parse("motion", "on", payload, ts)
+
+    assert (msg.is_active, msg.value) == (True, "on")
+    assert (msg.battery, msg.linkquality) == (87, 120)
+    assert msg.timestamp == ts
+    assert msg.data["voltage"] == 3000
+
+
+def test_parse_unrecognized_state_keeps_battery():
+    """Durum alani olmayan mesaj taninmaz ama pil bilgisi korunur."""
+    proc = EventProcessor()
+
+    msg = proc.parse("motion", "on", b'{"battery": 8}')
+    assert msg.value is None and msg.battery == 8
+    assert proc.accept("m1", "presence", msg) is None
+
+    # Sonda fazladan karakter: JSON degil, duz string olarak da taninmaz
+    trailing = proc.parse("motion", "on", b'{"occupancy": true} x')
+    assert trailing.data is None and trailing.value is None
+    assert proc.parse("motion", "on", b"\xff\xfe") is None
+
+
 # --- debounce testleri ---
 
 def test_debounce_first_event_always_passes():
@@ -228,26 +261,73 @@ def test_recent_entries_preserved():
     assert "recent_sensor" in proc._last_event
 
 
-def test_cleanup_triggered_every_100_calls():
-    """process() her 100 cagri sonra cleanup tetiklemeli."""
+def test_expired_entry_evicted_on_next_message():
+    """Sona eren kayit, sureyi gecen ilk mesajda heap'ten temizlenir."""
     proc = EventProcessor(debounce_seconds=30)
-    old_time = datetime(2025, 3, 1, 10, 0, 0)
-    proc._record_event("stale", old_time)
-
-    # 99 cagri yap (henuz cleanup olmasin)
-    base_ts = datetime(2025, 3, 1, 12, 0, 0)
-    for i in range(99):
-        proc.process(
-            f"sensor_{i}", "presence", "motion", "on",
-            json.dumps({"occupancy": True}).encode(),
-            timestamp=base_ts + timedelta(seconds=i),
-        )
-    assert "stale" in proc._last_event  # henuz temizlenmemis
-
-    # 100. cagri: cleanup tetiklenir
-    proc.process(
-        "sensor_100", "presence", "motion", "on",
-        json.dumps({"occupancy": True}).encode(),
-        timestamp=base_ts + timedelta(minutes=5),
+    proc._record_event("stale", datetime(2025, 3, 1, 10, 0, 0))
+    payload = json.dumps({"occupancy": True}).encode()
+
+    proc.process("s1", "presence", "motion", "on", payload,
+                 timestamp=datetime(2025, 3, 1, 10, 59, 0))
+    assert "stale" in proc._last_event  # 1 saat dolmadi
+
+    proc.process("s2", "presence", "motion", "on", payload,
+                 timestamp=datetime(2025, 3, 1, 11, 0, 1))
+    assert "stale" not in proc._last_event
+
+
+def test_refreshed_entry_rescheduled_single_heap_entry():
+    """Tazelenen sensor silinmez, yeniden planlanir; heap sensor basina tek girdi."""
+    proc = EventProcessor(debounce_seconds=30)
+    base = datetime(2025, 3, 1, 10, 0, 0)
+    for minute in range(0, 120, 1):
+        proc._record_event("aktif", base + timedelta(minutes=minute))
+
+    assert len(proc._expiry) == 1
+    assert proc._cleanup_stale_entries(base + timedelta(minutes=150)) == 0
+    assert "aktif" in proc._last_event
+    assert proc._cleanup_stale_entries(base + timedelta(minutes=180)) == 1
+    assert proc._expiry == []
+
+
+def test_per_sensor_windows_and_counter():
+    """Sensor bazli pencere uygulanir; debounce sensor etiketiyle sayilir."""
+    def debounced(sensor: str) -> float:
+        prefix = f'annem_debounced_events_total{{sensor="{sensor}"}} '
+        for line in REGISTRY.render().splitlines():
+            if line.startswith(prefix):
+                return float(line.split()[-1])
+        return 0.0
+
+    proc = EventProcessor(debounce_seconds=30, windows={"buzdolabi_kapi_w": 5})
+    base = datetime(2025, 3, 1, 10, 0, 0)
+    before = debounced("mutfak_motion_w")
+    opened = json.dumps({"contact": False}).encode()
+    motion = json.dumps({"occupancy": True}).encode()
+
+    assert proc.process("buzdolabi_kapi_w", "fridge", "contact", "open", opened, base)
+    assert proc.process("buzdolabi_kapi_w", "fridge", "contact", "open", opened,
+                        base + timedelta(seconds=6))
+    assert proc.process("mutfak_motion_w", "presence", "motion", "on", motion, base)
+    assert proc.process("mutfak_motion_w", "presence", "motion", "on", motion,
+                        base + timedelta(seconds=6)) is None
+
+    assert proc.debounce_window("buzdolabi_kapi_w") == 5
+    assert proc.debounce_window("mutfak_motion_w") == 30
+    assert debounced("mutfak_motion_w") - before == 1
+    assert debounced("buzdolabi_kapi_w") == 0
+
+
+def test_debounce_windows_from_config():
+    """Oncelik: sensor penceresi > tip penceresi > varsayilan."""
+    config = AppConfig(
+        collector={"debounce_seconds": 20, "debounce_by_type": {"contact": 5}},
+        sensors=[
+            {"id": "pir", "channel": "presence", "type": "motion", "trigger_value": "on"},
+            {"id": "kapi", "channel": "door", "type": "contact", "trigger_value": "open"},
+            {"id": "buzdolabi", "channel": "fridge", "type": "contact", "trigger_value": "open",
+             "debounce_seconds": 2},
+        ],
     )
-    assert "stale" not in proc._last_event  # temizlendi
+
+    assert debounce_windows(config) == {"kapi": 5, "buzdolabi": 2}
@@ -0,0 +1,179 @@
+"""Canli akis testleri - EventHub, yavas istemci cikarma, yayinci baglantilari, SSE."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.alerter.alert_manager import AlertManager
+from src.alerter.telegram_bot import TelegramNotifier
+from src.collector.mqtt_client import MQTTCollector
+from src.config import AppConfig
+from src.dashboard.api import api_stream
+from src.dashboard.api import router as dashboard_router
+from src.dashboard.event_hub import KEEPALIVE, EventHub
+from src.database import get_db
+from src.detector.realtime_checks import RealtimeAlert
+
+
+def _event(ts: str, channel: str = "fridge") -> dict:
+    return {"timestamp": ts, "sensor_id": f"{channel}_sensor", "channel": channel}
+
+
+def test_publish_from_other_thread_delivered_in_order():
+    """Baska thread'den yayinlanan mesajlar sirali ve artan id ile ulasir."""
+    hub = EventHub(buffer_size=16)
+
+    async def scenario():
+        sub = hub.subscribe()
+        publisher = threading.Thread(
+            target=lambda: [hub.publish("mqtt", {"n": i}) for i in range(3)]
+        )
+        publisher.start()
+        publisher.join()
+        messages = [await sub.get(1.0) for _ in range(3)]
+        return messages, await sub.get(0.01)
+
+    messages, idle = asyncio.run(scenario())
+    assert [m.data["n"] for m in messages] == [0, 1, 2]
+    assert messages[0].id < messages[1].id < messages[2].id
+    assert idle is KEEPALIVE
+    assert messages[0].to_sse().startswith(f"id: {messages[0].id}\nevent: mqtt\ndata: ")
+
+
+def test_slow_consumer_evicted():
+    """Kuyrugu dolan abone cikarilir; get() None dondurur, digerleri etkilenmez."""
+    hub = EventHub(buffer_size=2)
+
+    async def scenario():
+        slow = hub.subscribe()
+        fast = hub.subscribe()
+        for i in range(3):
+            hub.publish("event", {"n": i})
+            await asyncio.sleep(0)
+            if i < 2:
+                await fast.get(1.0)  # hizli abone her mesaji tuketir
+        await asyncio.sleep(0)
+        return slow, fast, await slow.get(1.0), await fast.get(1.0)
+
+    slow, fast, slow_msg, fast_msg = asyncio.run(scenario())
+    assert slow.evicted and slow_msg is None
+    assert not fast.evicted and fast_msg.data == {"n": 2}
+    assert hub.stats() == {"subscribers": 1, "evictions": 1}
+
+
+def test_subscriber_limit():
+    """max_subscribers dolunca subscribe() None dondurur."""
+    hub = EventHub(max_subscribers=1)
+
+    async def scenario():
+        first = hub.subscribe()
+        second = hub.subscribe()
+        hub.unsubscribe(first)
+        return first, second, hub.subscribe()
+
+    first, second, third = asyncio.run(scenario())
+    assert first is not None and second is None and third is not None
+
+
+def test_slot_flip_published_once_per_slot():
+    """Ayni slot/kanal icin slot mesaji bir kez; yeni slot veya kanal tekrar."""
+    hub = EventHub()
+    published = []
+    hub.publish = lambda event, data: published.append((event, data))
+
+    hub.on_sensor_event(_event("2025-02-11T08:01:00"))
+    hub.on_sensor_event(_event("2025-02-11T08:14:59"))
+    hub.on_sensor_event(_event("2025-02-11T08:15:00"))
+    hub.on_sensor_event(_event("2025-02-11T08:15:30", channel="door"))
+
+    assert [e for e, _ in published].count("event") == 4
+    slots = [d for e, d in published if e == "slot"]
+    assert slots == [
+        {"date": "2025-02-11", "slot": 32, "channel": "fridge"},
+        {"date": "2025-02-11", "slot": 33, "channel": "fridge"},
+        {"date": "2025-02-11", "slot": 33, "channel": "door"},
+    ]
+
+
+def test_collector_notifies_connection_listeners(initialized_db):
+    """_on_connect / _on_disconnect baglanti dinleyicilerini cagirir."""
+    config = AppConfig(database={"path": initialized_db})
+    collector = MQTTCollector(config, initialized_db)
+    states = []
+    collector.add_connection_listener(states.append)
+
+    collector._on_connect(MagicMock(), None, None, 0, None)
+    collector._on_disconnect(MagicMock(), None, None, 7, None)
+
+    assert states == [True, False]
+
+
+def test_alert_manager_publishes_levels(initialized_db):
+    """Gunluk skor seviyesi ve gercek zamanli alarm dinleyiciye iletilir."""
+    notifier = MagicMock(spec=TelegramNotifier)
+    manager = AlertManager(AppConfig(), notifier)
+    alerts = []
+    manager.set_alert_listener(alerts.append)
+
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO daily_scores (date, composite_z, alert_level, train_days, is_learning) "
+            "VALUES ('2025-02-10', 0.4, 0, 20, 0)"
+        )
+        conn.commit()
+    manager.handle_daily_scores(initialized_db, "2025-02-10")
+    manager.handle_realtime_alert(
+        RealtimeAlert("fall_suspicion", 3, "Banyo 45 dk", None),
+    )
+
+    assert alerts[0] == {"source": "daily", "date": "2025-02-10", "level": 0}
+    assert alerts[1] == {"source": "fall_suspicion", "level": 3, "message": "Banyo 45 dk"}
+
+
+def test_stream_endpoint_sends_hello_then_events(initialized_db):
+    """/api/stream once hello, sonra hub mesajlarini SSE cercevesi olarak gonderir.
+
+    TestClient yanit govdesini tamamen topladigi icin sonsuz akis dogrudan
+    body_iterator uzerinden okunur.
+    """
+    app = FastAPI()
+    app.state.db_path = initialized_db
+    app.state.config = AppConfig()
+    hub = EventHub()
+    app.state.event_hub = hub
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        scope = {"type": "http", "app": app, "method": "GET", "path": "/api/stream",
+                 "headers": [], "query_string": b""}
+        response = await api_stream(Request(scope, receive))
+        frames = response.body_iterator
+        hello = await anext(frames)
+        hub.on_mqtt_state(True)
+        delta = await asyncio.wait_for(anext(frames), 1.0)
+        await frames.aclose()
+        return response, hello, delta
+
+    response, hello, delta = asyncio.run(scenario())
+    assert response.media_type == "text/event-stream"
+    assert hello == 'id: 0\nevent: hello\ndata: {"mqtt_connected":false}\n\n'
+    assert delta.endswith('event: mqtt\ndata: {"connected":true}\n\n')
+    assert hub.stats()["subscribers"] == 0  # akis kapaninca abonelik kalkar
+
+
+def test_stream_endpoint_rejects_when_full(initialized_db):
+    """Istemci limiti doluysa /api/stream 503 dondurur."""
+    app = FastAPI()
+    app.include_router(dashboard_router)
+    app.state.db_path = initialized_db
+    app.state.config = AppConfig(dashboard={"stream_max_clients": 0})
+
+    with TestClient(app) as client:
+        response = client.get("/api/stream")
+
+    assert response.status_code == 503
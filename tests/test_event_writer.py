@@ -0,0 +1,113 @@
+"""EventWriter testleri - group-commit yazici thread, kuyruk ve sayaclar."""
+
+import json
+from unittest.mock import patch
+
+from src.collector.event_writer import EventWriter
+from src.collector.mqtt_client import MQTTCollector
+from src.config import AppConfig
+from src.database import get_db
+
+
+def _event(i: int, sensor_id: str = "mutfak_motion") -> dict:
+    return {
+        "sensor_id": sensor_id,
+        "channel": "presence",
+        "timestamp": f"2025-03-01T10:{i // 60:02d}:{i % 60:02d}",
+        "event_type": "state_change",
+        "value": "on",
+    }
+
+
+def _count(db_path: str) -> int:
+    with get_db(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0]
+
+
+def test_submit_without_thread_writes_synchronously(initialized_db):
+    """Thread baslamadan submit() eventi hemen yazmali."""
+    writer = EventWriter(initialized_db)
+    assert writer.submit(_event(0)) is True
+    assert _count(initialized_db) == 1
+
+
+def test_batches_by_size(initialized_db):
+    """batch_size dolunca tek transaction'da yazilmali."""
+    writer = EventWriter(initialized_db, batch_size=10, flush_interval_ms=5000)
+    writer.start()
+    try:
+        for i in range(30):
+            writer.submit(_event(i))
+        assert writer.flush(timeout=5.0)
+    finally:
+        writer.stop()
+
+    stats = writer.stats()
+    assert _count(initialized_db) == 30
+    assert stats["events_written"] == 30
+    assert stats["batches_written"] == 3
+    assert stats["max_batch_size"] == 10
+
+
+def test_flush_window_commits_partial_batch(initialized_db):
+    """Batch dolmasa da dayaniklilik penceresi sonunda yazilmali."""
+    writer = EventWriter(initialized_db, batch_size=100, flush_interval_ms=20)
+    writer.start()
+    try:
+        writer.submit(_event(0))
+        writer.submit(_event(1))
+        assert writer.flush(timeout=2.0)
+        assert _count(initialized_db) == 2
+    finally:
+        writer.stop()
+
+
+def test_stop_drains_queue(initialized_db):
+    """stop() kuyrukta bekleyen tum eventleri yazmali."""
+    writer = EventWriter(initialized_db, batch_size=1000, flush_interval_ms=60_000)
+    writer.start()
+    for i in range(25):
+        writer.submit(_event(i))
+    writer.stop()
+
+    assert not writer.running
+    assert _count(initialized_db) == 25
+    assert writer.stats()["queue_depth"] == 0
+
+
+def test_queue_full_rejects_event(initialized_db):
+    """Kuyruk doluysa submit() False donmeli ve dropped sayaci artmali."""
+    writer = EventWriter(initialized_db, queue_size=2)
+    # Thread calisiyor gibi davran ama kuyrugu tuketme
+    with patch.object(EventWriter, "running", new=True):
+        assert writer.submit(_event(0))
+        assert writer.submit(_event(1))
+        assert writer.submit(_event(2)) is False
+        assert writer.stats()["dropped"] == 1
+        assert writer.stats()["queue_depth"] == 2
+
+
+def test_collector_stop_flushes_writer(initialized_db):
+    """MQTTCollector.stop() yazici kuyrugunu bosaltmali."""
+    config = AppConfig(
+        sensors=[{"id": "mutfak_motion", "channel": "presence", "type": "motion", "trigger_value": "on"}],
+        collector={"write_flush_ms": 60_000, "write_batch_size": 1000},
+        database={"path": initialized_db},
+    )
+    collector = MQTTCollector(config, initialized_db)
+    collector._writer.start()
+
+    msg = type("Msg", (), {
+        "topic": "zigbee2mqtt/mutfak_motion",
+        "payload": json.dumps({"occupancy": True}).encode(),
+    })()
+    collector._on_message(None, None, msg)
+    assert collector.writer_stats()["events_written"] == 0  # henuz pencere dolmadi
+
+    with patch.object(collector._client, "publish"), \
+         patch.object(collector._client, "loop_stop"), \
+         patch.object(collector._client, "disconnect"):
+        collector.stop()
+
+    assert _count(initialized_db) == 1
+    assert collector.writer_stats()["events_written"] == 1
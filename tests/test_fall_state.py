@@ -0,0 +1,116 @@
+"""FallStateTracker testleri - bellekte banyo durumu, write-behind kalicilik."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.collector.fall_state import FallStateTracker
+from src.collector.mqtt_client import MQTTCollector
+from src.config import AppConfig
+from src.database import get_system_state, set_system_state
+from src.detector.realtime_checks import check_fall_suspicion
+
+
+def _config(fall_minutes: int = 45) -> AppConfig:
+    return AppConfig(alerts={"fall_detection_minutes": fall_minutes})
+
+
+def test_bathroom_entry_persisted(initialized_db):
+    """Banyoya giris gecisi system_state'e yazilmali."""
+    tracker = FallStateTracker(initialized_db)
+    tracker.on_event("bathroom", "2025-03-01T10:00:00")
+
+    assert tracker.last_bathroom_time == "2025-03-01T10:00:00"
+    assert get_system_state(initialized_db, "last_bathroom_time") == "2025-03-01T10:00:00"
+
+
+def test_repeated_bathroom_event_is_write_behind(initialized_db):
+    """Banyoda devam eden eventler DB'ye yazilmamali, flush ile yazilmali."""
+    tracker = FallStateTracker(initialized_db)
+    tracker.on_event("bathroom", "2025-03-01T10:00:00")
+    tracker.on_event("bathroom", "2025-03-01T10:05:00")
+
+    assert tracker.last_bathroom_time == "2025-03-01T10:05:00"
+    assert get_system_state(initialized_db, "last_bathroom_time") == "2025-03-01T10:00:00"
+
+    tracker.flush()
+    assert get_system_state(initialized_db, "last_bathroom_time") == "2025-03-01T10:05:00"
+
+
+def test_normal_event_costs_no_db_write(initialized_db):
+    """Banyo disi durumda normal event hic DB yazmasi yapmamali."""
+    tracker = FallStateTracker(initialized_db)
+    _ = tracker.last_bathroom_time  # ilk yukleme
+
+    with patch("src.collector.fall_state.set_system_state") as mock_set, \
+         patch("src.collector.fall_state.get_system_state") as mock_get:
+        for _ in range(10):
+            tracker.on_event("presence", "2025-03-01T10:00:00")
+    mock_set.assert_not_called()
+    mock_get.assert_not_called()
+
+
+def test_other_channel_clears_and_persists(initialized_db):
+    """Banyo sonrasi baska kanal eventi durumu temizlemeli (gecis -> DB)."""
+    tracker = FallStateTracker(initialized_db)
+    tracker.on_event("bathroom", "2025-03-01T10:00:00")
+    tracker.on_event("presence", "2025-03-01T10:02:00")
+
+    assert tracker.last_bathroom_time == ""
+    assert get_system_state(initialized_db, "last_bathroom_time") == ""
+
+
+def test_state_restored_from_db(initialized_db):
+    """Yeniden baslatma sonrasi system_state'teki deger yuklenmeli."""
+    set_system_state(initialized_db, "last_bathroom_time", "2025-03-01T09:00:00")
+    tracker = FallStateTracker(initialized_db)
+    assert tracker.last_bathroom_time == "2025-03-01T09:00:00"
+
+
+def test_check_fall_suspicion_uses_tracker(initialized_db):
+    """tracker verilince alarm bellekteki durumdan uretilmeli ve durum temizlenmeli."""
+    tracker = FallStateTracker(initialized_db)
+    tracker.on_event("bathroom", "2025-03-01T10:00:00")
+    tracker.on_event("bathroom", "2025-03-01T10:10:00")  # sadece bellekte
+
+    now = datetime(2025, 3, 1, 10, 50)  # son banyo eventinden 40dk sonra
+    assert check_fall_suspicion(initialized_db, _config(), now=now, tracker=tracker) is None
+
+    now = datetime(2025, 3, 1, 10, 56)
+    alert = check_fall_suspicion(initialized_db, _config(), now=now, tracker=tracker)
+    assert alert is not None
+    assert alert.alert_level == 3
+    assert alert.last_event_time == "2025-03-01T10:10:00"
+    assert tracker.last_bathroom_time == ""
+    assert get_system_state(initialized_db, "last_bathroom_time") == ""
+
+    # Tekrar alarm yok
+    assert check_fall_suspicion(initialized_db, _config(), now=now, tracker=tracker) is None
+
+
+def test_collector_updates_tracker(initialized_db):
+    """MQTTCollector banyo eventinde tracker'i guncellemeli."""
+    config = AppConfig(
+        sensors=[
+            {"id": "banyo_kapi", "channel": "bathroom", "type": "contact", "trigger_value": "open"},
+            {"id": "mutfak_motion", "channel": "presence", "type": "motion", "trigger_value": "on"},
+        ],
+        database={"path": initialized_db},
+    )
+    collector = MQTTCollector(config, initialized_db)
+    msg = type("Msg", (), {
+        "topic": "zigbee2mqtt/banyo_kapi",
+        "payload": json.dumps({"contact": False}).encode(),
+    })()
+    collector._on_message(None, None, msg)
+    assert collector.fall_tracker.last_bathroom_time != ""
+
+    later = datetime.now() + timedelta(minutes=1)
+    with patch("src.collector.event_processor.datetime") as fake_dt:
+        fake_dt.now.return_value = later
+        msg2 = type("Msg", (), {
+            "topic": "zigbee2mqtt/mutfak_motion",
+            "payload": json.dumps({"occupancy": True}).encode(),
+        })()
+        collector._on_message(None, None, msg2)
+    assert collector.fall_tracker.last_bathroom_time == ""
@@ -1,5 +1,6 @@
 """main.py lifespan testleri - MQTT startup hatasi korumasi."""
 
+import threading
 from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
@@ -61,3 +62,56 @@ def test_health_error_returns_503(tmp_path):
             data = resp.json()
             assert data["status"] == "error"
             assert "disk read error" in data["reason"]
+
+
+def test_health_refresh_runs_in_read_pool(tmp_path):
+    """/health?fresh=1 metrik yenilemesini event loop disinda (okuma havuzunda) yapar."""
+    config_data = _make_config(tmp_path)
+    config_data.heartbeat.metrics_fresh_min_seconds = 0
+    threads = []
+
+    def collect(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        raise RuntimeError("olcum yok")
+
+    with patch("src.main.load_config", return_value=config_data), \
+         patch("src.main.MQTTCollector") as mock_mqtt, \
+         patch("src.main.collect_system_metrics", side_effect=collect):
+        mock_mqtt.return_value.is_connected.return_value = False
+
+        from src.main import app
+
+        with TestClient(app) as client:
+            threads.clear()
+            client.get("/health", params={"fresh": 1})
+
+    assert threads and all(name.startswith("dashboard-read") for name in threads)
+
+
+def test_quarantine_notice_sent_off_mqtt_thread(tmp_path):
+    """Karantina bildirimi cagiran (paho) thread'i bloklamaz, havuzda gonderilir."""
+    config_data = _make_config(tmp_path)
+    release = threading.Event()
+    sent = threading.Event()
+    threads = []
+
+    def send_to_all(text):
+        threads.append(threading.current_thread().name)
+        release.wait(5)
+        sent.set()
+
+    with patch("src.main.load_config", return_value=config_data), \
+         patch("src.main.MQTTCollector") as mock_mqtt, \
+         patch("src.main.TelegramNotifier") as mock_notifier:
+        mock_mqtt.return_value.is_connected.return_value = False
+        mock_notifier.return_value.send_to_all.side_effect = send_to_all
+
+        from src.main import app
+
+        with TestClient(app):
+            callback = mock_mqtt.return_value.set_quarantine_callback.call_args.args[0]
+            callback("s1", 250.0)  # Gonderim bitmeden donmeli
+            release.set()
+            assert sent.wait(5)
+
+    assert threads and threads[0] != threading.current_thread().name
@@ -0,0 +1,122 @@
+"""MetricsHistory testleri - halka tampon, pencere ozetleri, downsample, watchdog penceresi."""
+
+import math
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import AppConfig
+from src.dashboard.api import router as dashboard_router
+from src.heartbeat.metrics_history import (
+    HISTORY_FIELDS,
+    MetricsHistory,
+    WindowStats,
+    sample_history_row,
+)
+from src.heartbeat.metrics_sampler import MetricsSampler
+from src.heartbeat.system_monitor import SystemMetrics
+from src.heartbeat.watchdog import check_cpu_temp, check_ram_usage, run_health_checks
+
+
+def _row(cpu=10.0, temp=50.0, mem=40.0, disk=30.0, db=1.0, wal=0.1):
+    return (cpu, temp, mem, disk, db, wal)
+
+
+def _metrics(**overrides) -> SystemMetrics:
+    values = dict(
+        cpu_percent=10.0, memory_percent=40.0, disk_percent=30.0, cpu_temp=50.0,
+        db_size_mb=1.0, last_event_age_minutes=2.0, today_event_count=12,
+        uptime_seconds=100.0,
+    )
+    values.update(overrides)
+    return SystemMetrics(**values)
+
+
+def test_ring_overwrites_oldest():
+    """Kapasite dolunca en eski ornegin uzerine yazilir."""
+    history = MetricsHistory(capacity=4)
+    for i in range(6):
+        history.append(_row(cpu=float(i)), timestamp=100.0 + i)
+
+    assert len(history) == 4
+    stats = history.window("cpu_percent", seconds=100, now=106.0)
+    assert stats.count == 4
+    assert stats.mean == 3.5  # 2, 3, 4, 5
+    assert stats.max == 5.0
+
+
+def test_window_stats_and_missing_values():
+    """Pencere disi ve NaN (None) ornekler ozete girmez; p95 en yakin sira."""
+    history = MetricsHistory(capacity=100)
+    for i in range(20):
+        history.append(_row(cpu=float(i + 1), temp=None if i % 2 else 60.0), timestamp=float(i))
+
+    cpu = history.window("cpu_percent", seconds=10, now=19.0)  # ts 9..19
+    assert cpu.count == 11
+    assert cpu.max == 20.0
+    assert cpu.p95 == 20.0
+    assert math.isclose(cpu.mean, sum(range(10, 21)) / 11)
+
+    temp = history.window("cpu_temp", seconds=100, now=19.0)
+    assert temp.count == 10 and temp.mean == 60.0
+
+    empty = history.window("cpu_percent", seconds=5, now=1000.0)
+    assert empty.count == 0 and math.isnan(empty.mean)
+
+
+def test_downsample_buckets():
+    """Downsample kova ortalamalari dondurur, bos kovalar atlanir."""
+    history = MetricsHistory(capacity=100)
+    for ts in (0.0, 1.0, 2.0, 3.0, 8.0, 9.0):
+        history.append(_row(cpu=ts), timestamp=ts)
+
+    result = history.downsample(seconds=10, points=5, now=10.0)  # kova = 2 sn
+
+    assert result["bucket_seconds"] == 2.0
+    assert result["timestamps"] == [0.0, 2.0, 8.0]
+    assert result["cpu_percent"] == [0.5, 2.5, 8.5]
+    assert set(HISTORY_FIELDS) <= set(result)
+
+
+def test_sample_history_row_includes_wal_size(initialized_db):
+    """Hafif ornek tum alanlari dondurur; WAL modundaki DB icin WAL boyutu >= 0."""
+    row = sample_history_row(initialized_db)
+    assert len(row) == len(HISTORY_FIELDS)
+    assert row[HISTORY_FIELDS.index("db_size_mb")] > 0
+    assert row[HISTORY_FIELDS.index("wal_size_mb")] >= 0
+
+
+def test_watchdog_uses_window_mean():
+    """Tek yuksek ornek pencere ortalamasini gecmezse saglikli; surekli yukseklik uyari."""
+    spike = _metrics(cpu_temp=85.0, memory_percent=90.0)
+    calm = WindowStats(mean=55.0, max=85.0, p95=85.0, count=60)
+    hot = WindowStats(mean=82.0, max=86.0, p95=85.5, count=60)
+
+    assert check_cpu_temp(spike, calm).healthy
+    assert not check_cpu_temp(_metrics(cpu_temp=60.0), hot).healthy
+    assert "ort. 82.0" in check_cpu_temp(spike, hot).message
+    assert check_ram_usage(spike, WindowStats(50.0, 90.0, 88.0, 60)).healthy
+    # Yetersiz ornekte anlik deger kullanilir
+    assert not check_cpu_temp(spike, WindowStats(50.0, 85.0, 85.0, 2)).healthy
+
+    status = run_health_checks(spike, True, windows={"cpu_temp": calm, "memory_percent": calm})
+    assert status.all_healthy
+
+
+def test_api_metrics_history(initialized_db):
+    """/api/metrics/history ornekleyicinin tamponunu downsample eder."""
+    app = FastAPI()
+    app.include_router(dashboard_router)
+    app.state.db_path = initialized_db
+    app.state.config = AppConfig()
+    history = MetricsHistory(capacity=10)
+    sampler = MetricsSampler(initialized_db, history=history)
+    sampler.record_history()
+    sampler.record_history()
+    app.state.metrics_sampler = sampler
+
+    data = TestClient(app).get("/api/metrics/history", params={"minutes": 5, "points": 10}).json()
+
+    assert data["bucket_seconds"] == 30.0
+    assert 1 <= len(data["timestamps"]) <= 2  # iki ornek (kova sinirina gore 1-2 nokta)
+    assert len(data["memory_percent"]) == len(data["timestamps"])
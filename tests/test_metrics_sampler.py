@@ -0,0 +1,143 @@
+"""MetricsSampler testleri - TTL, zorla yenileme hiz siniri, hata, ortak snapshot."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import AppConfig
+from src.dashboard.api import router as dashboard_router
+from src.heartbeat.metrics_sampler import MetricsSampler, MetricsUnavailableError
+from src.heartbeat.system_monitor import SystemMetrics
+from src.jobs import heartbeat_job, watchdog_job
+
+
+def _metrics(cpu: float = 10.0) -> SystemMetrics:
+    return SystemMetrics(
+        cpu_percent=cpu, memory_percent=40.0, disk_percent=30.0, cpu_temp=50.0,
+        db_size_mb=1.0, last_event_age_minutes=2.0, today_event_count=12,
+        uptime_seconds=100.0,
+    )
+
+
+class _Clock:
+    """Elle ilerletilen monotonik saat."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _sampler(collect, clock, interval=15.0, fresh_min=5.0) -> MetricsSampler:
+    return MetricsSampler("unused.db", interval, fresh_min, collect=collect, clock=clock)
+
+
+def test_snapshot_cached_until_ttl():
+    """TTL dolana kadar ayni snapshot doner, yasi artar; sonra yeniden olcer."""
+    clock = _Clock()
+    collect = MagicMock(side_effect=[_metrics(1.0), _metrics(2.0)])
+    sampler = _sampler(collect, clock)
+
+    first = sampler.get()
+    clock.now += 10
+    second = sampler.get()
+    assert collect.call_count == 1
+    assert second.metrics is first.metrics
+    assert second.age_seconds == pytest.approx(10.0)
+
+    clock.now += 5
+    third = sampler.get()
+    assert collect.call_count == 2
+    assert third.metrics.cpu_percent == 2.0
+    assert third.age_seconds == 0.0
+
+
+def test_fresh_refresh_is_rate_limited():
+    """fresh=True yeniden olcer ama fresh_min_interval icinde tekrar olcmez."""
+    clock = _Clock()
+    collect = MagicMock(side_effect=lambda path: _metrics())
+    sampler = _sampler(collect, clock)
+
+    sampler.get()
+    clock.now += 2
+    sampler.get(fresh=True)
+    assert collect.call_count == 1  # 2 sn < 5 sn: sinirli
+
+    clock.now += 4
+    assert sampler.get(fresh=True).age_seconds == 0.0
+    assert collect.call_count == 2
+
+
+def test_failed_sample_raises_until_recovered():
+    """Son olcum basarisizsa get() hata verir; sonraki basarili olcum duzeltir."""
+    clock = _Clock()
+    collect = MagicMock(side_effect=[RuntimeError("disk read error"), _metrics()])
+    sampler = _sampler(collect, clock)
+
+    with pytest.raises(MetricsUnavailableError, match="disk read error"):
+        sampler.get()
+    with pytest.raises(MetricsUnavailableError):
+        sampler.get()  # TTL dolmadan tekrar denenmez
+    assert collect.call_count == 1
+
+    clock.now += 15
+    assert sampler.get().metrics.today_event_count == 12
+
+
+def test_concurrent_gets_sample_once():
+    """Es zamanli TTL kacirmalarinda tek olcum yapilir."""
+    release = threading.Event()
+    calls = []
+
+    def slow_collect(path):
+        calls.append(path)
+        release.wait(2)
+        return _metrics()
+
+    sampler = MetricsSampler("unused.db", 15.0, 5.0, collect=slow_collect)
+    threads = [threading.Thread(target=sampler.get) for _ in range(4)]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert len(calls) == 1
+
+
+def test_jobs_share_sampler_snapshot():
+    """heartbeat_job ve watchdog_job ayni snapshot'i kullanir (tek olcum)."""
+    collect = MagicMock(return_value=_metrics())
+    sampler = _sampler(collect, _Clock())
+    client = MagicMock()
+    collector = MagicMock(is_connected=MagicMock(return_value=True))
+
+    heartbeat_job(sampler, client, collector)
+    watchdog_job(sampler, collector, MagicMock())
+
+    assert collect.call_count == 1
+    client.send.assert_called_once_with(collect.return_value, True)
+
+
+def test_api_health_reports_metrics_age(initialized_db):
+    """/api/health snapshot yasini dondurur; ?fresh=1 hiz sinirina tabidir."""
+    app = FastAPI()
+    app.include_router(dashboard_router)
+    app.state.db_path = initialized_db
+    app.state.config = AppConfig()
+    collect = MagicMock(return_value=_metrics())
+    clock = _Clock()
+    app.state.metrics_sampler = _sampler(collect, clock)
+    client = TestClient(app)
+
+    client.get("/api/health")
+    clock.now += 3
+    data = client.get("/api/health", params={"fresh": 1}).json()
+
+    assert data["status"] in ("ok", "degraded")
+    assert data["metrics_age_seconds"] == 3.0
+    assert collect.call_count == 1
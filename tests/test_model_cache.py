@@ -0,0 +1,114 @@
+"""Model onbellegi testleri - versiyon anahtari, ogrenme sonrasi bayat okuma yok."""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.alerter.alert_manager import AlertManager
+from src.config import AppConfig
+from src.dashboard.charts import get_heatmap_data, get_status_data
+from src.database import get_data_version, get_db
+from src.learner.beta_model import BetaPosterior
+from src.learner.model_cache import get_model_view
+from src.learner.routine_learner import run_daily_learning
+
+CHANNELS = ["presence", "fridge", "bathroom", "door"]
+
+
+def _insert_day(db_path: str, date: str, active: int) -> None:
+    """Tum slotlari ayni active degeriyle slot_summary'e yaz."""
+    with get_db(db_path) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO slot_summary (date, slot, channel, active, event_count) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(date, s, ch, active, active) for ch in CHANNELS for s in range(96)],
+        )
+        conn.commit()
+
+
+@pytest.fixture
+def config():
+    return AppConfig(
+        model={"learning_days": 14, "prior_alpha": 1.0, "prior_beta": 1.0},
+    )
+
+
+def test_view_reused_until_version_changes(initialized_db, config):
+    """Ayni versiyonda ayni nesne doner, DB'ye tekrar gidilmez."""
+    _insert_day(initialized_db, "2025-01-15", active=1)
+    run_daily_learning(initialized_db, config, target_date="2025-01-15")
+
+    first = get_model_view(initialized_db)
+    with patch("src.learner.model_cache.load_model_with_ci_width") as mock_load:
+        second = get_model_view(initialized_db)
+    assert second is first
+    mock_load.assert_not_called()
+    assert first.version[1] == get_data_version("model")
+
+
+def test_external_snapshot_invalidates_view(initialized_db, config):
+    """Baska surecin yazdigi snapshot (surec ici versiyon artmadan) da gorulur."""
+    _insert_day(initialized_db, "2025-01-15", active=1)
+    run_daily_learning(initialized_db, config, target_date="2025-01-15")
+    first = get_model_view(initialized_db)
+
+    _insert_day(initialized_db, "2025-01-16", active=0)
+    with patch("src.learner.model_store.bump_data_version"):
+        run_daily_learning(initialized_db, config, target_date="2025-01-16")
+
+    view = get_model_view(initialized_db)
+    assert view is not first
+    assert view.version[0] == first.version[0] + 1
+    assert view.channel_means("presence")[0] == pytest.approx(BetaPosterior(2, 2).mean)
+    assert view.avg_ci_width == pytest.approx(BetaPosterior(2, 2).ci_width)
+
+
+def test_no_stale_read_after_learning(initialized_db, config):
+    """Ogrenme calismasi sonrasi heatmap/status/ozet yeni modeli gorur."""
+    _insert_day(initialized_db, "2025-01-15", active=1)
+    run_daily_learning(initialized_db, config, target_date="2025-01-15")
+
+    before = get_heatmap_data(initialized_db)["model"]["presence"][0]
+    ci_before = get_status_data(initialized_db, True)["learning"]["avg_ci_width"]
+    assert before["probability"] == pytest.approx(BetaPosterior(2, 1).mean, abs=1e-4)
+
+    _insert_day(initialized_db, "2025-01-16", active=0)
+    run_daily_learning(initialized_db, config, target_date="2025-01-16")
+
+    after = get_heatmap_data(initialized_db)["model"]["presence"][0]
+    ci_after = get_status_data(initialized_db, True)["learning"]["avg_ci_width"]
+    expected = BetaPosterior(2, 2)
+    assert after["probability"] == pytest.approx(expected.mean, abs=1e-4)
+    assert after["ci_width"] == pytest.approx(expected.ci_width, abs=1e-4)
+    assert ci_after == pytest.approx(round(expected.ci_width, 4))
+    assert ci_after != ci_before
+
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO daily_scores (date, train_days, composite_z, alert_level, is_learning) "
+            "VALUES (?, 3, 0.0, 0, 1)",
+            (datetime.now().strftime("%Y-%m-%d"),),
+        )
+        conn.commit()
+    notifier = MagicMock()
+    notifier.enabled = True
+    manager = AlertManager(config, notifier)
+    with patch("src.alerter.alert_manager.render_daily_summary") as mock_render:
+        mock_render.return_value = "test"
+        manager.handle_daily_summary(initialized_db)
+    assert mock_render.call_args.kwargs["ci_width"] == pytest.approx(expected.ci_width)
+
+
+def test_missing_model_not_cached(initialized_db):
+    """Model yokken None doner ve prior gorunumu kullanilir; sonra yazilan model gorunur."""
+    assert get_model_view(initialized_db) is None
+    heatmap = get_heatmap_data(initialized_db)
+    assert heatmap["model"]["door"][0]["probability"] == 0.5
+
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO model_state (slot, channel, alpha, beta) VALUES (0, 'door', 9.0, 1.0)"
+        )
+        conn.commit()
+    assert get_model_view(initialized_db).channel_means("door")[0] == pytest.approx(0.9)
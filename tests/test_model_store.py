@@ -0,0 +1,107 @@
+"""Model snapshot (model_store) testleri - blob format, versiyon, geri donus."""
+
+import pytest
+
+from src.database import get_db
+from src.learner.beta_model import BetaModelArray
+from src.learner.model_store import (
+    KEEP_SNAPSHOTS,
+    average_ci_width,
+    decode_model,
+    encode_model,
+    load_model,
+    save_model,
+)
+
+CHANNELS = ["presence", "fridge", "bathroom", "door"]
+
+
+def _model(offset: float = 0.0) -> BetaModelArray:
+    n = len(CHANNELS) * 96
+    return BetaModelArray(
+        CHANNELS,
+        [1.0 + offset + i * 0.01 for i in range(n)],
+        [2.0 + offset + i * 0.02 for i in range(n)],
+    )
+
+
+def test_encode_decode_roundtrip_zero_copy():
+    """Blob -> model ayni degerler, alpha/beta memoryview (kopyasiz)."""
+    model = _model()
+    blob = encode_model(model)
+    assert len(blob) == 2 * len(CHANNELS) * 96 * 8
+
+    restored = decode_model(CHANNELS, blob)
+    assert list(restored.alpha) == list(model.alpha)
+    assert list(restored.beta) == list(model.beta)
+    assert isinstance(restored.alpha, memoryview)
+
+
+def test_decode_rejects_wrong_size():
+    """Kanal sayisi blob'la uyusmuyorsa ValueError."""
+    blob = encode_model(_model())
+    with pytest.raises(ValueError):
+        decode_model(CHANNELS[:3], blob)
+
+
+def test_save_versions_and_prunes(initialized_db):
+    """Her kayit yeni versiyon; en fazla KEEP_SNAPSHOTS saklanir, son okunur."""
+    for i in range(KEEP_SNAPSHOTS + 3):
+        version = save_model(initialized_db, _model(i), "2025-01-01", legacy_rows=False)
+    assert version == KEEP_SNAPSHOTS + 3
+
+    with get_db(initialized_db) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM model_snapshot").fetchone()[0]
+        legacy = conn.execute("SELECT COUNT(*) FROM model_state").fetchone()[0]
+    assert count == KEEP_SNAPSHOTS
+    assert legacy == 0
+
+    loaded = load_model(initialized_db)
+    assert loaded.alpha[0] == pytest.approx(1.0 + KEEP_SNAPSHOTS + 2)
+
+
+def test_legacy_rows_written_in_same_save(initialized_db):
+    """legacy_rows=True -> model_state 384 satir, snapshot ile ayni degerler."""
+    model = _model()
+    save_model(initialized_db, model, "2025-01-01")
+    with get_db(initialized_db) as conn:
+        row = conn.execute(
+            "SELECT alpha, beta FROM model_state WHERE channel = 'fridge' AND slot = 5"
+        ).fetchone()
+        count = conn.execute("SELECT COUNT(*) FROM model_state").fetchone()[0]
+    assert count == len(CHANNELS) * 96
+    assert row["alpha"] == pytest.approx(model.posterior("fridge", 5).alpha)
+    assert row["beta"] == pytest.approx(model.posterior("fridge", 5).beta)
+
+
+def test_load_falls_back_to_model_state_rows(initialized_db):
+    """Snapshot yoksa model_state satirlari okunur, eksikler prior."""
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO model_state (slot, channel, alpha, beta) VALUES (3, 'door', 5.0, 2.0)"
+        )
+        conn.commit()
+        assert average_ci_width(conn) == pytest.approx(
+            BetaModelArray(["door"], [5.0] * 96, [2.0] * 96).avg_ci_width()
+        )
+
+    model = load_model(initialized_db, CHANNELS, prior_a=1.0, prior_b=1.0)
+    assert model.posterior("door", 3).alpha == 5.0
+    assert model.posterior("presence", 0).alpha == 1.0
+
+
+def test_load_returns_none_without_model(initialized_db):
+    """Hic model kaydi yoksa None."""
+    assert load_model(initialized_db) is None
+    with get_db(initialized_db) as conn:
+        assert average_ci_width(conn) is None
+
+
+def test_load_selects_requested_channels(initialized_db):
+    """Snapshot kanal sirasi farkli/eksikse istenen kanallara yeniden dizilir."""
+    save_model(initialized_db, _model(), "2025-01-01", legacy_rows=False)
+    model = load_model(initialized_db, ["door", "kitchen"], prior_a=3.0, prior_b=4.0)
+    assert model.channels == ["door", "kitchen"]
+    assert model.posterior("door", 0).alpha == pytest.approx(_model().posterior("door", 0).alpha)
+    assert model.posterior("kitchen", 10).alpha == 3.0
+    assert model.posterior("kitchen", 10).beta == 4.0
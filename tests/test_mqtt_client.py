@@ -1,10 +1,13 @@
 """MQTTCollector testleri - mock mesaj, gercek DB, broker'a baglanma yok."""
 
 import json
+from unittest.mock import MagicMock, patch
 
+import src.collector.event_processor as event_processor_mod
 from src.collector.mqtt_client import MQTTCollector
 from src.config import AppConfig
 from src.database import get_db
+from src.telemetry import REGISTRY
 
 
 class FakeMQTTMessage:
@@ -147,3 +150,73 @@ def test_on_message_debounce(initialized_db):
         count = conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0]
 
     assert count == 1  # debounce ile 2. mesaj filtrelendi
+
+
+def test_on_message_parses_payload_once(initialized_db):
+    """Durum ve pil ayni parse'tan okunur: mesaj basina tek JSON yuklemesi."""
+    collector = _make_collector(initialized_db)
+    warnings = []
+    collector.set_battery_callback(warnings.append)
+    msg = FakeMQTTMessage(
+        topic="zigbee2mqtt/mutfak_motion",
+        payload=json.dumps({"occupancy": True, "battery": 9, "linkquality": 80}).encode(),
+    )
+
+    with patch.object(
+        event_processor_mod, "_load_json_dict", wraps=event_processor_mod._load_json_dict,
+    ) as load:
+        collector._on_message(None, None, msg)
+    collector._writer.flush()
+
+    assert load.call_count == 1
+    assert warnings == [{"sensor_id": "mutfak_motion", "battery": 9}]
+    with get_db(initialized_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0] == 1
+
+
+def test_wildcard_mode_single_subscribe_and_aliases(initialized_db):
+    """Wildcard modu: tek SUBSCRIBE; alias topic'leri ayni sensore, bilinmeyenler sayilip atilir."""
+    sensors = [
+        {"id": f"hareket_{i}", "channel": "presence", "type": "motion", "trigger_value": "on"}
+        for i in range(300)
+    ]
+    sensors.append({
+        "id": "banyo_kapi", "channel": "bathroom", "type": "contact", "trigger_value": "open",
+        "aliases": ["0x00158d0001a2b3c4", "kat1/banyo"],
+    })
+    collector = _make_collector(initialized_db, sensors=sensors)
+    collector._config.mqtt.wildcard_subscribe = True
+
+    client = MagicMock()
+    collector._on_connect(client, None, None, 0, None)
+    client.subscribe.assert_called_once_with([("zigbee2mqtt/+", 0), ("zigbee2mqtt/kat1/banyo", 0)])
+
+    def unknown_total() -> float:
+        for line in REGISTRY.render().splitlines():
+            if line.startswith("annem_mqtt_unknown_topics_total "):
+                return float(line.split()[-1])
+        return 0.0
+
+    before = unknown_total()
+    payload = json.dumps({"contact": False}).encode()
+    collector._on_message(None, None, FakeMQTTMessage("zigbee2mqtt/0x00158d0001a2b3c4", payload))
+    collector._on_message(None, None, FakeMQTTMessage("zigbee2mqtt/salon_lamba", payload))
+    collector._on_message(None, None, FakeMQTTMessage("zigbee2mqtt/salon_lamba", payload))
+    collector._writer.flush()
+
+    assert unknown_total() - before == 2
+    assert collector._unknown_logged == {"zigbee2mqtt/salon_lamba"}
+    with get_db(initialized_db) as conn:
+        rows = conn.execute("SELECT sensor_id, channel FROM sensor_events").fetchall()
+    assert [tuple(r) for r in rows] == [("banyo_kapi", "bathroom")]
+
+
+def test_per_sensor_mode_subscribes_in_one_call(initialized_db):
+    """Varsayilan mod: tum sensor topic'leri tek subscribe cagrisinda."""
+    collector = _make_collector(initialized_db)
+    client = MagicMock()
+    collector._on_connect(client, None, None, 0, None)
+
+    (filters,), _ = client.subscribe.call_args
+    assert client.subscribe.call_count == 1
+    assert sorted(t for t, _ in filters) == sorted(collector._sensor_map)
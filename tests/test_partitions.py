@@ -0,0 +1,172 @@
+"""Aylik sensor_events bolumleme testleri - donusum, yonlendirme, retention DROP."""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.collector.event_writer import EventWriter
+from src.collector.slot_aggregator import aggregate_day
+from src.dashboard.charts import get_status_data
+from src.database import cleanup_old_events, configure_event_partitions, get_db
+from src.detector.trend_analyzer import get_daily_event_counts
+from src.partitions import (
+    events_source,
+    insert_events,
+    is_partitioned,
+    latest_event,
+    list_partitions,
+)
+
+
+def _rows(*timestamps, channel="presence"):
+    return [(ts, "s1", channel, "state_change", "on") for ts in timestamps]
+
+
+def _tables(conn) -> set[str]:
+    return {
+        r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+
+
+@pytest.fixture
+def partitioned_db(initialized_db):
+    configure_event_partitions(initialized_db, True)
+    return initialized_db
+
+
+def test_enable_and_disable_round_trip(initialized_db):
+    """Mevcut eventler ay tablolarina tasinir; geri donuste tek tabloda birlesir."""
+    with get_db(initialized_db) as conn:
+        insert_events(conn, _rows("2025-01-31T23:59:59", "2025-02-01T00:00:00", "2025-02-11T08:00:00"))
+        conn.commit()
+
+    assert configure_event_partitions(initialized_db, True) == 3
+    assert configure_event_partitions(initialized_db, True) == 0
+    with get_db(initialized_db) as conn:
+        assert is_partitioned(conn)
+        assert list_partitions(conn) == ["2025-01", "2025-02"]
+        assert "sensor_events" not in _tables(conn)
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events_p202502").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0] == 3
+
+    assert configure_event_partitions(initialized_db, False) == 3
+    with get_db(initialized_db) as conn:
+        assert not is_partitioned(conn)
+        assert not any(t.startswith("sensor_events_p") for t in _tables(conn))
+        indexes = {
+            r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'sensor_events'"
+            )
+        }
+        assert {"idx_events_ts", "idx_events_channel", "idx_events_ts_channel"} <= indexes
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0] == 3
+
+
+def test_writes_create_partitions_with_distinct_ids(partitioned_db):
+    """insert_events ay tablosunu ilk eventte olusturur; id'ler aylar arasi cakismaz."""
+    with get_db(partitioned_db) as conn:
+        insert_events(conn, _rows("2025-03-01T10:00:00", "2025-04-02T10:00:00"))
+        # View'a dogrudan INSERT trigger ile mevcut aya yonlenir
+        conn.execute(
+            "INSERT INTO sensor_events (timestamp, sensor_id, channel) "
+            "VALUES ('2025-03-05T09:00:00', 's2', 'door')"
+        )
+        conn.commit()
+
+        rows = conn.execute("SELECT id, event_type, created_at FROM sensor_events").fetchall()
+        assert len({r["id"] for r in rows}) == 3
+        assert all(r["event_type"] == "state_change" and r["created_at"] for r in rows)
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events_p202503").fetchone()[0] == 2
+
+        # Bolumu olmayan aya view uzerinden yazma acik hata verir
+        with pytest.raises(sqlite3.IntegrityError, match="bolum yok"):
+            conn.execute(
+                "INSERT INTO sensor_events (timestamp, sensor_id, channel) "
+                "VALUES ('2030-01-01T00:00:00', 's1', 'door')"
+            )
+
+
+def test_events_source_prunes_months(partitioned_db):
+    """Router yalnizca araliga dusen ay tablolarini dondurur."""
+    with get_db(partitioned_db) as conn:
+        insert_events(conn, _rows("2025-01-10T08:00:00", "2025-02-10T08:00:00", "2025-03-10T08:00:00"))
+        conn.commit()
+
+        assert events_source(conn, "2025-02-11T00:00:00", "2025-02-11T23:59:59") == "sensor_events_p202502"
+        union = events_source(conn, "2025-02-01")
+        assert "p202502" in union and "p202503" in union and "p202501" not in union
+        empty = events_source(conn, "2026-01-01")
+        assert conn.execute(f"SELECT COUNT(*) FROM {empty}").fetchone()[0] == 0
+        assert conn.execute(f"SELECT COUNT(*) FROM {union}").fetchone()[0] == 2
+        assert latest_event(conn)["timestamp"] == "2025-03-10T08:00:00"
+
+
+def test_events_source_plain_table(initialized_db):
+    """Bolumleme kapaliyken router tabloyu oldugu gibi dondurur."""
+    with get_db(initialized_db) as conn:
+        assert events_source(conn, "2025-02-01", "2025-03-01") == "sensor_events"
+        assert latest_event(conn) is None
+
+
+def test_cleanup_drops_whole_months(partitioned_db):
+    """Retention satir silmez: tamami eski aylar DROP edilir, cutoff ayi kalir."""
+    now = datetime.now()
+    cutoff = now - timedelta(days=90)
+    old = (cutoff.replace(day=1) - timedelta(days=1)).strftime("%Y-%m-%dT12:00:00")
+    boundary = cutoff.strftime("%Y-%m-01T00:00:00")
+    with get_db(partitioned_db) as conn:
+        insert_events(conn, _rows(old, old, boundary, now.strftime("%Y-%m-%dT%H:%M:%S")))
+        conn.commit()
+
+    assert cleanup_old_events(partitioned_db, retention_days=90) == 2
+    with get_db(partitioned_db) as conn:
+        assert old[:7] not in list_partitions(conn)
+        assert boundary[:7] in list_partitions(conn)
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0] == 2
+        # DELETE view trigger'i ile ilgili aydan silinir
+        conn.execute("DELETE FROM sensor_events WHERE timestamp = ?", (boundary,))
+        conn.commit()
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0] == 1
+    assert cleanup_old_events(partitioned_db, retention_days=90) == 0
+
+
+def test_readers_and_writer_on_partitions(partitioned_db):
+    """EventWriter ay tablosuna yazar; dashboard, trend ve slot okumalari ayni sonucu verir."""
+    now = datetime.now()
+    writer = EventWriter(partitioned_db)
+    for minutes in (30, 20, 10):
+        ts = (now - timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%S")
+        writer.submit({
+            "timestamp": ts, "sensor_id": "s1", "channel": "presence",
+            "event_type": "state_change", "value": "on",
+        })
+    with get_db(partitioned_db) as conn:
+        insert_events(conn, _rows((now - timedelta(days=40)).strftime("%Y-%m-%dT12:00:00")))
+        conn.commit()
+
+    status = get_status_data(partitioned_db, True)
+    counts = get_daily_event_counts(partitioned_db, "presence", days=45, now=now)
+    today = now.strftime("%Y-%m-%d")
+
+    assert status["last_event"]["sensor_id"] == "s1"
+    assert status["today_event_count"] == sum(
+        1 for m in (30, 20, 10) if (now - timedelta(minutes=m)).date() == now.date()
+    )
+    assert sum(c for _, c in counts) == 4
+    assert aggregate_day(partitioned_db, today, ["presence"]) == 96
+
+
+def test_enable_aborts_on_malformed_timestamp(initialized_db):
+    """Hicbir aya dusmeyen timestamp varsa donusum geri alinir, satir kaybolmaz."""
+    with get_db(initialized_db) as conn:
+        insert_events(conn, _rows("2025-02-11T08:00:00", "11/02/2025 08:00"))
+        conn.commit()
+
+    with pytest.raises(ValueError, match="1 eventin timestamp'i gecersiz"):
+        configure_event_partitions(initialized_db, True)
+
+    with get_db(initialized_db) as conn:
+        assert not is_partitioned(conn)
+        assert list_partitions(conn) == []
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events").fetchone()[0] == 2
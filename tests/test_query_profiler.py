@@ -0,0 +1,144 @@
+"""Sorgu profilleme testleri - ifade istatistikleri, yavas sorgu logu, admin endpoint."""
+
+import logging
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import AppConfig
+from src.dashboard.api import router as dashboard_router
+from src.database import (
+    QueryBudgetExceeded,
+    close_all_connections,
+    configure_query_profiling,
+    get_db,
+    query_budget,
+)
+
+
+@pytest.fixture
+def profiler(initialized_db):
+    """Profilleme acik; sonradan acilan baglantilar profillenir."""
+    close_all_connections()
+    active = configure_query_profiling(True, slow_query_ms=1000.0)
+    yield active
+    configure_query_profiling(False)
+    close_all_connections()
+
+
+def _insert_events(db_path: str, n: int) -> None:
+    with get_db(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO sensor_events (timestamp, sensor_id, channel, event_type, value) "
+            "VALUES (?, 's1', 'presence', 'state_change', 'on')",
+            [(f"2025-02-11T08:{i:02d}:00",) for i in range(n)],
+        )
+        conn.commit()
+
+
+def _by_sql(profiler, fragment: str) -> dict:
+    matches = [q for q in profiler.top(100) if fragment in q["sql"]]
+    assert len(matches) == 1, matches
+    return matches[0]
+
+
+def test_records_caller_rows_and_fetch_modes(initialized_db, profiler):
+    """Ifade basina cagiran modul.fonksiyon, adet ve satir sayisi; fetch bicimi fark etmez."""
+    _insert_events(initialized_db, 40)
+
+    with get_db(initialized_db) as conn:
+        conn.execute("SELECT id FROM sensor_events").fetchall()
+        for _ in conn.execute("SELECT id FROM sensor_events WHERE id <= 5"):
+            pass
+        conn.execute("SELECT COUNT(*)   FROM\n sensor_events").fetchone()
+        # Tukenmeyen cursor commit'i engellemez, havuza donuste kaydedilir
+        conn.execute("SELECT id FROM sensor_events WHERE id > 30").fetchone()
+        conn.execute("INSERT INTO system_state (key, value) VALUES ('k', 'v')")
+        conn.commit()
+
+    insert = _by_sql(profiler, "INSERT INTO sensor_events")
+    assert insert["caller"] == "tests.test_query_profiler._insert_events"
+    assert insert["rows"] == 40
+    full = [q for q in profiler.top(100) if q["sql"] == "SELECT id FROM sensor_events"]
+    assert full[0]["rows"] == 40
+    assert _by_sql(profiler, "WHERE id <= 5")["rows"] == 5
+    assert _by_sql(profiler, "WHERE id > 30")["rows"] == 1
+    count = _by_sql(profiler, "SELECT COUNT(*) FROM sensor_events")  # bosluklar normalize
+    assert count["caller"] == "tests.test_query_profiler.test_records_caller_rows_and_fetch_modes"
+    assert count["count"] == 1 and count["rows"] == 1
+    assert _by_sql(profiler, "INTO system_state")["rows"] == 1
+
+
+def test_vm_steps_sort_and_reset(initialized_db, profiler):
+    """Tam tarama daha cok VM adimi sayar; siralama anahtari dogrulanir; reset temizler."""
+    _insert_events(initialized_db, 60)
+    profiler.reset()
+    with get_db(initialized_db, read_only=True) as conn:
+        conn.execute("SELECT SUM(length(value)) FROM sensor_events").fetchone()
+        conn.execute("SELECT 1").fetchone()
+
+    top = [q["sql"] for q in profiler.top(2, "steps")]
+    assert top[0] == "SELECT SUM(length(value)) FROM sensor_events"
+    assert profiler.top(1, "steps")[0]["vm_steps"] > 0
+    with pytest.raises(ValueError):
+        profiler.top(5, "speed")
+
+    profiler.reset()
+    assert profiler.top() == []
+
+
+def test_slow_query_logged(initialized_db, profiler, caplog):
+    """Esigi asan ifade WARNING ile cagiran bilgisiyle loglanir."""
+    profiler.slow_seconds = 0.0
+    with caplog.at_level(logging.WARNING, logger="annem_guvende"):
+        with get_db(initialized_db) as conn:
+            conn.execute("SELECT COUNT(*) FROM daily_scores").fetchone()
+
+    assert any(
+        "Yavas sorgu" in r.message and "SELECT COUNT(*) FROM daily_scores" in r.message
+        for r in caplog.records
+    )
+
+
+def test_budget_enforced_while_profiling(initialized_db, profiler):
+    """Profilleme acikken de salt-okunur sorgu butcesi uygulanir."""
+    slow_sql = (
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 5000000) "
+        "SELECT SUM(x) FROM n"
+    )
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(0.05), get_db(initialized_db, read_only=True) as conn:
+            conn.execute(slow_sql).fetchone()
+
+
+def test_disabled_uses_plain_connection(initialized_db):
+    """Profilleme kapaliyken baglanti standart sqlite3.Connection."""
+    close_all_connections()
+    with get_db(initialized_db) as conn:
+        assert type(conn) is sqlite3.Connection
+
+
+def test_admin_queries_endpoint(initialized_db, profiler):
+    """/api/admin/queries top-N dondurur; bilinmeyen siralama 400, DELETE sifirlar."""
+    app = FastAPI()
+    app.include_router(dashboard_router)
+    app.state.db_path = initialized_db
+    app.state.config = AppConfig()
+    client = TestClient(app)
+
+    client.get("/api/status")
+    data = client.get("/api/admin/queries", params={"top": 3, "sort": "max"}).json()
+
+    assert data["enabled"] is True
+    assert data["slow_query_ms"] == 1000.0
+    assert 0 < len(data["queries"]) <= 3
+    assert data["queries"][0]["caller"].startswith("src.")
+    assert client.get("/api/admin/queries", params={"sort": "x"}).status_code == 400
+
+    client.delete("/api/admin/queries")
+    assert client.get("/api/admin/queries").json()["queries"] == []
+
+    configure_query_profiling(False)
+    assert client.get("/api/admin/queries").json() == {"enabled": False, "queries": []}
@@ -0,0 +1,259 @@
+"""Event-driven deadline zamanlayici ve RealtimeMonitor testleri."""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from src.collector.fall_state import FallStateTracker
+from src.collector.mqtt_client import MQTTCollector
+from src.config import AppConfig
+from src.database import set_system_state
+from src.detector.deadline_timer import DeadlineTimer
+from src.detector.realtime_checks import evaluate_extended_silence
+from src.detector.realtime_monitor import FALL_TIMER, SILENCE_TIMER, RealtimeMonitor
+
+
+def _ago(minutes: float) -> str:
+    return (datetime.now() - timedelta(minutes=minutes)).isoformat(timespec="seconds")
+
+
+def _event(channel: str, timestamp: str) -> dict:
+    return {
+        "sensor_id": f"{channel}_sensor",
+        "channel": channel,
+        "timestamp": timestamp,
+        "event_type": "state_change",
+        "value": "on",
+    }
+
+
+# --- DeadlineTimer ---
+
+
+def test_timer_fires_in_deadline_order():
+    """Zamanlayicilar kurulma sirasina degil deadline sirasina gore calismali."""
+    timer = DeadlineTimer()
+    fired: list[str] = []
+    done = threading.Event()
+    timer.start()
+    try:
+        timer.arm("b", 0.10, lambda: fired.append("b") or done.set())
+        timer.arm("a", 0.02, lambda: fired.append("a"))
+        assert done.wait(2.0)
+    finally:
+        timer.stop()
+    assert fired == ["a", "b"]
+
+
+def test_timer_rearm_replaces_previous():
+    """Ayni anahtarla yeniden kurmak onceki zamanlayiciyi gecersiz kilmali."""
+    timer = DeadlineTimer()
+    fired: list[str] = []
+    done = threading.Event()
+    timer.start()
+    try:
+        timer.arm("fall", 0.02, lambda: fired.append("eski"))
+        timer.arm("fall", 0.08, lambda: fired.append("yeni") or done.set())
+        assert done.wait(2.0)
+        time.sleep(0.05)
+    finally:
+        timer.stop()
+    assert fired == ["yeni"]
+
+
+def test_timer_cancel_prevents_fire():
+    """Iptal edilen zamanlayici calismamali."""
+    timer = DeadlineTimer()
+    fired: list[str] = []
+    timer.start()
+    try:
+        timer.arm("fall", 0.05, lambda: fired.append("fall"))
+        assert timer.cancel("fall") is True
+        assert timer.cancel("fall") is False
+        time.sleep(0.15)
+    finally:
+        timer.stop()
+    assert fired == []
+    assert not timer.is_armed("fall")
+
+
+def test_timer_survives_callback_error():
+    """Callback hatasi zamanlayici thread'ini durdurmamali."""
+    timer = DeadlineTimer()
+    done = threading.Event()
+
+    def boom():
+        raise RuntimeError("hata")
+
+    timer.start()
+    try:
+        timer.arm("a", 0.0, boom)
+        timer.arm("b", 0.03, done.set)
+        assert done.wait(2.0)
+    finally:
+        timer.stop()
+
+
+# --- RealtimeMonitor ---
+
+
+def _monitor(db_path: str, config: AppConfig, tracker: FallStateTracker | None = None):
+    alerts = []
+    fired = threading.Event()
+
+    def callback(alert):
+        alerts.append(alert)
+        fired.set()
+
+    monitor = RealtimeMonitor(db_path, config, callback, fall_tracker=tracker)
+    return monitor, alerts, fired
+
+
+def test_fall_alert_fires_at_deadline(initialized_db):
+    """Suresi dolmus banyo event'i cron beklemeden alarm uretmeli."""
+    config = AppConfig(alerts={"fall_detection_minutes": 45})
+    tracker = FallStateTracker(initialized_db)
+    monitor, alerts, fired = _monitor(initialized_db, config, tracker)
+    monitor.start()
+    try:
+        ts = _ago(46)
+        tracker.on_event("bathroom", ts)
+        monitor.on_event(_event("bathroom", ts))
+        assert fired.wait(2.0)
+    finally:
+        monitor.stop()
+
+    assert alerts[0].alert_type == "fall_suspicion"
+    assert alerts[0].last_event_time == ts
+    # Alarm sonrasi durum temizlenmeli
+    assert tracker.last_bathroom_time == ""
+
+
+def test_other_channel_cancels_fall_timer(initialized_db):
+    """Banyo disi event dusme zamanlayicisini iptal etmeli, sessizligi yeniden kurmali."""
+    config = AppConfig(alerts={"fall_detection_minutes": 45})
+    monitor, alerts, _ = _monitor(initialized_db, config)
+    monitor.start()
+    try:
+        monitor.on_event(_event("bathroom", _ago(1)))
+        assert monitor._timer.is_armed(FALL_TIMER)
+        monitor.on_event(_event("kitchen", _ago(0)))
+        assert not monitor._timer.is_armed(FALL_TIMER)
+        assert monitor._timer.is_armed(SILENCE_TIMER)
+    finally:
+        monitor.stop()
+    assert alerts == []
+
+
+def test_vacation_mode_suppresses_deadline_alert(initialized_db):
+    """Tatil modunda deadline alarmi uretilmemeli."""
+    config = AppConfig(alerts={"fall_detection_minutes": 45})
+    set_system_state(initialized_db, "vacation_mode", "true")
+    tracker = FallStateTracker(initialized_db)
+    monitor, alerts, fired = _monitor(initialized_db, config, tracker)
+    monitor.start()
+    try:
+        ts = _ago(60)
+        tracker.on_event("bathroom", ts)
+        monitor.on_event(_event("bathroom", ts))
+        assert not fired.wait(0.3)
+    finally:
+        monitor.stop()
+    assert alerts == []
+
+
+def test_start_rearms_pending_bathroom_state(initialized_db):
+    """Yeniden baslatmada system_state'teki banyo durumu icin zamanlayici kurulmali."""
+    config = AppConfig(alerts={"fall_detection_minutes": 45})
+    set_system_state(initialized_db, "last_bathroom_time", _ago(10))
+    monitor, _, _ = _monitor(initialized_db, config, FallStateTracker(initialized_db))
+    monitor.start()
+    try:
+        assert monitor._timer.is_armed(FALL_TIMER)
+    finally:
+        monitor.stop()
+
+
+def _fixed_now(now: datetime):
+    """realtime_monitor'un gordugu datetime.now()'i sabitle."""
+
+    class _Fixed(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    return patch("src.detector.realtime_monitor.datetime", _Fixed)
+
+
+def test_previous_night_event_does_not_arm_silence(initialized_db):
+    """Dun geceki son event bugun sabah sessizlik alarmi uretmemeli (cron gibi)."""
+    config = AppConfig()
+    timer = MagicMock()
+    monitor = RealtimeMonitor(initialized_db, config, MagicMock(), timer=timer)
+
+    with _fixed_now(datetime(2025, 3, 1, 7, 30)):
+        monitor.on_event(_event("kitchen", "2025-02-28T23:00:00"))
+        timer.arm.assert_not_called()
+        timer.cancel.assert_called_with(SILENCE_TIMER)
+
+    # Gece yarisindan once kurulmus deadline ertesi sabah dolarsa alarm yok
+    with _fixed_now(datetime(2025, 3, 1, 8, 0)), \
+         patch("src.detector.realtime_monitor.is_vacation_mode", return_value=False):
+        monitor._on_silence_deadline("2025-02-28T23:00:00")
+    monitor._alert_callback.assert_not_called()
+
+
+def test_silence_deadline_not_before_morning_check(initialized_db):
+    """Bugunun erken eventi icin deadline morning_check_hour'dan once kurulmamali."""
+    config = AppConfig()
+    timer = MagicMock()
+    monitor = RealtimeMonitor(initialized_db, config, MagicMock(), timer=timer)
+
+    with _fixed_now(datetime(2025, 3, 1, 7, 30)):
+        monitor.on_event(_event("kitchen", "2025-03-01T06:10:00"))
+        assert timer.arm.call_args.args[0] == SILENCE_TIMER
+        assert timer.arm.call_args.args[1] == 3.5 * 3600  # 11:00'e kadar
+
+        monitor.on_event(_event("kitchen", "2025-03-01T09:15:00"))
+        assert timer.arm.call_args.args[1] == 4.75 * 3600  # 12:15'e kadar
+
+
+def test_evaluate_extended_silence_pure():
+    """Sessizlik karari son event zamanina gore DB'siz verilmeli."""
+    config = AppConfig()
+    now = datetime(2025, 3, 1, 14, 0)
+
+    alert = evaluate_extended_silence("2025-03-01T10:30:00", config, now)
+    assert alert is not None
+    assert alert.alert_type == "extended_silence"
+
+    assert evaluate_extended_silence("2025-03-01T12:30:00", config, now) is None
+    # Gece awake window disi
+    assert evaluate_extended_silence("2025-03-01T20:00:00", config, now.replace(hour=23, minute=30)) is None
+
+
+def test_collector_notifies_event_listeners(initialized_db):
+    """Collector kabul edilen eventi dinleyicilere iletmeli; dinleyici hatasi izole."""
+    config = AppConfig(
+        sensors=[{"id": "banyo_kapi", "channel": "bathroom", "type": "contact", "trigger_value": "open"}],
+        database={"path": initialized_db},
+    )
+    collector = MQTTCollector(config, initialized_db)
+    received: list[dict] = []
+
+    def broken(event):
+        raise RuntimeError("dinleyici hatasi")
+
+    collector.add_event_listener(broken)
+    collector.add_event_listener(received.append)
+
+    msg = type("Msg", (), {
+        "topic": "zigbee2mqtt/banyo_kapi",
+        "payload": json.dumps({"contact": False}).encode(),
+    })()
+    collector._on_message(None, None, msg)
+
+    assert len(received) == 1
+    assert received[0]["channel"] == "bathroom"
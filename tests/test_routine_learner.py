@@ -4,6 +4,7 @@ import pytest
 
 from src.config import AppConfig
 from src.database import get_db, init_db
+from src.learner.model_store import load_model
 from src.learner.routine_learner import run_daily_learning
 
 CHANNELS = ["presence", "fridge", "bathroom", "door"]
@@ -96,6 +97,26 @@ def test_active_slot_updates_alpha(learner_db, learner_config):
     assert row["beta"] == 1.0, f"beta={row['beta']}, 1.0 bekleniyor"
 
 
+def test_snapshot_only_mode_accumulates(learner_db, learner_config):
+    """legacy_model_rows=False: model_state bos, model snapshot'tan devam eder."""
+    learner_config.model.legacy_model_rows = False
+    active_all = {ch: list(range(96)) for ch in CHANNELS}
+    for date in ["2025-01-15", "2025-01-16"]:
+        _insert_slot_summary(learner_db, date, active_slots=active_all)
+        run_daily_learning(learner_db, learner_config, target_date=date)
+
+    with get_db(learner_db) as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM model_state").fetchone()[0]
+        versions = conn.execute("SELECT COUNT(*) FROM model_snapshot").fetchone()[0]
+    assert rows == 0
+    assert versions == 2
+
+    model = load_model(learner_db)
+    # prior(1,1) + 2 aktif gun -> alpha=3
+    assert model.posterior("presence", 0).alpha == 3.0
+    assert model.posterior("presence", 0).beta == 1.0
+
+
 def test_three_consecutive_days(learner_db, learner_config):
     """3 ardisik gun -> train_days=3."""
     for i, date in enumerate(["2025-01-15", "2025-01-16", "2025-01-17"]):
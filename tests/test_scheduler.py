@@ -0,0 +1,167 @@
+"""JobRunner testleri - thread havuzu, max_instances, bekleme/calisma suresi."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.config import SchedulerConfig
+from src.scheduler import JobRunner
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def _now() -> datetime:
+    """Saat dilimli simdiki zaman (runner Europe/Istanbul kullanir)."""
+    return datetime.now().astimezone()
+
+
+def test_job_runs_off_event_loop_and_records_stats():
+    """Job govdesi loop thread'inde degil; runs / run suresi kaydedilir."""
+    seen = {}
+
+    async def scenario():
+        runner = JobRunner(SchedulerConfig(max_workers=2))
+        runner.start()
+        loop_thread = threading.current_thread()
+        done = threading.Event()
+
+        def job():
+            seen["thread"] = threading.current_thread()
+            time.sleep(0.05)
+            done.set()
+
+        runner.add_job(job, "date", id="probe", run_date=_now())
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        runner.shutdown(wait=True)
+        return loop_thread, runner.stats()
+
+    loop_thread, stats = _run(scenario())
+    assert seen["thread"] is not loop_thread
+    assert stats["probe"]["runs"] == 1
+    assert stats["probe"]["failures"] == 0
+    assert stats["probe"]["last_run"] >= 0.05
+    assert stats["probe"]["last_wait"] >= 0.0
+
+
+def test_event_loop_responsive_during_blocking_job():
+    """Bloklayan job calisirken loop'taki kisa uyku gecikmez."""
+
+    async def scenario():
+        runner = JobRunner(SchedulerConfig())
+        runner.start()
+        started = threading.Event()
+
+        def blocking():
+            started.set()
+            time.sleep(0.5)
+
+        runner.add_job(blocking, "date", id="blocking", run_date=_now())
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        t0 = time.monotonic()
+        await asyncio.sleep(0.01)
+        lag = time.monotonic() - t0
+        runner.shutdown(wait=True)
+        return lag
+
+    assert _run(scenario()) < 0.2
+
+
+def test_max_instances_skips_overlapping_runs():
+    """Suren bir job tekrar tetiklenirse atlanir ve skipped sayilir."""
+
+    async def scenario():
+        runner = JobRunner(SchedulerConfig(max_instances=1))
+        runner.start()
+        release = threading.Event()
+        runner.add_job(
+            lambda: release.wait(4), "interval", id="slow",
+            seconds=0.1, next_run_time=_now(),
+        )
+        while not runner.stats().get("slow", {}).get("skipped"):
+            await asyncio.sleep(0.05)
+        release.set()
+        while not runner.stats()["slow"]["runs"]:
+            await asyncio.sleep(0.01)
+        runner.shutdown(wait=True)
+        return runner.stats()
+
+    stats = _run(scenario())
+    assert stats["slow"]["runs"] >= 1
+    assert stats["slow"]["skipped"] >= 1
+
+
+def test_failure_counted_and_reraised():
+    """Hata veren job failures sayar, istisna APScheduler'a iletilir."""
+    runner = JobRunner(SchedulerConfig())
+
+    def broken():
+        raise RuntimeError("boom")
+
+    timed = runner._timed("broken", broken)
+    with pytest.raises(RuntimeError):
+        timed()
+    stats = runner.stats()["broken"]
+    assert stats["runs"] == 1
+    assert stats["failures"] == 1
+
+
+def test_queue_wait_measured_when_pool_busy():
+    """Tek worker doluyken ikinci job'in kuyruk beklemesi olculur."""
+
+    async def scenario():
+        runner = JobRunner(SchedulerConfig(max_workers=1))
+        runner.start()
+        now = _now()
+        done = threading.Event()
+        runner.add_job(lambda: time.sleep(0.3), "date", id="first", run_date=now)
+        runner.add_job(done.set, "date", id="second", run_date=now + timedelta(milliseconds=50))
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+        runner.shutdown(wait=True)
+        return runner.stats()
+
+    stats = _run(scenario())
+    assert stats["second"]["last_wait"] >= 0.15
+    assert stats["first"]["last_wait"] < 0.15
+
+
+def test_executor_misfire_does_not_skew_next_wait():
+    """Havuzda beklerken kacirilan (misfire) calisma sonraki calismanin beklemesine eklenmez."""
+
+    async def scenario():
+        runner = JobRunner(SchedulerConfig(max_workers=1))
+        runner.start()
+        now = _now()
+        blocker_done = threading.Event()
+        done = threading.Event()
+
+        def blocker():
+            time.sleep(1.3)
+            blocker_done.set()
+
+        runner.add_job(blocker, "date", id="blocker", run_date=now)
+        runner.add_job(
+            done.set, "date", id="quick",
+            run_date=now + timedelta(milliseconds=50), misfire_grace_time=1,
+        )
+        while not blocker_done.is_set():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        runner.add_job(done.set, "date", id="quick", run_date=_now())
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+        runner.shutdown(wait=True)
+        return runner.stats()
+
+    stats = _run(scenario())["quick"]
+    assert stats["skipped"] == 1
+    assert stats["runs"] == 1
+    assert stats["last_wait"] < 0.2
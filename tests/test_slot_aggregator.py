@@ -1,9 +1,18 @@
 """Slot aggregator testleri - slot hesaplama, ozetleme, bos slot doldurma."""
 
+import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
+import pytest
+
+import src.collector.slot_aggregator as slot_aggregator_mod
 from src.collector.slot_aggregator import (
+    SlotAccumulator,
     aggregate_current_slot,
+    aggregate_day,
     fill_missing_slots,
     get_slot,
     get_slot_time_range,
@@ -299,3 +308,204 @@ def test_slot_boundary_exact_start_sees_empty(initialized_db):
     assert row is not None
     assert row["active"] == 0  # Bos slot - eventler onceki slotta
     assert row["event_count"] == 0
+
+
+# --- SlotAccumulator testleri ---
+
+def _acc_event(ts: str, channel: str = "presence") -> dict:
+    return {"timestamp": ts, "channel": channel, "sensor_id": "x", "value": "on"}
+
+
+def _slot_row(db_path, date, slot, channel):
+    with get_db(db_path) as conn:
+        return conn.execute(
+            "SELECT * FROM slot_summary WHERE date=? AND slot=? AND channel=?",
+            (date, slot, channel),
+        ).fetchone()
+
+
+def test_accumulator_flush_writes_counts_without_scan(initialized_db):
+    """Kapsanan slot bellekteki sayaclardan yazilmali, bos kanallar 0."""
+    acc = SlotAccumulator(initialized_db, ["presence", "fridge"], now=datetime(2025, 2, 11, 10, 10))
+    for minute in (31, 33, 40):
+        acc.add(_acc_event(f"2025-02-11T10:{minute}:00"))
+
+    with patch("src.collector.slot_aggregator.aggregate_current_slot") as sql_path:
+        assert acc.flush(datetime(2025, 2, 11, 10, 44)) is True
+        sql_path.assert_not_called()
+
+    row = _slot_row(initialized_db, "2025-02-11", 42, "presence")
+    assert (row["active"], row["event_count"]) == (1, 3)
+    row = _slot_row(initialized_db, "2025-02-11", 42, "fridge")
+    assert (row["active"], row["event_count"]) == (0, 0)
+
+
+def test_accumulator_partial_start_slot_falls_back(initialized_db):
+    """Baslangic slotu kismi: flush False donmeli, SQL yolu yazmali."""
+    acc = SlotAccumulator(initialized_db, ["presence"], now=datetime(2025, 2, 11, 10, 37))
+    assert not acc.covers(datetime(2025, 2, 11, 10, 44))
+    assert acc.covers(datetime(2025, 2, 11, 10, 45))
+
+    acc.add(_acc_event("2025-02-11T10:40:00"))
+    assert acc.flush(datetime(2025, 2, 11, 10, 44)) is False
+    assert _slot_row(initialized_db, "2025-02-11", 42, "presence") is None
+    assert acc.snapshot("2025-02-11")["presence"][42] == 0
+
+
+def test_accumulator_late_event_rewrites_total(initialized_db):
+    """Flush sonrasi gelen gec event toplam sayiyla yeniden yazilmali."""
+    acc = SlotAccumulator(initialized_db, ["presence"], now=datetime(2025, 2, 11, 9, 0))
+    acc.add(_acc_event("2025-02-11T10:31:00"))
+    acc.add(_acc_event("2025-02-11T10:32:00"))
+    acc.flush(datetime(2025, 2, 11, 10, 44))
+
+    acc.add(_acc_event("2025-02-11T10:44:59"))
+    acc.flush(datetime(2025, 2, 11, 10, 59))
+
+    assert _slot_row(initialized_db, "2025-02-11", 42, "presence")["event_count"] == 3
+
+
+def test_accumulator_snapshot_includes_open_slot(initialized_db):
+    """snapshot() slot siniri beklenmeden acik slotu gostermeli."""
+    acc = SlotAccumulator(initialized_db, ["presence", "fridge"], now=datetime(2025, 2, 11, 9, 0))
+    acc.add(_acc_event("2025-02-11T10:31:00"))
+    acc.add(_acc_event("2025-02-11T10:32:00", channel="fridge"))
+
+    snap = acc.snapshot("2025-02-11")
+    assert snap["presence"][42] == 1
+    assert snap["fridge"][42] == 1
+    assert sum(snap["presence"]) == 1
+
+
+def test_accumulator_add_not_blocked_by_flush_write(initialized_db):
+    """flush() DB'ye yazarken add() beklememeli; yazim sirasindaki event sonra yazilir."""
+    acc = SlotAccumulator(initialized_db, ["presence"], now=datetime(2025, 2, 11, 9, 0))
+    acc.add(_acc_event("2025-02-11T10:31:00"))
+    writing = threading.Event()
+    release = threading.Event()
+    real_get_db = slot_aggregator_mod.get_db
+
+    @contextmanager
+    def slow_get_db(db_path):
+        writing.set()
+        assert release.wait(5)
+        with real_get_db(db_path) as conn:
+            yield conn
+
+    with patch.object(slot_aggregator_mod, "get_db", slow_get_db):
+        flusher = threading.Thread(target=acc.flush, args=(datetime(2025, 2, 11, 10, 44),))
+        flusher.start()
+        assert writing.wait(5)
+        added = threading.Thread(target=acc.add, args=(_acc_event("2025-02-11T10:33:00"),))
+        added.start()
+        added.join(1)
+        assert not added.is_alive()
+        release.set()
+        flusher.join(5)
+
+    assert _slot_row(initialized_db, "2025-02-11", 42, "presence")["event_count"] == 1
+    acc.flush(datetime(2025, 2, 11, 10, 59))
+    assert _slot_row(initialized_db, "2025-02-11", 42, "presence")["event_count"] == 2
+
+
+def test_accumulator_failed_write_retried(initialized_db):
+    """Yazim basarisizsa sayaclar kaybolmaz, sonraki flush yazar."""
+    acc = SlotAccumulator(initialized_db, ["presence"], now=datetime(2025, 2, 10, 9, 0))
+    acc.add(_acc_event("2025-02-10T23:50:00"))
+
+    with patch.object(slot_aggregator_mod, "get_db", side_effect=sqlite3.OperationalError("database is locked")):
+        with pytest.raises(sqlite3.OperationalError):
+            acc.flush(datetime(2025, 2, 11, 0, 10))
+
+    assert acc.flush(datetime(2025, 2, 11, 0, 10)) is True
+    row = _slot_row(initialized_db, "2025-02-10", 95, "presence")
+    assert (row["active"], row["event_count"]) == (1, 1)
+    assert acc.snapshot("2025-02-10")["presence"][95] == 0
+
+
+def test_slot_aggregation_job_uses_accumulator(initialized_db):
+    """Job accumulator kapsiyorsa sensor_events'i taramamali."""
+    from src.jobs import slot_aggregation_job
+
+    acc = SlotAccumulator(initialized_db, ["presence"], now=datetime(2025, 2, 11, 9, 0))
+    fixed_now = datetime(2025, 2, 11, 10, 45)
+    with patch("src.jobs.datetime") as fake_dt, \
+         patch("src.jobs.aggregate_current_slot") as sql_path:
+        fake_dt.now.return_value = fixed_now
+        slot_aggregation_job(initialized_db, ["presence"], acc)
+        sql_path.assert_not_called()
+
+        # Kapsanmayan slot -> SQL yolu
+        late_acc = SlotAccumulator(initialized_db, ["presence"], now=datetime(2025, 2, 11, 10, 40))
+        slot_aggregation_job(initialized_db, ["presence"], late_acc)
+        sql_path.assert_called_once()
+
+
+# --- aggregate_day testleri ---
+
+def _all_slots(db_path):
+    with get_db(db_path) as conn:
+        rows = conn.execute(
+            "SELECT date, slot, channel, active, event_count FROM slot_summary "
+            "ORDER BY date, slot, channel"
+        ).fetchall()
+    return [tuple(r) for r in rows]
+
+
+def test_aggregate_day_matches_slot_by_slot(initialized_db, tmp_path):
+    """Tek gecis sonucu 96 x aggregate_current_slot + fill ile ayni olmali."""
+    from src.database import init_db
+    from src.simulator.sensor_simulator import SensorSimulator
+
+    channels = ["presence", "fridge", "bathroom", "door"]
+    legacy_db = str(tmp_path / "legacy.db")
+    init_db(legacy_db)
+    for db in (initialized_db, legacy_db):
+        SensorSimulator(db, seed=7).generate_normal_day("2025-02-11")
+
+    base = datetime(2025, 2, 11)
+    for i in range(96):
+        aggregate_current_slot(legacy_db, channels, now=base + timedelta(minutes=15 * i))
+    fill_missing_slots(legacy_db, "2025-02-11", channels)
+
+    written = aggregate_day(initialized_db, "2025-02-11", channels)
+
+    assert written == 96 * len(channels)
+    assert _all_slots(initialized_db) == _all_slots(legacy_db)
+
+
+def test_aggregate_day_range_with_zero_days(initialized_db):
+    """Aralikta eventsiz gunler de 96 x kanal sifir satirla yazilmali."""
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO sensor_events (timestamp, sensor_id, channel, event_type, value) "
+            "VALUES ('2025-02-12T23:59:59.500000', 'dis_kapi', 'door', 'state_change', 'open')"
+        )
+        conn.commit()
+
+    aggregate_day(initialized_db, ("2025-02-11", "2025-02-13"), ["presence"])
+
+    rows = _all_slots(initialized_db)
+    # presence (config) + door (event olan kanal), her ikisi 3 gun x 96 slot
+    assert len(rows) == 2 * 3 * 96
+    assert ("2025-02-12", 95, "door", 1, 1) in rows
+    assert all(r[4] == 0 for r in rows if r[2] == "presence")
+
+
+def test_aggregate_day_overwrites_stale_rows(initialized_db):
+    """Mevcut satirlar sensor_events'ten yeniden hesaplanmali (onarim)."""
+    with get_db(initialized_db) as conn:
+        conn.execute(
+            "INSERT INTO slot_summary (date, slot, channel, active, event_count) "
+            "VALUES ('2025-02-11', 42, 'presence', 1, 9)"
+        )
+        conn.execute(
+            "INSERT INTO sensor_events (timestamp, sensor_id, channel, event_type, value) "
+            "VALUES ('2025-02-11T10:31:00', 'mutfak_motion', 'presence', 'state_change', 'on')"
+        )
+        conn.commit()
+
+    aggregate_day(initialized_db, "2025-02-11", ["presence"])
+
+    row = _slot_row(initialized_db, "2025-02-11", 42, "presence")
+    assert row["event_count"] == 1
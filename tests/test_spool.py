@@ -0,0 +1,127 @@
+"""EventSpool testleri - checksum, sirali ve idempotent oynatma, EventWriter entegrasyonu."""
+
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+import src.collector.event_writer as event_writer_mod
+from src.collector.event_writer import EventWriter
+from src.collector.spool import EventSpool
+from src.database import configure_event_partitions, get_db
+
+
+def _event(i: int, sensor_id: str = "mutfak_motion") -> dict:
+    return {
+        "sensor_id": sensor_id,
+        "channel": "presence",
+        "timestamp": f"2025-03-01T10:{i // 60:02d}:{i % 60:02d}",
+        "event_type": "state_change",
+        "value": "on",
+    }
+
+
+def _timestamps(db_path: str) -> list[str]:
+    with get_db(db_path) as conn:
+        rows = conn.execute("SELECT timestamp FROM sensor_events ORDER BY id").fetchall()
+    return [r["timestamp"] for r in rows]
+
+
+def _locked(*args, **kwargs):
+    raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return EventSpool(str(tmp_path / "events.spool"))
+
+
+def test_replay_skips_corrupt_records_in_order(spool):
+    """Checksum'i tutmayan ve yarim kalan kayitlar atlanir; gecerliler sirayla oynatilir."""
+    assert spool.append([_event(0), _event(1)])
+    with open(spool.path, "ab") as f:
+        f.write(b"00000000 [\"bozuk\"]\n")
+    assert spool.append([_event(2)])
+    with open(spool.path, "ab") as f:
+        f.write(b"1a2b3c4d [\"2025-03-01T")  # elektrik kesintisi: yarim satir
+
+    written = []
+    assert spool.replay(lambda rows: written.extend(rows) or len(rows)) == 3
+    assert [r[0] for r in written] == [_event(i)["timestamp"] for i in range(3)]
+    assert spool.stats()["spool_corrupt"] == 2
+    assert not spool.pending
+    assert spool.replay(lambda rows: len(rows)) == 0
+
+
+def test_failed_replay_keeps_records(spool):
+    """write() hata verirse kayitlar silinmez; yeni eklenenler de sonra oynatilir."""
+    spool.append([_event(0)])
+    with pytest.raises(sqlite3.OperationalError):
+        spool.replay(_locked)
+    spool.append([_event(1)])
+
+    written = []
+    assert spool.replay(lambda rows: written.extend(rows) or len(rows)) == 2
+    assert [r[0] for r in written] == [_event(0)["timestamp"], _event(1)["timestamp"]]
+
+
+def test_locked_db_spools_and_replays_once(initialized_db, spool):
+    """DB kilitliyken batch spool'a gider; oynatma tekrarlansa da satir cogalmaz."""
+    writer = EventWriter(initialized_db, spool=spool)
+    with patch.object(event_writer_mod, "insert_events", side_effect=_locked):
+        assert writer.submit(_event(0))
+        assert writer.submit(_event(1))
+    assert _timestamps(initialized_db) == []
+    assert writer.stats()["spooled"] == 2
+    assert writer.stats()["write_errors"] == 2
+
+    assert writer.replay_spool() == 2
+    # .replay silinmeden cokme: ayni kayitlar tekrar oynatilir
+    spool.append([_event(0), _event(1), _event(1)])
+    assert writer.replay_spool() == 0
+
+    stats = writer.stats()
+    assert _timestamps(initialized_db) == [_event(0)["timestamp"], _event(1)["timestamp"]]
+    assert stats["replayed"] == 2
+    assert stats["replay_duplicates"] == 3
+    assert stats["spool_pending"] == 0
+
+
+def test_queue_full_spools_and_thread_replays(initialized_db, spool):
+    """Kuyruk doluysa event tampona alinir (submit fsync etmez); yazici thread
+    tamponu tek kayitta spool'lar ve bolumlu DB'ye oynatir."""
+    configure_event_partitions(initialized_db, True)
+    writer = EventWriter(initialized_db, queue_size=2, spool=spool)
+    with patch.object(EventWriter, "running", new=True), \
+         patch("src.collector.spool.os.fsync") as fsync:
+        for i in range(4):
+            assert writer.submit(_event(i))
+        assert not writer.submit(_event(4))  # Tampon da dolu
+    fsync.assert_not_called()
+    assert not spool.pending
+    stats = writer.stats()
+    assert stats["overflow_pending"] == 2
+    assert stats["dropped"] == 1
+
+    # Kuyruktaki eventleri bosalt; yazici thread baslangicta tamponu spool'lar ve oynatir
+    for _ in range(2):
+        writer._queue.get_nowait()
+        writer._queue.task_done()
+    with patch("src.collector.spool.os.fsync", wraps=os.fsync) as fsync:
+        writer.start()
+        try:
+            writer.submit(_event(5))
+            assert writer.flush(timeout=5.0)
+        finally:
+            writer.stop()
+    assert fsync.call_count == 1
+
+    stats = writer.stats()
+    assert stats["overflow_pending"] == 0
+    assert stats["spooled"] == 2
+    assert stats["replayed"] == 2
+    expected = [_event(i)["timestamp"] for i in (2, 3, 5)]
+    assert sorted(_timestamps(initialized_db)) == expected
+    with get_db(initialized_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sensor_events_p202503").fetchone()[0] == 3
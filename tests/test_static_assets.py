@@ -0,0 +1,133 @@
+"""Statik dosya testleri - sikistirma, hash'li adlar, onbellek, sayfa basina aktarilan bayt."""
+
+import os
+import re
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.middleware.gzip import GZipMiddleware
+
+from src.config import AppConfig
+from src.dashboard.api import router as dashboard_router
+from src.dashboard.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    StaticAssets,
+    _accepted_encodings,
+)
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "dashboard", "static")
+
+
+def _create_app(db_path: str) -> FastAPI:
+    """main.py ile ayni statik + API duzeni (lifespan olmadan)."""
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    app.include_router(dashboard_router)
+    app.mount("/static", StaticAssets(STATIC_DIR), name="static")
+    app.state.db_path = db_path
+    app.state.config = AppConfig()
+    return app
+
+
+def _raw_size(name: str) -> int:
+    return os.path.getsize(os.path.join(STATIC_DIR, name))
+
+
+def test_index_references_hashed_chart_with_immutable_cache(initialized_db):
+    """index.html hash'li chart URL'i icerir; hash'li dosya immutable, giris sayfasi no-cache."""
+    client = TestClient(_create_app(initialized_db))
+
+    index = client.get("/static/index.html")
+    assert index.status_code == 200
+    assert index.headers["cache-control"] == "no-cache"
+    match = re.search(r'src="(/static/chart\.umd\.min\.[0-9a-f]{10}\.js)"', index.text)
+    assert match, "index.html hash'li chart referansi icermiyor"
+
+    chart = client.get(match.group(1))
+    assert chart.status_code == 200
+    assert chart.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert "javascript" in chart.headers["content-type"]
+
+    # Eski (hash'siz) ad hala calisir ama her seferinde dogrulanir
+    plain = client.get("/static/chart.umd.min.js")
+    assert plain.status_code == 200
+    assert plain.headers["cache-control"] == "no-cache"
+    assert plain.content == chart.content
+
+    assert client.get("/static/../main.py").status_code == 404
+    assert client.get("/static/yok.js").status_code == 404
+
+
+def test_content_negotiation(initialized_db):
+    """Accept-Encoding'e gore gzip veya sikistirilmamis gonderilir; Vary eklenir."""
+    client = TestClient(_create_app(initialized_db))
+
+    gz = client.get("/static/chart.umd.min.js", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.headers["vary"] == "Accept-Encoding"
+    assert gz.num_bytes_downloaded < _raw_size("chart.umd.min.js") / 2
+
+    plain = client.get("/static/chart.umd.min.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.num_bytes_downloaded == _raw_size("chart.umd.min.js")
+    assert plain.content == gz.content  # httpx gzip'i acar
+
+    assert _accepted_encodings("gzip;q=0, br") == {"br"}
+    assert _accepted_encodings("GZIP, deflate;q=0.5") == {"gzip", "deflate"}
+
+
+class _FixedDatetime(datetime):
+    """Dakika siniri gecilse de status ETag'i sabit kalsin."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 2, 11, 8, 0)
+
+
+def test_transferred_bytes_per_page_load(initialized_db, monkeypatch):
+    """Sayfa yuklemesi basina aktarilan bayt: ilk ziyaret sikistirilmis, tekrar ziyaret ~0."""
+    monkeypatch.setattr("src.dashboard.api.datetime", _FixedDatetime)
+    client = TestClient(_create_app(initialized_db))
+    headers = {"Accept-Encoding": "gzip, deflate, br"}
+    etags: dict[str, str] = {}
+    bodies: dict[str, str] = {}
+    immutable: set[str] = set()
+    requested: list[tuple[str, int]] = []
+
+    def load_page() -> int:
+        """Tarayici gibi: index + script + bundle; immutable dosyalar tekrar istenmez."""
+        transferred = 0
+        paths = ["/static/index.html"]
+        while paths:
+            path = paths.pop(0)
+            if path in immutable:
+                continue  # Cache-Control: immutable -> istek yok
+            request_headers = dict(headers)
+            if path in etags:
+                request_headers["If-None-Match"] = etags[path]
+            response = client.get(path, headers=request_headers)
+            assert response.status_code in (200, 304)
+            transferred += response.num_bytes_downloaded
+            if response.status_code == 200 and "etag" in response.headers:
+                etags[path] = response.headers["etag"]
+                bodies[path] = response.text
+                if response.headers.get("cache-control") == IMMUTABLE_CACHE_CONTROL:
+                    immutable.add(path)
+            if path == "/static/index.html":
+                # 304'te tarayici onbellekteki sayfayi kullanir
+                paths += re.findall(r'src="(/static/[^"]+)"', bodies[path])
+                paths.append("/api/bundle?days=30")
+            requested.append((path, response.status_code))
+        return transferred
+
+    raw_total = _raw_size("index.html") + _raw_size("chart.umd.min.js")
+    first = load_page()
+    requested.clear()
+    second = load_page()
+
+    # Sikistirma: ilk ziyaret ham dosya boyutunun ~%40'indan az
+    assert first < raw_total * 0.4, f"ilk yukleme {first} bayt (ham {raw_total})"
+    # Tekrar ziyaret: index 304, chart hic istenmez, bundle 304
+    assert requested == [("/static/index.html", 304), ("/api/bundle?days=30", 304)]
+    assert second == 0, f"tekrar yukleme {second} bayt"
@@ -0,0 +1,109 @@
+"""StormGuard testleri - token bucket, karantina, MQTTCollector entegrasyonu."""
+
+import json
+
+from src.collector.mqtt_client import MQTTCollector
+from src.collector.storm_guard import ADMIT, LIMITED, QUARANTINED, StormGuard
+from src.config import AppConfig
+from src.database import get_db
+from src.telemetry import REGISTRY
+
+
+class FakeMQTTMessage:
+    def __init__(self, topic: str, payload: bytes):
+        self.topic = topic
+        self.payload = payload
+
+
+def _metric(name: str, sensor: str) -> float:
+    prefix = f'{name}{{sensor="{sensor}"'
+    return sum(
+        float(line.split()[-1])
+        for line in REGISTRY.render().splitlines()
+        if line.startswith(prefix)
+    )
+
+
+def test_token_bucket_limits_and_refills():
+    """Kova bitince mesajlar LIMITED; zamanla dolan token kadar tekrar ADMIT."""
+    guard = StormGuard(rate_per_second=1.0, burst=3, quarantine_rate=100.0)
+
+    results = [guard.admit("s1", 0.0) for _ in range(5)]
+    assert results == [ADMIT, ADMIT, ADMIT, LIMITED, LIMITED]
+    # Diger sensorun kovasi bagimsiz
+    assert guard.admit("s2", 0.0) == ADMIT
+    # 2 sn sonra 2 token
+    assert [guard.admit("s1", 2.0) for _ in range(3)] == [ADMIT, ADMIT, LIMITED]
+
+
+def test_quarantine_once_and_release():
+    """Pencere esigi asilinca tek bildirim; sure dolunca sensor serbest kalir."""
+    notices = []
+    guard = StormGuard(
+        rate_per_second=1.0, burst=5, quarantine_rate=2.0, quarantine_window=10.0,
+        quarantine_seconds=60.0, on_quarantine=lambda s, r: notices.append(s),
+    )
+
+    # 10 sn pencerede 20 mesaja kadar izin, 21. mesaj karantina
+    results = [guard.admit("flap", i * 0.1) for i in range(25)]
+    assert results[20:] == [QUARANTINED] * 5
+    assert QUARANTINED not in results[:20]
+    assert notices == ["flap"]
+    assert guard.quarantined(5.0) == ["flap"]
+    assert guard.stats()["tracked_sensors"] == 1
+
+    # Karantina boyunca tekrar bildirim yok
+    assert guard.admit("flap", 30.0) == QUARANTINED
+    assert notices == ["flap"]
+
+    # Sure dolunca kova dolu baslar
+    assert guard.admit("flap", 70.0) == ADMIT
+    assert guard.quarantined(70.0) == []
+
+
+def test_flooding_sensor_quarantined_healthy_sensor_saved(initialized_db):
+    """Collector: firtina yapan sensor parse edilmez ve karantinaya girer, digeri yazilir."""
+    config = AppConfig(
+        mqtt={"broker": "localhost", "port": 1883, "topic_prefix": "zigbee2mqtt"},
+        sensors=[
+            {"id": "flap_kapi", "channel": "door", "type": "contact", "trigger_value": "open"},
+            {"id": "mutfak_motion", "channel": "presence", "type": "motion", "trigger_value": "on"},
+        ],
+        collector={"storm_burst": 5, "quarantine_rate_per_second": 1.0, "quarantine_window_seconds": 30},
+        database={"path": initialized_db},
+    )
+    collector = MQTTCollector(config, initialized_db)
+    notices = []
+    collector.set_quarantine_callback(lambda s, r: notices.append((s, r)))
+    limited_before = _metric("annem_storm_dropped_total", "flap_kapi")
+
+    flood = FakeMQTTMessage("zigbee2mqtt/flap_kapi", json.dumps({"contact": False}).encode())
+    for _ in range(100):
+        collector._on_message(None, None, flood)
+    collector._on_message(
+        None, None,
+        FakeMQTTMessage("zigbee2mqtt/mutfak_motion", json.dumps({"occupancy": True}).encode()),
+    )
+    collector._writer.flush()
+
+    assert [s for s, _ in notices] == ["flap_kapi"]
+    assert collector.storm_stats() == {"tracked_sensors": 2, "quarantined_sensors": 1}
+    # 5 kabul (debounce sonrasi 1 event), 95 mesaj sayilip atildi
+    assert _metric("annem_storm_dropped_total", "flap_kapi") - limited_before == 95
+    with get_db(initialized_db) as conn:
+        rows = conn.execute("SELECT sensor_id FROM sensor_events ORDER BY id").fetchall()
+    assert [r["sensor_id"] for r in rows] == ["flap_kapi", "mutfak_motion"]
+
+
+def test_storm_protection_disabled(initialized_db):
+    """storm_protection kapaliyken hic mesaj atilmaz."""
+    config = AppConfig(
+        sensors=[{"id": "flap_kapi", "channel": "door", "type": "contact", "trigger_value": "open"}],
+        collector={"storm_protection": False, "storm_burst": 1},
+        database={"path": initialized_db},
+    )
+    collector = MQTTCollector(config, initialized_db)
+    collector.set_quarantine_callback(lambda s, r: None)
+
+    assert collector._storm_guard is None
+    assert collector.storm_stats()["tracked_sensors"] == 0
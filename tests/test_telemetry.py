@@ -0,0 +1,201 @@
+"""Telemetri testleri - thread parcali sayaclar, histogram, OpenMetrics, enstrumantasyon."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.alerter.telegram_bot import TelegramNotifier
+from src.collector.event_processor import EventProcessor
+from src.config import SchedulerConfig
+from src.scheduler import JobRunner
+from src.telemetry import REGISTRY, MetricFamily, Registry, _Family, register_stats
+from tests.test_main import _make_config
+
+
+def _sample(name: str, **labels) -> float:
+    """REGISTRY ciktisindan tek bir ornegin degeri (yoksa 0)."""
+    label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    prefix = f"{name}{{{label_str}}} " if labels else f"{name} "
+    for line in REGISTRY.render().splitlines():
+        if line.startswith(prefix):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_counter_sums_thread_shards():
+    """Her thread kendi parcasina yazar; okuma tum artislari kaybetmeden toplar."""
+    registry = Registry()
+    hits = registry.counter("t_hits", "test", ("kind",)).labels("a")
+
+    def work():
+        for _ in range(10_000):
+            hits.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert hits.value() == 40_000
+    assert 't_hits_total{kind="a"} 40000' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Kovalar kumulatif (le dahil), +Inf = count, sum gozlemlerin toplami."""
+    registry = Registry()
+    latency = registry.histogram("t_latency_seconds", "test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# TYPE t_latency_seconds histogram", "# HELP t_latency_seconds test"]
+    assert 't_latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 't_latency_seconds_bucket{le="1.0"} 3' in lines
+    assert 't_latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "t_latency_seconds_count 4" in lines
+    assert "t_latency_seconds_sum 3.65" in lines
+    assert lines[-1] == "# EOF"
+
+
+def test_register_stats_and_failing_collector():
+    """stats() sozlugu gauge/counter olur; hatali collector ciktiyi bozmaz."""
+    registry = Registry()
+    register_stats(
+        "queue", lambda: {"depth": 3, "dropped": 7, "name": "x", "ok": True},
+        "Kuyruk", counters=("dropped",), registry=registry,
+    )
+    registry.register_collector("broken", MagicMock(side_effect=RuntimeError("boom")))
+    registry.register_collector(
+        "labelled",
+        lambda: [MetricFamily("t_temp", "gauge", "test", [({"zone": 'a"b'}, 1.5)])],
+    )
+
+    text = registry.render()
+
+    assert "# TYPE annem_queue_depth gauge\n" in text
+    assert "annem_queue_depth 3\n" in text
+    assert "# TYPE annem_queue_dropped counter\n" in text
+    assert "annem_queue_dropped_total 7\n" in text
+    assert "annem_queue_name" not in text and "annem_queue_ok" not in text
+    assert 't_temp{zone="a\\"b"} 1.5' in text
+    assert text.endswith("# EOF\n")
+
+    registry.histogram("t_conflict", "x")
+    with pytest.raises(ValueError):
+        registry.counter("t_conflict", "x")
+
+
+def test_event_processor_outcomes():
+    """process() kabul / debounce / parse edilemeyen / pasif mesajlari sayar."""
+    name = "annem_events_processed_total"
+    before = {o: _sample(name, outcome=o) for o in ("accepted", "debounced", "unparsed", "inactive")}
+    processor = EventProcessor()
+
+    processor.process("m1", "presence", "motion", "on", b'{"occupancy": true}')
+    processor.process("m1", "presence", "motion", "on", b'{"occupancy": true}')
+    processor.process("m1", "presence", "motion", "on", b'{"occupancy": false}')
+    processor.process("m1", "presence", "motion", "on", b"???")
+
+    for outcome in before:
+        assert _sample(name, outcome=outcome) - before[outcome] == 1, outcome
+
+
+def test_telegram_send_outcomes():
+    """Telegram istekleri yontem + sonuca gore sayilir, sure histogramina yazilir."""
+    name = "annem_telegram_requests_total"
+
+    def delta(outcome, run):
+        before = _sample(name, method="sendMessage", outcome=outcome)
+        run()
+        return _sample(name, method="sendMessage", outcome=outcome) - before
+
+    def client(handler):
+        return httpx.Client(transport=httpx.MockTransport(handler))
+
+    ok = TelegramNotifier("t", ["1"], client=client(lambda r: httpx.Response(200, json={})))
+    bad = TelegramNotifier("t", ["1"], client=client(lambda r: httpx.Response(500, json={})))
+
+    def refuse(request):
+        raise httpx.ConnectError("refused")
+
+    down = TelegramNotifier("t", ["1"], client=client(refuse))
+
+    assert delta("ok", lambda: ok.send_message("1", "x")) == 1
+    assert delta("api_error", lambda: bad.send_message("1", "x")) == 1
+    assert delta("network_error", lambda: down.send_message("1", "x")) == 1
+    assert _sample("annem_telegram_request_seconds_count", method="sendMessage") >= 3
+
+
+def test_job_runner_records_duration_and_outcome():
+    """JobRunner her calismayi sure histogramina ve sonuc sayacina yazar."""
+    runner = JobRunner(SchedulerConfig())
+    runner._timed("telemetry_probe", lambda: None)()
+    with pytest.raises(RuntimeError):
+        runner._timed("telemetry_probe", MagicMock(side_effect=RuntimeError("x")))()
+
+    assert _sample("annem_job_duration_seconds_count", job="telemetry_probe") == 2
+    assert _sample("annem_job_runs_total", job="telemetry_probe", outcome="ok") == 1
+    assert _sample("annem_job_runs_total", job="telemetry_probe", outcome="error") == 1
+
+
+def test_metrics_endpoint(tmp_path):
+    """/metrics (Basic Auth arkasinda) OpenMetrics dondurur: handler suresi, bilesen istatistikleri."""
+    with patch("src.main.load_config", return_value=_make_config(tmp_path)), \
+         patch("src.main.MQTTCollector") as mock_mqtt:
+        collector = MagicMock()
+        collector.start.side_effect = ConnectionRefusedError("Connection refused")
+        collector.is_connected.return_value = False
+        collector.writer_stats.return_value = {"queue_depth": 0, "dropped": 2}
+        mock_mqtt.return_value = collector
+
+        from src.main import _boot_config, app
+
+        auth = (_boot_config.dashboard.username, _boot_config.dashboard.password)
+        with TestClient(app) as client:
+            client.auth = auth
+            client.get("/api/status")
+            resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/openmetrics-text")
+    text = resp.text
+    assert 'annem_dashboard_request_seconds_count{route="/api/status",status="200"}' in text
+    assert "annem_event_writer_dropped_total 2" in text
+    assert "annem_system_memory_percent " in text
+    assert "annem_stream_subscribers 0" in text
+    assert text.endswith("# EOF\n")
+
+
+def test_metrics_render_runs_in_read_pool(tmp_path):
+    """/metrics render'i (system_stats yenilemesi dahil) event loop disinda calisir."""
+    threads = []
+
+    def render() -> str:
+        threads.append(threading.current_thread().name)
+        return "# EOF\n"
+
+    with patch("src.main.load_config", return_value=_make_config(tmp_path)), \
+         patch("src.main.MQTTCollector") as mock_mqtt:
+        mock_mqtt.return_value.is_connected.return_value = False
+        mock_mqtt.return_value.writer_stats.return_value = {}
+
+        from src.main import _boot_config, app
+
+        with TestClient(app) as client:
+            client.auth = (_boot_config.dashboard.username, _boot_config.dashboard.password)
+            with patch.object(REGISTRY, "render", side_effect=render):
+                resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert threads and threads[0].startswith("dashboard-read")
+
+
+def test_family_is_abstract():
+    """_Family dogrudan orneklenemez; alt siniflar _new_child tanimlar."""
+    with pytest.raises(TypeError):
+        _Family("x", "y")